@@ -12,7 +12,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 
-from src.core import settings, setup_logging, get_logger
+from src.core import settings, setup_logging, get_logger, app_lifespan
 from src.features.devices import router as devices_router
 from src.features.network import network_router
 from src.core.unified import router as hub_router  # ✅ Renommé: hub → unified
@@ -74,13 +74,51 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Erreur chargement NetworkRegistry: {e}")
     
-    # ⚠️ MONITORING DÉSACTIVÉ : Scans ON-DEMAND uniquement via API
+    # ⚠️ MONITORING PAR DÉFAUT : Scans ON-DEMAND uniquement via API
     # Raison : Éviter perturbations réseau et détection antivirus
     # Utiliser : POST /api/network/scan ou POST /api/network/v2/scan
-    logger.info("ℹ️  Network monitoring: ON-DEMAND mode (no auto-scan)")
+    # Opt-in : HOME333_ADAPTIVE_SCAN_ENABLED=true → probes adaptatifs par device (budget pkt/s borné)
+    if settings.adaptive_scan_enabled:
+        from src.features.network.monitoring.scan_scheduler import get_scan_scheduler
+        app_lifespan.register_service(get_scan_scheduler(), "Adaptive scan scheduler")
+        logger.info(f"⏱️  Network monitoring: ADAPTIVE mode ({settings.adaptive_scan_max_pps} pkt/s max)")
+    else:
+        logger.info("ℹ️  Network monitoring: ON-DEMAND mode (no auto-scan)")
+    
+    # Baux DHCP locaux : HOME333_DHCP_LEASE_FILES='["/var/lib/misc/dnsmasq.leases"]'
+    if settings.dhcp_lease_files:
+        from src.features.network.monitoring.lease_watcher import get_lease_watcher
+        app_lifespan.register_service(get_lease_watcher(), "DHCP lease watcher")
+    
+    # Latence continue (opt-in) : HOME333_LATENCY_MONITOR_ENABLED=true
+    if settings.latency_monitor_enabled:
+        from src.features.network.monitoring.latency_service import get_latency_service
+        app_lifespan.register_service(get_latency_service(), "Latency service")
+    
+    # Bande passante par device : HOME333_BANDWIDTH_COLLECTOR_ENABLED=true (conntrack)
+    if settings.bandwidth_collector_enabled:
+        from src.features.network.monitoring.bandwidth_monitor import get_bandwidth_monitor
+        app_lifespan.register_service(get_bandwidth_monitor(), "Bandwidth collector")
+    
+    # Séries persistantes latence / bande passante (flush + compaction) : HOME333_TIMESERIES_ENABLED=true
+    # Historique rechargé dans un thread avant le démarrage des collecteurs
+    if settings.timeseries_enabled:
+        from src.features.network.monitoring.timeseries_store import get_timeseries_store, restore_network_history
+        app_lifespan.add_startup_task(restore_network_history, "Network history restore")
+        app_lifespan.register_service(get_timeseries_store(), "Time series store")
+    
+    # Présence (opt-in) : HOME333_PRESENCE_ENABLED=true → scans complets + registry
+    # échantillonné à chaque slot si le scan scheduler le tient à jour
+    if settings.presence_enabled:
+        from src.features.network.monitoring.presence_store import get_presence_store
+        app_lifespan.register_service(get_presence_store(), "Presence store")
+    
+    await app_lifespan.startup()
     
     yield
     
+    await app_lifespan.shutdown()
+    
     logger.info("👋 Shutdown gracefully")
     
     logger.info("🛑 333HOME - Arrêt")
@@ -49,6 +49,60 @@ class Settings(BaseSettings):
     scan_timeout: int = Field(default=30, description="Timeout scan réseau (secondes)")
     max_concurrent_scans: int = Field(default=50, description="Scans simultanés max")
     
+    # Scheduler de scan adaptatif (opt-in, désactivé = mode ON-DEMAND)
+    adaptive_scan_enabled: bool = Field(default=False, description="Probes adaptatifs en arrière-plan")
+    adaptive_scan_max_pps: float = Field(default=2.0, description="Budget max du scheduler (paquets/seconde)")
+    
+    # SNMP (switches / APs managés) - vide = source désactivée
+    snmp_targets: list = Field(default=[], description="Agents SNMP à interroger (host ou host:port)")
+    snmp_community: str = Field(default="public", description="Communauté SNMPv2c (lecture seule)")
+    
+    # API routeur (inventaire LAN en un appel) - vide = source désactivée
+    router_api: str = Field(default="", description="Type de box interrogée (freebox)")
+    freebox_url: str = Field(default="http://mafreebox.freebox.fr", description="URL de la Freebox")
+    freebox_app_id: str = Field(default="fr.333home.hub", description="app_id enregistré sur la Freebox")
+    freebox_app_token: str = Field(default="", description="app_token obtenu à l'appairage")
+    
+    # Baux DHCP locaux (dnsmasq / ISC dhcpd) - vide = source désactivée
+    dhcp_lease_files: list = Field(default=[], description="Fichiers de baux DHCP à suivre (inotify)")
+    
+    # Probes TCP (ports/services des devices en ligne) - opt-in : HOME333_PORT_PROBE_ENABLED=true
+    port_probe_enabled: bool = Field(default=False, description="Sonder les ports TCP des devices en ligne")
+    port_probe_ports: list = Field(default=[], description="Ports sondés (vide = jeu par défaut)")
+    port_probe_ttl: int = Field(default=3600, description="Durée de validité des résultats par device (secondes)")
+    port_probe_max_in_flight: int = Field(default=64, description="Connexions TCP simultanées max")
+    icmp_max_pps: float = Field(default=500.0, description="Débit max des echo requests ICMP (paquets/seconde)")
+    reachability_ttl: float = Field(default=5.0, description="Validité d'un résultat de joignabilité partagé (secondes)")
+    reachability_max_processes: int = Field(default=8, description="Processus ping simultanés max (sans socket ICMP)")
+    latency_monitor_enabled: bool = Field(default=False, description="Mesure de latence continue en arrière-plan")
+    latency_monitor_interval: float = Field(default=30.0, description="Intervalle de mesure par hôte en ligne (secondes)")
+    latency_offline_interval: float = Field(default=600.0, description="Intervalle max de mesure d'un hôte hors ligne (secondes)")
+    latency_max_in_flight: int = Field(default=16, description="Probes de latence simultanés max")
+    latency_history_size: int = Field(default=14400, description="Mesures de latence conservées par hôte (4 h à 1 Hz, ~8 octets/mesure)")
+    latency_stats_window: int = Field(default=100, description="Mesures récentes couvertes par les stats (moyenne, min/max, pertes, score)")
+    
+    # Bande passante par device (compteurs conntrack, nf_conntrack_acct=1)
+    bandwidth_collector_enabled: bool = Field(default=False, description="Collecte conntrack en arrière-plan")
+    conntrack_file: str = Field(default="/proc/net/nf_conntrack", description="Table conntrack lue par le collecteur")
+    
+    # Séries persistantes (latence, bande passante) - opt-in : HOME333_TIMESERIES_ENABLED=true
+    timeseries_enabled: bool = Field(default=False, description="Persister l'historique latence/bande passante sur disque")
+    timeseries_dir: str = Field(default="", description="Répertoire des segments de séries temporelles (vide = data/timeseries)")
+    timeseries_raw_retention_hours: float = Field(default=48.0, description="Rétention des points bruts avant rollup 1 min (heures)")
+    timeseries_rollup_retention_days: float = Field(default=90.0, description="Rétention des rollups 1 min (jours)")
+    timeseries_flush_interval: float = Field(default=10.0, description="Intervalle d'écriture des points sur disque (secondes)")
+    
+    # Détection d'anomalies (débit, latence, pertes) → historique réseau - opt-in : HOME333_ANOMALY_DETECTION_ENABLED=true
+    anomaly_detection_enabled: bool = Field(default=False, description="Détecteurs EWMA/saisonniers sur les métriques par device")
+    anomaly_z_threshold: float = Field(default=4.0, description="Z-score déclenchant une anomalie")
+    anomaly_cooldown: float = Field(default=900.0, description="Délai min entre deux événements d'un device/métrique (secondes)")
+    
+    # DNS (reverse lookups des scanners) - vide = /etc/resolv.conf
+    dns_server: str = Field(default="", description="Serveur DNS interrogé pour les PTR/A")
+
+    # Registre IEEE OUI compilé - vide = fichier embarqué
+    oui_registry_file: str = Field(default="", description="Registre OUI binaire (oui_registry build)")
+
     # Tailscale
     tailscale_api_base: str = "https://api.tailscale.com/api/v2"
     tailscale_cache_ttl: int = Field(default=300, description="TTL cache Tailscale (secondes)")
@@ -56,6 +110,10 @@ class Settings(BaseSettings):
     # Devices
     device_check_interval: int = Field(default=60, description="Intervalle vérification appareils (secondes)")
     device_history_retention: int = Field(default=30, description="Rétention historique appareils (jours)")
+    presence_enabled: bool = Field(default=False, description="Historique de présence des devices (bitmaps par slot)")
+    presence_slot_seconds: int = Field(default=300, description="Résolution de l'historique de présence (secondes)")
+    presence_retention_days: int = Field(default=30, description="Rétention de l'historique de présence (jours)")
+    change_feed_capacity: int = Field(default=2000, description="Événements conservés dans le flux de changements")
     
     # Performance
     worker_threads: int = Field(default=4, description="Nombre de workers threads")
@@ -17,6 +17,7 @@ import statistics
 
 from src.core.logging_config import get_logger
 from src.features.network.detector import ExtendedOUIDatabase
+from src.features.network.device_classifier import get_device_classifier
 
 logger = get_logger(__name__)
 
@@ -106,6 +107,19 @@ class DeviceChange:
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
+    
+    def to_event(self) -> Dict[str, Any]:
+        """Événement pour le change feed (même forme que les changements du registry)"""
+        return {
+            'type': self.change_type.value,
+            'mac': self.device_mac,
+            'old_value': self.old_value,
+            'new_value': self.new_value,
+            'source': self.source,
+            'confidence': self.confidence,
+            'timestamp': self.timestamp.isoformat(),
+            **self.metadata,
+        }
 
 
 @dataclass
@@ -159,6 +173,7 @@ class DeviceIntelligenceEngine:
     def __init__(self):
         self.logger = logger
         self.oui_db = ExtendedOUIDatabase()  # 🔧 Base OUI locale pour enrichissement vendor
+        self.classifier = get_device_classifier()  # Règles OS / spoofing compilées
         self.confidence_weights = {
             'freebox': 1.0,     # Source de vérité (routeur)
             'nmap': 0.9,        # Très fiable
@@ -167,6 +182,10 @@ class DeviceIntelligenceEngine:
             'netbios': 0.7,     # Assez fiable
             'tailscale': 0.9,   # Fiable (VPN)
             'snmp': 0.6,        # Dépend du device
+            'dhcp': 0.9,        # Baux du serveur DHCP local (attribution exacte)
+            'portscan': 0.8,    # Probes TCP-connect (ports/services)
+            'dns': 0.7,         # Reverse DNS (PTR du serveur DNS local)
+            'fingerprint': 0.6, # OS passif (TTL ICMP + options TCP)
             'manual': 1.0,      # Données manuelles = confiance max
         }
     
@@ -209,8 +228,8 @@ class DeviceIntelligenceEngine:
         unified = {
             'mac': mac,
             'sources': [s.source for s in sources],
-            'last_updated': datetime.now().isoformat(),
             'data_sources_count': len(sources),
+            **self.volatile_fields(sources),
         }
         
         # Fusionner les champs avec priorité
@@ -245,10 +264,6 @@ class DeviceIntelligenceEngine:
         # Status: online si AU MOINS une source dit online
         unified['is_online'] = any(s.is_online for s in sources)
         
-        # Latence: moyenne des sources qui répondent
-        latencies = [s.response_time_ms for s in sources if s.response_time_ms]
-        unified['average_latency_ms'] = statistics.mean(latencies) if latencies else None
-        
         # Ports ouverts: union de tous les ports détectés
         all_ports = set()
         for s in sources:
@@ -271,22 +286,35 @@ class DeviceIntelligenceEngine:
         unified['confidence_score'] = self.calculate_confidence(unified, sources)
         unified['data_quality'] = self._determine_data_quality(unified, sources).value
         
-        # Garder metadata de toutes les sources
-        unified['sources_metadata'] = {
-            s.source: {
-                'timestamp': s.timestamp.isoformat(),
-                'scan_type': s.scan_type,
-                'metadata': s.metadata
-            }
-            for s in sources
-        }
-        
         # Si données existantes, fusionner historique
         if existing_data:
             unified = self._merge_with_history(unified, existing_data)
         
         return unified
     
+    def volatile_fields(self, sources: List[DeviceData]) -> Dict[str, Any]:
+        """
+        Champs qui changent à chaque scan même si les observations sont identiques
+        
+        (horodatage, latence mesurée, metadata brutes des sources) - recalculés
+        sur les résultats de fusion mémoïsés.
+        """
+        # Latence: moyenne des sources qui répondent
+        latencies = [s.response_time_ms for s in sources if s.response_time_ms]
+        return {
+            'last_updated': datetime.now().isoformat(),
+            'average_latency_ms': statistics.mean(latencies) if latencies else None,
+            # Garder metadata de toutes les sources
+            'sources_metadata': {
+                s.source: {
+                    'timestamp': s.timestamp.isoformat(),
+                    'scan_type': s.scan_type,
+                    'metadata': s.metadata
+                }
+                for s in sources
+            },
+        }
+    
     def _merge_field(self, sources: List[DeviceData], field: str) -> Any:
         """Fusionne un champ spécifique en priorisant les sources fiables"""
         for source in sources:
@@ -305,46 +333,12 @@ class DeviceIntelligenceEngine:
         - Vendor Samsung/Android → Android
         - Vendor Raspberry Pi → Linux
         - Hostname patterns (MacBook, DESKTOP-, etc.)
+        
+        Règles: OS_RULES (device_classifier), première règle gagnante
         """
-        vendor = (unified.get('vendor') or '').lower()
-        hostname = (unified.get('hostname') or '').lower()
-        device_type = (unified.get('device_type') or '').lower()
-        
-        # Apple
-        if 'apple' in vendor or 'iphone' in vendor or 'ipad' in vendor:
-            if 'iphone' in device_type or 'ipad' in device_type:
-                return 'iOS'
-            if 'macbook' in hostname or 'imac' in hostname or 'mac' in hostname:
-                return 'macOS'
-            return 'iOS/macOS'
-        
-        # Android
-        if 'android' in vendor or 'samsung' in vendor or 'xiaomi' in vendor or 'huawei' in vendor:
-            return 'Android'
-        
-        # Windows (via hostname patterns)
-        if 'desktop-' in hostname or 'win-' in hostname or hostname.startswith('pc-'):
-            return 'Windows'
-        
-        # Windows (via vendor PC brands)
-        windows_vendors = ['asus', 'msi', 'dell', 'hp', 'lenovo', 'microsoft']
-        if any(v in vendor for v in windows_vendors):
-            return 'Windows'
-        
-        # Linux embedded
-        if 'raspberry' in vendor or 'espressif' in vendor or 'esp32' in vendor:
-            return 'Linux Embedded'
-        
-        # Network devices
-        if 'router' in device_type or 'freebox' in vendor or 'livebox' in vendor:
-            return 'Linux/RouterOS'
-        
-        # Smart devices
-        if 'tv' in device_type or 'smart' in device_type:
-            return 'Android TV/Linux'
-        
-        # Default heuristic: Si pas d'info, supposer Linux/Unix
-        return None  # Mieux vaut ne pas deviner
+        return self.classifier.classify_one(
+            unified.get('hostname'), unified.get('vendor'), device_type=unified.get('device_type')
+        ).os
     
     def _merge_with_history(
         self,
@@ -569,34 +563,26 @@ class DeviceIntelligenceEngine:
                     }
                 ))
         
-        # Détecter MAC spoofing potentiel
-        for device in devices:
+        # Détecter MAC spoofing potentiel (SPOOFING_RULES, lot classifié en une passe)
+        for device, result in zip(devices, self.classifier.classify(devices)):
             vendor = (device.get('vendor') or '').lower()
             device_type = (device.get('device_type') or '').lower()
             mac = device.get('mac')
             
-            # Exemple: vendor dit "Apple" mais device_type dit "Windows"
-            suspicious_combinations = [
-                ('apple', 'windows'),
-                ('microsoft', 'mac'),
-                ('cisco', 'windows'),
-            ]
-            
-            for vendor_keyword, type_keyword in suspicious_combinations:
-                if vendor_keyword in vendor and type_keyword in device_type:
-                    conflicts.append(NetworkConflict(
-                        conflict_type=ConflictType.MAC_SPOOFING,
-                        severity='warning',
-                        detected_at=timestamp,
-                        description=f"Possible MAC spoofing: vendor={vendor} vs type={device_type}",
-                        affected_devices=[mac],
-                        details={
-                            'mac': mac,
-                            'vendor': vendor,
-                            'device_type': device_type,
-                            'suspicion_level': 'medium'
-                        }
-                    ))
+            for _ in result.spoofing:
+                conflicts.append(NetworkConflict(
+                    conflict_type=ConflictType.MAC_SPOOFING,
+                    severity='warning',
+                    detected_at=timestamp,
+                    description=f"Possible MAC spoofing: vendor={vendor} vs type={device_type}",
+                    affected_devices=[mac],
+                    details={
+                        'mac': mac,
+                        'vendor': vendor,
+                        'device_type': device_type,
+                        'suspicion_level': 'medium'
+                    }
+                ))
         
         return conflicts
     
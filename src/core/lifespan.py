@@ -3,6 +3,7 @@
 Lifespan events moderne pour FastAPI (remplace @app.on_event)
 """
 
+import inspect
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
@@ -11,6 +12,13 @@ from fastapi import FastAPI
 logger = logging.getLogger(__name__)
 
 
+async def _maybe_await(result):
+    """Attendre le résultat s'il s'agit d'une coroutine (tâches sync ou async)"""
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
 class AppLifespan:
     """Gestionnaire du cycle de vie de l'application"""
     
@@ -20,7 +28,9 @@ class AppLifespan:
         self.shutdown_tasks = []
     
     def register_service(self, service, name: str):
-        """Enregistrer un service à gérer"""
+        """Enregistrer un service à gérer (idempotent)"""
+        if any(registered is service for registered, _ in self.services):
+            return
         self.services.append((service, name))
     
     def add_startup_task(self, task, name: str):
@@ -49,7 +59,7 @@ class AppLifespan:
             try:
                 logger.info(f"▶️ Démarrage: {name}")
                 if callable(task):
-                    await task() if hasattr(task, '__await__') else task()
+                    await _maybe_await(task())
                 logger.info(f"✅ {name} - OK")
             except Exception as e:
                 logger.error(f"❌ Erreur démarrage {name}: {e}")
@@ -59,7 +69,7 @@ class AppLifespan:
             try:
                 if hasattr(service, 'initialize'):
                     logger.info(f"🔧 Initialisation service: {name}")
-                    await service.initialize() if hasattr(service.initialize, '__await__') else service.initialize()
+                    await _maybe_await(service.initialize())
                     logger.info(f"✅ Service {name} initialisé")
             except Exception as e:
                 logger.error(f"❌ Erreur initialisation {name}: {e}")
@@ -80,7 +90,7 @@ class AppLifespan:
             try:
                 if hasattr(service, 'shutdown'):
                     logger.info(f"⏹️ Arrêt service: {name}")
-                    await service.shutdown() if hasattr(service.shutdown, '__await__') else service.shutdown()
+                    await _maybe_await(service.shutdown())
                     logger.info(f"✅ Service {name} arrêté")
             except Exception as e:
                 logger.error(f"❌ Erreur arrêt {name}: {e}")
@@ -90,7 +100,7 @@ class AppLifespan:
             try:
                 logger.info(f"⏹️ Exécution tâche d'arrêt: {name}")
                 if callable(task):
-                    await task() if hasattr(task, '__await__') else task()
+                    await _maybe_await(task())
                 logger.info(f"✅ {name} - OK")
             except Exception as e:
                 logger.error(f"❌ Erreur tâche d'arrêt {name}: {e}")
@@ -30,7 +30,7 @@ async def get_all_unified_devices() -> List[Dict[str, Any]]:
         Liste complète des devices avec toutes les infos
     """
     try:
-        devices = get_unified_devices()
+        devices = await get_unified_devices()
         result = [d.to_dict() for d in devices]
         logger.info(f"📊 Returning {len(result)} unified devices")
         return result
@@ -51,7 +51,7 @@ async def get_unified_device(device_id: str) -> Dict[str, Any]:
         Device avec toutes les infos
     """
     try:
-        device = get_unified_device_by_id(device_id)
+        device = await get_unified_device_by_id(device_id)
         
         if not device:
             raise HTTPException(status_code=404, detail="Device not found")
@@ -76,7 +76,7 @@ async def get_unified_device_by_mac_address(mac: str) -> Dict[str, Any]:
         Device avec toutes les infos
     """
     try:
-        device = get_unified_device_by_mac(mac)
+        device = await get_unified_device_by_mac(mac)
         
         if not device:
             raise HTTPException(status_code=404, detail="Device not found")
@@ -98,7 +98,7 @@ async def get_hub_stats() -> Dict[str, Any]:
         Statistiques agrégées
     """
     try:
-        stats = get_devices_stats()
+        stats = await get_devices_stats()
         logger.debug(f"📊 Hub stats: {stats}")
         return {
             'devices': stats,
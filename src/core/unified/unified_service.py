@@ -17,6 +17,7 @@ import json
 from src.features.devices.manager import DeviceManager
 from src.features.network.storage import get_all_devices as get_network_devices, get_device_by_mac
 from src.features.network.registry import get_network_registry  # ✅ Import registry
+from src.features.network.monitoring.reachability import get_reachability_service
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -128,7 +129,7 @@ class UnifiedDevice:
         }
 
 
-def get_unified_devices() -> List[UnifiedDevice]:
+async def get_unified_devices() -> List[UnifiedDevice]:
     """
     Récupère tous les devices en unifiant les sources
     
@@ -254,26 +255,20 @@ def get_unified_devices() -> List[UnifiedDevice]:
         logger.error(f"❌ Error enriching from registry: {e}")
     
     # 3. Vérifier le statut online des devices managés sans données réseau
-    # via ping rapide (pour sync temps réel)
+    # via ping rapide (pour sync temps réel) - un seul lot, cache partagé
     try:
-        import subprocess
-        for mac, data in unified.items():
-            if data['in_devices'] and not data['in_network'] and data.get('ip'):
-                # Ping rapide (timeout 1s) pour vérifier si online
-                try:
-                    result = subprocess.run(
-                        ['ping', '-c', '1', '-W', '1', data['ip']],
-                        capture_output=True,
-                        timeout=2
-                    )
-                    is_online = result.returncode == 0
-                    data['online'] = is_online
-                    if is_online:
-                        data['last_seen'] = datetime.now().isoformat()
-                        logger.debug(f"✅ Ping OK: {data['name']} ({data['ip']})")
-                except Exception as e:
-                    logger.debug(f"⚠️ Ping failed for {data['name']}: {e}")
-                    data['online'] = False
+        pending = {
+            mac: data['ip'] for mac, data in unified.items()
+            if data['in_devices'] and not data['in_network'] and data.get('ip')
+        }
+        if pending:
+            reachable = await get_reachability_service().is_reachable(pending.values(), timeout=1.0)
+            for mac, ip in pending.items():
+                data = unified[mac]
+                data['online'] = reachable.get(ip, False)
+                if data['online']:
+                    data['last_seen'] = datetime.now().isoformat()
+                    logger.debug(f"✅ Ping OK: {data['name']} ({ip})")
     except Exception as e:
         logger.warning(f"⚠️ Live ping check failed: {e}")
     
@@ -290,9 +285,9 @@ def get_unified_devices() -> List[UnifiedDevice]:
     return result
 
 
-def get_unified_device_by_mac(mac: str) -> Optional[UnifiedDevice]:
+async def get_unified_device_by_mac(mac: str) -> Optional[UnifiedDevice]:
     """Récupère un device unifié par MAC"""
-    devices = get_unified_devices()
+    devices = await get_unified_devices()
     mac_upper = mac.upper()
     
     for device in devices:
@@ -302,9 +297,9 @@ def get_unified_device_by_mac(mac: str) -> Optional[UnifiedDevice]:
     return None
 
 
-def get_unified_device_by_id(device_id: str) -> Optional[UnifiedDevice]:
+async def get_unified_device_by_id(device_id: str) -> Optional[UnifiedDevice]:
     """Récupère un device unifié par ID"""
-    devices = get_unified_devices()
+    devices = await get_unified_devices()
     
     for device in devices:
         if device.id == device_id:
@@ -313,9 +308,9 @@ def get_unified_device_by_id(device_id: str) -> Optional[UnifiedDevice]:
     return None
 
 
-def get_devices_stats() -> Dict[str, Any]:
+async def get_devices_stats() -> Dict[str, Any]:
     """Stats globales des devices"""
-    devices = get_unified_devices()
+    devices = await get_unified_devices()
     
     return {
         'total': len(devices),
@@ -8,7 +8,6 @@ Au lieu de ping individuel (lent), récupère le statut depuis le registry
 """
 
 import asyncio
-import subprocess
 from typing import Dict, List, Optional
 
 from src.core import get_logger
@@ -68,15 +67,10 @@ class DeviceMonitor:
         timeout = timeout or self.ping_timeout
         
         try:
-            # Utiliser ping système
-            process = await asyncio.create_subprocess_exec(
-                'ping', '-c', '1', '-W', str(timeout), ip,
-                stdout=asyncio.subprocess.DEVNULL,
-                stderr=asyncio.subprocess.DEVNULL
-            )
-            
-            returncode = await process.wait()
-            return returncode == 0
+            # Service partagé: cache court + coalescence des pings concurrents
+            from src.features.network.monitoring.reachability import get_reachability_service
+            reachable = await get_reachability_service().is_reachable([ip], timeout=timeout)
+            return reachable[ip]
             
         except Exception as e:
             logger.debug(f"Ping failed for {ip}: {e}")
@@ -141,6 +135,18 @@ class DeviceMonitor:
         # Charger le registry cache AVANT de vérifier les devices
         self._load_registry_cache()
         
+        # Devices hors registry: un seul lot de pings (résultats mis en cache)
+        unknown_ips = [
+            device['ip'] for device in devices
+            if device.get('ip') and device.get('mac', '').upper() not in self._registry_cache
+        ]
+        if unknown_ips:
+            try:
+                from src.features.network.monitoring.reachability import get_reachability_service
+                await get_reachability_service().is_reachable(unknown_ips, timeout=self.ping_timeout)
+            except Exception as e:
+                logger.debug(f"Batch ping failed: {e}")
+        
         tasks = [self.check_device_status(device) for device in devices]
         results = await asyncio.gather(*tasks)
         return list(results)
@@ -0,0 +1,160 @@
+"""
+🏠 333HOME - Change Feed
+
+Flux unique et borné des changements réseau:
+- Chaque événement reçoit un numéro de séquence croissant (seq)
+- Ring buffer (HOME333_CHANGE_FEED_CAPACITY derniers événements)
+- Lecture par curseur: since(seq) → événements postérieurs + prochain curseur,
+  les clients interrogent les deltas au lieu de relire tout le registry
+- Persistance optionnelle (fichier JSON réécrit avec le registry)
+
+Producteurs: NetworkRegistry (scans, baux DHCP, scheduler, conflits IP,
+rotations de MAC) et DeviceIntelligenceEngine (via MultiSourceScanner).
+"""
+
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ChangeFeed:
+    """
+    Ring buffer d'événements numérotés
+
+    Usage:
+        feed.extend(changes)                    # [{'type': ..., 'mac': ...}]
+        page = feed.since(cursor, limit=100)    # {'events', 'next_seq', 'truncated', ...}
+        cursor = page['next_seq']
+    """
+
+    def __init__(self, capacity: Optional[int] = None, storage_file: Optional[Path] = None):
+        self.capacity = capacity or settings.change_feed_capacity
+        self.storage_file = Path(storage_file) if storage_file else None
+        self._events: deque = deque(maxlen=self.capacity)
+        self.last_seq = 0
+        self._dirty = False
+        self._load()
+
+    # === ÉCRITURE ===
+
+    def append(self, event: Dict[str, Any]) -> int:
+        """Ajouter un événement (copié) et retourner son numéro de séquence"""
+        self.last_seq += 1
+        self._events.append({
+            'seq': self.last_seq,
+            **event,
+            'timestamp': event.get('timestamp') or datetime.now().isoformat(),
+        })
+        self._dirty = True
+        return self.last_seq
+
+    def extend(self, events: Iterable[Dict[str, Any]]) -> int:
+        for event in events:
+            self.append(event)
+        return self.last_seq
+
+    # === LECTURE ===
+
+    @property
+    def oldest_seq(self) -> int:
+        """Plus ancien seq encore disponible (last_seq + 1 si vide)"""
+        return self._events[0]['seq'] if self._events else self.last_seq + 1
+
+    def since(
+        self,
+        seq: int = 0,
+        limit: int = 100,
+        mac: Optional[str] = None,
+        types: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Événements de seq strictement supérieur au curseur
+
+        Args:
+            seq: Curseur (dernier seq déjà reçu, 0 = depuis le début)
+            limit: Nombre max d'événements retournés
+            mac: Filtrer sur une MAC (optionnel)
+            types: Filtrer sur des types d'événements (optionnel)
+
+        Returns:
+            {events, next_seq, latest_seq, oldest_seq, truncated}
+            truncated=True si des événements postérieurs au curseur ont été
+            évincés du buffer, ou si le curseur est inconnu (le client doit
+            se resynchroniser)
+        """
+        oldest = self.oldest_seq
+        # seqs contigus dans le buffer: position directe du curseur
+        start = max(seq + 1 - oldest, 0)
+        mac = mac.upper() if mac else None
+        types = set(types) if types else None
+
+        events: List[Dict[str, Any]] = []
+        next_seq = max(seq, self.last_seq)
+        for event in islice(self._events, start, None):
+            if mac and (event.get('mac') or '').upper() != mac:
+                continue
+            if types and event.get('type') not in types:
+                continue
+            if len(events) == limit:
+                next_seq = events[-1]['seq']
+                break
+            events.append(dict(event))
+
+        return {
+            'events': events,
+            'next_seq': next_seq,
+            'latest_seq': self.last_seq,
+            'oldest_seq': oldest,
+            'truncated': seq + 1 < oldest or seq > self.last_seq,
+        }
+
+    def latest(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Derniers événements, du plus récent au plus ancien"""
+        return [dict(e) for e in islice(reversed(self._events), limit)]
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'buffered': len(self._events),
+            'capacity': self.capacity,
+            'latest_seq': self.last_seq,
+            'oldest_seq': self.oldest_seq,
+            'persistent': self.storage_file is not None,
+        }
+
+    # === PERSISTANCE ===
+
+    def _load(self):
+        if not self.storage_file or not self.storage_file.exists():
+            return
+        try:
+            with open(self.storage_file, 'r') as f:
+                data = json.load(f)
+            self._events.extend(data.get('events', []))
+            self.last_seq = max(data.get('last_seq', 0), self._events[-1]['seq'] if self._events else 0)
+            logger.info(f"📜 Change feed chargé: {len(self._events)} événements (seq {self.last_seq})")
+        except Exception as e:
+            logger.error(f"❌ Erreur chargement change feed: {e}")
+
+    def save(self):
+        """Sauvegarder le buffer (no-op sans fichier ou sans nouvel événement)"""
+        if not self.storage_file or not self._dirty:
+            return
+        try:
+            tmp = self.storage_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump({'last_seq': self.last_seq, 'events': list(self._events)}, f, ensure_ascii=False)
+            tmp.replace(self.storage_file)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"❌ Erreur sauvegarde change feed: {e}")
@@ -0,0 +1,176 @@
+"""
+🏠 333HOME - IP Conflict Index
+
+Index IP ↔ MAC maintenu à chaque écriture (registry, DHCP tracker):
+- Mise à jour O(1) par changement (retrait de l'ancienne IP, ajout à la nouvelle)
+- Événements à la transition: conflit ouvert (2e MAC sur une IP) / résolu
+  (retour à une seule MAC), poussés aux abonnés et renvoyés à l'appelant
+- Les endpoints lisent l'index au lieu de regrouper tous les devices
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONFLICT_OPENED = 'ip_conflict_opened'
+CONFLICT_RESOLVED = 'ip_conflict_resolved'
+
+
+@dataclass
+class IPConflict:
+    """Conflit ouvert: plusieurs MACs sur une même IP"""
+    ip: str
+    opened_at: str
+    opened_monotonic: float = field(default_factory=time.monotonic, repr=False)
+
+
+class ConflictIndex:
+    """
+    Index IP → MACs avec détection incrémentale des conflits
+
+    Usage:
+        index = ConflictIndex('registry')
+        events = index.set_ip('AA:..', '192.168.1.10')  # [] ou [ip_conflict_opened]
+        index.subscribe(callback)                       # callback(event)
+    """
+
+    def __init__(self, name: str = 'conflicts'):
+        self.name = name
+        self._ip_by_mac: Dict[str, str] = {}
+        self._macs_by_ip: Dict[str, Set[str]] = {}
+        self._info: Dict[str, Dict[str, Any]] = {}
+        self._open: Dict[str, IPConflict] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self.stats = {'updates': 0, 'opened': 0, 'resolved': 0}
+
+    # === ÉCRITURES ===
+
+    def set_ip(self, mac: str, ip: Optional[str], **info) -> List[Dict[str, Any]]:
+        """
+        Associer une MAC à une IP (None = retirer la MAC de l'index)
+
+        Args:
+            mac: Adresse MAC
+            ip: IP actuelle (None si offline / inconnue)
+            **info: Données affichées avec le conflit (hostname, last_seen...)
+
+        Returns:
+            Événements de conflit déclenchés par ce changement
+        """
+        mac = mac.upper()
+        if info:
+            self._info[mac] = info
+        old_ip = self._ip_by_mac.get(mac)
+        if old_ip == ip:
+            return []
+
+        self.stats['updates'] += 1
+        events = []
+        if old_ip is not None:
+            del self._ip_by_mac[mac]
+            macs = self._macs_by_ip[old_ip]
+            macs.discard(mac)
+            if not macs:
+                del self._macs_by_ip[old_ip]
+            if len(macs) <= 1 and old_ip in self._open:
+                events.append(self._resolve(old_ip, mac))
+
+        if ip is None:
+            self._info.pop(mac, None)
+        else:
+            self._ip_by_mac[mac] = ip
+            macs = self._macs_by_ip.setdefault(ip, set())
+            macs.add(mac)
+            if len(macs) == 2:
+                events.append(self._open_conflict(ip))
+
+        for event in events:
+            self._notify(event)
+        return events
+
+    def remove(self, mac: str) -> List[Dict[str, Any]]:
+        return self.set_ip(mac, None)
+
+    def rebuild(self, entries: Iterable[Tuple[str, Optional[str], Dict[str, Any]]]):
+        """Reconstruire l'index (chargement initial) - sans événements"""
+        self._ip_by_mac.clear()
+        self._macs_by_ip.clear()
+        self._info.clear()
+        self._open.clear()
+        now = datetime.now().isoformat()
+        for mac, ip, info in entries:
+            if not ip:
+                continue
+            mac = mac.upper()
+            self._ip_by_mac[mac] = ip
+            self._macs_by_ip.setdefault(ip, set()).add(mac)
+            self._info[mac] = info
+        for ip, macs in self._macs_by_ip.items():
+            if len(macs) > 1:
+                self._open[ip] = IPConflict(ip=ip, opened_at=now)
+
+    def _open_conflict(self, ip: str) -> Dict[str, Any]:
+        conflict = self._open[ip] = IPConflict(ip=ip, opened_at=datetime.now().isoformat())
+        self.stats['opened'] += 1
+        macs = sorted(self._macs_by_ip[ip])
+        logger.warning(f"⚠️ Conflit IP ({self.name}): {ip} utilisée par {', '.join(macs)}")
+        return {'type': CONFLICT_OPENED, 'ip': ip, 'macs': macs, 'timestamp': conflict.opened_at}
+
+    def _resolve(self, ip: str, departed_mac: str) -> Dict[str, Any]:
+        conflict = self._open.pop(ip)
+        self.stats['resolved'] += 1
+        duration = time.monotonic() - conflict.opened_monotonic
+        logger.info(f"✅ Conflit IP résolu ({self.name}): {ip} ({departed_mac} parti, {duration:.0f}s)")
+        return {
+            'type': CONFLICT_RESOLVED,
+            'ip': ip,
+            'mac': departed_mac,
+            'remaining_macs': sorted(self._macs_by_ip.get(ip, ())),
+            'opened_at': conflict.opened_at,
+            'duration_seconds': round(duration, 1),
+            'timestamp': datetime.now().isoformat(),
+        }
+
+    # === ABONNÉS ===
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        """Recevoir les événements opened/resolved au fil de l'eau"""
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event: Dict[str, Any]):
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.error(f"❌ Abonné conflits ({self.name}): {e}")
+
+    # === LECTURE ===
+
+    def get_conflicts(self) -> List[Dict[str, Any]]:
+        """Conflits ouverts (lecture de l'index, pas de regroupement)"""
+        return [
+            {
+                'ip': ip,
+                'devices': [{'mac': mac, **self._info.get(mac, {})} for mac in sorted(self._macs_by_ip[ip])],
+                'conflict_count': len(self._macs_by_ip[ip]),
+                'opened_at': conflict.opened_at,
+            }
+            for ip, conflict in self._open.items()
+        ]
+
+    def get_macs(self, ip: str) -> Set[str]:
+        return set(self._macs_by_ip.get(ip, ()))
+
+    def get_ip(self, mac: str) -> Optional[str]:
+        return self._ip_by_mac.get(mac.upper())
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {**self.stats, 'indexed_macs': len(self._ip_by_mac), 'open_conflicts': len(self._open)}
@@ -8,7 +8,6 @@ Combine:
 - Device Identifier (patterns hostname, services)
 """
 
-import re
 import time
 import logging
 import asyncio
@@ -16,6 +15,9 @@ import aiohttp
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
+from .device_classifier import TYPE_RULES, get_device_classifier
+from .oui_registry import get_oui_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -111,9 +113,13 @@ class MacVendorAPI:
 # === BASE OUI LOCALE ÉTENDUE ===
 
 class ExtendedOUIDatabase:
-    """Base OUI locale avec IoT, chauffage, électroménager"""
+    """
+    Base OUI locale: overlay curé (type d'appareil, IoT, chauffage,
+    électroménager) au-dessus du registre IEEE complet (oui_registry)
+    """
     
     def __init__(self):
+        self.registry = get_oui_registry()
         self.oui_database = {
             # APPLE (including randomized MACs patterns)
             "00:1F:F3": {"vendor": "Apple Inc.", "type": "mobile", "note": "iPhone/iPad ancien"},
@@ -184,6 +190,18 @@ class ExtendedOUIDatabase:
             info['confidence'] = 'high'
             return info
         
+        # Registre IEEE (plus long préfixe, pas d'indice de type)
+        match = self.registry.lookup(mac_clean)
+        if match:
+            vendor, prefix_bits = match
+            return {
+                'vendor': vendor,
+                'source': 'ieee_oui',
+                'oui': oui,
+                'prefix_bits': prefix_bits,
+                'confidence': 'high',
+            }
+        
         return None
     
     def get_icon(self, device_type: str) -> str:
@@ -208,60 +226,11 @@ class ExtendedOUIDatabase:
 # === DEVICE IDENTIFIER ===
 
 class DeviceIdentifier:
-    """Identifie le type d'appareil via patterns"""
+    """Identifie le type d'appareil via patterns (cf. device_classifier)"""
     
     def __init__(self):
-        self.patterns = {
-            'smartphone': {
-                'hostnames': [
-                    r'.*iphone.*', r'.*android.*', r'.*samsung.*',
-                    r'.*galaxy.*', r'.*pixel.*', r'.*xiaomi.*'
-                ],
-                'vendors': ['Apple', 'Samsung', 'Huawei', 'Xiaomi', 'OnePlus', 'Google'],
-                'services': ['5353'],
-            },
-            'computer': {
-                'hostnames': [
-                    r'.*desktop.*', r'.*laptop.*', r'.*pc.*',
-                    r'.*-pc$', r'.*win.*', r'.*ubuntu.*'
-                ],
-                'vendors': ['Dell', 'HP', 'Lenovo', 'ASUS', 'MSI'],
-                'services': ['135', '139', '445', '3389'],
-            },
-            'router': {
-                'hostnames': [
-                    r'.*router.*', r'.*gateway.*', r'.*livebox.*',
-                    r'.*freebox.*', r'.*bbox.*'
-                ],
-                'vendors': ['Netgear', 'TP-Link', 'D-Link', 'Freebox', 'Orange'],
-                'services': ['80', '443', '8080'],
-            },
-            'smart_tv': {
-                'hostnames': [r'.*tv.*', r'.*samsung.*tv.*', r'.*lg.*tv.*'],
-                'vendors': ['Samsung', 'LG', 'Sony'],
-                'services': ['8080', '9080'],
-            },
-            'iot': {
-                'hostnames': [
-                    r'.*esp.*', r'.*sensor.*', r'.*smart.*',
-                    r'.*bulb.*', r'.*camera.*'
-                ],
-                'vendors': ['Espressif', 'Raspberry Pi', 'Nest', 'Philips'],
-                'services': ['80', '443', '1883'],
-            },
-            'raspberry_pi': {
-                'hostnames': [r'.*raspberry.*', r'.*rpi.*', r'.*pi.*'],
-                'vendors': ['Raspberry Pi'],
-                'services': ['22', '80'],
-            },
-        }
-    
-    def _match_patterns(self, value: str, patterns: List[str]) -> bool:
-        """Check si value matche un pattern"""
-        if not value:
-            return False
-        value_lower = value.lower()
-        return any(re.match(p, value_lower) for p in patterns)
+        self.classifier = get_device_classifier()
+        self.patterns = TYPE_RULES
     
     def identify(
         self,
@@ -270,47 +239,11 @@ class DeviceIdentifier:
         services: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """Identifie le type d'appareil"""
-        scores = {}
-        
-        for device_type, patterns in self.patterns.items():
-            score = 0.0
-            
-            # Hostname (40%)
-            if hostname and self._match_patterns(hostname, patterns.get('hostnames', [])):
-                score += 0.4
-            
-            # Vendor (40%)
-            if vendor:
-                vendor_patterns = patterns.get('vendors', [])
-                if any(vp.lower() in vendor.lower() for vp in vendor_patterns):
-                    score += 0.4
-            
-            # Services (20%)
-            if services:
-                service_patterns = patterns.get('services', [])
-                if any(str(s) in service_patterns for s in services):
-                    score += 0.2
-            
-            if score > 0:
-                scores[device_type] = score
-        
-        if scores:
-            best_type = max(scores, key=scores.get)
-            best_score = scores[best_type]
-            
-            if best_score >= 0.3:
-                confidence = 'high' if best_score >= 0.7 else 'medium'
-                return {
-                    'device_type': best_type,
-                    'confidence': confidence,
-                    'score': best_score,
-                }
-        
-        return {
-            'device_type': 'unknown',
-            'confidence': 'low',
-            'score': 0.0,
-        }
+        return self.classifier.classify_one(hostname, vendor, services).to_identification()
+    
+    def identify_many(self, devices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Identifie un lot de devices (dicts: hostname, vendor, services)"""
+        return [c.to_identification() for c in self.classifier.classify(devices)]
 
 
 # === DETECTOR PRINCIPAL ===
@@ -347,7 +280,7 @@ class DeviceDetector:
         # 1. Base OUI locale (prioritaire)
         local_info = self.oui_db.lookup(mac)
         
-        if local_info:
+        if local_info and local_info.get('type'):
             vendor = local_info['vendor']
             device_type = local_info.get('type', 'unknown')
             note = local_info.get('note', '')
@@ -362,8 +295,8 @@ class DeviceDetector:
                 'note': note,
             }
         
-        # 2. API externe (macvendors.com)
-        api_info = await self.mac_api.get_vendor_info(mac)
+        # 2. Registre IEEE local, sinon API externe (macvendors.com)
+        api_info = local_info or await self.mac_api.get_vendor_info(mac)
         vendor = api_info.get('vendor', 'Unknown')
         
         # 3. Identification via patterns
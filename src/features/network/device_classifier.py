@@ -0,0 +1,296 @@
+"""
+🏠 333HOME - Device Classifier
+
+Classification des appareils en une passe, à partir d'une table de règles
+déclarative compilée une seule fois:
+- Type d'appareil (score hostname 40% / vendor 40% / services 20%)
+- OS probable (heuristiques vendor / hostname / type, première règle gagnante)
+- Combinaisons vendor/type suspectes (MAC spoofing)
+
+Tous les mots-clés de toutes les règles sont compilés dans une regex
+combinée par champ: chaque champ d'un device (hostname, vendor, type) est
+parcouru une seule fois, puis toutes les règles sont évaluées par
+intersections d'ensembles.
+
+Usage:
+    classifier = get_device_classifier()
+    results = classifier.classify(devices)  # lot de dicts unifiés
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Préfixe "^" sur un mot-clé = ancré en début de valeur
+ANCHOR = '\x00'
+
+# Type d'appareil: mots-clés hostname / vendor (sous-chaînes, casse ignorée)
+# et ports ouverts. Ordre = priorité en cas d'égalité de score.
+TYPE_RULES: Dict[str, Dict[str, List[str]]] = {
+    'smartphone': {
+        'hostnames': ['iphone', 'android', 'samsung', 'galaxy', 'pixel', 'xiaomi'],
+        'vendors': ['Apple', 'Samsung', 'Huawei', 'Xiaomi', 'OnePlus', 'Google'],
+        'services': ['5353'],
+    },
+    'computer': {
+        'hostnames': ['desktop', 'laptop', 'pc', 'win', 'ubuntu'],
+        'vendors': ['Dell', 'HP', 'Lenovo', 'ASUS', 'MSI'],
+        'services': ['135', '139', '445', '3389'],
+    },
+    'router': {
+        'hostnames': ['router', 'gateway', 'livebox', 'freebox', 'bbox'],
+        'vendors': ['Netgear', 'TP-Link', 'D-Link', 'Freebox', 'Orange'],
+        'services': ['80', '443', '8080'],
+    },
+    'smart_tv': {
+        'hostnames': ['tv'],
+        'vendors': ['Samsung', 'LG', 'Sony'],
+        'services': ['8080', '9080'],
+    },
+    'iot': {
+        'hostnames': ['esp', 'sensor', 'smart', 'bulb', 'camera'],
+        'vendors': ['Espressif', 'Raspberry Pi', 'Nest', 'Philips'],
+        'services': ['80', '443', '1883'],
+    },
+    'raspberry_pi': {
+        'hostnames': ['raspberry', 'rpi', 'pi'],
+        'vendors': ['Raspberry Pi'],
+        'services': ['22', '80'],
+    },
+}
+
+TYPE_WEIGHTS = {'hostname': 0.4, 'vendor': 0.4, 'services': 0.2}
+MIN_TYPE_SCORE = 0.3
+HIGH_TYPE_SCORE = 0.7
+
+# OS: (os, clauses) - toutes les clauses doivent matcher, une clause est
+# une liste d'alternatives (champ, mot-clé). Première règle gagnante.
+APPLE = [('vendor', 'apple'), ('vendor', 'iphone'), ('vendor', 'ipad')]
+OS_RULES: List[Tuple[str, List[List[Tuple[str, str]]]]] = [
+    ('iOS', [APPLE, [('device_type', 'iphone'), ('device_type', 'ipad')]]),
+    ('macOS', [APPLE, [('hostname', 'macbook'), ('hostname', 'imac'), ('hostname', 'mac')]]),
+    ('iOS/macOS', [APPLE]),
+    ('Android', [[('vendor', kw) for kw in ('android', 'samsung', 'xiaomi', 'huawei')]]),
+    ('Windows', [[('hostname', 'desktop-'), ('hostname', 'win-'), ('hostname', '^pc-')]]),
+    ('Windows', [[('vendor', kw) for kw in ('asus', 'msi', 'dell', 'hp', 'lenovo', 'microsoft')]]),
+    ('Linux Embedded', [[('vendor', 'raspberry'), ('vendor', 'espressif'), ('vendor', 'esp32')]]),
+    ('Linux/RouterOS', [[('device_type', 'router'), ('vendor', 'freebox'), ('vendor', 'livebox')]]),
+    ('Android TV/Linux', [[('device_type', 'tv'), ('device_type', 'smart')]]),
+]
+
+# Vendor / type incompatibles → MAC spoofing possible
+SPOOFING_RULES: List[Tuple[str, str]] = [
+    ('apple', 'windows'),
+    ('microsoft', 'mac'),
+    ('cisco', 'windows'),
+]
+
+FIELDS = ('hostname', 'vendor', 'device_type')
+
+
+# === MATCHER ===
+
+class KeywordMatcher:
+    """
+    Toutes les occurrences de tous les mots-clés en un seul parcours
+
+    Une seule regex par champ: alternative en lookahead `(?=(kw1|kw2|...))`
+    (matchs chevauchants, moteur C), mots-clés les plus longs d'abord. À une
+    position donnée seul le plus long est capturé: les mots-clés qui en sont
+    des préfixes sont ajoutés via une fermeture précalculée.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        keywords = sorted(set(keywords), key=lambda kw: (-len(kw), kw))
+        self._closure: Dict[str, FrozenSet[str]] = {
+            kw: frozenset(other for other in keywords if kw.startswith(other))
+            for kw in keywords
+        }
+        alternation = '|'.join(re.escape(kw) for kw in keywords)
+        self._pattern = re.compile(f'(?=({alternation}))') if keywords else None
+
+    def search(self, text: str) -> FrozenSet[str]:
+        """Ensemble des mots-clés présents dans `text`"""
+        if self._pattern is None:
+            return frozenset()
+        found = set()
+        for keyword in self._pattern.findall(text):
+            found |= self._closure[keyword]
+        return frozenset(found)
+
+
+def _keyword(raw: str) -> str:
+    raw = raw.lower()
+    return ANCHOR + raw[1:] if raw.startswith('^') else raw
+
+
+# === CLASSIFIER ===
+
+@dataclass
+class Classification:
+    """Résultat de classification d'un device"""
+    device_type: str = 'unknown'
+    confidence: str = 'low'
+    score: float = 0.0
+    scores: Dict[str, float] = field(default_factory=dict)
+    os: Optional[str] = None
+    spoofing: List[Tuple[str, str]] = field(default_factory=list)
+
+    def to_identification(self) -> Dict:
+        """Format historique de DeviceIdentifier.identify"""
+        return {'device_type': self.device_type, 'confidence': self.confidence, 'score': self.score}
+
+
+class DeviceClassifier:
+    """
+    Classifieur compilé (types, OS, spoofing) - une passe par champ
+
+    Compilation: chaque (champ, mot-clé) devient un bit, chaque type un bit.
+    Un champ scanné donne (bits mots-clés, bits types); la décision complète
+    ne dépend que de ces masques et est mémorisée par combinaison.
+    """
+
+    CACHE_SIZE = 4096   # Valeurs distinctes mémorisées par champ
+
+    def __init__(
+        self,
+        type_rules: Dict[str, Dict[str, List[str]]] = TYPE_RULES,
+        os_rules: Sequence = OS_RULES,
+        spoofing_rules: Sequence[Tuple[str, str]] = SPOOFING_RULES,
+    ):
+        self.type_order = list(type_rules)
+        type_bits = {device_type: 1 << i for i, device_type in enumerate(self.type_order)}
+
+        # Types: (champ, mot-clé) → masque des types, port → masque des types
+        literal_types: Dict[Tuple[str, str], int] = {}
+        self._service_types: Dict[str, int] = {}
+        for device_type, rules in type_rules.items():
+            for name, key in (('hostname', 'hostnames'), ('vendor', 'vendors')):
+                for raw in rules.get(key, []):
+                    literal = (name, _keyword(raw))
+                    literal_types[literal] = literal_types.get(literal, 0) | type_bits[device_type]
+            for port in rules.get('services', []):
+                port = str(port)
+                self._service_types[port] = self._service_types.get(port, 0) | type_bits[device_type]
+
+        literals = set(literal_types)
+        os_clauses = [(os_name, [[(n, _keyword(kw)) for n, kw in clause] for clause in clauses])
+                      for os_name, clauses in os_rules]
+        literals.update(lit for _, clauses in os_clauses for clause in clauses for lit in clause)
+        spoofing = [(('vendor', _keyword(v)), ('device_type', _keyword(t))) for v, t in spoofing_rules]
+        literals.update(lit for pair in spoofing for lit in pair)
+
+        bits = {literal: 1 << i for i, literal in enumerate(sorted(literals))}
+        self._keyword_bits = {
+            name: {kw: (bits[(n, kw)], literal_types.get((n, kw), 0)) for n, kw in literals if n == name}
+            for name in FIELDS
+        }
+        self._os_rules = [
+            (os_name, [sum(bits[lit] for lit in clause) for clause in clauses])
+            for os_name, clauses in os_clauses
+        ]
+        self._spoofing_rules = [
+            ((vendor[1], type_[1]), bits[vendor] | bits[type_]) for vendor, type_ in spoofing
+        ]
+        self._matchers = {name: KeywordMatcher(self._keyword_bits[name]) for name in FIELDS}
+
+        self._scan_cache: Dict[str, Dict[str, Tuple[int, int]]] = {name: {} for name in FIELDS}
+        self._decisions: Dict[Tuple[int, int, int, int], Tuple] = {}
+
+    def _scan(self, name: str, value: Optional[str]) -> Tuple[int, int]:
+        """Champ → (bits mots-clés, bits types), mémorisé par valeur"""
+        if not value:
+            return 0, 0
+        cache = self._scan_cache[name]
+        hit = cache.get(value)
+        if hit is None:
+            literal_mask = type_mask = 0
+            keyword_bits = self._keyword_bits[name]
+            for kw in self._matchers[name].search(ANCHOR + value.lower()):
+                bit, types = keyword_bits[kw]
+                literal_mask |= bit
+                type_mask |= types
+            if len(cache) >= self.CACHE_SIZE:
+                cache.clear()
+            hit = cache[value] = (literal_mask, type_mask)
+        return hit
+
+    def _decide(self, hostname_types: int, vendor_types: int, service_types: int, observed: int) -> Tuple:
+        scores = {}
+        for i, candidate in enumerate(self.type_order):
+            bit = 1 << i
+            score = ((TYPE_WEIGHTS['hostname'] if hostname_types & bit else 0)
+                     + (TYPE_WEIGHTS['vendor'] if vendor_types & bit else 0)
+                     + (TYPE_WEIGHTS['services'] if service_types & bit else 0))
+            if score > 0:
+                scores[candidate] = round(score, 2)
+
+        device_type, confidence, best_score = 'unknown', 'low', 0.0
+        if scores:
+            best = max(scores, key=scores.get)
+            if scores[best] >= MIN_TYPE_SCORE:
+                device_type, best_score = best, scores[best]
+                confidence = 'high' if best_score >= HIGH_TYPE_SCORE else 'medium'
+
+        # OS: première règle dont toutes les clauses matchent
+        os_name = next(
+            (name for name, clauses in self._os_rules if all(clause & observed for clause in clauses)),
+            None,
+        )
+        spoofing = [pair for pair, mask in self._spoofing_rules if observed & mask == mask]
+        return device_type, confidence, best_score, scores, os_name, spoofing
+
+    def classify_one(
+        self,
+        hostname: Optional[str],
+        vendor: Optional[str],
+        services: Optional[Iterable] = None,
+        device_type: Optional[str] = None,
+    ) -> Classification:
+        """Classifier un device (type, OS, spoofing) en un parcours par champ"""
+        hostname_literals, hostname_types = self._scan('hostname', hostname)
+        vendor_literals, vendor_types = self._scan('vendor', vendor)
+        type_literals, _ = self._scan('device_type', device_type)
+        service_types = 0
+        for service in services or ():
+            service_types |= self._service_types.get(str(service), 0)
+
+        key = (hostname_types, vendor_types, service_types, hostname_literals | vendor_literals | type_literals)
+        decision = self._decisions.get(key)
+        if decision is None:
+            if len(self._decisions) >= self.CACHE_SIZE:
+                self._decisions.clear()
+            decision = self._decisions[key] = self._decide(*key)
+
+        device_type, confidence, score, scores, os_name, spoofing = decision
+        return Classification(device_type, confidence, score, dict(scores), os_name, list(spoofing))
+
+    def classify(self, devices: Iterable[Dict]) -> List[Classification]:
+        """
+        Classifier un lot de devices (dicts unifiés: hostname, vendor,
+        services/open_ports, device_type)
+        """
+        return [
+            self.classify_one(
+                device.get('hostname'),
+                device.get('vendor'),
+                device.get('services') or device.get('open_ports'),
+                device.get('device_type'),
+            )
+            for device in devices
+        ]
+
+
+# === SINGLETON ===
+_classifier: Optional[DeviceClassifier] = None
+
+
+def get_device_classifier() -> DeviceClassifier:
+    """Récupère le classifieur partagé (table compilée une seule fois)"""
+    global _classifier
+    if _classifier is None:
+        _classifier = DeviceClassifier()
+    return _classifier
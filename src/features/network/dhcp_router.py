@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any
 
 from src.features.network.monitoring.dhcp_tracker import get_dhcp_tracker  # ✅ Déplacé dans monitoring/
+from src.features.network.monitoring.lease_watcher import get_lease_watcher
 from src.core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -61,10 +62,27 @@ async def get_device_ip_history(mac: str) -> List[Dict[str, Any]]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/leases/watcher")
+async def get_lease_watcher_status() -> Dict[str, Any]:
+    """
+    Statut du suivi des fichiers de baux DHCP (inotify / polling)
+    
+    Returns:
+        Mode, fichiers suivis, nombre de baux appliqués
+    """
+    try:
+        return get_lease_watcher().get_status()
+    except Exception as e:
+        logger.error(f"❌ Failed to get lease watcher status: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/conflicts")
 async def get_ip_conflicts() -> List[Dict[str, Any]]:
     """
-    Détecter les conflits d'IP (même IP attribuée à plusieurs MACs)
+    Conflits d'IP ouverts (même IP attribuée à plusieurs MACs)
+    
+    Lecture de l'index maintenu à chaque écriture du tracker (pas de recalcul).
     
     Returns:
         Liste des conflits détectés avec détails
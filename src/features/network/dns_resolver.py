@@ -0,0 +1,344 @@
+"""
+🏠 333HOME - Async DNS Resolver
+
+Résolution DNS asynchrone en UDP brut (PTR / A), pour tous les scanners:
+- Lots de requêtes concurrentes sur un seul socket (ID → future)
+- Cache partagé positif / négatif respectant les TTL (RFC 2308 pour le
+  négatif: minimum du SOA de la section autorité)
+- Requêtes identiques en vol fusionnées (une seule question sur le réseau)
+
+Serveur: HOME333_DNS_SERVER, sinon le premier `nameserver` de
+/etc/resolv.conf (en général la box, qui connaît les noms DHCP).
+"""
+
+import asyncio
+import ipaddress
+import logging
+import random
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TYPE_A = 1
+TYPE_SOA = 6
+TYPE_PTR = 12
+CLASS_IN = 1
+
+RCODE_NOERROR = 0
+RCODE_SERVFAIL = 2
+RCODE_NXDOMAIN = 3
+
+HEADER = struct.Struct('!HHHHHH')
+RR_FIXED = struct.Struct('!HHIH')
+
+
+class DnsError(Exception):
+    """Réponse DNS invalide"""
+
+
+# === FORMAT WIRE ===
+
+def encode_name(name: str) -> bytes:
+    out = bytearray()
+    for label in name.rstrip('.').split('.'):
+        raw = label.encode('idna') if label else b''
+        if len(raw) > 63:
+            raise DnsError(f"Label trop long: {label}")
+        out.append(len(raw))
+        out.extend(raw)
+    out.append(0)
+    return bytes(out)
+
+
+def build_query(query_id: int, name: str, qtype: int) -> bytes:
+    """Requête standard, récursion demandée"""
+    return HEADER.pack(query_id, 0x0100, 1, 0, 0, 0) + encode_name(name) + struct.pack('!HH', qtype, CLASS_IN)
+
+
+def read_name(data: bytes, pos: int) -> Tuple[str, int]:
+    """Lire un nom (avec pointeurs de compression) → (nom, position après le nom)"""
+    labels = []
+    end = None
+    for _ in range(128):   # Garde-fou contre les boucles de pointeurs
+        if pos >= len(data):
+            raise DnsError("Nom tronqué")
+        length = data[pos]
+        if length & 0xC0 == 0xC0:
+            if pos + 1 >= len(data):
+                raise DnsError("Pointeur tronqué")
+            if end is None:
+                end = pos + 2
+            pos = ((length & 0x3F) << 8) | data[pos + 1]
+            continue
+        pos += 1
+        if length == 0:
+            return '.'.join(labels), end if end is not None else pos
+        labels.append(data[pos:pos + length].decode('ascii', errors='replace'))
+        pos += length
+    raise DnsError("Boucle de compression")
+
+
+def parse_response(data: bytes) -> Dict:
+    """
+    Décoder une réponse DNS
+
+    Returns:
+        {id, rcode, answers: [(type, ttl, value)], negative_ttl}
+    """
+    if len(data) < HEADER.size:
+        raise DnsError("Réponse trop courte")
+    query_id, flags, qdcount, ancount, nscount, _ = HEADER.unpack_from(data, 0)
+    pos = HEADER.size
+
+    for _ in range(qdcount):
+        _, pos = read_name(data, pos)
+        pos += 4
+
+    answers = []
+    negative_ttl = None
+    for index in range(ancount + nscount):
+        _, pos = read_name(data, pos)
+        if pos + RR_FIXED.size > len(data):
+            raise DnsError("RR tronqué")
+        rtype, _rclass, ttl, rdlength = RR_FIXED.unpack_from(data, pos)
+        pos += RR_FIXED.size
+        rdata_pos = pos
+        pos += rdlength
+
+        if index < ancount:
+            if rtype == TYPE_A and rdlength == 4:
+                answers.append((rtype, ttl, str(ipaddress.IPv4Address(data[rdata_pos:pos]))))
+            elif rtype == TYPE_PTR:
+                answers.append((rtype, ttl, read_name(data, rdata_pos)[0]))
+        elif rtype == TYPE_SOA and rdlength >= 20:
+            # RFC 2308: TTL négatif = min(TTL du SOA, champ MINIMUM)
+            minimum = struct.unpack_from('!I', data, pos - 4)[0]
+            negative_ttl = min(ttl, minimum)
+
+    return {
+        'id': query_id,
+        'rcode': flags & 0x000F,
+        'answers': answers,
+        'negative_ttl': negative_ttl,
+    }
+
+
+def reverse_name(ip: str) -> str:
+    """192.168.1.10 → 10.1.168.192.in-addr.arpa"""
+    return ipaddress.ip_address(ip).reverse_pointer
+
+
+def system_nameserver(resolv_conf: Path = Path('/etc/resolv.conf')) -> str:
+    try:
+        for line in resolv_conf.read_text().splitlines():
+            parts = line.split()
+            if len(parts) >= 2 and parts[0] == 'nameserver' and ':' not in parts[1]:
+                return parts[1]
+    except OSError:
+        pass
+    return '127.0.0.1'
+
+
+# === TRANSPORT ===
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.pending: Dict[int, asyncio.Future] = {}
+
+    def datagram_received(self, data: bytes, addr):
+        try:
+            response = parse_response(data)
+        except (DnsError, struct.error, ValueError) as e:
+            logger.debug(f"DNS: réponse ignorée de {addr}: {e}")
+            return
+        future = self.pending.pop(response['id'], None)
+        if future and not future.done():
+            future.set_result(response)
+
+
+class AsyncDnsResolver:
+    """
+    Résolveur DNS asynchrone avec cache TTL partagé
+
+    Usage:
+        resolver = get_dns_resolver()
+        names = await resolver.reverse_many(['192.168.1.10', '192.168.1.11'])
+    """
+
+    def __init__(
+        self,
+        nameserver: Optional[str] = None,
+        port: int = 53,
+        timeout: float = 1.0,
+        retries: int = 1,
+        max_in_flight: int = 32,
+        min_ttl: int = 30,
+        max_ttl: int = 3600,
+        negative_ttl: int = 300,
+        error_ttl: int = 30,
+    ):
+        self.nameserver = nameserver or settings.dns_server or system_nameserver()
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.max_in_flight = max_in_flight
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+
+        # Cache: (qtype, nom) → (expiration monotonic, valeur ou None)
+        self._cache: Dict[Tuple[int, str], Tuple[float, Optional[str]]] = {}
+        self._inflight: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._protocol: Optional[_DnsProtocol] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._transport_lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {'queries': 0, 'hits': 0, 'negative_hits': 0, 'coalesced': 0, 'timeouts': 0}
+
+    # === API ===
+
+    async def reverse(self, ip: str) -> Optional[str]:
+        """PTR: IP → hostname (None si inconnu)"""
+        try:
+            name = reverse_name(ip)
+        except ValueError:
+            return None
+        return await self._lookup(TYPE_PTR, name)
+
+    async def resolve(self, hostname: str) -> Optional[str]:
+        """A: hostname → première IPv4 (None si inconnu)"""
+        return await self._lookup(TYPE_A, hostname.rstrip('.').lower())
+
+    async def reverse_many(self, ips: Iterable[str]) -> Dict[str, Optional[str]]:
+        """PTR en lot (concurrent, dédupliqué)"""
+        unique = list(dict.fromkeys(ips))
+        names = await asyncio.gather(*(self.reverse(ip) for ip in unique))
+        return dict(zip(unique, names))
+
+    async def resolve_many(self, hostnames: Iterable[str]) -> Dict[str, Optional[str]]:
+        """A en lot (concurrent, dédupliqué)"""
+        unique = list(dict.fromkeys(hostnames))
+        ips = await asyncio.gather(*(self.resolve(h) for h in unique))
+        return dict(zip(unique, ips))
+
+    def get_cached(self, qtype: int, name: str) -> Tuple[bool, Optional[str]]:
+        """(trouvé, valeur) - valeur None = réponse négative en cache"""
+        entry = self._cache.get((qtype, name))
+        if entry and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def get_statistics(self) -> Dict:
+        return {**self.stats, 'cached': len(self._cache), 'nameserver': f"{self.nameserver}:{self.port}"}
+
+    # === INTERNE ===
+
+    async def _lookup(self, qtype: int, name: str) -> Optional[str]:
+        key = (qtype, name)
+        found, value = self.get_cached(qtype, name)
+        if found:
+            self.stats['hits' if value is not None else 'negative_hits'] += 1
+            return value
+
+        # Même question déjà en vol → partager la réponse
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(pending)
+
+        # Tâche détachée: l'annulation d'un appelant n'interrompt pas les autres
+        task = asyncio.ensure_future(self._query(qtype, name))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._inflight.pop(key) if self._inflight.get(key) is done else None)
+        return await asyncio.shield(task)
+
+    def _transport_ready(self, loop: asyncio.AbstractEventLoop) -> bool:
+        return self._transport is not None and self._loop is loop and not self._transport.is_closing()
+
+    async def _ensure_transport(self):
+        loop = asyncio.get_running_loop()
+        if self._transport_ready(loop):
+            return
+        # Premier appel concurrent: un seul socket et un seul sémaphore par boucle
+        if self._lock_loop is not loop:
+            self._transport_lock = asyncio.Lock()
+            self._lock_loop = loop
+        async with self._transport_lock:
+            if self._transport_ready(loop):
+                return
+            self._transport, self._protocol = await loop.create_datagram_endpoint(
+                _DnsProtocol, remote_addr=(self.nameserver, self.port)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+
+    def _store(self, key: Tuple[int, str], value: Optional[str], ttl: int):
+        self._cache[key] = (time.monotonic() + ttl, value)
+
+    async def _query(self, qtype: int, name: str) -> Optional[str]:
+        await self._ensure_transport()
+        key = (qtype, name)
+
+        async with self._semaphore:
+            for _ in range(self.retries + 1):
+                query_id = random.randrange(0x10000)
+                while query_id in self._protocol.pending:
+                    query_id = random.randrange(0x10000)
+
+                future = asyncio.get_running_loop().create_future()
+                self._protocol.pending[query_id] = future
+                self._transport.sendto(build_query(query_id, name, qtype))
+                self.stats['queries'] += 1
+                try:
+                    response = await asyncio.wait_for(future, self.timeout)
+                    break
+                except asyncio.TimeoutError:
+                    self._protocol.pending.pop(query_id, None)
+            else:
+                self.stats['timeouts'] += 1
+                self._store(key, None, self.error_ttl)
+                return None
+
+        if response['rcode'] not in (RCODE_NOERROR, RCODE_NXDOMAIN):
+            self._store(key, None, self.error_ttl)
+            return None
+
+        records = [(ttl, value) for rtype, ttl, value in response['answers'] if rtype == qtype]
+        if records:
+            ttl = max(self.min_ttl, min(self.max_ttl, min(t for t, _ in records)))
+            self._store(key, records[0][1], ttl)
+            return records[0][1]
+
+        # NXDOMAIN / NODATA → cache négatif
+        ttl = response['negative_ttl'] if response['negative_ttl'] is not None else self.negative_ttl
+        self._store(key, None, max(self.min_ttl, min(self.max_ttl, ttl)))
+        return None
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+# === SINGLETON ===
+_dns_resolver: Optional[AsyncDnsResolver] = None
+
+
+def get_dns_resolver() -> AsyncDnsResolver:
+    """Récupère le résolveur DNS partagé (cache commun à tous les scanners)"""
+    global _dns_resolver
+    if _dns_resolver is None:
+        _dns_resolver = AsyncDnsResolver()
+    return _dns_resolver
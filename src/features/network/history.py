@@ -31,6 +31,8 @@ from .storage import (
     get_all_devices,
     get_device_by_mac,
 )
+from .monitoring.presence_store import get_presence_store
+from src.core.config import settings
 from src.shared.utils import generate_unique_id
 
 
@@ -245,22 +247,26 @@ class NetworkHistory:
         
         first_seen = datetime.fromisoformat(device_data["first_seen"])
         last_seen = datetime.fromisoformat(device_data["last_seen"])
-        
-        total_days = max((last_seen - first_seen).days, 1)
         total_appearances = device_data.get("total_appearances", 1)
         
-        # Uptime (estimation simple)
-        uptime_percentage = min((total_appearances / total_days) * 10, 100.0)
+        # Uptime et durée moyenne de connexion: historique de présence (opt-in)
+        presence = get_presence_store().get_device_stats(mac) if settings.presence_enabled else None
         
-        # Durée moyenne connexion
-        avg_duration = total_days / max(total_appearances, 1)
+        if presence:
+            uptime_percentage = presence["uptime_percentage"]
+            avg_duration_hours = presence["average_online_seconds"] / 3600
+        else:
+            # Sans historique de présence: estimation simple sur les apparitions
+            total_days = max((last_seen - first_seen).days, 1)
+            uptime_percentage = min((total_appearances / total_days) * 10, 100.0)
+            avg_duration_hours = total_days / max(total_appearances, 1) * 24
         
         return DeviceStatistics(
             mac=mac,
             name=device_data.get("current_hostname"),
             total_appearances=total_appearances,
             uptime_percentage=round(uptime_percentage, 2),
-            average_connection_duration_hours=round(avg_duration * 24, 2),
+            average_connection_duration_hours=round(avg_duration_hours, 2),
             last_ip=device_data["current_ip"],
             last_seen=last_seen,
         )
@@ -361,9 +367,13 @@ class NetworkHistory:
         
         events.sort(key=lambda e: e.timestamp, reverse=True)
         
-        # Online periods (estimation simple)
+        # Online periods (historique de présence, vide si désactivé)
         online_periods = []
-        # TODO: Implémenter tracking périodes
+        if settings.presence_enabled:
+            online_periods = [
+                OnlinePeriod(start=start, end=end, duration_hours=round((end - start).total_seconds() / 3600, 2))
+                for start, end in get_presence_store().get_online_periods(mac)
+            ]
         
         # Statistics
         statistics = self.get_device_statistics(mac)
@@ -0,0 +1,211 @@
+"""
+🏠 333HOME - Identity Resolver
+
+Rattachement des MACs aléatoires (bit "locally administered", Wi-Fi privé
+iOS/Android/Windows) au device logique qu'elles remplacent:
+- Signal fort: DHCP client-id (identique d'une MAC à l'autre)
+- Signal faible: hostname normalisé (DHCP, mDNS, NetBIOS), hors noms
+  génériques ("iphone", "android"...)
+- Timing: un device n'est jamais online sous deux MACs à la fois → un
+  candidat observé en même temps que la nouvelle MAC est écarté (signal
+  faible), et pour les entrées existantes les périodes de présence ne
+  doivent pas se chevaucher
+
+Un nom de modèle par défaut ("galaxy-a52", "iphone-15") est porté par tous
+les exemplaires du modèle: il ne suffit qu'avec un fabricant connu identique.
+Deux client-ids différents écartent toujours le rattachement par hostname.
+
+Les MACs universelles (attribuées par le constructeur) ne sont jamais fusionnées.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ROTATION_CLIENT_ID = 'client_id'
+ROTATION_HOSTNAME = 'hostname'
+
+# Hostnames par défaut partagés par des appareils différents
+GENERIC_HOSTNAMES = {
+    'android', 'iphone', 'ipad', 'ipod', 'macbook', 'macbook-air', 'macbook-pro', 'imac',
+    'galaxy', 'localhost', 'unknown', 'espressif', 'esp32', 'esp8266', 'raspberrypi', 'windows',
+}
+
+# Nom de modèle par défaut: préfixe constructeur + références ("galaxy-a52",
+# "iphone-15-pro", "sm-a525f", "android-3f9a2b1c") - "pixel-de-marie" n'en est pas un
+DEFAULT_MODEL_HOSTNAME = re.compile(
+    r'^(?:iphone|ipad|ipod|macbook(?:-air|-pro)?|imac|galaxy|sm|pixel|redmi|xiaomi|poco|oneplus|'
+    r'huawei|honor|oppo|vivo|realme|nokia|moto|motorola|android)'
+    r'(?:[-_]?(?:[a-z]{0,2}\d+[a-z]*|[0-9a-f]{6,}|pro|max|plus|mini|ultra|lite|note|air|se|fe|neo|xl))+$'
+)
+
+
+def is_randomized_mac(mac: str) -> bool:
+    """MAC localement administrée (bit 0x02 du 1er octet) et unicast"""
+    try:
+        first = int(mac[:2], 16)
+    except (ValueError, TypeError):
+        return False
+    return bool(first & 0x02) and not first & 0x01
+
+
+def normalize_hostname(hostname: Optional[str]) -> Optional[str]:
+    """Hostname court en minuscules (sans domaine), None si générique"""
+    if not hostname:
+        return None
+    name = hostname.strip().lower().split('.')[0]
+    if len(name) < 3 or name in GENERIC_HOSTNAMES:
+        return None
+    return name
+
+
+def is_default_hostname(name: str) -> bool:
+    """Hostname normalisé = nom de modèle attribué d'usine"""
+    return bool(DEFAULT_MODEL_HOSTNAME.match(name))
+
+
+def hostname_corroborated(
+    name: str,
+    client_id: Optional[str],
+    vendor: Optional[str],
+    other: Any,
+) -> bool:
+    """
+    Le hostname partagé avec l'entrée `other` suffit-il au rattachement ?
+
+    Args:
+        name: Hostname normalisé commun
+        client_id, vendor: Attributs observés pour la nouvelle MAC
+        other: Entrée candidate (dhcp_client_id, vendor)
+    """
+    # Deux clients DHCP distincts
+    if client_id and other.dhcp_client_id and client_id.strip().lower() != other.dhcp_client_id.strip().lower():
+        return False
+    if not is_default_hostname(name):
+        return True
+    return bool(vendor) and vendor == other.vendor
+
+
+def identity_signals(hostname: Optional[str], client_id: Optional[str]) -> List[Tuple[str, str]]:
+    """Signaux d'identité, du plus fort au plus faible"""
+    signals = []
+    if client_id:
+        signals.append((ROTATION_CLIENT_ID, client_id.strip().lower()))
+    name = normalize_hostname(hostname)
+    if name:
+        signals.append((ROTATION_HOSTNAME, name))
+    return signals
+
+
+@dataclass
+class Rotation:
+    """Nouvelle MAC rattachée à une entrée existante"""
+    old_mac: str
+    new_mac: str
+    reason: str                     # client_id | hostname
+
+
+class IdentityResolver:
+    """
+    Résolution d'identité des MACs aléatoires sur les entrées du registry
+
+    Les entrées doivent exposer mac, current_hostname, dhcp_client_id, vendor,
+    is_online, first_seen, last_seen, last_seen_online (DeviceRegistryEntry).
+
+    Usage:
+        rotation = resolver.find(mac, hostname, client_id, registry.devices, concurrent=scanned, vendor=vendor)
+        chains = resolver.clusters(registry.devices.values())
+    """
+
+    def __init__(self):
+        self.stats = {'rotations': 0, 'consolidated': 0}
+
+    def find(
+        self,
+        mac: str,
+        hostname: Optional[str],
+        client_id: Optional[str],
+        devices: Dict[str, Any],
+        concurrent: Iterable[str] = (),
+        vendor: Optional[str] = None,
+    ) -> Optional[Rotation]:
+        """
+        Entrée existante que la nouvelle MAC remplace
+
+        Args:
+            mac: Nouvelle MAC (absente du registry)
+            hostname, client_id: Signaux observés pour cette MAC
+            devices: Entrées du registry par MAC
+            concurrent: MACs observées en même temps que la nouvelle
+            vendor: Fabricant observé (corrobore un nom de modèle par défaut)
+
+        Returns:
+            Rotation (ancienne MAC → nouvelle) ou None
+        """
+        if not is_randomized_mac(mac):
+            return None
+        signals = identity_signals(hostname, client_id)
+        if not signals:
+            return None
+
+        concurrent = set(concurrent)
+        for reason, value in signals:
+            candidates = [
+                device for other, device in devices.items()
+                if other != mac
+                and is_randomized_mac(other)
+                and (reason, value) in identity_signals(device.current_hostname, device.dhcp_client_id)
+                # Même client-id = même client DHCP; un hostname ne suffit pas
+                # si les deux MACs sont présentes en même temps
+                and (reason == ROTATION_CLIENT_ID or (
+                    other not in concurrent and hostname_corroborated(value, client_id, vendor, device)
+                ))
+            ]
+            if candidates:
+                previous = max(candidates, key=lambda d: d.last_seen_online or d.last_seen or '')
+                self.stats['rotations'] += 1
+                logger.info(f"🔀 MAC aléatoire: {previous.mac} → {mac} ({reason}: {value})")
+                return Rotation(old_mac=previous.mac, new_mac=mac, reason=reason)
+        return None
+
+    def clusters(self, devices: Iterable[Any]) -> List[List[Any]]:
+        """
+        Chaînes d'entrées existantes représentant un même device (≥ 2 entrées)
+
+        Entrées aléatoires triées par première détection; une entrée prolonge
+        la chaîne dont la dernière entrée partage un signal et n'était plus
+        vue online quand elle est apparue (hostname seul: voir
+        hostname_corroborated).
+        """
+        randomized = sorted(
+            (d for d in devices if is_randomized_mac(d.mac)),
+            key=lambda d: d.first_seen or '',
+        )
+        chains: List[List[Any]] = []
+        by_signal: Dict[Tuple[str, str], int] = {}
+
+        for device in randomized:
+            signals = identity_signals(device.current_hostname, device.dhcp_client_id)
+            candidates: Set[int] = {by_signal[s] for s in signals if s in by_signal}
+            chain_index = None
+            for index in sorted(candidates, key=lambda i: chains[i][-1].first_seen or '', reverse=True):
+                tail = chains[index][-1]
+                ended = tail.last_seen_online or tail.first_seen or ''
+                shared = [s for s in signals if by_signal.get(s) == index]
+                corroborated = any(reason == ROTATION_CLIENT_ID for reason, _ in shared) or any(
+                    hostname_corroborated(value, device.dhcp_client_id, device.vendor, tail) for _, value in shared
+                )
+                if corroborated and not tail.is_online and ended <= (device.first_seen or ''):
+                    chain_index = index
+                    break
+            if chain_index is None:
+                chain_index = len(chains)
+                chains.append([])
+            chains[chain_index].append(device)
+            for signal in signals:
+                by_signal[signal] = chain_index
+
+        return [chain for chain in chains if len(chain) > 1]
@@ -0,0 +1,296 @@
+"""
+🚨 333HOME - Anomaly Detector
+
+Détection d'anomalies en flux sur les métriques par device :
+- EWMA / EWMV (moyenne et variance exponentielles) : z-score de chaque
+  échantillon par rapport à la tendance récente
+- Baseline saisonnière par heure de la semaine (168 créneaux) : un pic
+  habituel (sauvegarde nocturne, streaming du soir) n'est pas signalé
+- O(1) par échantillon et mémoire fixe par device (~3 Ko par métrique)
+- Événements sur front montant (hystérésis) + délai minimal entre deux
+  événements d'un même device, écrits dans l'historique réseau
+
+Métriques: débit (BandwidthMonitor), latence et pertes (LatencyMonitor).
+"""
+
+import logging
+import math
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from src.core.config import settings
+from ..schemas import NetworkEvent, NetworkEventType
+
+logger = logging.getLogger(__name__)
+
+SEASON_SLOTS = 168          # Heures de la semaine
+
+
+@dataclass(frozen=True)
+class DetectorConfig:
+    """Paramètres d'une métrique"""
+    event_type: NetworkEventType
+    unit: str
+    alpha: float = 0.05             # Poids EWMA (tendance récente)
+    seasonal_alpha: float = 0.02    # Poids par créneau horaire
+    min_samples: int = 30           # Échantillons avant de signaler
+    min_std: float = 1.0            # Écart-type plancher (bruit de fond)
+    min_value: float = 0.0          # Valeur minimale pour un événement
+    smoothing: Optional[float] = None   # Lissage EWMA de l'entrée (pertes)
+
+
+DEFAULT_DETECTORS: Dict[str, DetectorConfig] = {
+    'traffic': DetectorConfig(NetworkEventType.TRAFFIC_SPIKE, 'bps', min_std=1e6, min_value=8e6),
+    'latency': DetectorConfig(NetworkEventType.LATENCY_DEGRADED, 'ms', min_std=2.0, min_value=10.0),
+    'loss': DetectorConfig(NetworkEventType.PACKET_LOSS, 'ratio', min_std=0.05, min_value=0.25, smoothing=0.3),
+}
+
+
+@dataclass
+class Anomaly:
+    """Anomalie détectée"""
+    metric: str
+    key: str                    # MAC (débit) ou IP (latence, pertes)
+    timestamp: float
+    value: float
+    expected: float
+    z_score: float
+    seasonal_z_score: Optional[float] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'metric': self.metric,
+            'key': self.key,
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
+            'value': round(self.value, 3),
+            'expected': round(self.expected, 3),
+            'z_score': round(self.z_score, 2),
+            'seasonal_z_score': round(self.seasonal_z_score, 2) if self.seasonal_z_score is not None else None,
+        }
+
+
+class MetricDetector:
+    """
+    Z-scores EWMA + baseline par heure de la semaine d'un flux de valeurs
+
+    Seules les hausses sont anomales (pic de trafic, dégradation).
+    """
+
+    __slots__ = ('config', 'mean', 'var', 'count', 'smoothed', 'active',
+                 '_season_mean', '_season_var', '_season_count')
+
+    def __init__(self, config: DetectorConfig):
+        self.config = config
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self.smoothed: Optional[float] = None
+        self.active = False                 # Anomalie en cours (hystérésis)
+        self._season_mean = array('d', [0.0]) * SEASON_SLOTS
+        self._season_var = array('d', [0.0]) * SEASON_SLOTS
+        self._season_count = array('H', [0]) * SEASON_SLOTS
+
+    def _std(self, variance: float, mean: float) -> float:
+        return max(math.sqrt(variance), self.config.min_std, 0.1 * abs(mean))
+
+    def update(self, value: float, timestamp: float, threshold: float) -> Tuple[bool, float, Optional[float]]:
+        """
+        Intégrer une valeur
+
+        Returns:
+            (nouvelle anomalie, z-score EWMA, z-score saisonnier ou None)
+        """
+        config = self.config
+        if config.smoothing is not None:
+            self.smoothed = value if self.smoothed is None else self.smoothed + config.smoothing * (value - self.smoothed)
+            value = self.smoothed
+
+        local = time.localtime(timestamp)
+        slot = local.tm_wday * 24 + local.tm_hour
+        z = (value - self.mean) / self._std(self.var, self.mean)
+        seasonal_z = None
+        if self._season_count[slot] >= config.min_samples:
+            season_mean = self._season_mean[slot]
+            seasonal_z = (value - season_mean) / self._std(self._season_var[slot], season_mean)
+
+        anomalous = (
+            self.count >= config.min_samples
+            and z >= threshold
+            and (seasonal_z is None or seasonal_z >= threshold)
+            and value >= config.min_value
+        )
+        raised = anomalous and not self.active
+        seasonal_value = value
+        if anomalous:
+            self.active = True
+            # Valeur écrêtée: une anomalie ne déplace pas les baselines
+            # (créneau saisonnier en apprentissage: valeur brute)
+            value = self.mean + threshold * self._std(self.var, self.mean)
+            if seasonal_z is not None:
+                seasonal_value = self._season_mean[slot] + threshold * self._std(self._season_var[slot], self._season_mean[slot])
+        elif z < threshold / 2:
+            self.active = False
+
+        if self.count:
+            diff = value - self.mean
+            increment = config.alpha * diff
+            self.mean += increment
+            self.var = (1 - config.alpha) * (self.var + diff * increment)
+        else:
+            self.mean = value
+        self.count += 1
+
+        diff = seasonal_value - self._season_mean[slot]
+        weight = config.seasonal_alpha if self._season_count[slot] else 1.0
+        self._season_mean[slot] += weight * diff
+        self._season_var[slot] = (1 - weight) * (self._season_var[slot] + diff * weight * diff)
+        if self._season_count[slot] < 0xFFFF:
+            self._season_count[slot] += 1
+        return raised, z, seasonal_z
+
+
+class AnomalyDetector:
+    """
+    Détecteurs par (métrique, device) et émission des événements
+
+    Usage:
+        detector = get_anomaly_detector()
+        detector.observe('latency', '192.168.1.10', 35.2)
+        detector.get_recent()           # [Anomaly.to_dict()]
+    """
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        cooldown: Optional[float] = None,
+        detectors: Optional[Dict[str, DetectorConfig]] = None,
+        sink: Optional[Callable[[Anomaly], None]] = None,
+        registry=None,
+    ):
+        """
+        Args:
+            threshold: Z-score déclenchant une anomalie (défaut: HOME333_ANOMALY_Z_THRESHOLD)
+            cooldown: Délai min entre deux événements d'un device/métrique (secondes)
+            detectors: Paramètres par métrique (défaut: traffic, latency, loss)
+            sink: Destination des anomalies (défaut: historique réseau)
+            registry: NetworkRegistry pour IP → MAC des événements (défaut: singleton)
+        """
+        self.threshold = threshold or settings.anomaly_z_threshold
+        self.cooldown = settings.anomaly_cooldown if cooldown is None else cooldown
+        self.configs = dict(detectors or DEFAULT_DETECTORS)
+        self.sink = sink or self._save_to_history
+        self._registry = registry
+        self._detectors: Dict[Tuple[str, str], MetricDetector] = {}
+        self._last_event: Dict[Tuple[str, str], float] = {}
+        self.recent: Deque[Anomaly] = deque(maxlen=100)
+        self.stats = {'samples': 0, 'anomalies': 0, 'suppressed': 0}
+
+    @property
+    def registry(self):
+        if self._registry is None:
+            from ..registry import get_network_registry
+            self._registry = get_network_registry()
+        return self._registry
+
+    def observe(self, metric: str, key: str, value: float, timestamp: Optional[float] = None, emit: bool = True) -> Optional[Anomaly]:
+        """
+        Intégrer un échantillon (O(1))
+
+        Args:
+            metric: 'traffic', 'latency' ou 'loss'
+            key: MAC ou IP du device
+            value: Valeur (bps, ms, taux de pertes 0-1)
+            emit: False pour apprendre sans signaler (historique rechargé)
+
+        Returns:
+            Anomaly si un événement a été émis
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        detector = self._detectors.get((metric, key))
+        if detector is None:
+            detector = self._detectors[(metric, key)] = MetricDetector(self.configs[metric])
+        expected = detector.mean
+        raised, z, seasonal_z = detector.update(value, timestamp, self.threshold)
+        self.stats['samples'] += 1
+        if not raised or not emit:
+            return None
+
+        last = self._last_event.get((metric, key))
+        if last is not None and timestamp - last < self.cooldown:
+            self.stats['suppressed'] += 1
+            return None
+        self._last_event[(metric, key)] = timestamp
+        anomaly = Anomaly(
+            metric=metric,
+            key=key,
+            timestamp=timestamp,
+            value=detector.smoothed if detector.smoothed is not None else value,
+            expected=expected,
+            z_score=z,
+            seasonal_z_score=seasonal_z,
+        )
+        self.recent.append(anomaly)
+        self.stats['anomalies'] += 1
+        logger.warning(f"🚨 Anomalie {metric} sur {key}: {anomaly.value:.2f} (attendu ~{expected:.2f}, z={z:.1f})")
+        try:
+            self.sink(anomaly)
+        except Exception as e:
+            logger.error(f"❌ Erreur enregistrement anomalie: {e}")
+        return anomaly
+
+    def _save_to_history(self, anomaly: Anomaly):
+        """Événement dans l'historique réseau (timeline), MAC résolue si possible"""
+        from ..history import NetworkHistory
+
+        mac, name = anomaly.key, None
+        devices = self.registry.devices
+        entry = devices.get(mac)
+        if entry is None:
+            entry = next((d for d in devices.values() if d.current_ip == anomaly.key), None)
+            if entry is not None:
+                mac = entry.mac
+        if entry is not None:
+            name = entry.current_hostname
+        NetworkHistory()._save_event(NetworkEvent(
+            event_id=f"event_{anomaly.metric}_{mac}_{int(anomaly.timestamp)}",
+            timestamp=datetime.fromtimestamp(anomaly.timestamp),
+            event_type=self.configs[anomaly.metric].event_type,
+            device_mac=mac,
+            device_name=name,
+            details={**anomaly.to_dict(), 'unit': self.configs[anomaly.metric].unit},
+        ))
+
+    def get_recent(self, limit: int = 20) -> List[Dict]:
+        """Dernières anomalies (plus récente en premier)"""
+        return [anomaly.to_dict() for anomaly in list(self.recent)[::-1][:limit]]
+
+    def get_status(self) -> Dict:
+        return {
+            'threshold': self.threshold,
+            'cooldown': self.cooldown,
+            'detectors': len(self._detectors),
+            'active': sorted(f"{metric}:{key}" for (metric, key), d in self._detectors.items() if d.active),
+            **self.stats,
+        }
+
+    def forget(self, metric: str, key: Optional[str] = None):
+        """Oublier les baselines d'un device (ou d'une métrique)"""
+        for series in [s for s in self._detectors if s[0] == metric and key in (None, s[1])]:
+            del self._detectors[series]
+            self._last_event.pop(series, None)
+
+
+# === SINGLETON ===
+_anomaly_detector: Optional[AnomalyDetector] = None
+
+
+def get_anomaly_detector() -> AnomalyDetector:
+    """Récupère le détecteur d'anomalies singleton"""
+    global _anomaly_detector
+    if _anomaly_detector is None:
+        _anomaly_detector = AnomalyDetector()
+    return _anomaly_detector
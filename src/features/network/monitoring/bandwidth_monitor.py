@@ -3,9 +3,11 @@
 
 Monitoring professionnel de la bande passante réseau :
 - Suivi upload/download par device
-- Top talkers identification
+- Top talkers identification (sketches Space-Saving/Count-Min par fenêtre)
 - Statistiques d'usage
-- Détection anomalies
+- Historique multi-résolution (1 s / 1 min / 1 h, fenêtres arbitraires)
+- Persistance des échantillons (time series store), rechargés au démarrage
+- Détection anomalies (pics de débit : EWMA + baseline par heure de la semaine)
 """
 
 import asyncio
@@ -15,6 +17,13 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import logging
 
+from src.core.config import settings
+from .anomaly_detector import AnomalyDetector, get_anomaly_detector
+from .bandwidth_series import DEFAULT_RESOLUTIONS, BandwidthSeries
+from .conntrack_collector import ConntrackCollector
+from .heavy_hitters import WindowedHeavyHitters
+from .timeseries_store import TimeSeriesStore, get_timeseries_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,26 +104,74 @@ class BandwidthMonitor:
     """
     Moniteur de bande passante réseau
     
-    Note: Utilise /proc/net/dev pour Linux.
-    Pour monitoring précis par IP, nécessite iptables ou nDPI.
-    Cette implémentation basique estime le traffic.
+    Sources des échantillons:
+    - Boucle de fond: compteurs de flux conntrack agrégés par IP
+      (HOME333_BANDWIDTH_COLLECTOR_ENABLED), IP → MAC via le registry
+    - POST /api/network/bandwidth/sample (agents, scripts externes)
     """
     
-    def __init__(self, sampling_interval: float = 5.0):
+    def __init__(
+        self,
+        sampling_interval: float = 5.0,
+        collector: Optional[ConntrackCollector] = None,
+        registry=None,
+        store: Optional[TimeSeriesStore] = None,
+        anomalies: Optional[AnomalyDetector] = None,
+    ):
         """
         Initialise le moniteur
         
         Args:
             sampling_interval: Intervalle entre échantillons (secondes)
+            collector: Collecteur conntrack (défaut: HOME333_CONNTRACK_FILE)
+            registry: NetworkRegistry pour IP → MAC (défaut: singleton)
+            store: Persistance des échantillons (None = mémoire seulement)
+            anomalies: Détecteur d'anomalies (None = désactivé)
         """
         self.sampling_interval = sampling_interval
+        self.collector = collector or ConntrackCollector()
+        self._registry = registry
+        self.store = store
+        self.anomalies = anomalies
+        self._collected_macs: set = set()
+        self.unattributed_bytes = 0
+        # Top talkers sur fenêtres récentes (≤ 1 h, mémoire bornée)
+        self._new_sketches()
         self._devices: Dict[str, BandwidthStats] = {}
-        self._samples: Dict[str, List[BandwidthSample]] = {}
+        self._series: Dict[str, BandwidthSeries] = {}
         self._running = False
         self._task: Optional[asyncio.Task] = None
         
         logger.info(f"BandwidthMonitor initialized (interval={sampling_interval}s)")
     
+    def _new_sketches(self):
+        self.talkers = {sort_by: WindowedHeavyHitters() for sort_by in ("total", "upload", "download")}
+        self.peer_talkers = WindowedHeavyHitters(capacity=128)
+        self._removed_macs: set = set()
+    
+    @property
+    def registry(self):
+        if self._registry is None:
+            from ..registry import get_network_registry
+            self._registry = get_network_registry()
+        return self._registry
+    
+    # === LIFECYCLE (AppLifespan) ===
+    
+    async def initialize(self):
+        """Démarrer la collecte (appelé par AppLifespan)"""
+        self.start()
+    
+    async def shutdown(self):
+        """Arrêter la collecte (appelé par AppLifespan)"""
+        self.stop()
+        if self._task:
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
     def start(self):
         """Démarre le monitoring en arrière-plan"""
         if self._running:
@@ -139,7 +196,10 @@ class BandwidthMonitor:
         """Boucle de monitoring continue"""
         try:
             while self._running:
-                await self._collect_samples()
+                try:
+                    await self._collect_samples()
+                except Exception as e:
+                    logger.error(f"Bandwidth collection error: {e}")
                 await asyncio.sleep(self.sampling_interval)
         except asyncio.CancelledError:
             logger.info("Monitoring loop cancelled")
@@ -147,10 +207,44 @@ class BandwidthMonitor:
             logger.error(f"Monitoring loop error: {e}")
     
     async def _collect_samples(self):
-        """Collecte les échantillons pour tous les devices"""
-        # Note: Implémentation basique
-        # Pour production, utiliser iptables -nvx ou nDPI
-        pass
+        """
+        Collecte les échantillons pour tous les devices
+        
+        Un delta conntrack par IP et par intervalle (pas de travail par
+        paquet) ; les devices déjà collectés sans trafic reçoivent un
+        échantillon nul pour que le débit courant retombe.
+        """
+        deltas = await self.collector.collect()
+        seen = set()
+        for ip, (bytes_sent, bytes_received) in deltas.items():
+            mac = self._resolve_mac(ip)
+            if mac is None:
+                self.unattributed_bytes += bytes_sent + bytes_received
+                continue
+            entry = self.registry.devices.get(mac)
+            stats = self.register_device(ip, mac, entry.current_hostname if entry else None)
+            stats.ip = ip
+            self.add_sample(mac, bytes_sent, bytes_received)
+            seen.add(mac)
+        
+        now = time.time()
+        for peer, total in self.collector.last_peer_deltas.items():
+            self.peer_talkers.add(peer, total, now)
+        
+        for mac in self._collected_macs - seen:
+            if mac in self._devices:
+                self.add_sample(mac, 0, 0)
+        self._collected_macs |= seen
+    
+    def _resolve_mac(self, ip: str) -> Optional[str]:
+        """MAC d'une IP: index des devices online, sinon IP courante du registry"""
+        macs = self.registry.conflicts.get_macs(ip)
+        if macs:
+            return min(macs)
+        for mac, entry in self.registry.devices.items():
+            if entry.current_ip == ip:
+                return mac
+        return None
     
     def register_device(
         self,
@@ -175,7 +269,7 @@ class BandwidthMonitor:
                 mac=mac,
                 hostname=hostname
             )
-            self._samples[mac] = []
+            self._series[mac] = BandwidthSeries()
             logger.info(f"Device registered for bandwidth monitoring: {ip} ({mac})")
         
         return self._devices[mac]
@@ -204,30 +298,78 @@ class BandwidthMonitor:
             bytes_received=bytes_received
         )
         
-        self._samples[mac].append(sample)
+        # Insertion O(1) dans les buckets (rollups en cascade)
+        self._series[mac].add(sample.timestamp, bytes_sent, bytes_received)
+        self.talkers["total"].add(mac, bytes_sent + bytes_received, sample.timestamp)
+        self.talkers["upload"].add(mac, bytes_sent, sample.timestamp)
+        self.talkers["download"].add(mac, bytes_received, sample.timestamp)
         self._update_stats(mac, sample)
+        if self.store:
+            self.store.append('bandwidth', mac, sample.timestamp, (bytes_sent, bytes_received))
+        stats = self._devices[mac]
+        if self.anomalies and stats.sample_count > 1:
+            self.anomalies.observe('traffic', mac, stats.current_total_bps, sample.timestamp)
+    
+    def restore_history(self) -> int:
+        """
+        Recharger les échantillons persistés sur la durée couverte par les
+        séries, regroupés à la résolution que chaque niveau conserve pour
+        leur âge (rejeu borné par device) ; sketches sur leur fenêtre
+        (≤ 1 h), détecteur d'anomalies hors niveau horaire
         
-        # Garder seulement 1h d'historique
-        max_age = time.time() - 3600
-        self._samples[mac] = [
-            s for s in self._samples[mac]
-            if s.timestamp > max_age
-        ]
+        Coûteux (lecture disque) : appelé hors event loop au démarrage.
+        
+        Returns:
+            Nombre de points rechargés
+        """
+        if not self.store:
+            return 0
+        now = time.time()
+        coarse, slots = DEFAULT_RESOLUTIONS[-1]
+        sketch_window = self.talkers["total"].max_window
+        restored = 0
+        for mac in self.store.keys('bandwidth'):
+            points = self.store.query('bandwidth', mac, now - coarse * slots, now)
+            if not points:
+                continue
+            entry = self.registry.devices.get(mac)
+            stats = self.register_device(
+                entry.current_ip if entry and entry.current_ip else "",
+                mac,
+                entry.current_hostname if entry else None,
+            )
+            stats.first_seen = stats.last_update = points[0][0]
+            series = self._series[mac]
+            for resolution, timestamp, sent, received in _downsample(points, now):
+                sample = BandwidthSample(timestamp=timestamp, bytes_sent=sent, bytes_received=received)
+                series.add(timestamp, sent, received)
+                if now - timestamp <= sketch_window:
+                    self.talkers["total"].add(mac, sample.total_bytes, timestamp)
+                    self.talkers["upload"].add(mac, sent, timestamp)
+                    self.talkers["download"].add(mac, received, timestamp)
+                self._update_stats(mac, sample)
+                if self.anomalies and stats.sample_count > 1 and resolution < coarse:
+                    self.anomalies.observe('traffic', mac, stats.current_total_bps, timestamp, emit=False)
+            stats.sample_count = len(points)
+            # Pas de débit "courant" tant qu'aucun nouvel échantillon n'est arrivé
+            stats.current_upload_bps = stats.current_download_bps = stats.current_total_bps = 0.0
+            restored += len(points)
+        if restored:
+            logger.info(f"Bandwidth history restored: {restored} samples ({len(self._devices)} devices)")
+        return restored
     
     def _update_stats(self, mac: str, sample: BandwidthSample) -> None:
         """Met à jour les statistiques d'un device"""
         stats = self._devices[mac]
-        samples = self._samples[mac]
         
         # Update totaux
         stats.total_bytes_sent += sample.bytes_sent
         stats.total_bytes_received += sample.bytes_received
         stats.total_bytes = stats.total_bytes_sent + stats.total_bytes_received
         
-        # Calcul débit actuel (bps)
-        if len(samples) >= 2:
-            prev_sample = samples[-2]
-            time_diff = sample.timestamp - prev_sample.timestamp
+        # Calcul débit actuel (bps) depuis l'échantillon précédent
+        if stats.sample_count >= 1:
+            time_diff = sample.timestamp - stats.last_update
             
             if time_diff > 0:
                 stats.current_upload_bps = (sample.bytes_sent * 8) / time_diff
@@ -251,12 +393,46 @@ class BandwidthMonitor:
             stats.peak_timestamp = sample.timestamp
         
         stats.last_update = sample.timestamp
-        stats.sample_count = len(samples)
+        stats.sample_count += 1
     
     def get_stats(self, mac: str) -> Optional[BandwidthStats]:
         """Récupère les stats d'un device"""
         return self._devices.get(mac)
     
+    def get_window_stats(
+        self,
+        mac: str,
+        window: float,
+        resolution: Optional[int] = None,
+    ) -> Optional[Dict]:
+        """
+        Totaux, débits moyens et pic d'un device sur une fenêtre
+        
+        Args:
+            mac: Adresse MAC du device
+            window: Durée de la fenêtre (secondes)
+            resolution: Résolution imposée (secondes, défaut: la plus fine couvrant la fenêtre)
+        
+        Returns:
+            Dict (bytes_sent, bytes_received, avg_*_bps, peak_total_bps, ...) ou None
+        """
+        series = self._series.get(mac)
+        if series is None:
+            return None
+        return series.totals(window, time.time(), resolution)
+    
+    def get_history(
+        self,
+        mac: str,
+        window: float,
+        resolution: Optional[int] = None,
+    ) -> Optional[List[Dict]]:
+        """Série de trafic d'un device (un point par bucket) ou None"""
+        series = self._series.get(mac)
+        if series is None:
+            return None
+        return series.points(window, time.time(), resolution)
+    
     def get_all_stats(self) -> List[BandwidthStats]:
         """Récupère les stats de tous les devices"""
         return list(self._devices.values())
@@ -264,7 +440,8 @@ class BandwidthMonitor:
     def get_top_talkers(
         self,
         limit: int = 10,
-        sort_by: str = "total"
+        sort_by: str = "total",
+        window: Optional[float] = None,
     ) -> List[BandwidthStats]:
         """
         Récupère les top talkers (devices avec plus de traffic)
@@ -272,13 +449,24 @@ class BandwidthMonitor:
         Args:
             limit: Nombre max de devices
             sort_by: Critère de tri (total, upload, download, current)
+            window: Classer sur les `window` dernières secondes (défaut: depuis le début)
         
         Returns:
             Liste des top devices
         """
         devices = list(self._devices.values())
         
-        if sort_by == "upload":
+        if window and sort_by != "current" and window <= self.talkers[sort_by].max_window:
+            # Sketch de la fenêtre: coût indépendant du nombre de devices
+            # (les devices réinitialisés restent dans les sketches jusqu'à expiration)
+            ranked = self.talkers[sort_by].top(limit + len(self._removed_macs), window)
+            return [self._devices[mac] for mac, _ in ranked if mac in self._devices][:limit]
+        elif window and sort_by != "current":
+            now = time.time()
+            key = {"upload": "bytes_sent", "download": "bytes_received"}.get(sort_by, "total_bytes")
+            totals = {mac: series.totals(window, now)[key] for mac, series in self._series.items()}
+            devices.sort(key=lambda d: totals.get(d.mac, 0), reverse=True)
+        elif sort_by == "upload":
             devices.sort(key=lambda d: d.total_bytes_sent, reverse=True)
         elif sort_by == "download":
             devices.sort(key=lambda d: d.total_bytes_received, reverse=True)
@@ -289,6 +477,19 @@ class BandwidthMonitor:
         
         return devices[:limit]
     
+    def get_top_peers(self, limit: int = 10, window: float = 300) -> List[Dict]:
+        """
+        Pairs externes les plus actifs (flux conntrack) sur une fenêtre récente
+        
+        Args:
+            limit: Nombre max de pairs
+            window: Fenêtre en secondes (≤ 1 h)
+        
+        Returns:
+            [{ip, bytes}] (octets estimés par excès)
+        """
+        return [{"ip": ip, "bytes": total} for ip, total in self.peer_talkers.top(limit, window)]
+    
     def get_total_bandwidth(self) -> Dict[str, float]:
         """
         Calcule la bande passante totale du réseau
@@ -318,12 +519,42 @@ class BandwidthMonitor:
         if mac:
             if mac in self._devices:
                 del self._devices[mac]
-                del self._samples[mac]
+                del self._series[mac]
+                self._collected_macs.discard(mac)
+                self._removed_macs.add(mac)
                 logger.info(f"Stats reset for device: {mac}")
         else:
             self._devices.clear()
-            self._samples.clear()
+            self._series.clear()
+            self._collected_macs.clear()
+            self._new_sketches()
             logger.info("All stats reset")
+        if self.store:
+            self.store.delete('bandwidth', mac)
+        if self.anomalies:
+            self.anomalies.forget('traffic', mac)
+
+
+def _downsample(points, now: float) -> List[List]:
+    """
+    Points persistés (chronologiques) → [[résolution, début du bucket,
+    envoyés, reçus]], chaque point regroupé à la résolution du niveau le
+    plus fin qui couvre encore son âge
+    """
+    # (début de couverture, résolution) des niveaux fins, du plus grossier au plus fin
+    thresholds = [(now - resolution * slots, resolution) for resolution, slots in reversed(DEFAULT_RESOLUTIONS[:-1])]
+    resolution = DEFAULT_RESOLUTIONS[-1][0]
+    buckets: List[List] = []
+    for timestamp, (sent, received) in points:
+        while thresholds and timestamp >= thresholds[0][0]:
+            resolution = thresholds.pop(0)[1]
+        start = timestamp // resolution * resolution
+        if buckets and buckets[-1][0] == resolution and buckets[-1][1] == start:
+            buckets[-1][2] += int(sent)
+            buckets[-1][3] += int(received)
+        else:
+            buckets.append([resolution, start, int(sent), int(received)])
+    return buckets
 
 
 # Singleton global
@@ -334,5 +565,8 @@ def get_bandwidth_monitor() -> BandwidthMonitor:
     """Récupère l'instance singleton du BandwidthMonitor"""
     global _bandwidth_monitor
     if _bandwidth_monitor is None:
-        _bandwidth_monitor = BandwidthMonitor()
+        _bandwidth_monitor = BandwidthMonitor(
+            store=get_timeseries_store() if settings.timeseries_enabled else None,
+            anomalies=get_anomaly_detector() if settings.anomaly_detection_enabled else None,
+        )
     return _bandwidth_monitor
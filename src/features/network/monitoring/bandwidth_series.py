@@ -0,0 +1,178 @@
+"""
+🌐 333HOME - Bandwidth Series
+
+Séries de trafic multi-résolution par device :
+- Ring buffers de buckets temporels à taille fixe (array('Q')), un par
+  résolution (1 s sur 10 min, 1 min sur 24 h, 1 h sur 30 jours par défaut)
+- Insertion en temps constant dans le bucket ouvert de la résolution fine
+- Rollups en cascade : un bucket fermé est ajouté au bucket parent de la
+  résolution suivante
+- Lecture d'une fenêtre quelconque sur la résolution adaptée (au plus un
+  ring parcouru + les buckets ouverts des niveaux plus fins), sans
+  rescanner d'échantillons bruts
+"""
+
+import math
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# (résolution en secondes, nombre de buckets)
+DEFAULT_RESOLUTIONS: Tuple[Tuple[int, int], ...] = (
+    (1, 600),           # 10 minutes
+    (60, 1440),         # 24 heures
+    (3600, 720),        # 30 jours
+)
+
+
+class BucketRing:
+    """Buckets (envoyés, reçus) d'une résolution, indexés par epoch // résolution"""
+
+    __slots__ = ('resolution', 'slots', '_ids', '_sent', '_received', 'open_id')
+
+    def __init__(self, resolution: int, slots: int):
+        self.resolution = resolution
+        self.slots = slots
+        self._ids = array('q', [-1]) * slots
+        self._sent = array('Q', [0]) * slots
+        self._received = array('Q', [0]) * slots
+        self.open_id: Optional[int] = None      # Bucket en cours de remplissage
+
+    def add(self, bucket_id: int, sent: int, received: int):
+        index = bucket_id % self.slots
+        if self._ids[index] != bucket_id:
+            self._ids[index] = bucket_id
+            self._sent[index] = 0
+            self._received[index] = 0
+        self._sent[index] += sent
+        self._received[index] += received
+
+    def get(self, bucket_id: int) -> Tuple[int, int]:
+        index = bucket_id % self.slots
+        if self._ids[index] != bucket_id:
+            return 0, 0
+        return self._sent[index], self._received[index]
+
+    @property
+    def nbytes(self) -> int:
+        return self.slots * (self._ids.itemsize + self._sent.itemsize + self._received.itemsize)
+
+
+class BandwidthSeries:
+    """
+    Trafic d'un device à plusieurs résolutions
+
+    Usage:
+        series.add(time.time(), bytes_sent, bytes_received)
+        series.totals(3600)                 # {'bytes_sent', 'bytes_received', 'peak_bps', ...}
+        series.points(86400)                # [{'timestamp', 'bytes_sent', 'bytes_received'}]
+    """
+
+    def __init__(self, resolutions: Sequence[Tuple[int, int]] = DEFAULT_RESOLUTIONS):
+        self.levels = [BucketRing(resolution, slots) for resolution, slots in resolutions]
+
+    # === ÉCRITURE ===
+
+    def add(self, timestamp: float, sent: int, received: int):
+        """Ajouter des octets au bucket courant (rollup des buckets fermés)"""
+        fine = self.levels[0]
+        bucket_id = int(timestamp // fine.resolution)
+        if fine.open_id is not None and bucket_id < fine.open_id:
+            bucket_id = fine.open_id            # Horloge reculée: bucket ouvert
+        if bucket_id != fine.open_id:
+            self._close(0, bucket_id)
+        fine.add(bucket_id, sent, received)
+
+    def _close(self, level: int, new_id: int):
+        """Fermer le bucket ouvert du niveau `level` et le remonter au parent"""
+        ring = self.levels[level]
+        closed, ring.open_id = ring.open_id, new_id
+        if closed is None or level + 1 == len(self.levels):
+            return
+        parent = self.levels[level + 1]
+        parent_id = closed * ring.resolution // parent.resolution
+        new_parent_id = new_id * ring.resolution // parent.resolution
+        if parent.open_id is None or parent_id > parent.open_id:
+            self._close(level + 1, parent_id)
+        parent.add(parent_id, *ring.get(closed))
+        if new_parent_id != parent.open_id:
+            self._close(level + 1, new_parent_id)
+
+    # === LECTURE ===
+
+    def _level_for(self, window: float) -> int:
+        """Niveau le plus fin couvrant la fenêtre"""
+        for level, ring in enumerate(self.levels):
+            if window <= ring.resolution * ring.slots:
+                return level
+        return len(self.levels) - 1
+
+    def _buckets(self, level: int, window: float, now: float) -> List[Tuple[int, int, int]]:
+        """
+        [(bucket_id, envoyés, reçus)] du niveau sur la fenêtre, buckets
+        ouverts des niveaux plus fins (pas encore remontés) inclus
+        """
+        ring = self.levels[level]
+        last = int(now // ring.resolution)
+        count = min(max(1, math.ceil(window / ring.resolution)), ring.slots)
+        buckets = []
+        for bucket_id in range(last - count + 1, last + 1):
+            sent, received = ring.get(bucket_id)
+            for finer in self.levels[:level]:
+                if finer.open_id is not None and finer.open_id * finer.resolution // ring.resolution == bucket_id:
+                    extra_sent, extra_received = finer.get(finer.open_id)
+                    sent += extra_sent
+                    received += extra_received
+            buckets.append((bucket_id, sent, received))
+        return buckets
+
+    def totals(self, window: float, now: float, resolution: Optional[int] = None) -> Dict:
+        """
+        Totaux et pic sur les `window` dernières secondes
+
+        Args:
+            window: Durée de la fenêtre (secondes)
+            now: Horodatage de fin de fenêtre (epoch)
+            resolution: Résolution imposée (défaut: la plus fine couvrant la fenêtre)
+        """
+        level = self._level(resolution) if resolution else self._level_for(window)
+        ring = self.levels[level]
+        buckets = self._buckets(level, window, now)
+        sent = sum(b[1] for b in buckets)
+        received = sum(b[2] for b in buckets)
+        duration = len(buckets) * ring.resolution
+        peak = max(buckets, key=lambda b: b[1] + b[2])
+        return {
+            'window_seconds': duration,
+            'resolution': ring.resolution,
+            'bytes_sent': sent,
+            'bytes_received': received,
+            'total_bytes': sent + received,
+            'avg_upload_bps': sent * 8 / duration,
+            'avg_download_bps': received * 8 / duration,
+            'peak_total_bps': (peak[1] + peak[2]) * 8 / ring.resolution,
+            'peak_timestamp': peak[0] * ring.resolution if peak[1] + peak[2] else None,
+        }
+
+    def points(self, window: float, now: float, resolution: Optional[int] = None) -> List[Dict]:
+        """Série [(timestamp début de bucket, envoyés, reçus)] pour graphiques"""
+        level = self._level(resolution) if resolution else self._level_for(window)
+        ring = self.levels[level]
+        return [
+            {'timestamp': bucket_id * ring.resolution, 'bytes_sent': sent, 'bytes_received': received}
+            for bucket_id, sent, received in self._buckets(level, window, now)
+        ]
+
+    def _level(self, resolution: int) -> int:
+        for level, ring in enumerate(self.levels):
+            if ring.resolution == resolution:
+                return level
+        raise ValueError(f"Résolution inconnue: {resolution}s "
+                         f"(disponibles: {[r.resolution for r in self.levels]})")
+
+    @property
+    def resolutions(self) -> List[int]:
+        return [ring.resolution for ring in self.levels]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(ring.nbytes for ring in self.levels)
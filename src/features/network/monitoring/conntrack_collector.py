@@ -0,0 +1,195 @@
+"""
+🌐 333HOME - Conntrack Traffic Collector
+
+Comptabilité de trafic par IP à partir des compteurs de flux du noyau :
+- Lecture de /proc/net/nf_conntrack (ou `conntrack -L -o extended`),
+  une ligne par flux, jamais par paquet
+- Compteurs original/reply de chaque flux (nécessite
+  net.netfilter.nf_conntrack_acct=1)
+- Delta par flux entre deux lectures, agrégé en (envoyés, reçus) par IP
+  du LAN ; un flux recréé repart de zéro
+- Octets échangés par pair externe (last_peer_deltas) pour les top talkers
+
+Seuls les flux traversant (ou visant) la machine sont visibles : le hub
+doit être la passerelle du LAN pour voir tout le trafic des devices.
+Utilisé par BandwidthMonitor._collect_samples (IP → MAC via le registry).
+"""
+
+import asyncio
+import ipaddress
+import logging
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (protocole, src, dst, sport, dport) du sens original (+ id si disponible)
+FlowKey = Tuple[str, ...]
+
+
+@dataclass
+class FlowCounters:
+    """Compteurs d'un flux conntrack"""
+    src: str                    # Initiateur (sens original)
+    dst: str
+    orig_bytes: int             # Octets initiateur → destination
+    reply_bytes: int            # Octets destination → initiateur
+
+
+def parse_conntrack(lines: Iterable[str]) -> Tuple[Dict[FlowKey, FlowCounters], bool]:
+    """
+    Analyser une table conntrack (format /proc/net/nf_conntrack ou
+    `conntrack -L -o extended`)
+
+    Returns:
+        ({clé de flux: compteurs}, accounting) - accounting=False si aucune
+        ligne ne porte de compteur bytes= (nf_conntrack_acct désactivé)
+    """
+    flows: Dict[FlowKey, FlowCounters] = {}
+    accounting = False
+    for line in lines:
+        tokens = line.split()
+        if len(tokens) < 6:
+            continue
+        proto = tokens[2]
+        tuples = []         # [{src, dst, sport, dport, bytes}] original puis reply
+        flow_id = None
+        for token in tokens[3:]:
+            key, sep, value = token.partition('=')
+            if not sep:
+                continue
+            if key == 'src':
+                tuples.append({'src': value})
+            elif key == 'id':
+                flow_id = value
+            elif tuples and key in ('dst', 'sport', 'dport', 'bytes'):
+                tuples[-1].setdefault(key, value)
+        if not tuples or 'dst' not in tuples[0]:
+            continue
+        orig = tuples[0]
+        reply = tuples[1] if len(tuples) > 1 else {}
+        if 'bytes' in orig:
+            accounting = True
+        key = (proto, orig['src'], orig['dst'], orig.get('sport', ''), orig.get('dport', ''))
+        if flow_id:
+            key += (flow_id,)
+        flows[key] = FlowCounters(
+            src=orig['src'],
+            dst=orig['dst'],
+            orig_bytes=int(orig.get('bytes', 0)),
+            reply_bytes=int(reply.get('bytes', 0)),
+        )
+    return flows, accounting
+
+
+def is_lan_address(ip: str) -> bool:
+    """Adresse d'un device local (privée IPv4/IPv6 ULA, hors loopback/link-local)"""
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return address.is_private and not (address.is_loopback or address.is_link_local or address.is_multicast)
+
+
+class ConntrackCollector:
+    """
+    Deltas de trafic par IP entre deux lectures de la table conntrack
+
+    Usage:
+        deltas = await collector.collect()     # {ip: (octets envoyés, octets reçus)}
+    """
+
+    def __init__(self, source: Optional[str] = None, use_cli: bool = True):
+        """
+        Args:
+            source: Fichier conntrack (défaut: HOME333_CONNTRACK_FILE)
+            use_cli: Utiliser `conntrack -L -o extended` si le fichier est absent
+        """
+        self.source = Path(source or settings.conntrack_file)
+        self.use_cli = use_cli
+        self._previous: Dict[FlowKey, FlowCounters] = {}
+        self._primed = False
+        self._warned_accounting = False
+        self.last_peer_deltas: Dict[str, int] = {}      # {IP externe: octets} de la dernière lecture
+        self.stats = {'reads': 0, 'flows': 0, 'bytes_attributed': 0, 'unavailable': None}
+
+    async def _read_lines(self) -> Optional[Iterable[str]]:
+        if self.source.exists():
+            try:
+                return await asyncio.to_thread(lambda: self.source.read_text().splitlines())
+            except OSError as e:
+                self.stats['unavailable'] = f"{self.source}: {e.strerror or e}"
+                return None
+        if self.use_cli and shutil.which('conntrack'):
+            process = await asyncio.create_subprocess_exec(
+                'conntrack', '-L', '-o', 'extended',
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await process.communicate()
+            return stdout.decode(errors='replace').splitlines()
+        self.stats['unavailable'] = f"{self.source} absent et commande conntrack introuvable"
+        return None
+
+    async def collect(self) -> Dict[str, Tuple[int, int]]:
+        """Lire la table et retourner les octets échangés depuis la lecture précédente"""
+        lines = await self._read_lines()
+        if lines is None:
+            return {}
+        flows, accounting = parse_conntrack(lines)
+        self.stats['reads'] += 1
+        self.stats['flows'] = len(flows)
+        self.stats['unavailable'] = None
+        if flows and not accounting and not self._warned_accounting:
+            logger.warning("⚠️ Conntrack sans compteurs: activer net.netfilter.nf_conntrack_acct=1")
+            self._warned_accounting = True
+        return self.update(flows)
+
+    def update(self, flows: Dict[FlowKey, FlowCounters]) -> Dict[str, Tuple[int, int]]:
+        """
+        Agréger les deltas par IP du LAN
+
+        Première lecture: référence seulement (pas de delta)
+        """
+        deltas: Dict[str, list] = {}
+        peers: Dict[str, int] = {}
+        for key, flow in flows.items():
+            previous = self._previous.get(key)
+            if previous is None:
+                if not self._primed:
+                    continue
+                orig, reply = flow.orig_bytes, flow.reply_bytes
+            else:
+                orig = flow.orig_bytes - previous.orig_bytes
+                reply = flow.reply_bytes - previous.reply_bytes
+                if orig < 0 or reply < 0:        # Flux recréé avec la même clé
+                    orig, reply = flow.orig_bytes, flow.reply_bytes
+            if not orig and not reply:
+                continue
+            # Initiateur: envoie orig, reçoit reply ; destination: l'inverse
+            if is_lan_address(flow.src):
+                entry = deltas.setdefault(flow.src, [0, 0])
+                entry[0] += orig
+                entry[1] += reply
+            if is_lan_address(flow.dst):
+                entry = deltas.setdefault(flow.dst, [0, 0])
+                entry[0] += reply
+                entry[1] += orig
+            else:
+                peers[flow.dst] = peers.get(flow.dst, 0) + orig + reply
+            if not is_lan_address(flow.src):
+                peers[flow.src] = peers.get(flow.src, 0) + orig + reply
+
+        self._previous = flows
+        self._primed = True
+        self.last_peer_deltas = peers
+        result = {ip: (sent, received) for ip, (sent, received) in deltas.items()}
+        self.stats['bytes_attributed'] += sum(s + r for s, r in result.values())
+        return result
+
+    def get_statistics(self) -> Dict:
+        return {'source': str(self.source), **self.stats}
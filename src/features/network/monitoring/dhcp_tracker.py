@@ -11,6 +11,7 @@ import json
 
 from src.core.config import settings
 from src.core.logging_config import get_logger
+from ..conflict_index import ConflictIndex
 
 logger = get_logger(__name__)
 
@@ -20,9 +21,20 @@ class DHCPTracker:
     Suivi des changements d'IP DHCP pour chaque appareil
     """
     
-    def __init__(self):
-        self.history_file = settings.data_dir / "dhcp_history.json"
+    def __init__(self, history_file: Optional[Path] = None):
+        self.history_file = Path(history_file) if history_file else settings.data_dir / "dhcp_history.json"
         self._ensure_storage()
+        
+        # Index IP ↔ MAC (IP actuelle de chaque device suivi), maintenu à chaque écriture
+        self.conflicts = ConflictIndex('dhcp')
+        self.conflicts.rebuild(
+            (mac, device["current_ip"], self._conflict_info(device))
+            for mac, device in self._load_history()["devices"].items()
+        )
+    
+    @staticmethod
+    def _conflict_info(device: Dict[str, Any]) -> Dict[str, Any]:
+        return {"hostname": device.get("hostname"), "last_seen": device["last_seen"]}
     
     def _ensure_storage(self):
         """Créer le fichier de stockage s'il n'existe pas"""
@@ -56,7 +68,7 @@ class DHCPTracker:
         except Exception as e:
             logger.error(f"❌ Failed to save DHCP history: {e}")
     
-    def track_ip_change(self, mac: str, ip: str, hostname: Optional[str] = None):
+    def track_ip_change(self, mac: str, ip: str, hostname: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Enregistrer un changement d'IP pour un appareil
         
@@ -64,6 +76,9 @@ class DHCPTracker:
             mac: Adresse MAC de l'appareil
             ip: Nouvelle adresse IP
             hostname: Nom d'hôte (optionnel)
+            
+        Returns:
+            Événements de conflit IP (ouvert / résolu) déclenchés
         """
         mac = mac.upper()
         history = self._load_history()
@@ -109,6 +124,7 @@ class DHCPTracker:
             device["ip_history"] = device["ip_history"][-50:]
         
         self._save_history(history)
+        return self.conflicts.set_ip(mac, ip, **self._conflict_info(device))
     
     def get_device_ip_history(self, mac: str) -> List[Dict[str, Any]]:
         """
@@ -164,36 +180,14 @@ class DHCPTracker:
     
     def get_ip_conflicts(self) -> List[Dict[str, Any]]:
         """
-        Détecter les conflits d'IP (même IP attribuée à plusieurs MACs)
+        Conflits d'IP (même IP attribuée à plusieurs MACs)
+        
+        Lecture de l'index maintenu par track_ip_change / cleanup_old_entries.
         
         Returns:
-            Liste des conflits détectés
+            Liste des conflits ouverts
         """
-        history = self._load_history()
-        
-        # Grouper par IP actuelle
-        ip_map = {}
-        for mac, device in history["devices"].items():
-            current_ip = device["current_ip"]
-            if current_ip not in ip_map:
-                ip_map[current_ip] = []
-            ip_map[current_ip].append({
-                "mac": mac,
-                "hostname": device.get("hostname"),
-                "last_seen": device["last_seen"]
-            })
-        
-        # Identifier les conflits
-        conflicts = []
-        for ip, devices in ip_map.items():
-            if len(devices) > 1:
-                conflicts.append({
-                    "ip": ip,
-                    "devices": devices,
-                    "conflict_count": len(devices)
-                })
-        
-        return conflicts
+        return self.conflicts.get_conflicts()
     
     def get_dhcp_pool_usage(self, subnet: str = "192.168.1") -> Dict[str, Any]:
         """
@@ -248,6 +242,7 @@ class DHCPTracker:
         
         for mac in devices_to_remove:
             del history["devices"][mac]
+            self.conflicts.remove(mac)
         
         if removed > 0:
             self._save_history(history)
@@ -0,0 +1,184 @@
+"""
+🌐 333HOME - Heavy Hitters
+
+Top talkers sur fenêtre glissante à mémoire bornée :
+- Un bucket par intervalle (60 s par défaut, 1 h conservée)
+- Chaque bucket : résumé Space-Saving (candidats, `capacity` clés max)
+  + sketch Count-Min (estimation des octets de n'importe quelle clé)
+- Requête top-k sur les N dernières secondes : union des candidats des
+  buckets de la fenêtre, estimation par la somme des Count-Min ; le coût
+  dépend de la fenêtre et de la taille des sketches, jamais du nombre
+  d'IPs / flux vus
+- Estimations par excès (jamais sous-estimées)
+"""
+
+import hashlib
+import heapq
+import math
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class SpaceSaving:
+    """
+    Résumé Space-Saving pondéré : les `capacity` clés les plus lourdes
+
+    Une clé absente remplace la clé minimale et hérite de son compteur
+    (erreur bornée par ce minimum).
+    """
+
+    __slots__ = ('capacity', 'counts', '_heap')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, Hashable]] = []     # (compteur, clé), entrées périmées ignorées
+
+    def add(self, key: Hashable, weight: int):
+        if key in self.counts:
+            self.counts[key] += weight
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = weight
+        else:
+            floor, evicted = self._pop_min()
+            del self.counts[evicted]
+            self.counts[key] = floor + weight
+        heapq.heappush(self._heap, (self.counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, k) for k, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[int, Hashable]:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return count, key
+
+
+class CountMin:
+    """Sketch Count-Min (depth lignes × width compteurs), additionnable"""
+
+    __slots__ = ('width', 'depth', 'rows')
+
+    def __init__(self, width: int, depth: int):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def indexes(self, key: Hashable) -> List[int]:
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * i:4 * i + 4], 'little') % self.width for i in range(self.depth)]
+
+    def add(self, key: Hashable, weight: int):
+        for row, index in zip(self.rows, self.indexes(key)):
+            row[index] += weight
+
+    def merge(self, other: 'CountMin'):
+        for row, other_row in zip(self.rows, other.rows):
+            for i, value in enumerate(other_row):
+                if value:
+                    row[i] += value
+
+    def estimate(self, key: Hashable) -> int:
+        return min(row[index] for row, index in zip(self.rows, self.indexes(key)))
+
+
+class _Bucket:
+    __slots__ = ('bucket_id', 'summary', 'sketch', 'total')
+
+    def __init__(self, bucket_id: int, capacity: int, width: int, depth: int):
+        self.bucket_id = bucket_id
+        self.summary = SpaceSaving(capacity)
+        self.sketch = CountMin(width, depth)
+        self.total = 0
+
+
+class WindowedHeavyHitters:
+    """
+    Top-k sur fenêtres récentes arbitraires (granularité bucket_seconds)
+
+    Usage:
+        hitters.add('192.168.1.10', 1500)
+        hitters.top(10, window=300)     # [(clé, octets estimés)]
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: int = 60,
+        buckets: int = 60,
+        capacity: int = 64,
+        width: int = 256,
+        depth: int = 4,
+    ):
+        """
+        Args:
+            bucket_seconds: Durée d'un bucket (secondes)
+            buckets: Nombre de buckets conservés (fenêtre max)
+            capacity: Clés candidates par bucket (Space-Saving)
+            width, depth: Dimensions des sketches Count-Min
+        """
+        self.bucket_seconds = bucket_seconds
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+        self._ring: List[Optional[_Bucket]] = [None] * buckets
+
+    @property
+    def max_window(self) -> int:
+        return self.bucket_seconds * len(self._ring)
+
+    def add(self, key: Hashable, weight: int, timestamp: Optional[float] = None):
+        """Ajouter `weight` octets à une clé (O(depth + log capacity))"""
+        if weight <= 0:
+            return
+        bucket_id = int((timestamp if timestamp is not None else time.time()) // self.bucket_seconds)
+        index = bucket_id % len(self._ring)
+        bucket = self._ring[index]
+        if bucket is None or bucket.bucket_id != bucket_id:
+            if bucket is not None and bucket.bucket_id > bucket_id:
+                return                  # Trop ancien (déjà écrasé)
+            bucket = self._ring[index] = _Bucket(bucket_id, self.capacity, self.width, self.depth)
+        bucket.summary.add(key, weight)
+        bucket.sketch.add(key, weight)
+        bucket.total += weight
+
+    def _window(self, window: float, now: float) -> List[_Bucket]:
+        last = int(now // self.bucket_seconds)
+        count = min(max(1, math.ceil(window / self.bucket_seconds)), len(self._ring))
+        return [
+            bucket for bucket in self._ring
+            if bucket is not None and last - count < bucket.bucket_id <= last
+        ]
+
+    def top(self, k: int, window: float, now: Optional[float] = None) -> List[Tuple[Hashable, int]]:
+        """
+        k clés les plus lourdes sur les `window` dernières secondes
+
+        Returns:
+            [(clé, octets estimés)] triés par ordre décroissant
+        """
+        buckets = self._window(window, now if now is not None else time.time())
+        if not buckets:
+            return []
+        if len(buckets) == 1:
+            bucket = buckets[0]
+            return heapq.nlargest(
+                k,
+                ((key, min(count, bucket.sketch.estimate(key))) for key, count in bucket.summary.counts.items()),
+                key=lambda item: item[1],
+            )
+
+        sketch = CountMin(self.width, self.depth)
+        candidates = set()
+        for bucket in buckets:
+            sketch.merge(bucket.sketch)
+            candidates.update(bucket.summary.counts)
+        return heapq.nlargest(
+            k,
+            ((key, sketch.estimate(key)) for key in candidates),
+            key=lambda item: item[1],
+        )
+
+    def total(self, window: float, now: Optional[float] = None) -> int:
+        """Octets totaux (exacts) sur la fenêtre"""
+        return sum(b.total for b in self._window(window, now if now is not None else time.time()))
@@ -0,0 +1,174 @@
+"""
+🌡️ 333HOME - Host Load Monitor
+Surveillance de la charge du Raspberry Pi pour throttler les scans
+
+Signaux:
+- Load average (normalisé par nombre de CPUs)
+- Température CPU (/sys/class/thermal)
+- Lag de l'event loop asyncio (web UI + WebSockets agents)
+
+Chaque signal produit un niveau (normal / elevated / critical) et une raison
+lisible. Le niveau le plus grave fixe le facteur de throttling appliqué par
+les consommateurs (scheduler, sources lourdes du MultiSourceScanner).
+"""
+
+import os
+import time
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# Seuils (elevated, critical)
+LOAD_PER_CPU_THRESHOLDS = (0.7, 1.2)
+CPU_TEMP_THRESHOLDS_C = (70.0, 80.0)     # Le Pi throttle lui-même vers 80-85°C
+LOOP_LAG_THRESHOLDS_S = (0.1, 0.5)
+
+# Facteur appliqué au débit / à la concurrence selon le niveau
+THROTTLE_FACTORS = {
+    'normal': 1.0,
+    'elevated': 0.5,
+    'critical': 0.0,     # 0 = différer les probes / sources lourdes
+}
+
+LEVEL_ORDER = ('normal', 'elevated', 'critical')
+
+THERMAL_ZONE_PATH = Path("/sys/class/thermal/thermal_zone0/temp")
+
+
+@dataclass
+class HostLoadSnapshot:
+    """État de charge de l'hôte à un instant T"""
+    timestamp: float
+    load_per_cpu: Optional[float] = None
+    cpu_temp_c: Optional[float] = None
+    loop_lag_s: Optional[float] = None
+    level: str = 'normal'
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def throttle_factor(self) -> float:
+        return THROTTLE_FACTORS[self.level]
+
+    @property
+    def is_throttled(self) -> bool:
+        return self.level != 'normal'
+
+    def to_dict(self) -> Dict:
+        return {
+            'level': self.level,
+            'throttle_factor': self.throttle_factor,
+            'reasons': self.reasons,
+            'load_per_cpu': round(self.load_per_cpu, 2) if self.load_per_cpu is not None else None,
+            'cpu_temp_c': round(self.cpu_temp_c, 1) if self.cpu_temp_c is not None else None,
+            'loop_lag_ms': round(self.loop_lag_s * 1000, 1) if self.loop_lag_s is not None else None,
+        }
+
+
+def _grade(value: Optional[float], thresholds: Tuple[float, float]) -> str:
+    if value is None:
+        return 'normal'
+    elevated, critical = thresholds
+    if value >= critical:
+        return 'critical'
+    if value >= elevated:
+        return 'elevated'
+    return 'normal'
+
+
+class HostLoadMonitor:
+    """
+    Moniteur de charge hôte (lecture /proc + /sys, pas de subprocess)
+
+    Le lag de l'event loop est alimenté par les boucles de fond via
+    record_loop_lag() (dépassement mesuré de leur asyncio.sleep).
+    """
+
+    def __init__(
+        self,
+        load_reader: Optional[Callable[[], Tuple[float, float, float]]] = None,
+        temp_path: Path = THERMAL_ZONE_PATH,
+        cpu_count: Optional[int] = None,
+        cache_ttl: float = 2.0,
+    ):
+        """
+        Args:
+            load_reader: Fonction retournant (load1, load5, load15) (défaut: os.getloadavg)
+            temp_path: Fichier température (millidegrés)
+            cpu_count: Nombre de CPUs (défaut: os.cpu_count())
+            cache_ttl: Durée de validité d'un snapshot (secondes)
+        """
+        self.load_reader = load_reader or os.getloadavg
+        self.temp_path = Path(temp_path)
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self.cache_ttl = cache_ttl
+        self._loop_lag_ewma: Optional[float] = None
+        self._last_snapshot: Optional[HostLoadSnapshot] = None
+        self._last_level = 'normal'
+
+    def record_loop_lag(self, lag_seconds: float, alpha: float = 0.3):
+        """Enregistrer un lag d'event loop mesuré (lissage EWMA)"""
+        lag = max(0.0, lag_seconds)
+        if self._loop_lag_ewma is None:
+            self._loop_lag_ewma = lag
+        else:
+            self._loop_lag_ewma = alpha * lag + (1 - alpha) * self._loop_lag_ewma
+        self._last_snapshot = None
+
+    def _read_load_per_cpu(self) -> Optional[float]:
+        try:
+            return self.load_reader()[0] / self.cpu_count
+        except (OSError, AttributeError, IndexError):
+            return None
+
+    def _read_cpu_temp(self) -> Optional[float]:
+        try:
+            return int(self.temp_path.read_text().strip()) / 1000.0
+        except (OSError, ValueError):
+            return None
+
+    def snapshot(self) -> HostLoadSnapshot:
+        """Snapshot courant (mis en cache `cache_ttl` secondes)"""
+        now = time.monotonic()
+        if self._last_snapshot and now - self._last_snapshot.timestamp < self.cache_ttl:
+            return self._last_snapshot
+
+        snap = HostLoadSnapshot(
+            timestamp=now,
+            load_per_cpu=self._read_load_per_cpu(),
+            cpu_temp_c=self._read_cpu_temp(),
+            loop_lag_s=self._loop_lag_ewma,
+        )
+
+        grades = [
+            (_grade(snap.load_per_cpu, LOAD_PER_CPU_THRESHOLDS), 'load', snap.load_per_cpu, '/cpu'),
+            (_grade(snap.cpu_temp_c, CPU_TEMP_THRESHOLDS_C), 'cpu_temp', snap.cpu_temp_c, '°C'),
+            (_grade(snap.loop_lag_s, LOOP_LAG_THRESHOLDS_S), 'loop_lag', snap.loop_lag_s, 's'),
+        ]
+        for level, name, value, unit in grades:
+            if level != 'normal':
+                snap.reasons.append(f"{name}={value:.2f}{unit} ({level})")
+                if LEVEL_ORDER.index(level) > LEVEL_ORDER.index(snap.level):
+                    snap.level = level
+
+        if snap.level != self._last_level:
+            logger.info(f"🌡️ Host load {self._last_level} → {snap.level}: {', '.join(snap.reasons) or 'OK'}")
+            self._last_level = snap.level
+
+        self._last_snapshot = snap
+        return snap
+
+
+# === SINGLETON ===
+_host_load_monitor: Optional[HostLoadMonitor] = None
+
+
+def get_host_load_monitor() -> HostLoadMonitor:
+    """Récupère le moniteur de charge hôte singleton"""
+    global _host_load_monitor
+    if _host_load_monitor is None:
+        _host_load_monitor = HostLoadMonitor()
+    return _host_load_monitor
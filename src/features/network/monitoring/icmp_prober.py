@@ -0,0 +1,291 @@
+"""
+⚡ 333HOME - ICMP Prober
+Echo requests multiplexés sur une seule socket ICMP (asyncio)
+
+Fonctionnalités:
+- Socket datagramme ICMP non privilégiée (net.ipv4.ping_group_range),
+  sinon socket raw (root / CAP_NET_RAW)
+- Milliers d'hôtes en parallèle sur la même socket, réponses associées
+  par séquence (+ identifiant en raw), débit d'envoi borné (paquets/s)
+- RTT = réception - émission sur l'horloge monotone (ns), sans
+  fork/exec de `ping`
+- TTL de chaque réponse (IP_RECVTTL / en-tête IP) pour os_fingerprint
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+ICMP_HEADER = struct.Struct('!BBHHH')
+IP_RECVTTL = getattr(socket, 'IP_RECVTTL', 12)
+PAYLOAD = b'333HOME-latency!'
+
+
+@dataclass
+class EchoReply:
+    """Réponse ICMP echo"""
+    ip: str
+    seq: int
+    rtt_ms: float
+    ttl: Optional[int] = None
+
+
+def checksum(data: bytes) -> int:
+    """Checksum Internet (complément à un sur 16 bits)"""
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def build_echo_request(ident: int, seq: int, payload: bytes = PAYLOAD) -> bytes:
+    header = ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    return ICMP_HEADER.pack(ICMP_ECHO_REQUEST, 0, checksum(header + payload), ident, seq) + payload
+
+
+def parse_echo_reply(data: bytes, raw: bool) -> Optional[Tuple[int, int, Optional[int]]]:
+    """
+    (identifiant, séquence, TTL) d'un echo reply, None sinon
+
+    raw=True: paquet précédé de l'en-tête IP (TTL lu dans l'en-tête)
+    """
+    ttl = None
+    if raw:
+        if len(data) < 20:
+            return None
+        ihl = (data[0] & 0x0F) * 4
+        ttl = data[8]
+        data = data[ihl:]
+    if len(data) < ICMP_HEADER.size:
+        return None
+    icmp_type, _, _, ident, seq = ICMP_HEADER.unpack_from(data)
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return ident, seq, ttl
+
+
+class _Pending:
+    __slots__ = ('ip', 'sent_ns', 'future')
+
+    def __init__(self, ip: str, future: asyncio.Future):
+        self.ip = ip
+        self.sent_ns = 0
+        self.future = future
+
+
+class ICMPProber:
+    """
+    Prober ICMP echo multiplexé
+
+    Usage:
+        prober = get_icmp_prober()
+        if await prober.open():
+            replies = await prober.ping_many(['192.168.1.1', ...], count=4)
+    """
+
+    def __init__(self, max_pps: Optional[float] = None, mode: Optional[str] = None):
+        """
+        Args:
+            max_pps: Débit d'envoi max (paquets/seconde, tous hôtes confondus)
+            mode: 'dgram' ou 'raw' (défaut: dgram puis raw)
+        """
+        self.max_pps = max_pps or settings.icmp_max_pps
+        self.modes = [mode] if mode else ['dgram', 'raw']
+        self.mode: Optional[str] = None
+        self.unavailable_reason: Optional[str] = None
+        self.ident = os.getpid() & 0xFFFF
+
+        self._sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[int, _Pending] = {}
+        self._seq = 0
+        self._next_send = 0.0
+        self.stats = {'sent': 0, 'received': 0, 'timeouts': 0, 'unmatched': 0}
+
+    # === SOCKET ===
+
+    async def open(self) -> bool:
+        """Ouvrir la socket pour la boucle courante (False si ICMP indisponible)"""
+        loop = asyncio.get_running_loop()
+        if self._sock is not None and self._loop is loop:
+            return True
+        if self.unavailable_reason is not None:
+            return False
+        self.close()
+
+        errors = []
+        for mode in self.modes:
+            sock_type = socket.SOCK_DGRAM if mode == 'dgram' else socket.SOCK_RAW
+            try:
+                sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+            except OSError as e:
+                errors.append(f"{mode}: {e.strerror or e}")
+                continue
+            if mode == 'dgram':
+                sock.setsockopt(socket.IPPROTO_IP, IP_RECVTTL, 1)
+            sock.setblocking(False)
+            self._sock, self._loop, self.mode = sock, loop, mode
+            loop.add_reader(sock.fileno(), self._on_readable)
+            logger.info(f"⚡ ICMP prober: socket {mode} ({self.max_pps:.0f} pkt/s max)")
+            return True
+
+        self.unavailable_reason = '; '.join(errors)
+        logger.warning(f"⚠️ ICMP prober indisponible ({self.unavailable_reason}), fallback ping")
+        return False
+
+    def close(self):
+        if self._sock is None:
+            return
+        try:
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.remove_reader(self._sock.fileno())
+        finally:
+            self._sock.close()
+            self._sock = None
+            self._loop = None
+        for pending in self._pending.values():
+            if not pending.future.done():
+                try:
+                    pending.future.cancel()
+                except RuntimeError:      # Boucle précédente déjà fermée
+                    pass
+        self._pending.clear()
+
+    def _on_readable(self):
+        """Vider la socket et associer chaque réponse à son echo en attente"""
+        raw = self.mode == 'raw'
+        while True:
+            try:
+                data, ancdata, _, address = self._sock.recvmsg(2048, socket.CMSG_SPACE(4))
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug(f"ICMP recv error: {e}")
+                return
+            received_ns = time.monotonic_ns()
+
+            parsed = parse_echo_reply(data, raw)
+            if parsed is None:
+                continue
+            ident, seq, ttl = parsed
+            # dgram: le kernel réécrit l'identifiant et filtre pour nous
+            if raw and ident != self.ident:
+                continue
+            pending = self._pending.get(seq)
+            if pending is None or pending.ip != address[0] or pending.future.done():
+                self.stats['unmatched'] += 1
+                continue
+
+            for level, kind, value in ancdata:
+                if level == socket.IPPROTO_IP and kind == socket.IP_TTL and len(value) >= 4:
+                    ttl = struct.unpack('i', value[:4])[0]
+            self.stats['received'] += 1
+            pending.future.set_result(EchoReply(
+                ip=pending.ip,
+                seq=seq,
+                rtt_ms=(received_ns - pending.sent_ns) / 1e6,
+                ttl=ttl,
+            ))
+
+    # === ENVOI ===
+
+    def _next_seq(self) -> int:
+        for _ in range(0x10000):
+            self._seq = (self._seq + 1) & 0xFFFF
+            if self._seq not in self._pending:
+                return self._seq
+        raise RuntimeError("ICMP prober: 65536 echos en attente")
+
+    async def _pace(self):
+        """Espacement des envois (budget max_pps global)"""
+        now = time.monotonic()
+        slot = max(now, self._next_send)
+        self._next_send = slot + 1.0 / self.max_pps
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def echo(self, ip: str, timeout: float = 2.0) -> Optional[EchoReply]:
+        """Un echo request → EchoReply, ou None (timeout / erreur d'envoi)"""
+        if not await self.open():
+            return None
+        await self._pace()
+
+        seq = self._next_seq()
+        pending = self._pending[seq] = _Pending(ip, self._loop.create_future())
+        packet = build_echo_request(self.ident, seq)
+        try:
+            pending.sent_ns = time.monotonic_ns()
+            await self._loop.sock_sendto(self._sock, packet, (ip, 0))
+            self.stats['sent'] += 1
+            return await asyncio.wait_for(pending.future, timeout)
+        except asyncio.TimeoutError:
+            self.stats['timeouts'] += 1
+            return None
+        except OSError as e:
+            logger.debug(f"ICMP send to {ip} failed: {e}")
+            return None
+        finally:
+            if self._pending.get(seq) is pending:
+                del self._pending[seq]
+
+    async def ping(
+        self,
+        ip: str,
+        count: int = 4,
+        timeout: float = 2.0,
+        interval: float = 0.2,
+    ) -> List[Optional[EchoReply]]:
+        """`count` echos espacés de `interval`, attentes en parallèle"""
+        tasks = []
+        for i in range(count):
+            if i:
+                await asyncio.sleep(interval)
+            tasks.append(asyncio.ensure_future(self.echo(ip, timeout)))
+        return list(await asyncio.gather(*tasks))
+
+    async def ping_many(
+        self,
+        ips: Iterable[str],
+        count: int = 4,
+        timeout: float = 2.0,
+        interval: float = 0.2,
+    ) -> Dict[str, List[Optional[EchoReply]]]:
+        """Pinger tous les hôtes en parallèle sur la même socket"""
+        ips = list(dict.fromkeys(ips))
+        results = await asyncio.gather(*(self.ping(ip, count, timeout, interval) for ip in ips))
+        return dict(zip(ips, results))
+
+    def get_statistics(self) -> Dict:
+        return {
+            'mode': self.mode,
+            'available': self.unavailable_reason is None,
+            'unavailable_reason': self.unavailable_reason,
+            'in_flight': len(self._pending),
+            'max_pps': self.max_pps,
+            **self.stats,
+        }
+
+
+# === SINGLETON ===
+_icmp_prober: Optional[ICMPProber] = None
+
+
+def get_icmp_prober() -> ICMPProber:
+    """Récupère le prober ICMP partagé"""
+    global _icmp_prober
+    if _icmp_prober is None:
+        _icmp_prober = ICMPProber()
+    return _icmp_prober
@@ -0,0 +1,198 @@
+"""
+⚡ 333HOME - Latency Ring Buffer
+Historique de latence compact par hôte (quantiles, histogrammes)
+
+Fonctionnalités:
+- Ring buffer de taille fixe: RTT en array('f'), timestamps epoch en
+  array('I'), pertes en bitmap (~8 octets par mesure au lieu d'un
+  dataclass + datetime par échantillon)
+- Mémoire allouée au fil des mesures jusqu'à la capacité, puis écrasement
+  des plus anciennes
+- Quantiles (p50/p95/p99) et histogramme sur une période, vectorisés
+  avec NumPy si disponible
+"""
+
+import bisect
+import math
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+# Bornes supérieures des classes d'histogramme (ms), dernière classe = +inf
+HISTOGRAM_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Quantile par interpolation linéaire (même méthode que numpy.percentile)"""
+    position = (len(sorted_values) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+class LatencyRingBuffer:
+    """
+    Mesures (timestamp, RTT ou perte) d'un hôte, ordre d'insertion
+
+    Usage:
+        buffer.append(12.5, int(time.time()))     # RTT en ms
+        buffer.append(None, int(time.time()))     # Perte
+        buffer.percentiles(since=now - 3600)      # {'p50': ..., 'p95': ..., 'p99': ...}
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._rtt = array('f')
+        self._ts = array('I')
+        self._lost = bytearray()
+        self._head = 0          # Prochaine position écrite une fois plein
+
+    # === ÉCRITURE ===
+
+    def append(self, rtt: Optional[float], timestamp: int) -> Optional[Tuple[Optional[float], int]]:
+        """
+        Ajouter une mesure
+
+        Returns:
+            (rtt ou None, timestamp) de la mesure écrasée, None si pas d'éviction
+        """
+        if len(self._rtt) < self.capacity:
+            index = len(self._rtt)
+            self._rtt.append(rtt or 0.0)
+            self._ts.append(timestamp)
+            if index % 8 == 0:
+                self._lost.append(0)
+            evicted = None
+        else:
+            index = self._head
+            self._head = (index + 1) % self.capacity
+            evicted = (None if self._is_lost(index) else self._rtt[index], self._ts[index])
+            self._rtt[index] = rtt or 0.0
+            self._ts[index] = timestamp
+
+        if rtt is None:
+            self._lost[index >> 3] |= 1 << (index & 7)
+        else:
+            self._lost[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+        return evicted
+
+    def clear(self):
+        self._rtt = array('f')
+        self._ts = array('I')
+        self._lost = bytearray()
+        self._head = 0
+
+    # === LECTURE ===
+
+    def __len__(self) -> int:
+        return len(self._rtt)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._rtt) * (self._rtt.itemsize + self._ts.itemsize) + len(self._lost)
+
+    def _is_lost(self, index: int) -> bool:
+        return bool(self._lost[index >> 3] >> (index & 7) & 1)
+
+    def _order(self) -> Iterable[int]:
+        """Positions du plus ancien au plus récent"""
+        size = len(self._rtt)
+        return (range(size) if size < self.capacity
+                else (i % size for i in range(self._head, self._head + size)))
+
+    def latest(self) -> Optional[Tuple[int, Optional[float]]]:
+        """(timestamp, RTT stocké ou None) de la dernière mesure"""
+        if not self._rtt:
+            return None
+        index = (self._head - 1) % len(self._rtt) if len(self._rtt) == self.capacity else len(self._rtt) - 1
+        return self._ts[index], None if self._is_lost(index) else self._rtt[index]
+
+    def samples(self, since: Optional[int] = None) -> List[Tuple[int, Optional[float]]]:
+        """Mesures [(timestamp, RTT ou None)] postérieures à since (epoch s)"""
+        return [
+            (self._ts[i], None if self._is_lost(i) else self._rtt[i])
+            for i in self._order()
+            if since is None or self._ts[i] >= since
+        ]
+
+    def _window(self, since: Optional[int]):
+        """(RTT reçus, nombre de mesures, nombre de pertes) sur la période"""
+        size = len(self._rtt)
+        if size == 0:
+            return [], 0, 0
+        if NUMPY_AVAILABLE:
+            rtt = np.frombuffer(self._rtt, dtype=np.float32, count=size)
+            lost = np.unpackbits(np.frombuffer(self._lost, dtype=np.uint8), bitorder='little')[:size].astype(bool)
+            mask = np.ones(size, dtype=bool) if since is None else np.frombuffer(self._ts, dtype=np.uint32, count=size) >= since
+            received = rtt[mask & ~lost]
+            total = int(mask.sum())
+            return received, total, total - len(received)
+
+        received, total = [], 0
+        for _, value in self.samples(since):
+            total += 1
+            if value is not None:
+                received.append(value)
+        return received, total, total - len(received)
+
+    def percentiles(
+        self,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        since: Optional[int] = None,
+    ) -> Dict[str, Optional[float]]:
+        """
+        Quantiles des RTT reçus sur la période
+
+        Returns:
+            {'p50': ms, 'p95': ms, ...} (None si aucune réponse)
+        """
+        received, _, _ = self._window(since)
+        keys = [f"p{q:g}" for q in percentiles]
+        if len(received) == 0:
+            return dict.fromkeys(keys)
+        if NUMPY_AVAILABLE:
+            values = np.percentile(received, percentiles).tolist()
+        else:
+            ordered = sorted(received)
+            values = [percentile(ordered, q) for q in percentiles]
+        return {key: round(float(value), 2) for key, value in zip(keys, values)}
+
+    def histogram(
+        self,
+        bounds: Sequence[float] = HISTOGRAM_BOUNDS_MS,
+        since: Optional[int] = None,
+    ) -> Dict:
+        """
+        Répartition des RTT par classe
+
+        Returns:
+            {'buckets': [{'lt': borne ms ou None (+inf), 'count'}], 'total', 'lost'}
+            Classe i = RTT dans [bounds[i-1], bounds[i])
+        """
+        received, total, lost = self._window(since)
+        if NUMPY_AVAILABLE:
+            counts = np.bincount(
+                np.searchsorted(bounds, received, side='right'),
+                minlength=len(bounds) + 1,
+            ).tolist()
+        else:
+            counts = [0] * (len(bounds) + 1)
+            for value in received:
+                counts[bisect.bisect_right(bounds, value)] += 1
+
+        return {
+            'buckets': [
+                {'lt': bound, 'count': count}
+                for bound, count in zip(list(bounds) + [None], counts)
+            ],
+            'total': total,
+            'lost': lost,
+        }
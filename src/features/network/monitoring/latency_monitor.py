@@ -3,23 +3,39 @@
 Monitoring de latence et qualité réseau
 
 Fonctionnalités:
-- Mesure latence/ping en continu
-- Calcul jitter (variation latence)
+- Mesure latence/ping en continu (echo ICMP multiplexés, RTT horloge monotone)
+- Calcul jitter (RFC 3550) et statistiques en flux, lecture O(1) par hôte
 - Détection packet loss
 - Score qualité réseau
-- Historique latence par device
+- Historique latence par device (ring buffers compacts, quantiles/histogrammes)
+- Persistance des mesures (time series store), historique rechargé au démarrage
+- Détection de dégradations (latence, pertes) → historique réseau
 """
 
 import asyncio
-import time
+import heapq
 import logging
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+import math
+import re
+import time
 from collections import deque
+from typing import List, Dict, Optional, Sequence
+from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 
+from src.core.config import settings
+from ..os_fingerprint import get_os_fingerprinter
+from .anomaly_detector import AnomalyDetector, get_anomaly_detector
+from .icmp_prober import EchoReply, ICMPProber, get_icmp_prober
+from .latency_buffer import DEFAULT_PERCENTILES, HISTOGRAM_BOUNDS_MS, LatencyRingBuffer
+from .reachability import ReachabilityService, get_reachability_service
+from .streaming_stats import WindowedLatencyStats
+from .timeseries_store import TimeSeriesStore, get_timeseries_store
+
 logger = logging.getLogger(__name__)
 
+PING_REPLY = re.compile(r'icmp_seq=(\d+).*?time[=<]([\d.]+)')
+
 
 @dataclass
 class LatencyMeasurement:
@@ -48,16 +64,42 @@ class LatencyStats:
 class LatencyMonitor:
     """Moniteur de latence réseau"""
     
-    def __init__(self, history_size: int = 100):
+    def __init__(
+        self,
+        history_size: Optional[int] = None,
+        stats_window: Optional[int] = None,
+        prober: Optional[ICMPProber] = None,
+        store: Optional[TimeSeriesStore] = None,
+        anomalies: Optional[AnomalyDetector] = None,
+        reachability: Optional[ReachabilityService] = None,
+    ):
         """
         Initialise le moniteur
         
         Args:
-            history_size: Nombre de mesures à conserver en historique
+            history_size: Nombre de mesures à conserver par hôte
+                (défaut: HOME333_LATENCY_HISTORY_SIZE)
+            stats_window: Mesures récentes couvertes par les statistiques et
+                classements (défaut: HOME333_LATENCY_STATS_WINDOW, borné par
+                history_size)
+            prober: Prober ICMP (défaut: prober partagé)
+            store: Persistance des mesures (None = mémoire seulement)
+            anomalies: Détecteur d'anomalies (None = désactivé)
+            reachability: Service de joignabilité (processus `ping` bornés,
+                résultats réinjectés dans son cache)
         """
-        self.history_size = history_size
-        # Dict {ip: deque[LatencyMeasurement]}
-        self.history: Dict[str, deque] = {}
+        self.history_size = history_size or settings.latency_history_size
+        self.stats_window = min(stats_window or settings.latency_stats_window, self.history_size)
+        self.prober = prober or get_icmp_prober()
+        self.store = store
+        self.anomalies = anomalies
+        self.reachability = reachability or get_reachability_service()
+        # Dict {ip: LatencyRingBuffer}
+        self.history: Dict[str, LatencyRingBuffer] = {}
+        # Dict {ip: WindowedLatencyStats} mis à jour à chaque mesure, sur
+        # les stats_window dernières mesures (file d'éviction propre)
+        self.aggregates: Dict[str, WindowedLatencyStats] = {}
+        self._windows: Dict[str, deque] = {}
     
     async def measure_latency(
         self,
@@ -76,62 +118,131 @@ class LatencyMonitor:
         Returns:
             Liste de mesures
         """
-        measurements = []
+        if await self.prober.open():
+            replies = await self.prober.ping(ip, count=count, timeout=timeout)
+        else:
+            replies = await self._ping_subprocess(ip, count, timeout)
+        return self._record(ip, replies)
+    
+    async def _ping_subprocess(self, ip: str, count: int, timeout: float) -> List[Optional[EchoReply]]:
+        """
+        Fallback sans socket ICMP: un seul `ping -c count` par hôte, lancé
+        par le service de joignabilité (processus simultanés bornés)
         
-        for _ in range(count):
-            try:
-                start = time.time()
-                
-                # Ping via subprocess
-                process = await asyncio.create_subprocess_exec(
-                    'ping',
-                    '-c', '1',
-                    '-W', str(int(timeout)),
-                    ip,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.DEVNULL,
-                )
-                
-                await process.wait()
-                end = time.time()
-                
-                if process.returncode == 0:
-                    latency_ms = (end - start) * 1000
-                    measurements.append(LatencyMeasurement(
-                        timestamp=datetime.now(),
-                        latency_ms=latency_ms,
-                        success=True,
-                    ))
-                else:
-                    measurements.append(LatencyMeasurement(
-                        timestamp=datetime.now(),
-                        latency_ms=0.0,
-                        success=False,
-                    ))
-            
-            except Exception as e:
-                logger.debug(f"Ping failed for {ip}: {e}")
-                measurements.append(LatencyMeasurement(
-                    timestamp=datetime.now(),
-                    latency_ms=0.0,
-                    success=False,
-                ))
+        RTT = temps rapporté par ping pour chaque icmp_seq (pas la durée du process)
+        """
+        replies: List[Optional[EchoReply]] = [None] * count
+        result = await self.reachability.run_ping(ip, count=count, timeout=timeout)
+        if result is None:
+            return replies
         
-        # Sauvegarder dans l'historique
-        if ip not in self.history:
-            self.history[ip] = deque(maxlen=self.history_size)
+        _, output = result
+        for match in PING_REPLY.finditer(output):
+            seq = int(match.group(1))
+            if 1 <= seq <= count:
+                replies[seq - 1] = EchoReply(ip=ip, seq=seq, rtt_ms=float(match.group(2)))
+        return replies
+    
+    def _record(self, ip: str, replies: List[Optional[EchoReply]]) -> List[LatencyMeasurement]:
+        """Convertir les réponses en mesures + historique + TTL pour os_fingerprint"""
+        now = datetime.now()
+        measurements = [
+            LatencyMeasurement(timestamp=now, latency_ms=r.rtt_ms, success=True) if r
+            else LatencyMeasurement(timestamp=now, latency_ms=0.0, success=False)
+            for r in replies
+        ]
+        ttl = next((r.ttl for r in replies if r and r.ttl), None)
+        if ttl:
+            get_os_fingerprinter().observe_ttl(ip, ttl)
+        if replies:
+            self.reachability.record(ip, any(replies))
         
-        self.history[ip].extend(measurements)
+        # Historique mémoire + persistance (NaN = perte)
+        for r in replies:
+            rtt = r.rtt_ms if r else None
+            self._store_sample(ip, rtt, now)
+            if self.store:
+                self.store.append('latency', ip, now.timestamp(), (math.nan if rtt is None else rtt,))
+        
+        if self.anomalies and replies:
+            received = [r.rtt_ms for r in replies if r]
+            if received:
+                self.anomalies.observe('latency', ip, sum(received) / len(received), now.timestamp())
+            self.anomalies.observe('loss', ip, 1 - len(received) / len(replies), now.timestamp())
         
         return measurements
     
+    def _store_sample(self, ip: str, rtt: Optional[float], at: datetime):
+        """Historique + agrégats (fenêtre récente, éviction FIFO)"""
+        if ip not in self.history:
+            self.history[ip] = LatencyRingBuffer(self.history_size)
+            self.aggregates[ip] = WindowedLatencyStats()
+            self._windows[ip] = deque(maxlen=self.stats_window)
+        history = self.history[ip]
+        aggregate = self.aggregates[ip]
+        window = self._windows[ip]
+        
+        history.append(rtt, int(at.timestamp()))
+        if len(window) == window.maxlen:
+            aggregate.remove(window[0])
+        # Valeur relue (float32) pour que les retraits compensent exactement
+        value = history.latest()[1]
+        window.append(value)
+        aggregate.add(value, at)
+    
+    def restore_history(self) -> int:
+        """
+        Recharger les dernières mesures persistées (au plus history_size par
+        hôte, sur la rétention brute du store)
+        
+        Coûteux (lecture disque) : appelé hors event loop au démarrage.
+        
+        Returns:
+            Nombre de mesures rechargées
+        """
+        if not self.store:
+            return 0
+        since = time.time() - self.store.raw_retention
+        restored = 0
+        for ip in self.store.keys('latency'):
+            for timestamp, (rtt,) in self.store.query('latency', ip, since)[-self.history_size:]:
+                lost = math.isnan(rtt)
+                self._store_sample(ip, None if lost else rtt, datetime.fromtimestamp(timestamp))
+                if self.anomalies:
+                    # Baselines réapprises sans émettre d'événements
+                    if not lost:
+                        self.anomalies.observe('latency', ip, rtt, timestamp, emit=False)
+                    self.anomalies.observe('loss', ip, float(lost), timestamp, emit=False)
+                restored += 1
+        if restored:
+            logger.info(f"⚡ Latency history restored: {restored} measurements ({len(self.history)} hosts)")
+        return restored
+    
+    def get_series(self, ip: str, hours: float = 24) -> List[Dict]:
+        """
+        Série persistée d'un hôte (brute puis rollups 1 min au-delà de la
+        rétention brute), au-delà de l'historique mémoire
+        
+        Returns:
+            [{'timestamp', 'latency_ms' (None = perte)}]
+        """
+        if not self.store:
+            return [
+                {'timestamp': timestamp, 'latency_ms': rtt}
+                for timestamp, rtt in (self.history[ip].samples(self._since(hours)) if ip in self.history else [])
+            ]
+        return [
+            {'timestamp': timestamp, 'latency_ms': None if math.isnan(rtt) else round(rtt, 2)}
+            for timestamp, (rtt,) in self.store.query('latency', ip, time.time() - hours * 3600)
+        ]
+    
     def calculate_stats(
         self,
         ip: str,
         hostname: Optional[str] = None,
     ) -> Optional[LatencyStats]:
         """
-        Calcule les statistiques de latence
+        Calcule les statistiques de latence (stats_window dernières mesures)
         
         Args:
             ip: Adresse IP
@@ -140,39 +251,24 @@ class LatencyMonitor:
         Returns:
             LatencyStats ou None si pas de données
         """
-        if ip not in self.history or not self.history[ip]:
+        aggregate = self.aggregates.get(ip)
+        if aggregate is None or not aggregate.count:
             return None
         
-        measurements = list(self.history[ip])
-        successful = [m for m in measurements if m.success]
-        
-        if not successful:
+        if not aggregate.received:
             return LatencyStats(
                 ip=ip,
                 hostname=hostname,
-                measurements_count=len(measurements),
+                measurements_count=aggregate.count,
                 packet_loss_percent=100.0,
                 quality_score=0,
                 quality_label="Offline",
+                last_measurement=aggregate.last_timestamp,
             )
         
-        # Latences
-        latencies = [m.latency_ms for m in successful]
-        avg_latency = sum(latencies) / len(latencies)
-        min_latency = min(latencies)
-        max_latency = max(latencies)
-        
-        # Jitter (variation moyenne)
-        if len(latencies) > 1:
-            jitter = sum(
-                abs(latencies[i] - latencies[i-1])
-                for i in range(1, len(latencies))
-            ) / (len(latencies) - 1)
-        else:
-            jitter = 0.0
-        
-        # Packet loss
-        packet_loss = ((len(measurements) - len(successful)) / len(measurements)) * 100
+        avg_latency = aggregate.mean
+        jitter = aggregate.jitter
+        packet_loss = aggregate.loss_percent
         
         # Score qualité (0-100)
         # Facteurs:
@@ -205,15 +301,15 @@ class LatencyMonitor:
         return LatencyStats(
             ip=ip,
             hostname=hostname,
-            measurements_count=len(measurements),
+            measurements_count=aggregate.count,
             avg_latency_ms=round(avg_latency, 2),
-            min_latency_ms=round(min_latency, 2),
-            max_latency_ms=round(max_latency, 2),
+            min_latency_ms=round(aggregate.min, 2),
+            max_latency_ms=round(aggregate.max, 2),
             jitter_ms=round(jitter, 2),
             packet_loss_percent=round(packet_loss, 2),
             quality_score=quality_score,
             quality_label=quality_label,
-            last_measurement=measurements[-1].timestamp,
+            last_measurement=aggregate.last_timestamp,
         )
     
     async def monitor_hosts(
@@ -235,13 +331,17 @@ class LatencyMonitor:
         """
         logger.info(f"⚡ Starting latency monitoring for {len(ips)} hosts")
         
-        # Mesurer tous les hosts
-        tasks = [
-            self.measure_latency(ip, count=count_per_check)
-            for ip in ips
-        ]
-        
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # Mesurer tous les hosts (une seule socket ICMP partagée)
+        if await self.prober.open():
+            replies = await self.prober.ping_many(ips, count=count_per_check)
+            for ip, host_replies in replies.items():
+                self._record(ip, host_replies)
+        else:
+            tasks = [
+                self.measure_latency(ip, count=count_per_check)
+                for ip in ips
+            ]
+            await asyncio.gather(*tasks, return_exceptions=True)
         
         # Calculer les stats
         stats = {}
@@ -265,43 +365,85 @@ class LatencyMonitor:
         else:
             return "⚫"  # Bad/Offline
     
+    def _since(self, hours: Optional[float]) -> Optional[int]:
+        return int((datetime.now() - timedelta(hours=hours)).timestamp()) if hours else None
+    
+    def get_percentiles(
+        self,
+        ip: str,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        hours: Optional[float] = None,
+    ) -> Optional[Dict[str, Optional[float]]]:
+        """
+        Quantiles de latence d'un hôte
+        
+        Args:
+            ip: Adresse IP
+            percentiles: Quantiles demandés (0-100)
+            hours: Période (défaut: tout l'historique)
+            
+        Returns:
+            {'p50': ms, 'p95': ms, 'p99': ms} ou None si pas de données
+        """
+        history = self.history.get(ip)
+        if not history:
+            return None
+        return history.percentiles(percentiles, since=self._since(hours))
+    
+    def get_histogram(
+        self,
+        ip: str,
+        bounds: Sequence[float] = HISTOGRAM_BOUNDS_MS,
+        hours: Optional[float] = None,
+    ) -> Optional[Dict]:
+        """Histogramme de latence d'un hôte (None si pas de données)"""
+        history = self.history.get(ip)
+        if not history:
+            return None
+        return history.histogram(bounds, since=self._since(hours))
+    
+    def get_memory_usage(self) -> int:
+        """Octets occupés par les historiques"""
+        return sum(history.nbytes for history in self.history.values())
+    
+    def _all_stats(self) -> List[LatencyStats]:
+        return [stat for stat in map(self.calculate_stats, self.aggregates) if stat]
+    
     def get_top_performers(
         self,
         limit: int = 5,
     ) -> List[LatencyStats]:
         """Retourne les meilleurs performers (latence la plus basse)"""
-        all_stats = []
-        
-        for ip in self.history.keys():
-            stat = self.calculate_stats(ip)
-            if stat and stat.quality_score > 0:
-                all_stats.append(stat)
-        
-        all_stats.sort(key=lambda s: s.avg_latency_ms)
-        return all_stats[:limit]
+        candidates = (s for s in self._all_stats() if s.quality_score > 0)
+        return heapq.nsmallest(limit, candidates, key=lambda s: s.avg_latency_ms)
     
     def get_worst_performers(
         self,
         limit: int = 5,
     ) -> List[LatencyStats]:
         """Retourne les pires performers"""
-        all_stats = []
-        
-        for ip in self.history.keys():
-            stat = self.calculate_stats(ip)
-            if stat:
-                all_stats.append(stat)
-        
-        all_stats.sort(key=lambda s: (s.packet_loss_percent, -s.avg_latency_ms), reverse=True)
-        return all_stats[:limit]
+        return heapq.nlargest(
+            limit,
+            self._all_stats(),
+            key=lambda s: (s.packet_loss_percent, -s.avg_latency_ms),
+        )
     
     def clear_history(self, ip: Optional[str] = None):
         """Vide l'historique"""
         if ip:
             if ip in self.history:
                 self.history[ip].clear()
+                self.aggregates[ip].reset()
+                self._windows[ip].clear()
         else:
             self.history.clear()
+            self.aggregates.clear()
+            self._windows.clear()
+        if self.store:
+            self.store.delete('latency', ip)
+        if self.anomalies:
+            self.anomalies.forget('latency', ip)
+            self.anomalies.forget('loss', ip)
 
 
 # === SINGLETON ===
@@ -312,5 +454,8 @@ def get_latency_monitor() -> LatencyMonitor:
     """Récupère le moniteur de latence singleton"""
     global _latency_monitor
     if _latency_monitor is None:
-        _latency_monitor = LatencyMonitor()
+        _latency_monitor = LatencyMonitor(
+            store=get_timeseries_store() if settings.timeseries_enabled else None,
+            anomalies=get_anomaly_detector() if settings.anomaly_detection_enabled else None,
+        )
     return _latency_monitor
@@ -0,0 +1,406 @@
+"""
+⚡ 333HOME - Continuous Latency Service
+Mesure de latence en continu (opt-in) pour alimenter les séries par hôte
+
+Fonctionnalités:
+- Cibles: devices gérés, passerelle par défaut, agents connectés,
+  plus des cibles ajoutées via l'API
+- Chaque cible a sa propre échéance (intervalle ±10% de jitter, premiers
+  probes étalés) dans un tas: la boucle ne se réveille que pour les
+  probes dus
+- Plafond global de probes simultanés, réduit selon la charge du Pi
+- Hôtes hors ligne sondés de moins en moins souvent (backoff jusqu'à
+  HOME333_LATENCY_OFFLINE_INTERVAL)
+
+Activation: HOME333_LATENCY_MONITOR_ENABLED=true (enregistré dans AppLifespan)
+"""
+
+import asyncio
+import heapq
+import logging
+import random
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.core.config import settings
+from .host_load import HostLoadMonitor, get_host_load_monitor
+from .latency_monitor import LatencyMonitor, get_latency_monitor
+
+logger = logging.getLogger(__name__)
+
+PROC_NET_ROUTE = Path('/proc/net/route')
+OFFLINE_AFTER_MISSES = 2    # Probes ratés consécutifs avant backoff hors ligne
+OFFLINE_BACKOFF = 2.0       # Intervalle × 2 à chaque probe raté une fois hors ligne
+TARGETS_REFRESH = 60.0      # Relecture des sources de cibles (secondes)
+
+# {ip: (nom, source)}
+TargetProvider = Callable[[], Dict[str, Tuple[Optional[str], str]]]
+
+
+@dataclass
+class LatencyTarget:
+    """Cible de mesure continue"""
+    ip: str
+    name: Optional[str]
+    source: str                     # device | gateway | agent | manual
+    interval: float
+    next_due: float                 # time.monotonic()
+    is_online: Optional[bool] = None
+    missed_probes: int = 0
+    total_probes: int = 0
+    last_probe: Optional[float] = None
+    last_rtt_ms: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'ip': self.ip,
+            'name': self.name,
+            'source': self.source,
+            'interval': round(self.interval, 1),
+            'is_online': self.is_online,
+            'missed_probes': self.missed_probes,
+            'total_probes': self.total_probes,
+            'last_rtt_ms': self.last_rtt_ms,
+            'last_probe': datetime.fromtimestamp(self.last_probe).isoformat() if self.last_probe else None,
+        }
+
+
+def default_gateway(route_file: Path = PROC_NET_ROUTE) -> Optional[str]:
+    """Passerelle IPv4 par défaut (/proc/net/route)"""
+    try:
+        lines = route_file.read_text().splitlines()[1:]
+    except OSError:
+        return None
+    for line in lines:
+        fields = line.split()
+        # Destination 0.0.0.0 + flag RTF_GATEWAY
+        if len(fields) > 3 and fields[1] == '00000000' and int(fields[3], 16) & 0x2:
+            return socket.inet_ntoa(struct.pack('<L', int(fields[2], 16)))
+    return None
+
+
+def collect_default_targets() -> Dict[str, Tuple[Optional[str], str]]:
+    """Cibles par défaut: devices gérés, passerelle, agents connectés"""
+    targets: Dict[str, Tuple[Optional[str], str]] = {}
+
+    try:
+        from src.features.devices.manager import DeviceManager
+        for device in DeviceManager().get_all_devices():
+            if device.get('ip'):
+                targets[device['ip']] = (device.get('name'), 'device')
+    except Exception as e:
+        logger.debug(f"Latency targets: devices indisponibles ({e})")
+
+    gateway = default_gateway()
+    if gateway:
+        targets[gateway] = ('gateway', 'gateway')
+
+    try:
+        from src.features.agents.routers.agents_router import agent_manager
+        for agent_id, connection in agent_manager.connections.items():
+            client = getattr(connection.websocket, 'client', None)
+            if client and client.host:
+                targets.setdefault(client.host, (connection.metadata.get('hostname', agent_id), 'agent'))
+    except Exception as e:
+        logger.debug(f"Latency targets: agents indisponibles ({e})")
+
+    return targets
+
+
+class ContinuousLatencyService:
+    """
+    Service de mesure de latence continue
+
+    Les résultats sont enregistrés dans le LatencyMonitor (ring buffers +
+    agrégats), donc exposés par les endpoints /latency existants.
+    """
+
+    def __init__(
+        self,
+        monitor: Optional[LatencyMonitor] = None,
+        interval: Optional[float] = None,
+        offline_interval: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+        pings_per_probe: int = 1,
+        timeout: float = 1.0,
+        target_provider: Optional[TargetProvider] = None,
+        host_load: Optional[HostLoadMonitor] = None,
+    ):
+        """
+        Args:
+            monitor: LatencyMonitor (défaut: singleton)
+            interval: Intervalle de mesure d'un hôte en ligne (secondes)
+            offline_interval: Intervalle max d'un hôte hors ligne (secondes)
+            max_in_flight: Probes simultanés max (tous hôtes)
+            pings_per_probe: Echo requests par probe
+            timeout: Timeout d'un echo (secondes)
+            target_provider: Fonction {ip: (nom, source)} (défaut: devices/passerelle/agents)
+            host_load: HostLoadMonitor (défaut: singleton)
+        """
+        self.monitor = monitor or get_latency_monitor()
+        self.interval = interval or settings.latency_monitor_interval
+        self.offline_interval = max(offline_interval or settings.latency_offline_interval, self.interval)
+        self.max_in_flight = max_in_flight or settings.latency_max_in_flight
+        self.pings_per_probe = pings_per_probe
+        self.timeout = timeout
+        self.target_provider = target_provider or collect_default_targets
+        self.host_load = host_load or get_host_load_monitor()
+
+        self.targets: Dict[str, LatencyTarget] = {}
+        self.manual_targets: Dict[str, Optional[str]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._in_flight: Set[asyncio.Task] = set()
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._targets_refreshed: Optional[float] = None
+        self.total_probes = 0
+        self.deferred = 0
+
+    # === LIFECYCLE (AppLifespan) ===
+
+    async def initialize(self):
+        """Démarrer la boucle (appelé par AppLifespan)"""
+        self.start()
+
+    async def shutdown(self):
+        """Arrêter la boucle (appelé par AppLifespan)"""
+        self.stop()
+        tasks = [t for t in (self._task, *self._in_flight) if t]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def start(self):
+        """Démarre le service en arrière-plan"""
+        if self._running:
+            logger.warning("ContinuousLatencyService already running")
+            return
+        self._running = True
+        # Reconstruire le tas: les probes annulés par un stop() n'y sont plus
+        self._heap = [(t.next_due, ip) for ip, t in self.targets.items()]
+        heapq.heapify(self._heap)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"⚡ Latency service started (every {self.interval:.0f}s, {self.max_in_flight} in flight max)")
+
+    def stop(self):
+        """Arrête le service (les probes en cours sont annulés)"""
+        if not self._running:
+            return
+        self._running = False
+        for task in (self._task, *self._in_flight):
+            if task:
+                task.cancel()
+        logger.info("⚡ Latency service stopped")
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    # === CIBLES ===
+
+    def add_targets(self, ips: Iterable[str], name: Optional[str] = None) -> int:
+        """Ajouter des cibles manuelles (conservées jusqu'à remove_targets)"""
+        for ip in ips:
+            self.manual_targets[ip] = name
+        return self.refresh_targets()
+
+    def remove_targets(self, ips: Iterable[str]) -> int:
+        """Retirer des cibles manuelles"""
+        for ip in ips:
+            self.manual_targets.pop(ip, None)
+        return self.refresh_targets()
+
+    def refresh_targets(self) -> int:
+        """
+        Synchroniser les cibles avec les sources
+
+        Les nouvelles cibles sont étalées sur un intervalle (pas de burst),
+        les cibles existantes conservent leur planning.
+
+        Returns:
+            Nombre de cibles
+        """
+        try:
+            wanted = dict(self.target_provider())
+        except Exception as e:
+            logger.warning(f"⚠️ Latency targets refresh failed: {e}")
+            wanted = {ip: (t.name, t.source) for ip, t in self.targets.items() if t.source != 'manual'}
+        for ip, name in self.manual_targets.items():
+            wanted.setdefault(ip, (name, 'manual'))
+
+        now = time.monotonic()
+        for ip, (name, source) in wanted.items():
+            target = self.targets.get(ip)
+            if target is None:
+                target = self.targets[ip] = LatencyTarget(
+                    ip=ip, name=name, source=source,
+                    interval=self.interval,
+                    next_due=now + random.uniform(0, self.interval),
+                )
+                heapq.heappush(self._heap, (target.next_due, ip))
+            else:
+                target.name, target.source = name, source
+        for ip in [ip for ip in self.targets if ip not in wanted]:
+            del self.targets[ip]        # Entrée du tas ignorée au dépilement
+
+        self._targets_refreshed = now
+        if self._wakeup:
+            self._wakeup.set()
+        return len(self.targets)
+
+    # === SCHEDULING ===
+
+    def _pop_due(self, now: float, limit: int) -> List[LatencyTarget]:
+        """Cibles dues (les plus en retard d'abord), entrées périmées ignorées"""
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < limit:
+            next_due, ip = heapq.heappop(self._heap)
+            target = self.targets.get(ip)
+            if target is not None and target.next_due == next_due:
+                due.append(target)
+        return due
+
+    def _reschedule(self, target: LatencyTarget, reachable: Optional[bool] = None):
+        """
+        Intervalle nominal si joignable, backoff jusqu'à offline_interval
+        une fois hors ligne (reachable=None: intervalle inchangé)
+        """
+        if reachable:
+            target.interval = self.interval
+        elif reachable is False and target.missed_probes >= OFFLINE_AFTER_MISSES:
+            target.interval = min(target.interval * OFFLINE_BACKOFF, self.offline_interval)
+        # Jitter ±10% pour désynchroniser les hôtes
+        target.next_due = time.monotonic() + target.interval * random.uniform(0.9, 1.1)
+        heapq.heappush(self._heap, (target.next_due, target.ip))
+
+    async def _probe(self, target: LatencyTarget):
+        try:
+            measurements = await self.monitor.measure_latency(
+                target.ip, count=self.pings_per_probe, timeout=self.timeout,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Latency probe error for {target.ip}: {e}")
+            measurements = []
+
+        received = [m.latency_ms for m in measurements if m.success]
+        target.total_probes += 1
+        target.last_probe = time.time()
+        self.total_probes += 1
+        if received:
+            target.missed_probes = 0
+            target.is_online = True
+            target.last_rtt_ms = round(received[-1], 2)
+        else:
+            target.missed_probes += 1
+            if target.missed_probes >= OFFLINE_AFTER_MISSES:
+                target.is_online = False
+        if self.targets.get(target.ip) is target:
+            self._reschedule(target, bool(received))
+
+    def _launch(self, target: LatencyTarget):
+        task = asyncio.create_task(self._probe(target))
+        self._in_flight.add(task)
+
+        def _done(t: asyncio.Task):
+            self._in_flight.discard(t)
+            if self._wakeup:
+                self._wakeup.set()
+
+        task.add_done_callback(_done)
+
+    async def run_once(self) -> int:
+        """
+        Lancer les probes dus dans la limite du plafond courant
+
+        Returns:
+            Nombre de probes lancés
+        """
+        now = time.monotonic()
+        if self._targets_refreshed is None or now - self._targets_refreshed >= TARGETS_REFRESH:
+            self.refresh_targets()
+        if not self._heap or self._heap[0][0] > now:
+            return 0
+
+        # 🌡️ Plafond réduit selon la charge de l'hôte
+        factor = self.host_load.snapshot().throttle_factor
+        if factor == 0:
+            self.deferred += 1
+            for target in self._pop_due(now, len(self._heap)):
+                self._reschedule(target)
+            return 0
+
+        capacity = max(1, int(self.max_in_flight * factor)) - len(self._in_flight)
+        due = self._pop_due(now, capacity) if capacity > 0 else []
+        for target in due:
+            self._launch(target)
+        return len(due)
+
+    async def _loop(self):
+        """Boucle: dormir jusqu'à la prochaine échéance (ou fin d'un probe)"""
+        try:
+            while self._running:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Latency service tick error: {e}")
+                now = time.monotonic()
+                next_due = self._heap[0][0] if self._heap else now + TARGETS_REFRESH
+                delay = min(max(next_due - now, 0.05), TARGETS_REFRESH)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            logger.info("Latency service loop cancelled")
+        except Exception as e:
+            logger.error(f"Latency service loop error: {e}")
+
+    # === STATUS ===
+
+    def get_status(self) -> Dict[str, Any]:
+        """Statut du service pour l'API"""
+        now = time.monotonic()
+        sources: Dict[str, int] = {}
+        for target in self.targets.values():
+            sources[target.source] = sources.get(target.source, 0) + 1
+        next_due = min((t.next_due for t in self.targets.values()), default=None)
+
+        return {
+            'enabled': settings.latency_monitor_enabled,
+            'running': self._running,
+            'interval': self.interval,
+            'offline_interval': self.offline_interval,
+            'max_in_flight': self.max_in_flight,
+            'in_flight': len(self._in_flight),
+            'targets': len(self.targets),
+            'sources': sources,
+            'offline': sum(1 for t in self.targets.values() if t.is_online is False),
+            'total_probes': self.total_probes,
+            'deferred': self.deferred,
+            'next_probe_in_seconds': round(max(0.0, next_due - now), 1) if next_due is not None else None,
+        }
+
+    def get_targets(self) -> List[Dict[str, Any]]:
+        return [t.to_dict() for t in sorted(self.targets.values(), key=lambda t: t.ip)]
+
+
+# === SINGLETON ===
+_latency_service: Optional[ContinuousLatencyService] = None
+
+
+def get_latency_service() -> ContinuousLatencyService:
+    """Récupère le service de latence continue singleton"""
+    global _latency_service
+    if _latency_service is None:
+        _latency_service = ContinuousLatencyService()
+    return _latency_service
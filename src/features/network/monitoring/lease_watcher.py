@@ -0,0 +1,236 @@
+"""
+🏠 333HOME - DHCP Lease Watcher
+
+Surveillance des fichiers de baux dnsmasq / ISC dhcpd via inotify:
+chaque attribution est appliquée immédiatement au NetworkRegistry et au
+DHCPTracker (un changement d'IP est capturé à l'attribution, pas au scan
+suivant). Seul le delta depuis la dernière lecture est appliqué.
+
+inotify est appelé via ctypes (Linux, pas de dépendance). Ailleurs, ou si
+inotify est indisponible, repli sur un polling stat() léger.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.core.config import settings
+from ..registry import NetworkRegistry, get_network_registry
+from ..scanners.dhcp_lease_scanner import LeaseDelta, LeaseFileReader
+from .dhcp_tracker import DHCPTracker, get_dhcp_tracker
+
+logger = logging.getLogger(__name__)
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class _Inotify:
+    """Wrapper ctypes minimal autour de inotify_init1 / inotify_add_watch"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, Path] = {}
+
+    def add_watch(self, directory: Path):
+        wd = self._add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self.watches[wd] = directory
+
+    def read_paths(self) -> List[Path]:
+        """Chemins modifiés depuis la dernière lecture"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        paths = []
+        pos = 0
+        while pos + EVENT_HEADER.size <= len(data):
+            wd, _mask, _cookie, length = EVENT_HEADER.unpack_from(data, pos)
+            pos += EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b'\0').decode(errors='replace')
+            pos += length
+            if wd in self.watches and name:
+                paths.append(self.watches[wd] / name)
+        return paths
+
+    def close(self):
+        os.close(self.fd)
+
+
+class DHCPLeaseWatcher:
+    """
+    Service de suivi des baux DHCP (AppLifespan: initialize/shutdown)
+
+    Les répertoires des fichiers sont surveillés (dnsmasq et dhcpd
+    remplacent le fichier par renommage).
+    """
+
+    def __init__(
+        self,
+        lease_files: Optional[List[str]] = None,
+        registry: Optional[NetworkRegistry] = None,
+        tracker: Optional[DHCPTracker] = None,
+        debounce: float = 0.2,
+        poll_interval: float = 5.0,
+    ):
+        files = lease_files if lease_files is not None else settings.dhcp_lease_files
+        self.readers: Dict[Path, LeaseFileReader] = {Path(p): LeaseFileReader(Path(p)) for p in files}
+        self.registry = registry or get_network_registry()
+        self.tracker = tracker or get_dhcp_tracker()
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self._inotify: Optional[_Inotify] = None
+        self._task: Optional[asyncio.Task] = None
+        self._dirty: set = set()
+        self._wakeup: Optional[asyncio.Event] = None
+
+        self.mode = 'stopped'
+        self.applied_leases = 0
+        self.released_leases = 0
+
+    # === LIFECYCLE ===
+
+    async def initialize(self):
+        await self.start()
+
+    async def shutdown(self):
+        await self.stop()
+
+    async def start(self):
+        if self._task is not None or not self.readers:
+            return
+
+        # État de référence: intégrer les baux existants sans marquer online
+        self.refresh_all()
+
+        self._wakeup = asyncio.Event()
+        try:
+            self._inotify = _Inotify()
+            for directory in {p.parent for p in self.readers}:
+                self._inotify.add_watch(directory)
+            asyncio.get_running_loop().add_reader(self._inotify.fd, self._on_inotify)
+            self.mode = 'inotify'
+        except (OSError, AttributeError) as e:
+            logger.warning(f"📄 inotify indisponible ({e}), polling toutes les {self.poll_interval}s")
+            if self._inotify:
+                self._inotify.close()
+            self._inotify = None
+            self.mode = 'polling'
+
+        self._task = asyncio.create_task(self._watch_loop())
+        logger.info(f"📄 DHCP lease watcher démarré ({self.mode}, {len(self.readers)} fichiers)")
+
+    async def stop(self):
+        if self._inotify is not None:
+            asyncio.get_running_loop().remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.mode = 'stopped'
+
+    def _on_inotify(self):
+        for path in self._inotify.read_paths():
+            if path in self.readers:
+                self._dirty.add(path)
+        if self._dirty:
+            self._wakeup.set()
+
+    async def _watch_loop(self):
+        while True:
+            if self.mode == 'inotify':
+                await self._wakeup.wait()
+                # Regrouper les écritures successives (write + rename)
+                await asyncio.sleep(self.debounce)
+                self._wakeup.clear()
+                paths, self._dirty = self._dirty, set()
+            else:
+                await asyncio.sleep(self.poll_interval)
+                paths = set(self.readers)
+
+            for path in paths:
+                try:
+                    self.apply_delta(self.readers[path].refresh())
+                except Exception as e:
+                    logger.error(f"❌ Lecture baux {path}: {e}")
+
+    # === DELTA ===
+
+    def refresh_all(self) -> int:
+        """Relire tous les fichiers et appliquer les deltas (retourne le nombre de changements)"""
+        return sum(len(self.apply_delta(reader.refresh())) for reader in self.readers.values())
+
+    def apply_delta(self, delta: LeaseDelta) -> List[dict]:
+        """
+        Appliquer un delta de baux au registry et au DHCPTracker
+
+        Returns:
+            Changements registry (new_device, ip_changed, ...)
+        """
+        if not delta:
+            return []
+
+        changes = []
+        for lease in delta.upserted:
+            # Première lecture: baux existants ≠ device présent maintenant
+            changes.extend(self.registry.update_from_lease(
+                lease.mac, lease.ip, lease.hostname, seen=not delta.initial, client_id=lease.client_id
+            ))
+            self.tracker.track_ip_change(lease.mac, lease.ip, lease.hostname)
+
+        self.applied_leases += len(delta.upserted)
+        self.released_leases += len(delta.removed)
+        if changes or delta.upserted:
+            self.registry._save()
+
+        if changes:
+            logger.info(f"📄 Baux DHCP: {len(delta.upserted)} attribués, {len(delta.removed)} libérés, {len(changes)} changements")
+        return changes
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            'mode': self.mode,
+            'files': {
+                str(path): {'format': reader.format, 'active_leases': len(reader.leases)}
+                for path, reader in self.readers.items()
+            },
+            'applied_leases': self.applied_leases,
+            'released_leases': self.released_leases,
+        }
+
+
+# === SINGLETON ===
+_lease_watcher: Optional[DHCPLeaseWatcher] = None
+
+
+def get_lease_watcher() -> DHCPLeaseWatcher:
+    """Récupère le watcher de baux DHCP singleton"""
+    global _lease_watcher
+    if _lease_watcher is None:
+        _lease_watcher = DHCPLeaseWatcher()
+    return _lease_watcher
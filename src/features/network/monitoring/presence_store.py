@@ -0,0 +1,365 @@
+"""
+🏠 333HOME - Presence Store
+
+Historique de présence des devices en bitmaps:
+- Temps découpé en slots fixes (HOME333_PRESENCE_SLOT_SECONDS)
+- Par slot observé: un bitset (int Python) sur un index dense des devices
+- Par device: intervalles online encodés en RLE ([début, fin) en slots),
+  maintenus à chaque slot (échantillonner-et-maintenir entre deux
+  observations)
+
+Uptime %, taux de détection, plus longues périodes online/offline sur
+n'importe quelle fenêtre: O(nb d'intervalles) + bisect, sans relire ni
+re-parser d'historique.
+
+Alimentation (HOME333_PRESENCE_ENABLED): résultat de chaque scan complet
++ échantillon du registry à chaque slot, seulement si le scan scheduler
+tient son état à jour (sinon: flags is_online figés du dernier scan).
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.core.config import settings
+from ..registry import NetworkRegistry, get_network_registry
+
+logger = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Indices des bits à 1 d'un bitset"""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class PresenceStore:
+    """
+    Stockage de présence en bitmaps + intervalles RLE
+
+    Usage:
+        store = get_presence_store()
+        store.record(['AA:BB:...'])                       # slot courant
+        store.get_device_stats('AA:BB:...', start=hier)  # fenêtre libre
+    """
+
+    def __init__(
+        self,
+        slot_seconds: Optional[int] = None,
+        retention_days: Optional[int] = None,
+        storage_file: Optional[Path] = None,
+        registry: Optional[NetworkRegistry] = None,
+        sample_registry: Optional[bool] = None,
+    ):
+        self.slot_seconds = slot_seconds or settings.presence_slot_seconds
+        retention = retention_days or settings.presence_retention_days
+        self.max_slots = max(1, int(retention * 86400 // self.slot_seconds))
+        self.storage_file = Path(storage_file) if storage_file else settings.data_dir / "presence.json"
+        self._registry = registry
+        # Échantillonnage périodique du registry (défaut: scan scheduler actif)
+        self.registry_sampling = settings.adaptive_scan_enabled if sample_registry is None else sample_registry
+
+        # Index dense: MAC ↔ bit
+        self.macs: List[str] = []
+        self.index: Dict[str, int] = {}
+
+        # Slots observés (croissants) et bitset online de chaque slot
+        self.slots: List[int] = []
+        self.bitmaps: List[int] = []
+
+        # Par device: [[début, fin)] en slots, début de suivi
+        self.intervals: Dict[int, List[List[int]]] = {}
+        self.first_slot: Dict[int, int] = {}
+
+        self._task: Optional[asyncio.Task] = None
+        self._dirty = False
+        self._load()
+
+    @property
+    def registry(self) -> NetworkRegistry:
+        if self._registry is None:
+            self._registry = get_network_registry()
+        return self._registry
+
+    # === ÉCRITURE ===
+
+    def slot_of(self, timestamp: float) -> int:
+        return int(timestamp // self.slot_seconds)
+
+    def _dense(self, mac: str) -> int:
+        mac = mac.upper()
+        index = self.index.get(mac)
+        if index is None:
+            index = self.index[mac] = len(self.macs)
+            self.macs.append(mac)
+        return index
+
+    def record(self, online_macs: Iterable[str], at: Optional[float] = None) -> bool:
+        """
+        Enregistrer une observation (MACs online) dans le slot de `at`
+
+        Plusieurs observations dans un même slot sont fusionnées (OU).
+        Les observations antérieures au dernier slot sont ignorées.
+
+        Returns:
+            True si l'observation a été prise en compte
+        """
+        bits = 0
+        for mac in online_macs:
+            bits |= 1 << self._dense(mac)
+        return self._append(self.slot_of(time.time() if at is None else at), bits)
+
+    def _append(self, slot: int, bits: int) -> bool:
+        if self.slots and slot < self.slots[-1]:
+            return False
+
+        if self.slots and slot == self.slots[-1]:
+            new = bits & ~self.bitmaps[-1]
+            self.bitmaps[-1] |= bits
+            for device in iter_bits(new):
+                self._mark_online(device, slot)
+        else:
+            previous = self.bitmaps[-1] if self.bitmaps else 0
+            self.slots.append(slot)
+            self.bitmaps.append(bits)
+            # Online au slot précédent: maintenu jusqu'ici (+ ce slot si encore online)
+            for device in iter_bits(previous):
+                self.intervals[device][-1][1] = slot + 1 if bits >> device & 1 else slot
+            for device in iter_bits(bits & ~previous):
+                self._mark_online(device, slot)
+            if len(self.slots) > self.max_slots:
+                self._trim()
+
+        self._dirty = True
+        return True
+
+    def _mark_online(self, device: int, slot: int):
+        self.first_slot.setdefault(device, slot)
+        runs = self.intervals.setdefault(device, [])
+        if runs and runs[-1][1] == slot:
+            runs[-1][1] = slot + 1
+        else:
+            runs.append([slot, slot + 1])
+
+    def _trim(self):
+        """Rétention: oublier les slots (et portions d'intervalles) trop anciens"""
+        cut = len(self.slots) - self.max_slots
+        del self.slots[:cut]
+        del self.bitmaps[:cut]
+        oldest = self.slots[0]
+        for device, runs in self.intervals.items():
+            while runs and runs[0][1] <= oldest:
+                runs.pop(0)
+            if runs and runs[0][0] < oldest:
+                runs[0][0] = oldest
+            if device in self.first_slot:
+                self.first_slot[device] = max(self.first_slot[device], oldest)
+
+    # === REQUÊTES ===
+
+    def _to_datetime(self, slot: int) -> datetime:
+        return datetime.fromtimestamp(slot * self.slot_seconds)
+
+    def _window(self, device: int, start: Optional[datetime], end: Optional[datetime]) -> Tuple[int, int]:
+        """Fenêtre [w0, w1) en slots, bornée au suivi du device et au dernier slot observé"""
+        w0 = self.first_slot[device]
+        w1 = self.slots[-1] + 1
+        if start is not None:
+            w0 = max(w0, self.slot_of(start.timestamp()))
+        if end is not None:
+            w1 = min(w1, self.slot_of(end.timestamp()))
+        return w0, w1
+
+    def _clipped_runs(self, device: int, w0: int, w1: int) -> List[Tuple[int, int]]:
+        runs = self.intervals.get(device, [])
+        first = bisect.bisect_right(runs, w0, key=lambda run: run[1])
+        clipped = []
+        for start, end in runs[first:]:
+            if start >= w1:
+                break
+            clipped.append((max(start, w0), min(end, w1)))
+        return clipped
+
+    def _observed(self, a: int, b: int) -> int:
+        return bisect.bisect_left(self.slots, b) - bisect.bisect_left(self.slots, a)
+
+    def get_device_stats(
+        self,
+        mac: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Disponibilité d'un device sur une fenêtre (défaut: tout l'historique)
+
+        - uptime_percentage: temps online / temps suivi (entre deux observations,
+          l'état précédent est maintenu)
+        - detection_rate: observations online / observations
+        """
+        device = self.index.get(mac.upper())
+        if device is None or device not in self.first_slot or not self.slots:
+            return None
+
+        w0, w1 = self._window(device, start, end)
+        total_slots = max(w1 - w0, 0)
+        runs = self._clipped_runs(device, w0, w1) if total_slots else []
+
+        online_slots = sum(b - a for a, b in runs)
+        observations = self._observed(w0, w1) if total_slots else 0
+        detections = sum(self._observed(a, b) for a, b in runs)
+
+        # Trous entre intervalles (et aux bords de la fenêtre) = offline
+        gaps, cursor = [], w0
+        for a, b in runs:
+            gaps.append(a - cursor)
+            cursor = b
+        gaps.append(w1 - cursor)
+
+        slot = self.slot_seconds
+        return {
+            'mac': mac.upper(),
+            'window_start': self._to_datetime(w0).isoformat(),
+            'window_end': self._to_datetime(w1).isoformat(),
+            'tracked_seconds': total_slots * slot,
+            'online_seconds': online_slots * slot,
+            'uptime_percentage': round(online_slots / total_slots * 100, 2) if total_slots else 0.0,
+            'observations': observations,
+            'detections': detections,
+            'detection_rate': round(detections / observations, 3) if observations else 0.0,
+            'online_periods': len(runs),
+            'average_online_seconds': online_slots * slot // len(runs) if runs else 0,
+            'longest_online_seconds': max((b - a for a, b in runs), default=0) * slot,
+            'longest_offline_seconds': max(gaps, default=0) * slot if total_slots else 0,
+        }
+
+    def get_online_periods(
+        self,
+        mac: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[Tuple[datetime, datetime]]:
+        """Périodes online (début, fin) d'un device sur une fenêtre"""
+        device = self.index.get(mac.upper())
+        if device is None or device not in self.first_slot or not self.slots:
+            return []
+        w0, w1 = self._window(device, start, end)
+        return [(self._to_datetime(a), self._to_datetime(b)) for a, b in self._clipped_runs(device, w0, w1)]
+
+    def get_online_at(self, at: datetime) -> List[str]:
+        """MACs online au dernier slot observé avant `at`"""
+        position = bisect.bisect_right(self.slots, self.slot_of(at.timestamp())) - 1
+        if position < 0:
+            return []
+        return [self.macs[device] for device in iter_bits(self.bitmaps[position])]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'slot_seconds': self.slot_seconds,
+            'devices': len(self.macs),
+            'observed_slots': len(self.slots),
+            'max_slots': self.max_slots,
+            'intervals': sum(len(runs) for runs in self.intervals.values()),
+            'first_slot': self._to_datetime(self.slots[0]).isoformat() if self.slots else None,
+            'running': self._task is not None,
+        }
+
+    # === PERSISTANCE ===
+
+    def _load(self):
+        if not self.storage_file.exists():
+            return
+        try:
+            with open(self.storage_file, 'r') as f:
+                data = json.load(f)
+            if data.get('slot_seconds') != self.slot_seconds:
+                logger.warning("📊 Presence store: taille de slot modifiée, historique ignoré")
+                return
+            for mac in data.get('macs', []):
+                self._dense(mac)
+            for slot, bits in zip(data.get('slots', []), data.get('bitmaps', [])):
+                self._append(slot, int(bits, 16))
+            self._dirty = False
+            logger.info(f"📊 Presence store chargé: {len(self.macs)} devices, {len(self.slots)} slots")
+        except Exception as e:
+            logger.error(f"❌ Erreur chargement presence store: {e}")
+
+    def save(self):
+        """Sauvegarder les bitmaps (les intervalles sont reconstruits au chargement)"""
+        if not self._dirty:
+            return
+        try:
+            data = {
+                'version': STORAGE_VERSION,
+                'slot_seconds': self.slot_seconds,
+                'macs': self.macs,
+                'slots': self.slots,
+                'bitmaps': [format(bits, 'x') for bits in self.bitmaps],
+            }
+            tmp = self.storage_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(data, f)
+            tmp.replace(self.storage_file)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"❌ Erreur sauvegarde presence store: {e}")
+
+    # === LIFECYCLE ===
+
+    async def initialize(self):
+        await self.start()
+
+    async def shutdown(self):
+        await self.stop()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._sample_loop())
+            logger.info(f"📊 Presence store démarré (slots de {self.slot_seconds}s)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.save()
+
+    def sample_registry(self) -> bool:
+        """Observer l'état online courant du registry"""
+        online = [mac for mac, device in self.registry.devices.items() if device.is_online]
+        return self.record(online)
+
+    async def _sample_loop(self):
+        while True:
+            try:
+                if self.registry_sampling:
+                    self.sample_registry()
+                self.save()
+            except Exception as e:
+                logger.error(f"❌ Presence store: échantillonnage échoué: {e}")
+            # Réveil en milieu du slot suivant
+            now = time.time()
+            await asyncio.sleep(self.slot_seconds - now % self.slot_seconds + self.slot_seconds / 2)
+
+
+# === SINGLETON ===
+_presence_store: Optional[PresenceStore] = None
+
+
+def get_presence_store() -> PresenceStore:
+    """Récupère le presence store singleton"""
+    global _presence_store
+    if _presence_store is None:
+        _presence_store = PresenceStore()
+    return _presence_store
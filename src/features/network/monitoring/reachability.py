@@ -0,0 +1,204 @@
+"""
+📡 333HOME - Reachability Service
+
+Joignabilité des hôtes partagée par tous les appelants :
+- Cache des résultats (positifs et négatifs) à TTL court
+  (HOME333_REACHABILITY_TTL)
+- Coalescence : un seul probe en vol par IP, les appels concurrents
+  attendent le même résultat
+- Probes groupés : echo ICMP multiplexés sur la socket partagée
+  (ICMPProber), sinon processus `ping` bornés par un sémaphore commun
+  (HOME333_REACHABILITY_MAX_PROCESSES)
+- Mesures de latence réinjectées dans le cache (record)
+
+Appelants: DeviceMonitor.ping (POST /api/devices/{id}/ping), hub unifié,
+scan scheduler, LatencyMonitor (fallback `ping`).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from src.core.config import settings
+from ..os_fingerprint import get_os_fingerprinter
+from .icmp_prober import ICMPProber, get_icmp_prober
+
+logger = logging.getLogger(__name__)
+
+
+class ReachabilityService:
+    """
+    Joignabilité avec cache, coalescence et probes groupés
+
+    Usage:
+        service = get_reachability_service()
+        await service.is_reachable(['192.168.1.10', '192.168.1.20'])
+        # {'192.168.1.10': True, '192.168.1.20': False}
+    """
+
+    def __init__(
+        self,
+        prober: Optional[ICMPProber] = None,
+        ttl: Optional[float] = None,
+        max_processes: Optional[int] = None,
+    ):
+        """
+        Args:
+            prober: Prober ICMP (défaut: prober partagé)
+            ttl: Durée de validité d'un résultat (secondes)
+            max_processes: Processus `ping` simultanés max (fallback sans socket ICMP)
+        """
+        self.prober = prober or get_icmp_prober()
+        self.ttl = settings.reachability_ttl if ttl is None else ttl
+        self._processes = asyncio.Semaphore(max_processes or settings.reachability_max_processes)
+        self._cache: Dict[str, Tuple[float, bool]] = {}        # {ip: (horloge monotone, joignable)}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'coalesced': 0, 'probed': 0, 'processes': 0}
+
+    # === CACHE ===
+
+    def get_cached(self, ip: str, max_age: Optional[float] = None) -> Optional[bool]:
+        """Résultat encore valide pour une IP (None si absent ou expiré)"""
+        entry = self._cache.get(ip)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > (self.ttl if max_age is None else max_age):
+            del self._cache[ip]
+            return None
+        return entry[1]
+
+    def record(self, ip: str, reachable: bool):
+        """Enregistrer une observation externe (mesure de latence, scan)"""
+        self._cache[ip] = (time.monotonic(), reachable)
+
+    # === PROBES ===
+
+    async def is_reachable(
+        self,
+        ips: Iterable[str],
+        timeout: float = 1.0,
+        max_age: Optional[float] = None,
+    ) -> Dict[str, bool]:
+        """
+        Joignabilité de plusieurs IPs
+
+        Args:
+            ips: Adresses IP
+            timeout: Attente max d'une réponse (secondes)
+            max_age: Âge max accepté d'un résultat en cache (défaut: TTL, 0 = probe forcé
+                sauf probe déjà en vol)
+
+        Returns:
+            {ip: joignable}
+        """
+        results: Dict[str, bool] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        missing = []
+        for ip in dict.fromkeys(ips):
+            self.stats['requests'] += 1
+            cached = self.get_cached(ip, max_age)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                results[ip] = cached
+            elif ip in self._in_flight:
+                self.stats['coalesced'] += 1
+                waiting[ip] = self._in_flight[ip]
+            else:
+                missing.append(ip)
+
+        if missing:
+            loop = asyncio.get_running_loop()
+            futures = {ip: loop.create_future() for ip in missing}
+            self._in_flight.update(futures)
+            waiting.update(futures)
+            # Tâche détachée: l'annulation d'un appelant n'interrompt pas les autres
+            asyncio.ensure_future(self._run_batch(futures, timeout))
+
+        if waiting:
+            values = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+            results.update(zip(waiting, values))
+        return results
+
+    async def _run_batch(self, futures: Dict[str, asyncio.Future], timeout: float):
+        ips = list(futures)
+        self.stats['probed'] += len(ips)
+        try:
+            probed = await self._probe(ips, timeout)
+        except Exception as e:
+            logger.debug(f"Reachability probe failed: {e}")
+            probed = {}
+        finally:
+            for ip, future in futures.items():
+                if self._in_flight.get(ip) is future:
+                    del self._in_flight[ip]
+        for ip, future in futures.items():
+            reachable = probed.get(ip, False)
+            self.record(ip, reachable)
+            if not future.done():
+                future.set_result(reachable)
+
+    async def _probe(self, ips: list, timeout: float) -> Dict[str, bool]:
+        """Un echo par IP : socket ICMP partagée, sinon `ping` bornés"""
+        if await self.prober.open():
+            replies = await self.prober.ping_many(ips, count=1, timeout=timeout)
+            fingerprinter = get_os_fingerprinter()
+            for ip, (reply,) in replies.items():
+                if reply:
+                    fingerprinter.observe_ttl(ip, reply.ttl)
+            return {ip: replies[ip][0] is not None for ip in ips}
+
+        returns = await asyncio.gather(*(self.run_ping(ip, count=1, timeout=timeout) for ip in ips))
+        return {ip: result is not None and result[0] == 0 for ip, result in zip(ips, returns)}
+
+    async def run_ping(
+        self,
+        ip: str,
+        count: int = 1,
+        timeout: float = 1.0,
+        interval: float = 0.2,
+    ) -> Optional[Tuple[int, str]]:
+        """
+        Lancer `ping` (nombre de processus simultanés borné pour tous les appelants)
+
+        Returns:
+            (code retour, sortie) ou None si le lancement a échoué
+        """
+        command = ['ping', '-c', str(count), '-W', str(max(int(timeout), 1))]
+        if count > 1:
+            command += ['-i', str(interval)]
+        async with self._processes:
+            self.stats['processes'] += 1
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *command, ip,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                stdout, _ = await process.communicate()
+            except Exception as e:
+                logger.debug(f"Ping failed for {ip}: {e}")
+                return None
+        output = stdout.decode(errors='replace')
+        get_os_fingerprinter().observe_ping_output(ip, output)
+        return process.returncode, output
+
+    def get_statistics(self) -> Dict:
+        return {
+            'ttl': self.ttl,
+            'cached': len(self._cache),
+            'in_flight': len(self._in_flight),
+            **self.stats,
+        }
+
+
+# === SINGLETON ===
+_reachability_service: Optional[ReachabilityService] = None
+
+
+def get_reachability_service() -> ReachabilityService:
+    """Récupère le service de joignabilité partagé"""
+    global _reachability_service
+    if _reachability_service is None:
+        _reachability_service = ReachabilityService()
+    return _reachability_service
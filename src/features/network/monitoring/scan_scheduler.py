@@ -0,0 +1,421 @@
+"""
+⏱️ 333HOME - Adaptive Scan Scheduler
+Scheduler de fond (opt-in) pour garder le registry frais sans sweeps complets
+
+Fonctionnalités:
+- Probe individuel de chaque device du registry (pas de sweep /24)
+- Intervalle adaptatif par device : mobiles souvent, infrastructure rarement
+- Profil dérivé de l'historique du registry (type, IP/hostname changes)
+- Backoff sur devices stables, reset dès qu'un changement d'état est vu
+- Budget global de paquets/seconde (token bucket)
+- Throttling selon la charge du Pi (load, température, lag event loop)
+
+Activation: HOME333_ADAPTIVE_SCAN_ENABLED=true (enregistré dans AppLifespan)
+"""
+
+import asyncio
+import random
+import time
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.core.config import settings
+from ..registry import DeviceRegistryEntry, NetworkRegistry, get_network_registry
+from .host_load import HostLoadMonitor, get_host_load_monitor
+from .reachability import get_reachability_service
+
+logger = logging.getLogger(__name__)
+
+
+# Profils de volatilité : (intervalle min, intervalle max) en secondes
+PROFILE_INTERVALS: Dict[str, tuple] = {
+    'volatile': (60, 600),      # Téléphones, tablettes, laptops en DHCP
+    'standard': (300, 1800),    # PCs, devices sans info
+    'static': (900, 3600),      # Routeurs, serveurs, IoT fixe
+}
+
+VOLATILE_KEYWORDS = ('phone', 'mobile', 'iphone', 'ipad', 'android', 'tablet', 'galaxy', 'pixel', 'wearable')
+STATIC_KEYWORDS = ('router', 'server', 'switch', 'printer', 'nas', 'tv', 'iot', 'heating', 'appliance',
+                   'freebox', 'livebox', 'raspberry', 'microcontroller', 'security', 'audio')
+
+BACKOFF_FACTOR = 1.5        # Intervalle × 1.5 après un probe sans changement
+OFFLINE_AFTER_MISSES = 2    # Probes ratés consécutifs avant de marquer offline
+
+
+ProbeFunc = Callable[[str], Awaitable[bool]]
+
+
+@dataclass
+class DeviceSchedule:
+    """Planning de probe d'un device"""
+    mac: str
+    ip: str
+    profile: str
+    interval: float
+    next_due: float                 # time.monotonic()
+    is_online: Optional[bool] = None
+    missed_probes: int = 0
+    total_probes: int = 0
+    last_probe: Optional[float] = None
+
+
+class ProbeBudget:
+    """
+    Token bucket limitant le nombre de paquets/seconde
+
+    Le bucket se remplit à `rate` tokens/s jusqu'à `burst`.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.base_rate = max(rate, 0.01)
+        self.rate = self.base_rate
+        self.burst = burst if burst is not None else max(1.0, self.rate)
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self, packets: float = 1.0):
+        """Attendre que le budget permette d'envoyer `packets` paquets"""
+        while True:
+            self._refill()
+            if self._tokens >= packets:
+                self._tokens -= packets
+                return
+            await asyncio.sleep((packets - self._tokens) / self.rate)
+
+    def scale(self, factor: float):
+        """Ajuster le débit à `factor` × débit de base (throttling)"""
+        self._refill()
+        self.rate = max(self.base_rate * factor, 0.01)
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+async def ping_probe(ip: str) -> bool:
+    """Probe par défaut : un seul echo ICMP via le service de joignabilité partagé (TTL transmis au fingerprinting)"""
+    try:
+        return (await get_reachability_service().is_reachable([ip], timeout=1.0))[ip]
+    except Exception as e:
+        logger.debug(f"Probe failed for {ip}: {e}")
+        return False
+
+
+class AdaptiveScanScheduler:
+    """
+    Scheduler de probes adaptatif
+
+    Chaque device du registry a son propre intervalle, borné par son profil.
+    Un device stable voit son intervalle augmenter (backoff), un device qui
+    change d'état repasse à l'intervalle minimum de son profil.
+    """
+
+    def __init__(
+        self,
+        probe: Optional[ProbeFunc] = None,
+        max_packets_per_second: float = 2.0,
+        max_concurrent_probes: int = 4,
+        tick_interval: float = 5.0,
+        registry: Optional[NetworkRegistry] = None,
+        host_load: Optional[HostLoadMonitor] = None,
+    ):
+        """
+        Args:
+            probe: Coroutine ip -> bool (défaut: ping ICMP)
+            max_packets_per_second: Budget global de paquets/seconde
+            max_concurrent_probes: Probes simultanés max
+            tick_interval: Période de la boucle de scheduling (secondes)
+            registry: NetworkRegistry (défaut: singleton)
+            host_load: HostLoadMonitor (défaut: singleton)
+        """
+        self.probe = probe or ping_probe
+        self.budget = ProbeBudget(max_packets_per_second)
+        self.max_concurrent_probes = max_concurrent_probes
+        self.tick_interval = tick_interval
+        self._registry = registry
+        self.schedules: Dict[str, DeviceSchedule] = {}
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self.host_load = host_load or get_host_load_monitor()
+        self.total_probes = 0
+        self.deferred_ticks = 0
+        self.last_tick: Optional[float] = None
+        self.last_throttle: Optional[Dict[str, Any]] = None
+
+    @property
+    def registry(self) -> NetworkRegistry:
+        if self._registry is None:
+            self._registry = get_network_registry()
+        return self._registry
+
+    # === LIFECYCLE (AppLifespan) ===
+
+    async def initialize(self):
+        """Démarrer la boucle (appelé par AppLifespan)"""
+        self.start()
+
+    async def shutdown(self):
+        """Arrêter la boucle (appelé par AppLifespan)"""
+        self.stop()
+        if self._task:
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def start(self):
+        """Démarre le scheduler en arrière-plan"""
+        if self._running:
+            logger.warning("AdaptiveScanScheduler already running")
+            return
+        self._running = True
+        self._task = asyncio.create_task(self._scheduling_loop())
+        logger.info(f"⏱️ AdaptiveScanScheduler started (budget={self.budget.base_rate} pkt/s)")
+
+    def stop(self):
+        """Arrête le scheduler"""
+        if not self._running:
+            return
+        self._running = False
+        if self._task:
+            self._task.cancel()
+        logger.info("⏱️ AdaptiveScanScheduler stopped")
+
+    async def _scheduling_loop(self):
+        """Boucle de scheduling continue"""
+        try:
+            while self._running:
+                try:
+                    await self.run_once()
+                except Exception as e:
+                    logger.error(f"Scheduling tick error: {e}")
+                # Le dépassement du sleep mesure le lag de l'event loop (coût nul)
+                before = time.monotonic()
+                await asyncio.sleep(self.tick_interval)
+                self.host_load.record_loop_lag(time.monotonic() - before - self.tick_interval)
+        except asyncio.CancelledError:
+            logger.info("Scheduling loop cancelled")
+        except Exception as e:
+            logger.error(f"Scheduling loop error: {e}")
+
+    # === PROFILS ===
+
+    def classify_device(self, entry: DeviceRegistryEntry) -> str:
+        """
+        Déduire le profil de volatilité depuis l'historique du registry
+
+        - volatile : type mobile, ou IP/hostname déjà changés
+        - static : infrastructure (routeur, serveur, IoT, ...)
+        - standard : le reste
+        """
+        descriptor = ' '.join(filter(None, [entry.device_type, entry.vendor, entry.current_hostname])).lower()
+
+        if any(k in descriptor for k in VOLATILE_KEYWORDS):
+            return 'volatile'
+        if len(entry.ip_history) > 1 or len(entry.hostname_history) > 1:
+            return 'volatile'
+        if any(k in descriptor for k in STATIC_KEYWORDS):
+            return 'static'
+        return 'standard'
+
+    def sync_targets(self) -> int:
+        """
+        Synchroniser les plannings avec le registry
+
+        Ajoute les nouveaux devices, retire ceux supprimés, suit les changements d'IP.
+
+        Returns:
+            Nombre de devices planifiés
+        """
+        now = time.monotonic()
+        seen = set()
+
+        for mac, entry in self.registry.devices.items():
+            if not entry.current_ip:
+                continue
+            seen.add(mac)
+            schedule = self.schedules.get(mac)
+            profile = self.classify_device(entry)
+
+            if schedule is None:
+                min_interval, _ = PROFILE_INTERVALS[profile]
+                # Étaler les premiers probes pour éviter un burst au démarrage
+                self.schedules[mac] = DeviceSchedule(
+                    mac=mac,
+                    ip=entry.current_ip,
+                    profile=profile,
+                    interval=min_interval,
+                    next_due=now + random.uniform(0, min(min_interval, 30)),
+                    is_online=entry.is_online,
+                )
+            else:
+                schedule.ip = entry.current_ip
+                if schedule.profile != profile:
+                    schedule.profile = profile
+                    min_interval, max_interval = PROFILE_INTERVALS[profile]
+                    schedule.interval = min(max(schedule.interval, min_interval), max_interval)
+
+        for mac in list(self.schedules):
+            if mac not in seen:
+                del self.schedules[mac]
+
+        return len(self.schedules)
+
+    def _reschedule(self, schedule: DeviceSchedule, changed: bool):
+        """Backoff si stable, reset à l'intervalle min si changement"""
+        min_interval, max_interval = PROFILE_INTERVALS[schedule.profile]
+        if changed:
+            schedule.interval = min_interval
+        else:
+            schedule.interval = min(schedule.interval * BACKOFF_FACTOR, max_interval)
+        # Jitter ±10% pour éviter la synchronisation des probes
+        schedule.next_due = time.monotonic() + schedule.interval * random.uniform(0.9, 1.1)
+
+    # === PROBES ===
+
+    def due_schedules(self) -> List[DeviceSchedule]:
+        """Devices dont le probe est dû (les plus en retard d'abord)"""
+        now = time.monotonic()
+        due = [s for s in self.schedules.values() if s.next_due <= now]
+        due.sort(key=lambda s: s.next_due)
+        return due
+
+    async def run_once(self) -> Dict[str, int]:
+        """
+        Un tick de scheduling : probe les devices dus et met à jour le registry
+
+        Returns:
+            Dict {probed, changed, deferred}
+        """
+        self.last_tick = time.time()
+        self.sync_targets()
+        due = self.due_schedules()
+        if not due:
+            return {'probed': 0, 'changed': 0, 'deferred': False}
+
+        # 🌡️ Throttling selon la charge de l'hôte
+        load = self.host_load.snapshot()
+        self.last_throttle = load.to_dict()
+        if load.throttle_factor == 0:
+            self.deferred_ticks += 1
+            logger.info(f"⏱️ Scheduler: {len(due)} probes différés ({', '.join(load.reasons)})")
+            return {'probed': 0, 'changed': 0, 'deferred': True}
+
+        self.budget.scale(load.throttle_factor)
+        concurrency = max(1, int(self.max_concurrent_probes * load.throttle_factor))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _probe(schedule: DeviceSchedule) -> bool:
+            async with semaphore:
+                await self.budget.acquire(1)
+                try:
+                    return await self.probe(schedule.ip)
+                except Exception as e:
+                    logger.debug(f"Probe error for {schedule.ip}: {e}")
+                    return False
+
+        results = await asyncio.gather(*[_probe(s) for s in due])
+
+        changed_count = 0
+        for schedule, reachable in zip(due, results):
+            if self._apply_result(schedule, reachable):
+                changed_count += 1
+
+        if changed_count:
+            self.registry._save()
+            logger.info(f"⏱️ Scheduler: {len(due)} probes, {changed_count} changements d'état")
+
+        return {'probed': len(due), 'changed': changed_count, 'deferred': False}
+
+    def _apply_result(self, schedule: DeviceSchedule, reachable: bool) -> bool:
+        """
+        Appliquer le résultat d'un probe au registry
+
+        Returns:
+            True si le statut online du device a changé
+        """
+        schedule.total_probes += 1
+        schedule.last_probe = time.time()
+        self.total_probes += 1
+
+        if reachable:
+            schedule.missed_probes = 0
+            new_online = True
+        else:
+            schedule.missed_probes += 1
+            # Un seul probe raté ne suffit pas (mobiles en veille, perte ponctuelle)
+            new_online = False if schedule.missed_probes >= OFFLINE_AFTER_MISSES else schedule.is_online
+
+        changed = new_online != schedule.is_online
+        schedule.is_online = new_online
+
+        entry = self.registry.devices.get(schedule.mac)
+        if entry is not None:
+            now_iso = datetime.now(timezone.utc).isoformat()
+            if reachable:
+                entry.last_seen = now_iso
+                entry.last_seen_online = now_iso
+            if new_online is not None and entry.is_online != new_online:
+                entry.is_online = new_online
+                self.registry.record_changes([{
+                    'type': 'device_online' if new_online else 'device_offline',
+                    'mac': schedule.mac,
+                    'ip': entry.current_ip,
+                    'source': 'scheduler',
+                    'timestamp': now_iso,
+                }])
+                self.registry.index_device(schedule.mac)
+                changed = True
+
+        # Premier probe raté → re-probe rapide pour confirmer (ou infirmer) le offline
+        self._reschedule(schedule, changed or (not reachable and schedule.missed_probes == 1))
+        return changed
+
+    # === STATUS ===
+
+    def get_status(self) -> Dict[str, Any]:
+        """Statut du scheduler pour l'API"""
+        now = time.monotonic()
+        profiles: Dict[str, int] = {}
+        for s in self.schedules.values():
+            profiles[s.profile] = profiles.get(s.profile, 0) + 1
+
+        next_due = min((s.next_due for s in self.schedules.values()), default=None)
+
+        return {
+            'enabled': settings.adaptive_scan_enabled,
+            'running': self._running,
+            'targets': len(self.schedules),
+            'profiles': profiles,
+            'max_packets_per_second': self.budget.base_rate,
+            'current_packets_per_second': self.budget.rate,
+            'total_probes': self.total_probes,
+            'deferred_ticks': self.deferred_ticks,
+            'throttle': self.last_throttle,
+            'host_load': self.host_load.snapshot().to_dict(),
+            'next_probe_in_seconds': round(max(0.0, next_due - now), 1) if next_due is not None else None,
+            'last_tick': datetime.fromtimestamp(self.last_tick).isoformat() if self.last_tick else None,
+        }
+
+
+# === SINGLETON ===
+_scan_scheduler: Optional[AdaptiveScanScheduler] = None
+
+
+def get_scan_scheduler() -> AdaptiveScanScheduler:
+    """Récupère le scheduler de scan singleton"""
+    global _scan_scheduler
+    if _scan_scheduler is None:
+        _scan_scheduler = AdaptiveScanScheduler(
+            max_packets_per_second=settings.adaptive_scan_max_pps,
+        )
+    return _scan_scheduler
@@ -0,0 +1,129 @@
+"""
+⚡ 333HOME - Streaming Latency Stats
+Agrégats de latence mis à jour à l'insertion (lecture O(1) par hôte)
+
+Fonctionnalités:
+- Moyenne / variance glissantes (Welford, avec retrait de l'échantillon évincé)
+- Jitter RFC 3550 (J += (|D| - J) / 16 entre RTT successifs)
+- Min / max de la fenêtre (deques monotones indexées)
+- Compteur de pertes sur la fenêtre
+"""
+
+import math
+from collections import deque
+from datetime import datetime
+from typing import Optional
+
+
+class WindowedLatencyStats:
+    """
+    Agrégats d'une fenêtre FIFO de mesures (RTT ou perte)
+
+    Le propriétaire conserve les mesures: à chaque éviction il appelle
+    remove() avec l'échantillon le plus ancien, dans l'ordre d'insertion.
+
+    Usage:
+        stats.add(12.5)          # RTT en ms
+        stats.add(None)          # Perte
+        stats.remove(12.5)       # Éviction du plus ancien
+        stats.mean, stats.jitter, stats.loss_percent
+    """
+
+    JITTER_GAIN = 1 / 16
+
+    __slots__ = (
+        'count', 'lost', 'received', 'mean', '_m2', 'jitter', 'last_rtt',
+        'last_timestamp', '_added', '_removed', '_min', '_max',
+    )
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0              # Mesures dans la fenêtre
+        self.lost = 0               # Pertes dans la fenêtre
+        self.received = 0           # RTT dans la fenêtre
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.jitter = 0.0
+        self.last_rtt: Optional[float] = None
+        self.last_timestamp: Optional[datetime] = None
+        # Index des RTT reçus (insertions / évictions) pour les deques monotones
+        self._added = 0
+        self._removed = 0
+        self._min: deque = deque()  # (index, rtt) croissants
+        self._max: deque = deque()  # (index, rtt) décroissants
+
+    # === ÉCRITURE ===
+
+    def add(self, rtt: Optional[float], timestamp: Optional[datetime] = None):
+        """Ajouter une mesure (None = perte)"""
+        self.count += 1
+        self.last_timestamp = timestamp or datetime.now()
+        if rtt is None:
+            self.lost += 1
+            return
+
+        self.received += 1
+        delta = rtt - self.mean
+        self.mean += delta / self.received
+        self._m2 += delta * (rtt - self.mean)
+
+        if self.last_rtt is not None:
+            self.jitter += (abs(rtt - self.last_rtt) - self.jitter) * self.JITTER_GAIN
+        self.last_rtt = rtt
+
+        index = self._added
+        self._added += 1
+        while self._min and self._min[-1][1] >= rtt:
+            self._min.pop()
+        self._min.append((index, rtt))
+        while self._max and self._max[-1][1] <= rtt:
+            self._max.pop()
+        self._max.append((index, rtt))
+
+    def remove(self, rtt: Optional[float]):
+        """Retirer la mesure la plus ancienne de la fenêtre (None = perte)"""
+        if self.count == 0:
+            return
+        self.count -= 1
+        if rtt is None:
+            self.lost -= 1
+            return
+
+        self.received -= 1
+        if self.received == 0:
+            self.mean = self._m2 = 0.0
+        else:
+            delta = rtt - self.mean
+            self.mean -= delta / self.received
+            self._m2 = max(self._m2 - delta * (rtt - self.mean), 0.0)
+
+        index = self._removed
+        self._removed += 1
+        if self._min and self._min[0][0] == index:
+            self._min.popleft()
+        if self._max and self._max[0][0] == index:
+            self._max.popleft()
+
+    # === LECTURE ===
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1] if self._min else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1] if self._max else 0.0
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.received - 1) if self.received > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def loss_percent(self) -> float:
+        return self.lost / self.count * 100 if self.count else 0.0
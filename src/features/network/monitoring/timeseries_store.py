@@ -0,0 +1,462 @@
+"""
+📈 333HOME - Time Series Store
+
+Stockage persistant des séries de métriques (latence, bande passante) :
+- Un répertoire par métrique / clé (IP ou MAC), un segment par tranche de
+  temps (1 h en brut, 1 jour pour les rollups 1 min)
+- Segments colonnaires en ajout seul : `<début>.ts` = décalages en ms
+  depuis le début du segment (array('I'), croissants), un fichier par
+  colonne de valeurs (`<début>.c0`, `.c1`, ...)
+- Lecture par mmap + bisect sur les décalages : une requête ne touche que
+  les segments et les pages de sa fenêtre
+- Écritures bufferisées en mémoire, flush périodique
+  (HOME333_TIMESERIES_FLUSH_INTERVAL)
+- Compaction : segments bruts plus vieux que la rétention brute agrégés
+  par minute (moyenne ou somme selon la métrique) puis supprimés ;
+  rollups supprimés après leur propre rétention
+
+Utilisé par LatencyMonitor et BandwidthMonitor pour retrouver leur
+historique après un redémarrage.
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import mmap
+import os
+import shutil
+import time
+from array import array
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tiers: (nom, durée d'un segment en secondes)
+TIER_RAW = ('raw', 3600)
+TIER_ROLLUP = ('1m', 86400)
+ROLLUP_RESOLUTION = 60
+COMPACT_INTERVAL = 3600
+
+Point = Tuple[float, Tuple[float, ...]]
+
+
+@dataclass(frozen=True)
+class MetricSpec:
+    """Schéma d'une métrique"""
+    columns: Tuple[str, ...]
+    typecode: str = 'f'         # Type array des colonnes ('f' float32, 'd' float64)
+    rollup: str = 'mean'        # Agrégat par minute: 'mean' (NaN ignorés) ou 'sum'
+
+
+DEFAULT_METRICS: Dict[str, MetricSpec] = {
+    'latency': MetricSpec(columns=('rtt_ms',), typecode='f', rollup='mean'),            # NaN = perte
+    'bandwidth': MetricSpec(columns=('bytes_sent', 'bytes_received'), typecode='d', rollup='sum'),
+}
+
+
+@contextmanager
+def _mapped(path: Path, typecode: str) -> Iterator[Optional[memoryview]]:
+    """Vue typée en lecture seule (mmap) d'un fichier colonne, None si vide/absent"""
+    itemsize = array(typecode).itemsize
+    try:
+        with open(path, 'rb') as f:
+            usable = os.fstat(f.fileno()).st_size // itemsize * itemsize
+            if not usable:
+                yield None
+                return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        yield None
+        return
+    raw = memoryview(mm)
+    part = raw[:usable]
+    view = part.cast(typecode)
+    try:
+        yield view
+    finally:
+        view.release()
+        part.release()
+        raw.release()
+        mm.close()
+
+
+class TimeSeriesStore:
+    """
+    Séries temporelles persistantes par métrique et par clé
+
+    Usage:
+        store = get_timeseries_store()
+        store.append('latency', '192.168.1.10', time.time(), (12.5,))
+        store.query('latency', '192.168.1.10', start=time.time() - 3600)
+        # [(timestamp, (rtt_ms,)), ...]
+    """
+
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        raw_retention_hours: Optional[float] = None,
+        rollup_retention_days: Optional[float] = None,
+        flush_interval: Optional[float] = None,
+        metrics: Optional[Dict[str, MetricSpec]] = None,
+    ):
+        """
+        Args:
+            root: Répertoire des segments (défaut: HOME333_TIMESERIES_DIR ou data/timeseries)
+            raw_retention_hours: Durée conservée en brut avant compaction
+            rollup_retention_days: Durée conservée en rollups 1 min
+            flush_interval: Intervalle d'écriture des points bufferisés (secondes)
+            metrics: Schémas des métriques (défaut: latency, bandwidth)
+        """
+        self.root = Path(root or settings.timeseries_dir or settings.data_dir / "timeseries")
+        self.raw_retention = (raw_retention_hours or settings.timeseries_raw_retention_hours) * 3600
+        self.rollup_retention = (rollup_retention_days or settings.timeseries_rollup_retention_days) * 86400
+        self.flush_interval = flush_interval or settings.timeseries_flush_interval
+        self.metrics = dict(metrics or DEFAULT_METRICS)
+
+        self._pending: Dict[Tuple[str, str], List[Point]] = {}
+        self._last_ms: Dict[Tuple[str, str, str], int] = {}        # Dernier timestamp écrit par série/tier
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {'points_written': 0, 'flushes': 0, 'compactions': 0, 'segments_rolled_up': 0}
+
+    # === CHEMINS ===
+
+    def _spec(self, metric: str) -> MetricSpec:
+        spec = self.metrics.get(metric)
+        if spec is None:
+            raise ValueError(f"Métrique inconnue: {metric} (disponibles: {list(self.metrics)})")
+        return spec
+
+    def _dir(self, metric: str, key: str, tier: Tuple[str, int]) -> Path:
+        return self.root / metric / quote(key, safe='.') / tier[0]
+
+    @staticmethod
+    def _segments(directory: Path) -> List[int]:
+        """Débuts (epoch s) des segments d'un tier, triés"""
+        try:
+            return sorted(int(name[:-3]) for name in os.listdir(directory) if name.endswith('.ts'))
+        except FileNotFoundError:
+            return []
+
+    def keys(self, metric: str) -> List[str]:
+        """Clés (IP, MAC...) ayant des données persistées ou en attente"""
+        self._spec(metric)
+        keys = {key for m, key in self._pending if m == metric}
+        try:
+            keys.update(unquote(name) for name in os.listdir(self.root / metric))
+        except FileNotFoundError:
+            pass
+        return sorted(keys)
+
+    # === ÉCRITURE ===
+
+    def append(self, metric: str, key: str, timestamp: float, values: Sequence[float]):
+        """Bufferiser un point (écrit au prochain flush)"""
+        spec = self._spec(metric)
+        if len(values) != len(spec.columns):
+            raise ValueError(f"{metric}: {len(spec.columns)} valeurs attendues ({', '.join(spec.columns)})")
+        self._pending.setdefault((metric, key), []).append((timestamp, tuple(values)))
+
+    def flush(self) -> int:
+        """Écrire les points en attente dans les segments bruts"""
+        pending, self._pending = self._pending, {}
+        written = 0
+        for (metric, key), points in pending.items():
+            try:
+                written += self._write(metric, key, TIER_RAW, points)
+            except OSError as e:
+                logger.error(f"❌ Time series {metric}/{key}: écriture échouée: {e}")
+        if written:
+            self.stats['points_written'] += written
+            self.stats['flushes'] += 1
+        return written
+
+    def _last_written(self, metric: str, key: str, tier: Tuple[str, int]) -> Optional[int]:
+        """
+        Dernier timestamp (ms) écrit dans un tier
+
+        Au premier accès (après redémarrage), le dernier segment est réparé :
+        fichiers tronqués au même nombre de points (écriture interrompue).
+        """
+        series = (metric, key, tier[0])
+        if series in self._last_ms:
+            return self._last_ms[series]
+        spec = self._spec(metric)
+        directory = self._dir(metric, key, tier)
+        segments = self._segments(directory)
+        last_ms = None
+        if segments:
+            base = segments[-1]
+            paths = [(directory / f"{base}.ts", 'I')] + [
+                (directory / f"{base}.c{index}", spec.typecode) for index in range(len(spec.columns))
+            ]
+            sizes = [(path, array(typecode).itemsize) for path, typecode in paths]
+            count = min(path.stat().st_size // itemsize if path.exists() else 0 for path, itemsize in sizes)
+            for path, itemsize in sizes:
+                if path.exists() and path.stat().st_size != count * itemsize:
+                    os.truncate(path, count * itemsize)
+            with _mapped(directory / f"{base}.ts", 'I') as offsets:
+                last_ms = base * 1000 + offsets[-1] if offsets else None
+        self._last_ms[(metric, key, tier[0])] = last_ms
+        return last_ms
+
+    def _write(self, metric: str, key: str, tier: Tuple[str, int], points: Sequence[Point]) -> int:
+        """Ajouter des points (ordre chronologique) aux segments d'un tier"""
+        spec = self._spec(metric)
+        directory = self._dir(metric, key, tier)
+        directory.mkdir(parents=True, exist_ok=True)
+        last_ms = self._last_written(metric, key, tier) or 0
+
+        # Regroupement par segment ; horloge reculée → timestamp du point précédent
+        segments: Dict[int, Tuple[array, List[array]]] = {}
+        for timestamp, values in points:
+            ms = max(int(timestamp * 1000), last_ms)
+            last_ms = ms
+            base = ms // 1000 // tier[1] * tier[1]
+            offsets, columns = segments.setdefault(
+                base, (array('I'), [array(spec.typecode) for _ in spec.columns]))
+            offsets.append(ms - base * 1000)
+            for column, value in zip(columns, values):
+                column.append(value)
+        self._last_ms[(metric, key, tier[0])] = last_ms
+
+        for base, (offsets, columns) in segments.items():
+            # Colonnes d'abord : un point n'est visible qu'une fois son offset écrit
+            for index, column in enumerate(columns):
+                with open(directory / f"{base}.c{index}", 'ab') as f:
+                    column.tofile(f)
+            with open(directory / f"{base}.ts", 'ab') as f:
+                offsets.tofile(f)
+        return len(points)
+
+    def delete(self, metric: str, key: Optional[str] = None):
+        """Supprimer les données d'une clé (ou de toute la métrique)"""
+        self._spec(metric)
+        for series in list(self._pending):
+            if series[0] == metric and key in (None, series[1]):
+                del self._pending[series]
+        for series in list(self._last_ms):
+            if series[0] == metric and key in (None, series[1]):
+                del self._last_ms[series]
+        target = self.root / metric if key is None else self.root / metric / quote(key, safe='.')
+        shutil.rmtree(target, ignore_errors=True)
+
+    # === LECTURE ===
+
+    def _read_tier(
+        self,
+        metric: str,
+        key: str,
+        tier: Tuple[str, int],
+        start: float,
+        end: float,
+    ) -> List[Point]:
+        spec = self._spec(metric)
+        directory = self._dir(metric, key, tier)
+        start_ms, end_ms = int(start * 1000), int(end * 1000)
+        points: List[Point] = []
+        for base in self._segments(directory):
+            if base * 1000 > end_ms or (base + tier[1]) * 1000 <= start_ms:
+                continue
+            points.extend(self._read_segment(directory, base, spec, start_ms, end_ms))
+        return points
+
+    def _read_segment(self, directory: Path, base: int, spec: MetricSpec, start_ms: int, end_ms: int) -> List[Point]:
+        """Points d'un segment dans [start_ms, end_ms] (bisect sur les décalages mappés)"""
+        with _mapped(directory / f"{base}.ts", 'I') as offsets:
+            if offsets is None:
+                return []
+            origin = base * 1000
+            count = len(offsets)
+            lo = bisect.bisect_left(offsets, start_ms - origin, 0, count) if start_ms > origin else 0
+            hi = bisect.bisect_right(offsets, end_ms - origin, lo, count)
+            timestamps = [(origin + offset) / 1000 for offset in offsets[lo:hi]]
+
+        columns = []
+        for index in range(len(spec.columns)):
+            with _mapped(directory / f"{base}.c{index}", spec.typecode) as column:
+                values = column[lo:hi].tolist() if column is not None else []
+            columns.append(values)
+        # Écriture interrompue: tronquer à la colonne la plus courte
+        size = min([len(timestamps)] + [len(values) for values in columns])
+        return list(zip(timestamps[:size], zip(*columns))) if size else []
+
+    def query(
+        self,
+        metric: str,
+        key: str,
+        start: float,
+        end: Optional[float] = None,
+    ) -> List[Point]:
+        """
+        Points d'une série sur [start, end]
+
+        Rollups 1 min pour la partie déjà compactée, points bruts ensuite,
+        points non encore écrits inclus.
+
+        Returns:
+            [(timestamp epoch, (valeurs...))] chronologiques
+        """
+        end = time.time() if end is None else end
+        raw = self._read_tier(metric, key, TIER_RAW, start, end)
+        rollups = self._read_tier(metric, key, TIER_ROLLUP, start, end)
+        if raw:
+            rollups = [point for point in rollups if point[0] < raw[0][0]]
+        pending = [point for point in self._pending.get((metric, key), ()) if start <= point[0] <= end]
+        return rollups + raw + pending
+
+    # === COMPACTION ===
+
+    @staticmethod
+    def _downsample(spec: MetricSpec, points: Sequence[Point]) -> List[Point]:
+        """Agréger des points bruts par minute (début de minute)"""
+        buckets: Dict[int, List[Tuple[float, ...]]] = {}
+        for timestamp, values in points:
+            buckets.setdefault(int(timestamp // ROLLUP_RESOLUTION) * ROLLUP_RESOLUTION, []).append(values)
+        rollups = []
+        for bucket, rows in sorted(buckets.items()):
+            aggregated = []
+            for column in zip(*rows):
+                present = [value for value in column if not math.isnan(value)]
+                if spec.rollup == 'sum':
+                    aggregated.append(float(sum(present)))
+                else:
+                    aggregated.append(sum(present) / len(present) if present else math.nan)
+            rollups.append((float(bucket), tuple(aggregated)))
+        return rollups
+
+    def compact(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Agréger les segments bruts expirés en rollups 1 min, purger les
+        rollups expirés
+
+        Returns:
+            {'rolled_up': segments bruts compactés, 'expired': segments supprimés}
+        """
+        now = time.time() if now is None else now
+        raw_cutoff = now - self.raw_retention
+        rollup_cutoff = now - self.rollup_retention
+        rolled_up = expired = 0
+
+        for metric, spec in self.metrics.items():
+            try:
+                keys = os.listdir(self.root / metric)
+            except FileNotFoundError:
+                continue
+            for quoted in keys:
+                key = unquote(quoted)
+                raw_dir = self._dir(metric, key, TIER_RAW)
+                rollup_dir = self._dir(metric, key, TIER_ROLLUP)
+                for base in self._segments(raw_dir):
+                    if base + TIER_RAW[1] > raw_cutoff:
+                        break
+                    points = self._read_segment(raw_dir, base, spec, 0, (base + TIER_RAW[1]) * 1000)
+                    rollups = self._downsample(spec, points)
+                    # Reprise après interruption: ne pas réécrire les minutes déjà présentes
+                    last_ms = self._last_written(metric, key, TIER_ROLLUP)
+                    if last_ms is not None:
+                        rollups = [point for point in rollups if point[0] * 1000 > last_ms]
+                    if rollups:
+                        self._write(metric, key, TIER_ROLLUP, rollups)
+                    self._remove_segment(raw_dir, base, spec)
+                    rolled_up += 1
+                for base in self._segments(rollup_dir):
+                    if base + TIER_ROLLUP[1] > rollup_cutoff:
+                        break
+                    self._remove_segment(rollup_dir, base, spec)
+                    expired += 1
+                if (metric, key) not in self._pending and not self._segments(raw_dir) and not self._segments(rollup_dir):
+                    shutil.rmtree(self.root / metric / quoted, ignore_errors=True)
+                    self._last_ms.pop((metric, key, TIER_RAW[0]), None)
+                    self._last_ms.pop((metric, key, TIER_ROLLUP[0]), None)
+
+        self.stats['compactions'] += 1
+        self.stats['segments_rolled_up'] += rolled_up
+        if rolled_up or expired:
+            logger.info(f"📈 Time series compactées: {rolled_up} segments → rollups, {expired} expirés")
+        return {'rolled_up': rolled_up, 'expired': expired}
+
+    @staticmethod
+    def _remove_segment(directory: Path, base: int, spec: MetricSpec):
+        # Offsets d'abord : un segment sans .ts est invisible
+        (directory / f"{base}.ts").unlink(missing_ok=True)
+        for index in range(len(spec.columns)):
+            (directory / f"{base}.c{index}").unlink(missing_ok=True)
+
+    def get_statistics(self) -> Dict:
+        """Taille disque et compteurs"""
+        disk_bytes = sum(path.stat().st_size for path in self.root.rglob('*') if path.is_file()) if self.root.exists() else 0
+        return {
+            'root': str(self.root),
+            'metrics': {metric: len(self.keys(metric)) for metric in self.metrics},
+            'pending_points': sum(len(points) for points in self._pending.values()),
+            'disk_bytes': disk_bytes,
+            **self.stats,
+        }
+
+    # === LIFECYCLE ===
+
+    async def initialize(self):
+        await self.start()
+
+    async def shutdown(self):
+        await self.stop()
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+            logger.info(f"📈 Time series store démarré ({self.root})")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+
+    async def _loop(self):
+        next_compaction = 0.0
+        while True:
+            try:
+                self.flush()
+                if time.monotonic() >= next_compaction:
+                    next_compaction = time.monotonic() + COMPACT_INTERVAL
+                    await asyncio.to_thread(self.compact)
+            except Exception as e:
+                logger.error(f"❌ Time series store: {e}")
+            await asyncio.sleep(self.flush_interval)
+
+
+# === SINGLETON ===
+_timeseries_store: Optional[TimeSeriesStore] = None
+
+
+def get_timeseries_store() -> TimeSeriesStore:
+    """Récupère le time series store singleton"""
+    global _timeseries_store
+    if _timeseries_store is None:
+        _timeseries_store = TimeSeriesStore()
+    return _timeseries_store
+
+
+async def restore_network_history() -> int:
+    """
+    Recharger l'historique latence / bande passante (tâche de démarrage,
+    avant les collecteurs) : lecture des segments et rejeu hors event loop
+    """
+    from .bandwidth_monitor import get_bandwidth_monitor
+    from .latency_monitor import get_latency_monitor
+
+    restored = 0
+    for monitor in (get_latency_monitor(), get_bandwidth_monitor()):
+        restored += await asyncio.to_thread(monitor.restore_history)
+    return restored
@@ -0,0 +1,219 @@
+"""
+🏠 333HOME - Passive OS Fingerprinting
+
+Inférence d'OS sans paquet supplémentaire, à partir de ce que les probes
+reçoivent déjà:
+- TTL des réponses ICMP echo (ping du scheduler / LatencyMonitor)
+- Options TCP du SYN-ACK des probes TCP-connect (lues via TCP_INFO:
+  timestamps, SACK, window scale, MSS)
+
+Les observations sont confrontées à une table de signatures compilée:
+index par TTL initial, puis signatures triées de la plus spécifique à la
+plus générique (premier match = meilleur match).
+"""
+
+import logging
+import re
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INITIAL_TTLS = (32, 64, 128, 255)
+MAX_HOPS = 30                      # Au-delà: TTL initial non déductible
+
+# TCP_INFO (linux/tcp.h): u8 state, ca_state, retransmits, probes, backoff,
+# options, wscale (snd:4 | rcv:4), flags puis u32 rto, ato, snd_mss, rcv_mss...
+TCP_INFO_HEAD = struct.Struct('8B4I')
+TCPI_OPT_TIMESTAMPS = 1
+TCPI_OPT_SACK = 2
+TCPI_OPT_WSCALE = 4
+TCP_TIMESTAMP_OPTION_LEN = 12
+
+PING_TTL_PATTERN = re.compile(r'ttl=(\d+)', re.IGNORECASE)
+
+# (os, ttl initial, timestamps, sack, wscale, mss, confiance) - None = indifférent
+SIGNATURES = [
+    ('Windows', 128, False, True, 8, None, 0.85),
+    ('Windows', 128, None, None, None, None, 0.6),
+    ('Linux', 64, True, True, 7, None, 0.75),
+    ('macOS/iOS', 64, True, True, 6, None, 0.7),
+    ('Linux', 64, True, True, None, None, 0.6),
+    ('Embedded (lwIP/RTOS)', 64, False, False, None, None, 0.55),
+    ('Embedded (lwIP/RTOS)', 255, False, False, None, None, 0.6),
+    ('Linux/Unix', 64, None, None, None, None, 0.45),
+    ('Network device (Cisco/RTOS)', 255, None, None, None, None, 0.5),
+    ('Legacy/Embedded', 32, None, None, None, None, 0.4),
+]
+
+# Sans TTL connu: signatures basées uniquement sur les options TCP
+OPTIONS_ONLY_SIGNATURES = [
+    ('Windows', None, False, True, 8, None, 0.6),
+    ('Linux', None, True, True, 7, None, 0.55),
+    ('macOS/iOS', None, True, True, 6, None, 0.5),
+    ('Linux/Unix', None, True, True, None, None, 0.35),
+    ('Embedded (lwIP/RTOS)', None, False, False, None, None, 0.4),
+]
+
+FIELDS = ('timestamps', 'sack', 'wscale', 'mss')
+
+
+@dataclass
+class Observation:
+    """Empreinte passive d'un hôte (champs None = non observé)"""
+    ttl: Optional[int] = None           # TTL reçu (après décrément des routeurs)
+    timestamps: Optional[bool] = None
+    sack: Optional[bool] = None
+    wscale: Optional[int] = None
+    mss: Optional[int] = None
+    updated_at: float = 0.0
+
+    @property
+    def initial_ttl(self) -> Optional[int]:
+        return guess_initial_ttl(self.ttl)
+
+    @property
+    def has_tcp(self) -> bool:
+        return self.timestamps is not None
+
+
+def guess_initial_ttl(ttl: Optional[int]) -> Optional[int]:
+    """TTL initial probable = plus petite valeur standard ≥ TTL reçu"""
+    if not ttl:
+        return None
+    for initial in INITIAL_TTLS:
+        if ttl <= initial:
+            return initial if initial - ttl <= MAX_HOPS else None
+    return None
+
+
+def parse_ping_ttl(output: str) -> Optional[int]:
+    """TTL depuis la sortie de `ping` (`... ttl=64 time=0.5 ms`)"""
+    match = PING_TTL_PATTERN.search(output)
+    return int(match.group(1)) if match else None
+
+
+def read_tcp_options(sock: socket.socket) -> Optional[Dict]:
+    """
+    Options négociées dans le SYN-ACK (Linux TCP_INFO), sans I/O réseau
+
+    Returns:
+        {timestamps, sack, wscale, mss} ou None si indisponible
+    """
+    tcp_info = getattr(socket, 'TCP_INFO', None)
+    if tcp_info is None or sock is None:
+        return None
+    try:
+        raw = sock.getsockopt(socket.IPPROTO_TCP, tcp_info, TCP_INFO_HEAD.size)
+        fields = TCP_INFO_HEAD.unpack(raw[:TCP_INFO_HEAD.size])
+    except (OSError, struct.error):
+        return None
+
+    options, wscale_byte, snd_mss = fields[5], fields[6], fields[10]
+    timestamps = bool(options & TCPI_OPT_TIMESTAMPS)
+    return {
+        'timestamps': timestamps,
+        'sack': bool(options & TCPI_OPT_SACK),
+        'wscale': wscale_byte & 0x0F if options & TCPI_OPT_WSCALE else None,
+        # snd_mss exclut l'option timestamp → MSS annoncé par le pair
+        'mss': snd_mss + (TCP_TIMESTAMP_OPTION_LEN if timestamps else 0) if snd_mss else None,
+    }
+
+
+def _compile(signatures: List[Tuple]) -> Dict[Optional[int], List[Tuple]]:
+    """
+    Compiler la table: {ttl initial: [(indices contraints, valeurs, os, confiance)]}
+
+    Dans chaque bucket, les signatures les plus contraintes passent en premier.
+    """
+    compiled: Dict[Optional[int], List[Tuple]] = {}
+    for os_name, ttl, *constraints, confidence in signatures:
+        indices = tuple(i for i, v in enumerate(constraints) if v is not None)
+        values = tuple(constraints[i] for i in indices)
+        compiled.setdefault(ttl, []).append((indices, values, os_name, confidence))
+    for bucket in compiled.values():
+        bucket.sort(key=lambda sig: (-len(sig[0]), -sig[3]))
+    return compiled
+
+
+class OSFingerprinter:
+    """
+    Collecte des observations passives par IP + matching de signatures
+    """
+
+    def __init__(self, max_age: float = 24 * 3600):
+        self.max_age = max_age
+        self.observations: Dict[str, Observation] = {}
+        self._table = _compile(SIGNATURES)
+        self._options_table = _compile(OPTIONS_ONLY_SIGNATURES)[None]
+
+    def _get(self, ip: str) -> Observation:
+        obs = self.observations.get(ip)
+        if obs is None:
+            obs = self.observations[ip] = Observation()
+        obs.updated_at = time.monotonic()
+        return obs
+
+    def observe_ttl(self, ip: str, ttl: Optional[int]):
+        """Enregistrer le TTL d'une réponse ICMP echo"""
+        if ttl:
+            self._get(ip).ttl = ttl
+
+    def observe_ping_output(self, ip: str, output: str):
+        self.observe_ttl(ip, parse_ping_ttl(output))
+
+    def observe_tcp(self, ip: str, options: Optional[Dict]):
+        """Enregistrer les options TCP d'un SYN-ACK (cf. read_tcp_options)"""
+        if options:
+            obs = self._get(ip)
+            for name in FIELDS:
+                setattr(obs, name, options.get(name))
+
+    def match(self, obs: Observation) -> Optional[Tuple[str, float]]:
+        """Meilleure signature pour une observation → (os, confiance)"""
+        values = tuple(getattr(obs, name) for name in FIELDS)
+
+        if obs.initial_ttl is not None:
+            candidates = self._table.get(obs.initial_ttl, [])
+        elif obs.has_tcp:
+            candidates = self._options_table
+        else:
+            return None
+
+        for indices, expected, os_name, confidence in candidates:
+            # Contrainte sur une option non observée (ping seul) → signature ignorée
+            if all(values[i] == v for i, v in zip(indices, expected)):
+                return os_name, confidence
+        return None
+
+    def infer(self, ip: str) -> Optional[Tuple[str, float]]:
+        """OS probable d'une IP (None si aucune observation récente)"""
+        obs = self.observations.get(ip)
+        if obs is None or time.monotonic() - obs.updated_at > self.max_age:
+            return None
+        return self.match(obs)
+
+    def get_observation(self, ip: str) -> Optional[Dict]:
+        obs = self.observations.get(ip)
+        if obs is None:
+            return None
+        return {
+            'ttl': obs.ttl,
+            'initial_ttl': obs.initial_ttl,
+            **{name: getattr(obs, name) for name in FIELDS},
+        }
+
+
+# === SINGLETON ===
+_fingerprinter: Optional[OSFingerprinter] = None
+
+
+def get_os_fingerprinter() -> OSFingerprinter:
+    """Récupère le fingerprinter partagé (alimenté par toutes les probes)"""
+    global _fingerprinter
+    if _fingerprinter is None:
+        _fingerprinter = OSFingerprinter()
+    return _fingerprinter
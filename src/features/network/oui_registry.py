@@ -0,0 +1,281 @@
+"""
+🏠 333HOME - IEEE OUI Registry (offline)
+
+Registre IEEE complet (MA-L 24 bits, MA-M 28 bits, MA-S/IAB 36 bits)
+compilé dans un fichier binaire trié, mappé en mémoire (mmap):
+- Chargement en quelques ms (en-tête seulement), pas de dict Python
+- Seules les pages lues sont résidentes
+- Recherche par plus long préfixe: 36 → 28 → 24 bits (bisect)
+
+Format (little-endian):
+    en-tête  HEADER: magic, version, nb entrées 24/28/36, offset des noms
+    tables   une par longueur, triées: (préfixe, offset du nom)
+    noms     pool dédupliqué: u8 longueur + UTF-8
+
+Compilation depuis les fichiers IEEE (oui.txt / mam.txt / oui36.txt / iab.txt
+ou leurs versions CSV):
+    python -m src.features.network.oui_registry build <sortie.bin> <fichiers...>
+"""
+
+import bisect
+import csv
+import logging
+import mmap
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'OUIR'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIII')
+PREFIX_LENGTHS = (36, 28, 24)      # Ordre de recherche: plus long d'abord
+RECORD_FORMATS = {24: '<II', 28: '<II', 36: '<QI'}
+
+DEFAULT_REGISTRY_FILE = Path(__file__).parent / 'data' / 'oui_registry.bin'
+
+# Blocs MA-L "parents" des attributions MA-M / MA-S : pas un constructeur,
+# ignorés (un préfixe 28/36 bits absent doit rester un échec local)
+REGISTRATION_AUTHORITY = 'IEEE Registration Authority'
+
+# Lignes "(base 16)" des fichiers texte IEEE:
+#   MA-L:        "286FB9     (base 16)		Nokia ..."
+#   MA-M/MA-S:   "0D7000-0D7FFF     (base 16)		Avant ..." (précédée de "40-D8-55   (hex)")
+HEX_LINE = re.compile(r'^\s*([0-9A-F]{2}(?:-[0-9A-F]{2}){2})\s+\(hex\)', re.IGNORECASE)
+BASE16_LINE = re.compile(r'^\s*([0-9A-F]{6})(?:-([0-9A-F]{6}))?\s+\(base 16\)\s*(.*)$', re.IGNORECASE)
+
+
+# === COMPILATION ===
+
+def _range_bits(start: str, end: str) -> int:
+    """Taille d'un bloc MA-M/MA-S → longueur du préfixe (28 ou 36 bits)"""
+    size = int(end, 16) - int(start, 16) + 1
+    return 48 - (size.bit_length() - 1) - 24
+
+
+def parse_ieee_text(lines: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+    """
+    Fichier texte IEEE → (longueur, préfixe, organisation)
+
+    Le préfixe est un entier sur `longueur` bits (ex: 0x0050C2F71 sur 36 bits).
+    """
+    oui = None
+    for line in lines:
+        hex_match = HEX_LINE.match(line)
+        if hex_match:
+            oui = hex_match.group(1).replace('-', '')
+            continue
+        match = BASE16_LINE.match(line)
+        if not match:
+            continue
+        start, end, organization = match.groups()
+        organization = organization.strip()
+        if end is None:
+            yield 24, int(start, 16), organization
+        elif oui:
+            extra_bits = _range_bits(start, end)
+            digits = extra_bits // 4
+            yield 24 + extra_bits, int(oui + start[:digits], 16), organization
+
+
+def parse_ieee_csv(lines: Iterable[str]) -> Iterator[Tuple[int, int, str]]:
+    """CSV IEEE (Registry,Assignment,Organization Name,...) → (longueur, préfixe, organisation)"""
+    for row in csv.DictReader(lines):
+        assignment = (row.get('Assignment') or '').strip()
+        if assignment and len(assignment) in (6, 7, 9):
+            yield len(assignment) * 4, int(assignment, 16), (row.get('Organization Name') or '').strip()
+
+
+def compile_registry(sources: Iterable[Path], output: Path) -> Dict[int, int]:
+    """
+    Compiler des fichiers IEEE en un registre binaire
+
+    Returns:
+        Nombre d'entrées par longueur de préfixe
+    """
+    entries: Dict[int, Dict[int, str]] = {bits: {} for bits in PREFIX_LENGTHS}
+    for source in sources:
+        source = Path(source)
+        with open(source, encoding='utf-8', errors='replace', newline='') as f:
+            parser = parse_ieee_csv if source.suffix.lower() == '.csv' else parse_ieee_text
+            for bits, prefix, organization in parser(f):
+                if bits in entries and organization and organization != REGISTRATION_AUTHORITY:
+                    entries[bits][prefix] = organization
+
+    pool = bytearray()
+    offsets: Dict[str, int] = {}
+    tables = []
+    for bits in (24, 28, 36):
+        fmt = struct.Struct(RECORD_FORMATS[bits])
+        table = bytearray()
+        for prefix, organization in sorted(entries[bits].items()):
+            if organization not in offsets:
+                raw = organization.encode('utf-8')[:255]
+                offsets[organization] = len(pool)
+                pool.append(len(raw))
+                pool.extend(raw)
+            table.extend(fmt.pack(prefix, offsets[organization]))
+        tables.append(table)
+
+    strings_offset = HEADER.size + sum(len(t) for t in tables)
+    counts = {bits: len(entries[bits]) for bits in PREFIX_LENGTHS}
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, counts[24], counts[28], counts[36], strings_offset))
+        for table in tables:
+            f.write(table)
+        f.write(pool)
+    return counts
+
+
+# === LECTURE ===
+
+class _Keys:
+    """Vue séquence (pour bisect) sur les préfixes d'une table mappée"""
+
+    def __init__(self, buffer: mmap.mmap, offset: int, count: int, record: struct.Struct):
+        self.buffer = buffer
+        self.offset = offset
+        self.count = count
+        self.record = record
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> int:
+        return self.record.unpack_from(self.buffer, self.offset + index * self.record.size)[0]
+
+    def name_offset(self, index: int) -> int:
+        return self.record.unpack_from(self.buffer, self.offset + index * self.record.size)[1]
+
+
+class OUIRegistry:
+    """
+    Registre IEEE mappé en mémoire
+
+    Usage:
+        registry = get_oui_registry()
+        registry.lookup('00:50:C2:F7:1A:BC')  # → ('RF Code', 36)
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or settings.oui_registry_file or DEFAULT_REGISTRY_FILE)
+        self._buffer: Optional[mmap.mmap] = None
+        self._tables: Dict[int, _Keys] = {}
+        self._strings_offset = 0
+        self.load_time_ms = 0.0
+
+        try:
+            self._open()
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"⚠️ Registre OUI indisponible ({self.path}): {e}")
+
+    def _open(self):
+        start = time.perf_counter()
+        with open(self.path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, _, n24, n28, n36, strings_offset = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            buffer.close()
+            raise ValueError(f"format inconnu ({magic!r} v{version})")
+
+        offset = HEADER.size
+        for bits, count in ((24, n24), (28, n28), (36, n36)):
+            record = struct.Struct(RECORD_FORMATS[bits])
+            self._tables[bits] = _Keys(buffer, offset, count, record)
+            offset += count * record.size
+
+        self._buffer = buffer
+        self._strings_offset = strings_offset
+        self.load_time_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"📚 Registre OUI: {len(self)} préfixes ({self.load_time_ms:.1f} ms)")
+
+    @property
+    def available(self) -> bool:
+        return self._buffer is not None
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self._tables.values())
+
+    def _name(self, offset: int) -> str:
+        position = self._strings_offset + offset
+        length = self._buffer[position]
+        return self._buffer[position + 1:position + 1 + length].decode('utf-8', errors='replace')
+
+    def lookup(self, mac: str) -> Optional[Tuple[str, int]]:
+        """
+        Organisation IEEE d'une MAC (plus long préfixe)
+
+        Un bloc de l'autorité d'enregistrement IEEE (parent MA-M / MA-S)
+        n'est pas un constructeur : None.
+
+        Returns:
+            (organisation, longueur du préfixe) ou None
+        """
+        if not self.available or not mac:
+            return None
+        digits = ''.join(c for c in mac.upper() if c in '0123456789ABCDEF')
+        if len(digits) < 6:
+            return None
+
+        for bits in PREFIX_LENGTHS:
+            length = bits // 4
+            table = self._tables[bits]
+            if not table or len(digits) < length:
+                continue
+            key = int(digits[:length], 16)
+            index = bisect.bisect_left(table, key)
+            if index < len(table) and table[index] == key:
+                name = self._name(table.name_offset(index))
+                # Registre compilé avant le filtrage des blocs parents
+                if name == REGISTRATION_AUTHORITY:
+                    return None
+                return name, bits
+        return None
+
+    def get_statistics(self) -> Dict:
+        return {
+            'path': str(self.path),
+            'available': self.available,
+            'entries': {f'{bits}bit': len(t) for bits, t in self._tables.items()},
+            'load_time_ms': round(self.load_time_ms, 2),
+        }
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+            self._tables = {}
+
+
+# === SINGLETON ===
+_oui_registry: Optional[OUIRegistry] = None
+
+
+def get_oui_registry() -> OUIRegistry:
+    """Récupère le registre OUI partagé (ouvert une seule fois)"""
+    global _oui_registry
+    if _oui_registry is None:
+        _oui_registry = OUIRegistry()
+    return _oui_registry
+
+
+def _main(argv: List[str]) -> int:
+    if len(argv) < 3 or argv[0] != 'build':
+        print("Usage: python -m src.features.network.oui_registry build <sortie.bin> <fichiers IEEE...>")
+        return 1
+    counts = compile_registry([Path(p) for p in argv[2:]], Path(argv[1]))
+    print(f"✅ {argv[1]}: " + ', '.join(f"{n} préfixes {bits} bits" for bits, n in sorted(counts.items())))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(_main(sys.argv[1:]))
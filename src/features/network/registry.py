@@ -20,6 +20,10 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict, field
 
+from .change_feed import ChangeFeed
+from .conflict_index import ConflictIndex
+from .identity_resolver import IdentityResolver
+
 
 logger = logging.getLogger(__name__)
 
@@ -89,6 +93,10 @@ class DeviceRegistryEntry:
     ip_history: List[Dict[str, Any]] = field(default_factory=list)
     hostname_history: List[Dict[str, Any]] = field(default_factory=list)
     
+    # Identité (MACs aléatoires: adresses précédentes du même device)
+    dhcp_client_id: Optional[str] = None
+    previous_macs: List[str] = field(default_factory=list)
+    
     # Timestamps
     first_seen: Optional[str] = None
     last_seen: Optional[str] = None
@@ -118,7 +126,16 @@ class NetworkRegistry:
         self.registry_file = Path(registry_file)
         self.registry_file.parent.mkdir(parents=True, exist_ok=True)
         self.devices: Dict[str, DeviceRegistryEntry] = {}
+        self.conflicts = ConflictIndex('registry')  # IP ↔ MAC des devices online
+        self.identities = IdentityResolver()        # Rotation des MACs aléatoires
+        self.feed = ChangeFeed(storage_file=self.registry_file.with_name(f"{self.registry_file.stem}_changes.json"))
         self._load()
+        if self.consolidate_identities():
+            self._save()
+        self.conflicts.rebuild(
+            (mac, device.current_ip if device.is_online else None, self._conflict_info(device))
+            for mac, device in self.devices.items()
+        )
     
     def _load(self):
         """Charger le registry depuis le fichier"""
@@ -151,6 +168,7 @@ class NetworkRegistry:
             
             with open(self.registry_file, 'w') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
+            self.feed.save()
             
             logger.debug(f"💾 Registry sauvegardé: {len(self.devices)} devices")
         except Exception as e:
@@ -173,11 +191,20 @@ class NetworkRegistry:
             'changes': []
         }
         
+        scanned_macs = {d.get('mac', '').upper() for d in scan_devices if d.get('mac')}
+        
         for device_dict in scan_devices:
             mac = device_dict.get('mac', '').upper()
             if not mac:
                 continue
             
+            # MAC aléatoire inconnue: rotation d'un device déjà suivi ?
+            if mac not in self.devices:
+                stats['changes'].extend(self._resolve_identity(
+                    mac, device_dict.get('current_hostname'), device_dict.get('dhcp_client_id'),
+                    concurrent=scanned_macs, timestamp=now, vendor=device_dict.get('vendor')
+                ))
+            
             # Device existant ou nouveau
             if mac in self.devices:
                 # Mise à jour
@@ -198,7 +225,6 @@ class NetworkRegistry:
                 })
         
         # Marquer devices offline (présents dans registry mais pas dans le scan)
-        scanned_macs = {d.get('mac', '').upper() for d in scan_devices if d.get('mac')}
         for mac, device in self.devices.items():
             if mac not in scanned_macs and device.is_online:
                 device.is_online = False
@@ -209,7 +235,13 @@ class NetworkRegistry:
                     'last_ip': device.current_ip,
                     'timestamp': now
                 })
+                stats['changes'].extend(self._index(mac))
+        
+        # Conflits: uniquement les devices du scan (les autres n'ont pas bougé)
+        for mac in scanned_macs:
+            stats['changes'].extend(self._index(mac))
         
+        self.feed.extend(stats['changes'])
         self._save()
         logger.info(f"📊 Registry enrichi: {stats['new']} nouveaux, {stats['updated']} mis à jour")
         
@@ -233,6 +265,7 @@ class NetworkRegistry:
             is_agent_connected=device_dict.get('is_agent_connected', False),
             agent_id=device_dict.get('agent_id'),
             agent_version=device_dict.get('agent_version'),
+            dhcp_client_id=device_dict.get('dhcp_client_id'),
             first_seen=timestamp,
             last_seen=timestamp,
             last_seen_online=timestamp if device_dict.get('is_online') else None,
@@ -253,58 +286,8 @@ class NetworkRegistry:
         device.last_seen = timestamp
         device.total_detections += 1
         
-        new_ip = device_dict.get('current_ip')
-        new_hostname = device_dict.get('current_hostname')
-        
-        # Vérifier changement d'IP (DHCP)
-        if new_ip and new_ip != device.current_ip:
-            changes.append({
-                'type': 'ip_changed',
-                'mac': mac,
-                'old_ip': device.current_ip,
-                'new_ip': new_ip,
-                'timestamp': timestamp
-            })
-            
-            # Mettre à jour historique IP
-            existing_ip = next((h for h in device.ip_history if h['ip'] == new_ip), None)
-            if existing_ip:
-                existing_ip['last_seen'] = timestamp
-                existing_ip['occurrences'] += 1
-            else:
-                device.ip_history.append({
-                    'ip': new_ip,
-                    'first_seen': timestamp,
-                    'last_seen': timestamp,
-                    'occurrences': 1
-                })
-            
-            device.current_ip = new_ip
-            logger.info(f"🔄 IP changée: {mac} {device.current_ip} → {new_ip}")
-        
-        # Vérifier changement de hostname
-        if new_hostname and new_hostname != device.current_hostname:
-            changes.append({
-                'type': 'hostname_changed',
-                'mac': mac,
-                'old_hostname': device.current_hostname,
-                'new_hostname': new_hostname,
-                'timestamp': timestamp
-            })
-            
-            # Mettre à jour historique hostname
-            existing_hostname = next((h for h in device.hostname_history if h['hostname'] == new_hostname), None)
-            if existing_hostname:
-                existing_hostname['last_seen'] = timestamp
-            else:
-                device.hostname_history.append({
-                    'hostname': new_hostname,
-                    'first_seen': timestamp,
-                    'last_seen': timestamp
-                })
-            
-            device.current_hostname = new_hostname
-            logger.info(f"🔄 Hostname changé: {mac} {device.current_hostname} → {new_hostname}")
+        changes.extend(self._track_ip(device, device_dict.get('current_ip'), timestamp))
+        changes.extend(self._track_hostname(device, device_dict.get('current_hostname'), timestamp))
         
         # Mettre à jour statut online
         if device_dict.get('is_online') and not device.is_online:
@@ -319,6 +302,8 @@ class NetworkRegistry:
         device.is_online = device_dict.get('is_online', False)
         device.is_vpn_connected = device_dict.get('is_vpn_connected', False)
         device.vpn_ip = device_dict.get('vpn_ip')
+        if device_dict.get('dhcp_client_id'):
+            device.dhcp_client_id = device_dict['dhcp_client_id']
         
         # Enrichir vendor/OS si non définis
         if not device.vendor and device_dict.get('vendor'):
@@ -330,6 +315,252 @@ class NetworkRegistry:
         
         return changes
     
+    def _track_ip(self, device: DeviceRegistryEntry, new_ip: Optional[str], timestamp: str) -> List[dict]:
+        """Changement d'IP (DHCP) + historique IP"""
+        if not new_ip or new_ip == device.current_ip:
+            return []
+        
+        change = {
+            'type': 'ip_changed',
+            'mac': device.mac,
+            'old_ip': device.current_ip,
+            'new_ip': new_ip,
+            'timestamp': timestamp
+        }
+        
+        # Mettre à jour historique IP
+        existing_ip = next((h for h in device.ip_history if h['ip'] == new_ip), None)
+        if existing_ip:
+            existing_ip['last_seen'] = timestamp
+            existing_ip['occurrences'] += 1
+        else:
+            device.ip_history.append({
+                'ip': new_ip,
+                'first_seen': timestamp,
+                'last_seen': timestamp,
+                'occurrences': 1
+            })
+        
+        logger.info(f"🔄 IP changée: {device.mac} {device.current_ip} → {new_ip}")
+        device.current_ip = new_ip
+        return [change]
+    
+    def _track_hostname(self, device: DeviceRegistryEntry, new_hostname: Optional[str], timestamp: str) -> List[dict]:
+        """Changement de hostname + historique hostname"""
+        if not new_hostname or new_hostname == device.current_hostname:
+            return []
+        
+        change = {
+            'type': 'hostname_changed',
+            'mac': device.mac,
+            'old_hostname': device.current_hostname,
+            'new_hostname': new_hostname,
+            'timestamp': timestamp
+        }
+        
+        # Mettre à jour historique hostname
+        existing_hostname = next((h for h in device.hostname_history if h['hostname'] == new_hostname), None)
+        if existing_hostname:
+            existing_hostname['last_seen'] = timestamp
+        else:
+            device.hostname_history.append({
+                'hostname': new_hostname,
+                'first_seen': timestamp,
+                'last_seen': timestamp
+            })
+        
+        logger.info(f"🔄 Hostname changé: {device.mac} {device.current_hostname} → {new_hostname}")
+        device.current_hostname = new_hostname
+        return [change]
+    
+    def update_from_lease(
+        self,
+        mac: str,
+        ip: str,
+        hostname: Optional[str] = None,
+        seen: bool = True,
+        client_id: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Appliquer une attribution DHCP (bail) à un seul device
+        
+        Contrairement à update_from_scan, les autres devices ne sont pas
+        touchés (pas de passage offline). Le registry n'est pas sauvegardé:
+        l'appelant sauvegarde une fois le lot de baux appliqué.
+        
+        Args:
+            mac: MAC du client DHCP
+            ip: IP attribuée
+            hostname: Hostname annoncé par le client (optionnel)
+            seen: True si le client vient de dialoguer en DHCP (device présent)
+            client_id: DHCP client-id (option 61), stable malgré les MACs aléatoires
+            
+        Returns:
+            Liste des changements (même format que update_from_scan)
+        """
+        mac = mac.upper()
+        now = datetime.now().isoformat()
+        
+        changes = []
+        if mac not in self.devices:
+            online = [m for m, d in self.devices.items() if d.is_online]
+            changes = self._resolve_identity(mac, hostname, client_id, concurrent=online, timestamp=now)
+        
+        device = self.devices.get(mac)
+        if device is None:
+            self._create_new_device(mac, {
+                'current_ip': ip,
+                'current_hostname': hostname,
+                'is_online': seen,
+                'dhcp_client_id': client_id,
+            }, now)
+            changes.append({'type': 'new_device', 'mac': mac, 'ip': ip, 'hostname': hostname, 'timestamp': now})
+            changes.extend(self._index(mac))
+            self.feed.extend(changes)
+            return changes
+        
+        if client_id:
+            device.dhcp_client_id = client_id
+        changes.extend(self._track_ip(device, ip, now))
+        changes.extend(self._track_hostname(device, hostname, now))
+        
+        if seen:
+            device.last_seen = now
+            device.last_seen_online = now
+            if not device.is_online:
+                device.is_online = True
+                changes.append({'type': 'device_online', 'mac': mac, 'ip': device.current_ip, 'timestamp': now})
+        
+        changes.extend(self._index(mac))
+        self.feed.extend(changes)
+        return changes
+    
+    # === IDENTITÉ (MACs ALÉATOIRES) ===
+    
+    def _resolve_identity(
+        self,
+        mac: str,
+        hostname: Optional[str],
+        client_id: Optional[str],
+        concurrent,
+        timestamp: str,
+        vendor: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Rattacher une nouvelle MAC aléatoire à l'entrée qu'elle remplace
+        
+        L'entrée existante est conservée (historique, notes, is_managed) et
+        re-clé sous la nouvelle MAC; l'ancienne passe dans previous_macs.
+        
+        Returns:
+            [mac_rotated, ...événements conflits] ou [] si aucune rotation
+        """
+        rotation = self.identities.find(mac, hostname, client_id, self.devices, concurrent, vendor=vendor)
+        if rotation is None:
+            return []
+        
+        device = self.devices.pop(rotation.old_mac)
+        events = self.conflicts.remove(rotation.old_mac)
+        device.previous_macs = [m for m in device.previous_macs if m != mac] + [rotation.old_mac]
+        device.mac = mac
+        self.devices[mac] = device
+        
+        return [
+            {
+                'type': 'mac_rotated',
+                'mac': mac,
+                'old_mac': rotation.old_mac,
+                'reason': rotation.reason,
+                'timestamp': timestamp,
+            },
+            *events,
+        ]
+    
+    def consolidate_identities(self) -> int:
+        """
+        Fusionner les entrées existantes d'un même device à MAC aléatoire
+        
+        Chaque chaîne (IdentityResolver.clusters) est fusionnée dans son
+        entrée la plus récente. Appelé au chargement.
+        
+        Returns:
+            Nombre d'entrées supprimées
+        """
+        removed = 0
+        for chain in self.identities.clusters(list(self.devices.values())):
+            target = chain[-1]
+            for source in reversed(chain[:-1]):
+                self._merge_entries(target, source)
+                del self.devices[source.mac]
+                removed += 1
+        
+        if removed:
+            self.identities.stats['consolidated'] += removed
+            logger.info(f"🔀 Registry: {removed} entrées de MACs aléatoires fusionnées")
+        return removed
+    
+    @staticmethod
+    def _merge_entries(target: DeviceRegistryEntry, source: DeviceRegistryEntry):
+        """Absorber l'historique d'une entrée plus ancienne du même device"""
+        target.previous_macs = [
+            m for m in source.previous_macs + [source.mac] + target.previous_macs if m != target.mac
+        ]
+        target.first_seen = min(filter(None, [source.first_seen, target.first_seen]), default=None)
+        target.total_detections += source.total_detections
+        target.is_managed = target.is_managed or source.is_managed
+        for attr in ('current_hostname', 'vendor', 'os_detected', 'device_type', 'dhcp_client_id', 'notes'):
+            if not getattr(target, attr):
+                setattr(target, attr, getattr(source, attr))
+        
+        ips = {h['ip']: h for h in target.ip_history}
+        for entry in source.ip_history:
+            if entry['ip'] in ips:
+                merged = ips[entry['ip']]
+                merged['first_seen'] = min(merged['first_seen'], entry['first_seen'])
+                merged['occurrences'] += entry.get('occurrences', 1)
+            else:
+                target.ip_history.append(dict(entry))
+        target.ip_history.sort(key=lambda h: h['first_seen'])
+        
+        hostnames = {h['hostname']: h for h in target.hostname_history}
+        for entry in source.hostname_history:
+            if entry['hostname'] in hostnames:
+                hostnames[entry['hostname']]['first_seen'] = min(hostnames[entry['hostname']]['first_seen'], entry['first_seen'])
+            else:
+                target.hostname_history.append(dict(entry))
+        target.hostname_history.sort(key=lambda h: h['first_seen'])
+    
+    # === CONFLITS IP ===
+    
+    @staticmethod
+    def _conflict_info(device: DeviceRegistryEntry) -> dict:
+        return {'hostname': device.current_hostname, 'last_seen': device.last_seen}
+    
+    def index_device(self, mac: str) -> List[dict]:
+        """
+        Répercuter l'état d'un device dans l'index des conflits IP
+        
+        À appeler après toute écriture de current_ip / is_online faite hors
+        des méthodes du registry (scheduler, refresh ARP...).
+        
+        Returns:
+            Événements ip_conflict_opened / ip_conflict_resolved (publiés dans le feed)
+        """
+        events = self._index(mac)
+        self.feed.extend(events)
+        return events
+    
+    def _index(self, mac: str) -> List[dict]:
+        mac = mac.upper()
+        device = self.devices.get(mac)
+        if device is None or not device.is_online:
+            return self.conflicts.remove(mac)
+        return self.conflicts.set_ip(mac, device.current_ip, **self._conflict_info(device))
+    
+    def get_conflicts(self) -> List[dict]:
+        """Conflits IP ouverts entre devices online (lecture de l'index)"""
+        return self.conflicts.get_conflicts()
+    
     def get_all_devices(self) -> List[dict]:
         """Récupérer tous les devices du registry"""
         return [device.to_dict() for device in self.devices.values()]
@@ -339,19 +570,40 @@ class NetworkRegistry:
         device = self.devices.get(mac.upper())
         return device.to_dict() if device else None
     
-    def get_recent_changes(self, limit: int = 50) -> List[dict]:
+    def record_changes(self, changes: List[dict]) -> int:
+        """Publier des changements produits hors du registry (scheduler, moteur d'intelligence)"""
+        return self.feed.extend(changes)
+    
+    def get_recent_changes(
+        self,
+        limit: int = 50,
+        since: Optional[int] = None,
+        mac: Optional[str] = None,
+    ) -> dict:
         """
-        Récupérer les changements récents (triés par date)
+        Changements récents depuis le flux numéroté
         
-        TODO: Implémenter un vrai système de changelog
-        Pour l'instant, trier par last_seen
+        Args:
+            limit: Nombre max d'événements
+            since: Curseur (dernier seq reçu); None = derniers événements
+            mac: Filtrer sur un device
+            
+        Returns:
+            {events, next_seq, latest_seq, oldest_seq, truncated}
         """
-        devices = sorted(
-            self.devices.values(),
-            key=lambda d: d.last_seen or '',
-            reverse=True
-        )
-        return [d.to_dict() for d in devices[:limit]]
+        if since is not None:
+            return self.feed.since(since, limit=limit, mac=mac)
+        
+        events = self.feed.latest(len(self.feed) if mac else limit)
+        if mac:
+            events = [e for e in events if (e.get('mac') or '').upper() == mac.upper()][:limit]
+        return {
+            'events': events,
+            'next_seq': self.feed.last_seq,
+            'latest_seq': self.feed.last_seq,
+            'oldest_seq': self.feed.oldest_seq,
+            'truncated': False,
+        }
     
     def get_statistics(self) -> dict:
         """Statistiques globales du registry"""
@@ -369,6 +621,7 @@ class NetworkRegistry:
             'vpn_connected': vpn_count,
             'managed': managed_count,
             'dhcp_dynamic': dhcp_dynamic,
+            'randomized_macs_merged': sum(len(d.previous_macs) for d in self.devices.values()),
             'last_updated': max((d.last_seen for d in self.devices.values()), default=None)
         }
     
@@ -16,13 +16,15 @@ router = APIRouter(prefix="/bandwidth", tags=["network-bandwidth"])
 
 @router.get("/stats", response_model=dict)
 async def get_bandwidth_stats(
-    mac: Optional[str] = Query(None, description="MAC address (None = all)")
+    mac: Optional[str] = Query(None, description="MAC address (None = all)"),
+    window: Optional[int] = Query(None, ge=1, le=30 * 86400, description="Fenêtre en secondes (device uniquement)"),
 ) -> dict:
     """
     Récupère les statistiques de bande passante
     
     Args:
         mac: Adresse MAC (optionnel, None = tous)
+        window: Ajoute les totaux/pic sur les `window` dernières secondes
         
     Returns:
         Statistiques bandwidth
@@ -39,34 +41,35 @@ async def get_bandwidth_stats(
                     detail=f"Device not found: {mac}"
                 )
             
-            return {
-                "device": {
-                    "ip": stats.ip,
-                    "mac": stats.mac,
-                    "hostname": stats.hostname,
-                    "current": {
-                        "upload_mbps": stats.current_upload_bps / (1024 * 1024),
-                        "download_mbps": stats.current_download_bps / (1024 * 1024),
-                        "total_mbps": stats.current_mbps,
-                    },
-                    "total": {
-                        "bytes_sent": stats.total_bytes_sent,
-                        "bytes_received": stats.total_bytes_received,
-                        "total_mb": stats.total_mb,
-                    },
-                    "average": {
-                        "upload_mbps": stats.avg_upload_bps / (1024 * 1024),
-                        "download_mbps": stats.avg_download_bps / (1024 * 1024),
-                        "total_mbps": stats.avg_mbps,
-                    },
-                    "peak": {
-                        "mbps": stats.peak_mbps,
-                        "timestamp": stats.peak_timestamp,
-                    },
-                    "uptime_seconds": stats.uptime_seconds,
-                    "sample_count": stats.sample_count,
-                }
+            device = {
+                "ip": stats.ip,
+                "mac": stats.mac,
+                "hostname": stats.hostname,
+                "current": {
+                    "upload_mbps": stats.current_upload_bps / (1024 * 1024),
+                    "download_mbps": stats.current_download_bps / (1024 * 1024),
+                    "total_mbps": stats.current_mbps,
+                },
+                "total": {
+                    "bytes_sent": stats.total_bytes_sent,
+                    "bytes_received": stats.total_bytes_received,
+                    "total_mb": stats.total_mb,
+                },
+                "average": {
+                    "upload_mbps": stats.avg_upload_bps / (1024 * 1024),
+                    "download_mbps": stats.avg_download_bps / (1024 * 1024),
+                    "total_mbps": stats.avg_mbps,
+                },
+                "peak": {
+                    "mbps": stats.peak_mbps,
+                    "timestamp": stats.peak_timestamp,
+                },
+                "uptime_seconds": stats.uptime_seconds,
+                "sample_count": stats.sample_count,
             }
+            if window:
+                device["window"] = monitor.get_window_stats(mac, window)
+            return {"device": device}
         else:
             # Stats globales
             all_stats = monitor.get_all_stats()
@@ -100,7 +103,8 @@ async def get_bandwidth_stats(
 @router.get("/top-talkers", response_model=dict)
 async def get_top_talkers(
     limit: int = Query(10, ge=1, le=50),
-    sort_by: str = Query("total", regex="^(total|upload|download|current)$")
+    sort_by: str = Query("total", regex="^(total|upload|download|current)$"),
+    window: Optional[int] = Query(None, ge=1, le=30 * 86400, description="Classer sur les N dernières secondes"),
 ) -> dict:
     """
     Récupère les top talkers (devices avec plus de traffic)
@@ -108,16 +112,18 @@ async def get_top_talkers(
     Args:
         limit: Nombre max de devices
         sort_by: Critère (total/upload/download/current)
+        window: Fenêtre de classement en secondes (défaut: depuis le début)
         
     Returns:
         Liste des top talkers
     """
     try:
         monitor = get_bandwidth_monitor()
-        top_devices = monitor.get_top_talkers(limit=limit, sort_by=sort_by)
+        top_devices = monitor.get_top_talkers(limit=limit, sort_by=sort_by, window=window)
         
         return {
             "sort_by": sort_by,
+            "window": window,
             "count": len(top_devices),
             "top_talkers": [
                 {
@@ -130,6 +136,7 @@ async def get_top_talkers(
                     "total_bytes_sent": stats.total_bytes_sent,
                     "total_bytes_received": stats.total_bytes_received,
                     "peak_mbps": stats.peak_mbps,
+                    **({"window": monitor.get_window_stats(stats.mac, window)} if window else {}),
                 }
                 for idx, stats in enumerate(top_devices)
             ]
@@ -143,6 +150,74 @@ async def get_top_talkers(
         )
 
 
+@router.get("/top-peers", response_model=dict)
+async def get_top_peers(
+    limit: int = Query(10, ge=1, le=50),
+    window: int = Query(300, ge=1, le=3600, description="Fenêtre en secondes"),
+) -> dict:
+    """
+    Pairs externes les plus actifs (flux conntrack) sur une fenêtre récente
+    
+    Args:
+        limit: Nombre max de pairs
+        window: Fenêtre en secondes (1 h max)
+        
+    Returns:
+        Liste des pairs {ip, bytes} (octets estimés par excès)
+    """
+    try:
+        peers = get_bandwidth_monitor().get_top_peers(limit=limit, window=window)
+        return {"window": window, "count": len(peers), "top_peers": peers}
+    
+    except Exception as e:
+        logger.error(f"❌ Error getting top peers: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur récupération top peers: {str(e)}"
+        )
+
+
+@router.get("/history/{mac}", response_model=dict)
+async def get_bandwidth_history(
+    mac: str,
+    window: int = Query(3600, ge=1, le=30 * 86400, description="Fenêtre en secondes"),
+    resolution: Optional[int] = Query(None, description="Résolution en secondes (1, 60, 3600)"),
+) -> dict:
+    """
+    Série de trafic d'un device (un point par bucket)
+    
+    Args:
+        mac: Adresse MAC
+        window: Fenêtre en secondes
+        resolution: Résolution imposée (défaut: la plus fine couvrant la fenêtre)
+        
+    Returns:
+        Dict {mac, window, points: [{timestamp, bytes_sent, bytes_received}]}
+    """
+    try:
+        monitor = get_bandwidth_monitor()
+        points = monitor.get_history(mac, window, resolution)
+        
+        if points is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Device not found: {mac}"
+            )
+        
+        return {"mac": mac, "window": window, "count": len(points), "points": points}
+    
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"❌ Error getting bandwidth history: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur récupération historique bandwidth: {str(e)}"
+        )
+
+
 @router.post("/register", response_model=dict)
 async def register_device_bandwidth(
     ip: str,
@@ -4,16 +4,104 @@ Endpoints pour mesure latence/qualité réseau
 """
 
 import logging
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
 
 from ..monitoring.latency_monitor import get_latency_monitor  # ✅ Déplacé dans monitoring/
+from ..monitoring.latency_service import get_latency_service
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/latency", tags=["network-latency"])
 
 
+@router.get("/service/status")
+async def get_latency_service_status() -> dict:
+    """
+    Statut du service de latence continue et de ses cibles
+    
+    Returns:
+        Dict {status, targets}
+    """
+    try:
+        service = get_latency_service()
+        return {"status": service.get_status(), "targets": service.get_targets()}
+    
+    except Exception as e:
+        logger.error(f"❌ Error getting latency service status: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur statut service latence: {str(e)}"
+        )
+
+
+@router.post("/service/start")
+async def start_latency_service() -> dict:
+    """Démarrer la mesure de latence continue"""
+    try:
+        service = get_latency_service()
+        service.start()
+        return service.get_status()
+    
+    except Exception as e:
+        logger.error(f"❌ Error starting latency service: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur démarrage service latence: {str(e)}"
+        )
+
+
+@router.post("/service/stop")
+async def stop_latency_service() -> dict:
+    """Arrêter la mesure de latence continue"""
+    try:
+        service = get_latency_service()
+        service.stop()
+        return service.get_status()
+    
+    except Exception as e:
+        logger.error(f"❌ Error stopping latency service: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur arrêt service latence: {str(e)}"
+        )
+
+
+@router.post("/service/targets")
+async def add_latency_targets(
+    ips: List[str] = Query(..., description="IPs à mesurer en continu"),
+    name: Optional[str] = Query(None, description="Nom affiché"),
+) -> dict:
+    """Ajouter des cibles manuelles au service de latence"""
+    try:
+        total = get_latency_service().add_targets(ips, name=name)
+        return {"added": len(ips), "total_targets": total}
+    
+    except Exception as e:
+        logger.error(f"❌ Error adding latency targets: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur ajout cibles latence: {str(e)}"
+        )
+
+
+@router.delete("/service/targets")
+async def remove_latency_targets(
+    ips: List[str] = Query(..., description="IPs à retirer"),
+) -> dict:
+    """Retirer des cibles manuelles du service de latence"""
+    try:
+        total = get_latency_service().remove_targets(ips)
+        return {"removed": len(ips), "total_targets": total}
+    
+    except Exception as e:
+        logger.error(f"❌ Error removing latency targets: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur retrait cibles latence: {str(e)}"
+        )
+
+
 @router.get("/{ip}")
 async def get_device_latency(ip: str) -> dict:
     """
@@ -60,6 +148,119 @@ async def get_device_latency(ip: str) -> dict:
         )
 
 
+@router.get("/{ip}/percentiles")
+async def get_device_latency_percentiles(
+    ip: str,
+    q: List[float] = Query([50, 95, 99], description="Quantiles (0-100)"),
+    hours: Optional[float] = Query(None, gt=0, description="Période (défaut: tout l'historique)"),
+) -> dict:
+    """
+    Quantiles de latence d'un device (p50/p95/p99 par défaut)
+    
+    Args:
+        ip: Adresse IP
+        q: Quantiles demandés
+        hours: Période en heures
+        
+    Returns:
+        Dict {ip, hours, percentiles}
+    """
+    if any(not 0 <= value <= 100 for value in q):
+        raise HTTPException(status_code=400, detail="Quantiles attendus entre 0 et 100")
+    
+    try:
+        percentiles = get_latency_monitor().get_percentiles(ip, q, hours=hours)
+        
+        if percentiles is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Pas de données de latence pour {ip}"
+            )
+        
+        return {"ip": ip, "hours": hours, "percentiles": percentiles}
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error getting latency percentiles: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur récupération quantiles: {str(e)}"
+        )
+
+
+@router.get("/{ip}/histogram")
+async def get_device_latency_histogram(
+    ip: str,
+    hours: Optional[float] = Query(None, gt=0, description="Période (défaut: tout l'historique)"),
+) -> dict:
+    """
+    Histogramme de latence d'un device
+    
+    Args:
+        ip: Adresse IP
+        hours: Période en heures
+        
+    Returns:
+        Dict {ip, hours, buckets: [{lt, count}], total, lost}
+    """
+    try:
+        histogram = get_latency_monitor().get_histogram(ip, hours=hours)
+        
+        if histogram is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Pas de données de latence pour {ip}"
+            )
+        
+        return {"ip": ip, "hours": hours, **histogram}
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error getting latency histogram: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur récupération histogramme: {str(e)}"
+        )
+
+
+@router.get("/{ip}/series")
+async def get_device_latency_series(
+    ip: str,
+    hours: float = Query(24, gt=0, le=2160, description="Période en heures (rollups 1 min au-delà de la rétention brute)"),
+) -> dict:
+    """
+    Série de latence persistée d'un device (survit aux redémarrages)
+    
+    Args:
+        ip: Adresse IP
+        hours: Période en heures
+        
+    Returns:
+        Dict {ip, hours, points: [{timestamp, latency_ms}]}
+    """
+    try:
+        points = get_latency_monitor().get_series(ip, hours=hours)
+        
+        if not points:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Pas de données de latence pour {ip}"
+            )
+        
+        return {"ip": ip, "hours": hours, "points": points}
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error getting latency series: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur récupération série latence: {str(e)}"
+        )
+
+
 @router.post("/measure")
 async def measure_latency(
     background_tasks: BackgroundTasks,
@@ -8,10 +8,12 @@ jamais détectés avec leur historique complet (IP, hostname, présence).
 
 import logging
 import subprocess
+from datetime import datetime, timedelta
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Query
 
 from ..registry import get_network_registry
+from ..monitoring.presence_store import get_presence_store
 from ..schemas import DeviceRegistryResponse, RegistryStatistics
 
 logger = logging.getLogger(__name__)
@@ -194,25 +196,28 @@ async def get_registry_statistics():
 @router.get(
     "/recent-changes",
     summary="Get Recent Changes",
-    description="Récupérer les devices triés par activité récente (pour timeline)"
+    description="Flux de changements numéroté (timeline), lecture incrémentale avec since=<seq>"
 )
 async def get_recent_changes(
-    limit: int = Query(50, ge=1, le=200, description="Nombre de devices à retourner")
+    limit: int = Query(50, ge=1, le=200, description="Nombre d'événements à retourner"),
+    since: Optional[int] = Query(None, ge=0, description="Dernier seq reçu (absent = derniers événements)"),
+    mac: Optional[str] = Query(None, description="Filtrer sur un device")
 ):
     """
-    Récupérer les devices récemment actifs (triés par last_seen).
-    Utile pour timeline d'événements dans le dashboard.
+    Récupérer les changements réseau (nouveaux devices, IP/hostname, online/offline,
+    conflits IP, rotations de MAC...).
+    
+    Polling: rappeler avec since=next_seq pour ne recevoir que les nouveaux
+    événements; truncated=true → curseur trop ancien, relire le registry.
     """
     try:
         registry = get_network_registry()
-        recent = registry.get_recent_changes(limit=limit)
-        
-        logger.info(f"📊 Recent changes: {len(recent)} devices")
+        page = registry.get_recent_changes(limit=limit, since=since, mac=mac)
         
         return {
-            'total': len(recent),
+            'total': len(page['events']),
             'limit': limit,
-            'devices': recent
+            **page
         }
     
     except Exception as e:
@@ -223,6 +228,72 @@ async def get_recent_changes(
         )
 
 
+@router.get(
+    "/conflicts",
+    summary="Get IP Conflicts",
+    description="Conflits IP ouverts entre devices online (index maintenu à chaque écriture)"
+)
+async def get_registry_conflicts():
+    """
+    Récupérer les conflits IP ouverts (même IP sur plusieurs MACs online).
+    Lecture directe de l'index, aucun recalcul.
+    """
+    try:
+        registry = get_network_registry()
+        conflicts = registry.get_conflicts()
+        
+        return {
+            'total': len(conflicts),
+            'conflicts': conflicts,
+            'index': registry.conflicts.get_statistics()
+        }
+    
+    except Exception as e:
+        logger.error(f"❌ Error fetching registry conflicts: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur récupération conflits: {str(e)}"
+        )
+
+
+@router.get(
+    "/device/{mac}/presence",
+    summary="Get Device Presence",
+    description="Uptime, taux de détection et périodes online d'un device (historique de présence)"
+)
+async def get_device_presence(
+    mac: str,
+    hours: Optional[int] = Query(None, ge=1, le=24 * 365, description="Fenêtre (défaut: tout l'historique)")
+):
+    """
+    Disponibilité d'un device sur une fenêtre glissante.
+    Calculée depuis les bitmaps de présence, sans relecture d'historique.
+    """
+    try:
+        store = get_presence_store()
+        start = datetime.now() - timedelta(hours=hours) if hours else None
+        stats = store.get_device_stats(mac, start=start)
+        if stats is None:
+            raise HTTPException(status_code=404, detail=f"Aucune présence enregistrée pour {mac}")
+        
+        return {
+            **stats,
+            'periods': [
+                {'start': a.isoformat(), 'end': b.isoformat()}
+                for a, b in store.get_online_periods(mac, start=start)
+            ],
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Error fetching presence for {mac}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur récupération présence: {str(e)}"
+        )
+
+
 @router.post(
     "/device/{mac}/manage",
     summary="Mark Device As Managed",
@@ -408,6 +479,7 @@ async def refresh_registry_status():
             
             if changed:
                 updated_count += 1
+                registry.index_device(mac)
         
         # 5. Sauvegarder
         registry._save()
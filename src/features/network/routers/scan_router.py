@@ -16,6 +16,8 @@ from ..scanners.multi_source import MultiSourceScanner  # ✅ Déplacé dans sca
 from ..storage import save_scan_result, get_all_devices, get_device_by_mac
 from ..history import NetworkHistory
 from ..registry import NetworkRegistry
+from ..monitoring.presence_store import get_presence_store
+from src.core.config import settings
 from src.shared.constants import DeviceStatus  # ✅ Source unique RÈGLE #1
 
 
@@ -267,6 +269,7 @@ async def scan_network(
         registry = get_network_registry()
         
         # Convertir devices en format dict pour le registry
+        client_ids = {ud.mac: ud.dhcp_client_id for ud in network_devices_only}
         devices_for_registry = []
         for device in devices:
             devices_for_registry.append({
@@ -278,13 +281,18 @@ async def scan_network(
                 'device_type': device.device_type,
                 'is_online': device.currently_online,
                 'is_vpn_connected': device.is_vpn_connected,
-                'vpn_ip': device.vpn_ip
+                'vpn_ip': device.vpn_ip,
+                'dhcp_client_id': client_ids.get(device.mac)
             })
         
         # Enrichir le registry et récupérer les stats
         registry_stats = registry.update_from_scan(devices_for_registry)
         scan_result.new_devices = registry_stats['new']
         
+        # 📊 Présence: observation du scan complet
+        if settings.presence_enabled:
+            get_presence_store().record(d['mac'] for d in devices_for_registry if d['is_online'])
+        
         # 🌐 ENRICHISSEMENT: Vendor lookup API pour devices sans vendor
         # (en background pour ne pas ralentir la réponse)
         background_tasks.add_task(enrich_vendors_from_api, devices_for_registry, registry)
@@ -351,6 +359,26 @@ async def get_scan_status() -> dict:
     }
 
 
+@router.get("/scheduler")
+async def get_scheduler_status() -> dict:
+    """
+    Statut du scheduler de scan adaptatif (opt-in)
+    
+    Returns:
+        Dict avec enabled, running, targets, profils et budget paquets/s
+    """
+    from ..monitoring.scan_scheduler import get_scan_scheduler
+    
+    try:
+        return get_scan_scheduler().get_status()
+    except Exception as e:
+        logger.error(f"❌ Error getting scheduler status: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur statut scheduler: {str(e)}"
+        )
+
+
 @router.get("/ping")
 async def quick_ping_check() -> dict:
     """
@@ -10,6 +10,11 @@ from .nmap_scanner import NmapScanner
 from .mdns_scanner import MDNSScanner
 from .netbios_scanner import NetBIOSScanner
 from .tailscale_scanner import TailscaleScanner
+from .snmp_scanner import SNMPScanner
+from .router_api import RouterAPISource, RouterScanner
+from .freebox_api import FreeboxAPISource
+from .dhcp_lease_scanner import DHCPLeaseScanner
+from .port_prober import TCPPortProber
 
 __all__ = [
     'ARPScanner',
@@ -17,4 +22,10 @@ __all__ = [
     'MDNSScanner',
     'NetBIOSScanner',
     'TailscaleScanner',
+    'SNMPScanner',
+    'RouterAPISource',
+    'RouterScanner',
+    'FreeboxAPISource',
+    'DHCPLeaseScanner',
+    'TCPPortProber',
 ]
@@ -0,0 +1,241 @@
+"""
+🏠 333HOME - DHCP Lease Scanner
+
+Lecture des fichiers de baux DHCP locaux (dnsmasq, ISC dhcpd).
+Liste exacte et gratuite des attributions MAC/IP/hostname.
+
+Lecture incrémentale (LeaseFileReader):
+- ISC dhcpd: fichier journal (append-only) → seuls les octets ajoutés
+  depuis la dernière lecture sont parsés; relecture complète si dhcpd
+  réécrit le fichier (inode changé / taille réduite)
+- dnsmasq: fichier réécrit à chaque changement → relecture + diff
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.core.config import settings
+from src.core.device_intelligence import DeviceData
+
+
+logger = logging.getLogger(__name__)
+
+MAC_PATTERN = re.compile(r'^[0-9a-fA-F]{2}(:[0-9a-fA-F]{2}){5}$')
+ISC_LEASE_BLOCK = re.compile(r'lease\s+([0-9.]+)\s*\{(.*?)\}', re.DOTALL)
+ISC_INACTIVE_STATES = ('free', 'expired', 'released', 'abandoned', 'reset', 'backup')
+
+
+@dataclass
+class DhcpLease:
+    """Bail DHCP (une attribution MAC → IP)"""
+    mac: str
+    ip: str
+    hostname: Optional[str] = None
+    expires: Optional[datetime] = None   # None = bail infini
+    active: bool = True
+    client_id: Optional[str] = None      # Option 61 (stable malgré les MACs aléatoires)
+
+    def same_assignment(self, other: Optional['DhcpLease']) -> bool:
+        return other is not None and (self.ip, self.hostname, self.expires) == (other.ip, other.hostname, other.expires)
+
+
+@dataclass
+class LeaseDelta:
+    """Changements depuis la dernière lecture d'un fichier de baux"""
+    upserted: List[DhcpLease] = field(default_factory=list)   # nouveaux baux / renouvellements / changements
+    removed: List[DhcpLease] = field(default_factory=list)    # baux libérés / expirés
+    initial: bool = False                                      # première lecture (état de référence)
+
+    def __bool__(self) -> bool:
+        return bool(self.upserted or self.removed)
+
+
+def parse_dnsmasq_leases(text: str) -> Dict[str, DhcpLease]:
+    """
+    Format dnsmasq: `<expiry epoch> <mac> <ip> <hostname|*> <client-id|*>`
+
+    Les lignes DHCPv6 (duid, IAID) sont ignorées.
+    """
+    leases = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) < 4 or not MAC_PATTERN.match(parts[1]):
+            continue
+        try:
+            expiry = int(parts[0])
+        except ValueError:
+            continue
+        mac = parts[1].upper()
+        leases[mac] = DhcpLease(
+            mac=mac,
+            ip=parts[2],
+            hostname=None if parts[3] == '*' else parts[3],
+            expires=datetime.fromtimestamp(expiry, tz=timezone.utc) if expiry else None,
+            client_id=parts[4] if len(parts) > 4 and parts[4] != '*' else None,
+        )
+    return leases
+
+
+def parse_isc_blocks(text: str) -> List[DhcpLease]:
+    """
+    Blocs `lease <ip> { ... }` ISC dhcpd, dans l'ordre du fichier
+
+    Un bloc plus récent remplace les précédents (fichier journal).
+    """
+    leases = []
+    for match in ISC_LEASE_BLOCK.finditer(text):
+        ip, body = match.groups()
+        mac = re.search(r'hardware ethernet\s+([0-9a-fA-F:]+);', body)
+        if not mac:
+            continue
+        hostname = re.search(r'client-hostname\s+"([^"]*)";', body)
+        ends = re.search(r'^\s*ends\s+\d\s+(\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2});', body, re.MULTILINE)
+        state = re.search(r'^\s*binding state\s+(\w+);', body, re.MULTILINE)
+        uid = re.search(r'^\s*uid\s+"((?:[^"\\]|\\.)*)";', body, re.MULTILINE)
+        leases.append(DhcpLease(
+            mac=mac.group(1).upper(),
+            ip=ip,
+            hostname=hostname.group(1) or None if hostname else None,
+            expires=datetime.strptime(ends.group(1), '%Y/%m/%d %H:%M:%S').replace(tzinfo=timezone.utc) if ends else None,
+            active=not state or state.group(1) not in ISC_INACTIVE_STATES,
+            client_id=uid.group(1) if uid else None,
+        ))
+    return leases
+
+
+def parse_isc_leases(text: str) -> Dict[str, DhcpLease]:
+    """État courant d'un fichier ISC complet (baux actifs par MAC)"""
+    leases: Dict[str, DhcpLease] = {}
+    for lease in parse_isc_blocks(text):
+        if lease.active:
+            leases[lease.mac] = lease
+        elif lease.mac in leases and leases[lease.mac].ip == lease.ip:
+            del leases[lease.mac]
+    return leases
+
+
+def detect_lease_format(path: Path, text: str) -> str:
+    """'isc' ou 'dnsmasq' (nom de fichier, sinon contenu)"""
+    if path.suffix == '.leases' and 'dhcpd' in path.name:
+        return 'isc'
+    return 'isc' if ISC_LEASE_BLOCK.search(text) else 'dnsmasq'
+
+
+class LeaseFileReader:
+    """
+    Lecteur incrémental d'un fichier de baux
+
+    refresh() retourne uniquement le delta depuis l'appel précédent.
+    """
+
+    def __init__(self, path: Path, lease_format: Optional[str] = None):
+        self.path = Path(path)
+        self.format = lease_format
+        self.leases: Dict[str, DhcpLease] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._read_once = False
+
+    def refresh(self) -> LeaseDelta:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return LeaseDelta()
+
+        initial = not self._read_once
+        rewritten = stat.st_ino != self._inode or stat.st_size < self._offset
+
+        if self.format == 'isc' and not rewritten:
+            if stat.st_size == self._offset:
+                return LeaseDelta()
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read().decode(errors='replace')
+            # Bloc en cours d'écriture: s'arrêter au dernier '}' complet
+            end = chunk.rfind('}') + 1
+            self._offset += len(chunk[:end].encode())
+            return self._apply_isc_blocks(parse_isc_blocks(chunk[:end]))
+
+        text = self.path.read_text(errors='replace')
+        if self.format is None:
+            self.format = detect_lease_format(self.path, text)
+        self._inode = stat.st_ino
+        self._offset = len(text.encode())
+        self._read_once = True
+
+        current = parse_isc_leases(text) if self.format == 'isc' else parse_dnsmasq_leases(text)
+        delta = LeaseDelta(initial=initial)
+        for mac, lease in current.items():
+            if not lease.same_assignment(self.leases.get(mac)):
+                delta.upserted.append(lease)
+        for mac, lease in self.leases.items():
+            if mac not in current:
+                delta.removed.append(lease)
+        self.leases = current
+        return delta
+
+    def _apply_isc_blocks(self, blocks: List[DhcpLease]) -> LeaseDelta:
+        delta = LeaseDelta()
+        for lease in blocks:
+            previous = self.leases.get(lease.mac)
+            if lease.active:
+                if not lease.same_assignment(previous):
+                    delta.upserted.append(lease)
+                self.leases[lease.mac] = lease
+            elif previous and previous.ip == lease.ip:
+                delta.removed.append(self.leases.pop(lease.mac))
+        return delta
+
+
+class DHCPLeaseScanner:
+    """
+    Scanner DHCP: baux actifs des serveurs DHCP locaux
+
+    Fichiers configurés via HOME333_DHCP_LEASE_FILES
+    (ex: /var/lib/misc/dnsmasq.leases, /var/lib/dhcp/dhcpd.leases).
+    """
+
+    def __init__(self, subnet: str = "192.168.1.0/24", lease_files: Optional[List[str]] = None):
+        self.subnet = subnet
+        files = lease_files if lease_files is not None else settings.dhcp_lease_files
+        self.readers = [LeaseFileReader(Path(p)) for p in files]
+        self.logger = logger
+
+    async def scan(self) -> List[DeviceData]:
+        """
+        Scan DHCP: baux actifs (non expirés)
+
+        Un bail actif ne prouve pas la présence: is_online reste False,
+        la source enrichit l'identité (IP, hostname).
+        """
+        devices = []
+        now = datetime.now(timezone.utc)
+
+        try:
+            for reader in self.readers:
+                reader.refresh()
+                for lease in reader.leases.values():
+                    if lease.expires and lease.expires < now:
+                        continue
+                    devices.append(DeviceData(
+                        mac=lease.mac,
+                        ip=lease.ip,
+                        hostname=lease.hostname,
+                        source='dhcp',
+                        timestamp=datetime.now(),
+                        scan_type=f'{reader.format}_lease',
+                        metadata={
+                            'lease_expires': lease.expires.isoformat() if lease.expires else None,
+                            'client_id': lease.client_id,
+                        },
+                    ))
+            self.logger.info(f"📡 DHCP: Found {len(devices)} active leases")
+        except Exception as e:
+            self.logger.error(f"DHCP lease scan error: {e}")
+
+        return devices
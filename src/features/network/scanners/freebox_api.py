@@ -0,0 +1,195 @@
+"""
+🏠 333HOME - Freebox OS API Source
+
+LAN browser de la Freebox (GET /api/vX/lan/browser/pub/): tous les hôtes
+connus avec MAC, adresses IPv4, joignabilité et nom, en un seul appel.
+
+Authentification Freebox OS:
+- app_token obtenu une fois (appairage, validation sur l'écran de la box)
+- challenge (GET login/) → password = HMAC-SHA1(app_token, challenge)
+- session_token (POST login/session/) mis en cache et réutilisé entre les
+  scans, renouvelé automatiquement quand la box le refuse
+"""
+
+import hashlib
+import hmac
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from src.core.config import settings
+from src.core.device_intelligence import DeviceData
+from .router_api import RouterAPIError, RouterAPISource
+
+
+logger = logging.getLogger(__name__)
+
+# host_type Freebox → DeviceType (src/shared/constants.py)
+HOST_TYPE_MAP = {
+    'workstation': 'computer',
+    'laptop': 'computer',
+    'nas': 'server',
+    'smartphone': 'phone',
+    'ip_phone': 'phone',
+    'tablet': 'tablet',
+    'printer': 'printer',
+    'television': 'tv',
+    'multimedia_device': 'tv',
+    'freebox_player': 'tv',
+    'vg_console': 'console',
+    'networking_device': 'network',
+    'freebox_delta': 'network',
+    'freebox_hd': 'network',
+    'freebox_mini': 'network',
+    'freebox_one': 'network',
+    'ip_camera': 'iot',
+    'smart_home': 'iot',
+    'car': 'other',
+    'other': 'other',
+}
+
+AUTH_ERRORS = ('auth_required', 'invalid_session', 'invalid_token')
+
+
+class FreeboxAPISource(RouterAPISource):
+    """
+    Source Freebox OS (LAN browser)
+    """
+
+    name = 'freebox'
+
+    def __init__(
+        self,
+        base_url: str = "http://mafreebox.freebox.fr",
+        app_id: str = "fr.333home.hub",
+        app_token: str = "",
+        timeout: float = 5.0,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.app_id = app_id
+        self.app_token = app_token
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+        # Cache: racine API (api_version) et session
+        self._api_root: Optional[str] = None
+        self._session_token: Optional[str] = None
+        self.login_count = 0
+
+    @classmethod
+    def from_settings(cls) -> Optional['FreeboxAPISource']:
+        if not settings.freebox_app_token:
+            logger.warning("Router API: freebox sans HOME333_FREEBOX_APP_TOKEN, source désactivée")
+            return None
+        return cls(
+            base_url=settings.freebox_url,
+            app_id=settings.freebox_app_id,
+            app_token=settings.freebox_app_token,
+        )
+
+    async def fetch_hosts(self) -> List[DeviceData]:
+        async with aiohttp.ClientSession(timeout=self.timeout) as http:
+            hosts = await self._authenticated_get(http, 'lan/browser/pub/')
+
+        now = datetime.now()
+        devices = []
+        for host in hosts or []:
+            device = self._to_device_data(host, now)
+            if device:
+                devices.append(device)
+        return devices
+
+    # === API ===
+
+    @staticmethod
+    async def _read(response: aiohttp.ClientResponse) -> Dict[str, Any]:
+        try:
+            payload = await response.json(content_type=None)
+        except ValueError:
+            raise RouterAPIError(f"Freebox: réponse non JSON (HTTP {response.status})")
+        if not isinstance(payload, dict):
+            raise RouterAPIError("Freebox: réponse invalide")
+        return payload
+
+    async def _discover(self, http: aiohttp.ClientSession) -> str:
+        """Racine API versionnée (ex: http://mafreebox.freebox.fr/api/v8/)"""
+        if self._api_root is None:
+            async with http.get(f"{self.base_url}/api_version") as response:
+                info = await self._read(response)
+            major = str(info.get('api_version', '4.0')).split('.')[0]
+            base = info.get('api_base_url', '/api/')
+            self._api_root = f"{self.base_url}{base}v{major}/"
+        return self._api_root
+
+    async def _login(self, http: aiohttp.ClientSession) -> str:
+        root = await self._discover(http)
+
+        async with http.get(f"{root}login/") as response:
+            payload = await self._read(response)
+        challenge = (payload.get('result') or {}).get('challenge')
+        if not challenge:
+            raise RouterAPIError("Freebox: pas de challenge de login")
+
+        password = hmac.new(self.app_token.encode(), challenge.encode(), hashlib.sha1).hexdigest()
+        async with http.post(f"{root}login/session/", json={'app_id': self.app_id, 'password': password}) as response:
+            payload = await self._read(response)
+        if not payload.get('success'):
+            raise RouterAPIError(f"Freebox: login refusé ({payload.get('error_code') or payload.get('msg')})")
+
+        self._session_token = payload['result']['session_token']
+        self.login_count += 1
+        logger.debug("Freebox: nouvelle session ouverte")
+        return self._session_token
+
+    async def _authenticated_get(self, http: aiohttp.ClientSession, path: str) -> Any:
+        """GET avec le session_token en cache (un seul re-login si expiré)"""
+        root = await self._discover(http)
+
+        for attempt in range(2):
+            token = self._session_token or await self._login(http)
+            async with http.get(f"{root}{path}", headers={'X-Fbx-App-Auth': token}) as response:
+                payload = await self._read(response)
+
+            if payload.get('success'):
+                return payload.get('result')
+            if payload.get('error_code') in AUTH_ERRORS and attempt == 0:
+                self._session_token = None
+                continue
+            raise RouterAPIError(f"Freebox: {path} en erreur ({payload.get('error_code') or payload.get('msg')})")
+
+    # === MAPPING ===
+
+    def _to_device_data(self, host: Dict[str, Any], now: datetime) -> Optional[DeviceData]:
+        l2ident = host.get('l2ident') or {}
+        if l2ident.get('type') != 'mac_address' or not l2ident.get('id'):
+            return None
+
+        # IPv4: joignable d'abord, puis la plus récemment active
+        ipv4 = sorted(
+            (c for c in host.get('l3connectivities') or [] if c.get('af') == 'ipv4'),
+            key=lambda c: (bool(c.get('reachable')), c.get('last_activity', 0)),
+            reverse=True,
+        )
+
+        host_type = host.get('host_type')
+        return DeviceData(
+            mac=l2ident['id'].upper(),
+            ip=ipv4[0]['addr'] if ipv4 else None,
+            hostname=host.get('primary_name') or None,
+            vendor=host.get('vendor_name') or None,
+            device_type=HOST_TYPE_MAP.get(host_type),
+            source=self.name,
+            is_online=bool(host.get('reachable')),
+            timestamp=now,
+            scan_type='lan_browser',
+            metadata={
+                'host_id': host.get('id'),
+                'host_type': host_type,
+                'persistent': host.get('persistent', False),
+                'first_activity': host.get('first_activity'),
+                'last_activity': host.get('last_activity'),
+                'last_time_reachable': host.get('last_time_reachable'),
+                'names': [n.get('name') for n in host.get('names') or [] if n.get('name')],
+            },
+        )
@@ -0,0 +1,132 @@
+"""
+🏠 333HOME - Merge Cache
+
+Mémoïsation des fusions multi-sources par device:
+- Clé: MAC + empreinte des observations normalisées de chaque source
+  (IP, hostname, vendor, type, statut, ports, services, OS)
+- Hit: le résultat fusionné précédent est réutilisé (tri des sources,
+  lookup OUI, inférence OS, score de confiance et détection de changements
+  sautés); seuls les champs volatils sont recalculés par l'appelant
+- Éviction: MACs non revues depuis `idle_ttl` + plafond LRU `max_entries`
+
+Horodatages, latences et metadata brutes ne font pas partie de l'empreinte:
+les sources sont horodatées à la collecte, la fraîcheur du score de
+confiance est donc constante d'un scan à l'autre.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from src.core.device_intelligence import DeviceData
+
+logger = logging.getLogger(__name__)
+
+# Champs listes remis à l'appelant (modifiés ensuite: sources + tailscale...)
+LIST_FIELDS = ('sources', 'open_ports', 'services')
+
+
+@dataclass
+class MergeEntry:
+    """Dernier résultat fusionné d'une MAC"""
+    fingerprint: int
+    merged: Dict[str, Any]
+    seen_at: float                  # time.monotonic()
+
+
+def fingerprint(sources: List[DeviceData]) -> int:
+    """Empreinte des observations normalisées (ordre des sources conservé)"""
+    return hash(tuple(
+        (
+            s.source,
+            s.ip,
+            s.hostname,
+            s.vendor,
+            s.device_type,
+            s.is_online,
+            tuple(sorted(s.open_ports)),
+            tuple(sorted(s.services)),
+            s.os_detected,
+            s.os_confidence,
+            s.scan_type,
+        )
+        for s in sources
+    ))
+
+
+def _detach(merged: Dict[str, Any]) -> Dict[str, Any]:
+    """Copie dont les listes ne sont pas partagées avec le cache"""
+    copy = dict(merged)
+    for field in LIST_FIELDS:
+        if isinstance(copy.get(field), list):
+            copy[field] = list(copy[field])
+    return copy
+
+
+class MergeCache:
+    """
+    Cache des fusions par MAC, invalidé dès qu'une observation change
+
+    Usage:
+        key = fingerprint(sources)
+        merged = cache.get(mac, key)
+        if merged is None:
+            merged = engine.merge_device_data(sources)
+            cache.put(mac, key, merged)
+    """
+
+    def __init__(self, max_entries: int = 2048, idle_ttl: float = 6 * 3600):
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self._entries: "OrderedDict[str, MergeEntry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, mac: str, key: int) -> Optional[Dict[str, Any]]:
+        """Résultat fusionné si les observations de la MAC sont inchangées"""
+        entry = self._entries.get(mac)
+        if entry is None or entry.fingerprint != key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        entry.seen_at = time.monotonic()
+        self._entries.move_to_end(mac)
+        return _detach(entry.merged)
+
+    def put(self, mac: str, key: int, merged: Dict[str, Any]):
+        self._entries[mac] = MergeEntry(fingerprint=key, merged=_detach(merged), seen_at=time.monotonic())
+        self._entries.move_to_end(mac)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def evict_idle(self) -> int:
+        """Retirer les MACs non revues depuis idle_ttl (appelé en fin de scan)"""
+        cutoff = time.monotonic() - self.idle_ttl
+        stale = [mac for mac, entry in self._entries.items() if entry.seen_at < cutoff]
+        for mac in stale:
+            del self._entries[mac]
+        self.evictions += len(stale)
+        if stale:
+            logger.debug(f"🧹 Merge cache: {len(stale)} MACs inactives retirées")
+        return len(stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+        }
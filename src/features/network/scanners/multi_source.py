@@ -6,10 +6,17 @@ Architecture modulaire (RULES.MD compliant).
 
 Sources:
 - Tailscale: VPN devices avec hostnames
+- Router API: inventaire complet de la box en un appel (Freebox OS, si configurée)
+- DHCP: baux dnsmasq / ISC dhcpd locaux (si configurés)
 - ARP: MAC/IP mapping (rapide, fiable)
+- SNMP: tables bridge/ARP des switches et APs managés (si configurés)
 - mDNS: Service discovery (hostname .local)
 - NetBIOS: Windows name resolution
 - nmap: Scan réseau complet (IP, ports, OS detection)
+- Ports: probes TCP-connect des devices en ligne (cache TTL par device,
+  opt-in HOME333_PORT_PROBE_ENABLED)
+- DNS: reverse lookups (PTR) en lot pour les devices sans hostname
+- Fingerprint: OS passif depuis TTL/options TCP déjà reçus (0 paquet)
 
 Références:
 - docs/NETWORK_PRO_ARCHITECTURE.md
@@ -19,10 +26,11 @@ Références:
 import asyncio
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 
-from src.core.device_intelligence import DeviceData, DeviceIntelligenceEngine
+from src.core.config import settings
+from src.core.device_intelligence import ChangeType, DeviceData, DeviceIntelligenceEngine
 from src.shared.constants import DeviceStatus  # ✅ Source unique RÈGLE #1
 from .scanner_models import UnifiedDevice, DeviceCapabilities  # ✅ Modèles scanner
 from .arp_scanner import ARPScanner  # ✅ Import direct (même dossier)
@@ -30,15 +38,35 @@ from .nmap_scanner import NmapScanner
 from .mdns_scanner import MDNSScanner
 from .netbios_scanner import NetBIOSScanner
 from .tailscale_scanner import TailscaleScanner
+from .snmp_scanner import SNMPScanner
+from .router_api import RouterScanner
+from .dhcp_lease_scanner import DHCPLeaseScanner
+from .port_prober import TCPPortProber, WEB_PORTS
+from .merge_cache import MergeCache, fingerprint
+from ..change_feed import ChangeFeed
+from ..detector import DeviceIdentifier
+from ..dns_resolver import get_dns_resolver
+from ..os_fingerprint import get_os_fingerprinter
+from ..monitoring.host_load import get_host_load_monitor
+from ..registry import get_network_registry
 
 logger = logging.getLogger(__name__)
 
+# Changements déjà publiés par le registry (scan_router → update_from_scan)
+REGISTRY_CHANGE_TYPES = {
+    ChangeType.IP_CHANGED,
+    ChangeType.HOSTNAME_CHANGED,
+    ChangeType.STATUS_CHANGED,
+    ChangeType.NEW_DEVICE,
+    ChangeType.DEVICE_DISAPPEARED,
+}
+
 
 class MultiSourceScanner:
     """
     Scanner multi-sources pour découverte réseau complète
     
-    Combine Tailscale + ARP + mDNS + NetBIOS + nmap.
+    Combine Tailscale + Router API + DHCP + ARP + SNMP + mDNS + NetBIOS + nmap.
     Utilise DeviceIntelligenceEngine pour fusion intelligente.
     """
     
@@ -50,21 +78,50 @@ class MultiSourceScanner:
         # Configuration sources
         self.enabled_sources = {
             'tailscale': True,
+            'router': True,
+            'dhcp': True,
             'arp': True,
+            'snmp': True,
             'mdns': True,
             'netbios': True,
             'nmap': True,
+            'ports': settings.port_probe_enabled,
+            'dns': True,
         }
         
         # Scanners modulaires
         self.scanners = {
             'tailscale': TailscaleScanner(subnet),
+            'router': RouterScanner(subnet),
+            'dhcp': DHCPLeaseScanner(subnet),
             'arp': ARPScanner(subnet),
+            'snmp': SNMPScanner(subnet),
             'mdns': MDNSScanner(subnet),
             'netbios': NetBIOSScanner(subnet),
             'nmap': NmapScanner(subnet),
         }
         
+        # Probes TCP (ports/services), résultats en cache par MAC
+        self.port_prober = TCPPortProber(
+            ports=settings.port_probe_ports or None,
+            max_in_flight=settings.port_probe_max_in_flight,
+            cache_ttl=settings.port_probe_ttl,
+        )
+        self.identifier = DeviceIdentifier()
+        self.resolver = get_dns_resolver()
+        self.fingerprinter = get_os_fingerprinter()
+        
+        # Sources lourdes (CPU/subprocess/réseau) différées si le Pi est en surcharge
+        self.heavy_sources = ('netbios', 'nmap', 'ports')
+        self.host_load = get_host_load_monitor()
+        self.throttled_sources: Dict[str, List[str]] = {}
+        
+        # Fusions mémoïsées (observations inchangées → merge/enrichissement sautés)
+        self.merge_cache = MergeCache()
+        
+        # Flux de changements (défaut: celui du registry)
+        self.change_feed: Optional[ChangeFeed] = None
+        
         # Cache des derniers scans
         self.last_scan_results: Dict[str, List[DeviceData]] = {}
         self.last_unified_devices: Dict[str, UnifiedDevice] = {}
@@ -83,35 +140,51 @@ class MultiSourceScanner:
         
         # Scans séquentiels avec throttling
         results = []
+        self.throttled_sources = {}
         
         # 1. Tailscale (VPN) - enrichissement uniquement (traité après)
         tailscale_enrichment = {}
         if self.enabled_sources['tailscale']:
-            self.logger.info("⏳ Tailscale enrichment scan (1/5)...")
+            self.logger.info("⏳ Tailscale enrichment scan (1/8)...")
             tailscale_enrichment = await self.scanners['tailscale'].scan()
             await asyncio.sleep(1)
         
-        # 2. ARP (rapide)
+        # 2. Router API (un appel HTTP, source de vérité)
+        if self.enabled_sources['router'] and self.scanners['router'].enabled:
+            self.logger.info("⏳ Router API inventory (2/8)...")
+            results.append(await self.scanners['router'].scan())
+        
+        # 3. Baux DHCP locaux (lecture fichier)
+        if self.enabled_sources['dhcp'] and self.scanners['dhcp'].readers:
+            self.logger.info("⏳ DHCP lease files (3/8)...")
+            results.append(await self.scanners['dhcp'].scan())
+        
+        # 4. ARP (rapide)
         if self.enabled_sources['arp']:
-            self.logger.info("⏳ ARP scan (2/5)...")
+            self.logger.info("⏳ ARP scan (4/8)...")
             results.append(await self.scanners['arp'].scan())
             await asyncio.sleep(2)
         
-        # 3. mDNS
+        # 5. SNMP (tables des switches/APs, uniquement si agents configurés)
+        if self.enabled_sources['snmp'] and self.scanners['snmp'].targets:
+            self.logger.info("⏳ SNMP bridge-table scan (5/8)...")
+            results.append(await self.scanners['snmp'].scan())
+        
+        # 6. mDNS
         if self.enabled_sources['mdns']:
-            self.logger.info("⏳ mDNS scan (3/5)...")
+            self.logger.info("⏳ mDNS scan (6/8)...")
             results.append(await self.scanners['mdns'].scan())
             await asyncio.sleep(2)
         
-        # 4. NetBIOS (Windows)
-        if self.enabled_sources['netbios']:
-            self.logger.info("⏳ NetBIOS scan (4/5)...")
+        # 7. NetBIOS (Windows)
+        if self.enabled_sources['netbios'] and not self._should_defer('netbios'):
+            self.logger.info("⏳ NetBIOS scan (7/8)...")
             results.append(await self.scanners['netbios'].scan())
             await asyncio.sleep(2)
         
-        # 5. Nmap (le plus lent)
-        if self.enabled_sources['nmap']:
-            self.logger.info("⏳ nmap scan (5/5 - slowest)...")
+        # 8. Nmap (le plus lent)
+        if self.enabled_sources['nmap'] and not self._should_defer('nmap'):
+            self.logger.info("⏳ nmap scan (8/8 - slowest)...")
             results.append(await self.scanners['nmap'].scan())
         
         # Fusionner les résultats (SAUF Tailscale)
@@ -128,25 +201,48 @@ class MultiSourceScanner:
                 devices_by_mac[mac] = []
             devices_by_mac[mac].append(data)
         
+        # Probes TCP des devices en ligne (re-sondés seulement si cache périmé)
+        if self.enabled_sources['ports'] and not self._should_defer('ports'):
+            await self._probe_ports(devices_by_mac)
+        
+        # Reverse DNS en lot (cache partagé) pour les devices sans hostname
+        if self.enabled_sources['dns']:
+            await self._resolve_hostnames(devices_by_mac)
+        
+        # OS passif (observations des probes ping/TCP, aucun paquet émis)
+        self._add_os_fingerprints(devices_by_mac)
+        
         # Fusionner avec DeviceIntelligenceEngine
         unified_devices: List[UnifiedDevice] = []
+        engine_events: List[Dict[str, Any]] = []
         for mac, sources in devices_by_mac.items():
-            # Merger les données
-            merged_dict = self.engine.merge_device_data(sources)
-            
-            # Calculer confidence
-            confidence = self.engine.calculate_confidence(merged_dict, sources)
-            merged_dict['confidence_score'] = confidence
-            
-            # Détecter changements si device existant
-            if mac in self.last_unified_devices:
-                old_device = self.last_unified_devices[mac]
-                changes = self.engine.detect_changes(
-                    old_device.to_dict(),
-                    merged_dict
-                )
-                if changes:
-                    self.logger.info(f"📊 {len(changes)} changes detected for {mac[:17]}")
+            # Observations identiques au scan précédent: fusion réutilisée
+            key = fingerprint(sources)
+            merged_dict = self.merge_cache.get(mac, key)
+            if merged_dict is not None:
+                merged_dict.update(self.engine.volatile_fields(sources))
+            else:
+                # Merger les données
+                merged_dict = self.engine.merge_device_data(sources)
+                
+                # Calculer confidence
+                confidence = self.engine.calculate_confidence(merged_dict, sources)
+                merged_dict['confidence_score'] = confidence
+                
+                # Détecter changements si device existant
+                if mac in self.last_unified_devices:
+                    old_device = self.last_unified_devices[mac]
+                    changes = self.engine.detect_changes(
+                        old_device.to_dict(),
+                        merged_dict
+                    )
+                    if changes:
+                        self.logger.info(f"📊 {len(changes)} changes detected for {mac[:17]}")
+                    engine_events.extend(
+                        c.to_event() for c in changes if c.change_type not in REGISTRY_CHANGE_TYPES
+                    )
+                
+                self.merge_cache.put(mac, key, merged_dict)
             
             # Créer UnifiedDevice
             try:
@@ -161,6 +257,9 @@ class MultiSourceScanner:
         
         # Sauvegarder pour prochaine itération
         self.last_unified_devices = {d.mac: d for d in unified_devices}
+        self.merge_cache.evict_idle()
+        if engine_events:
+            (self.change_feed or get_network_registry().feed).extend(engine_events)
         
         # Stats
         duration = (datetime.now() - start_time).total_seconds()
@@ -169,6 +268,109 @@ class MultiSourceScanner:
         
         return unified_devices
     
+    async def _probe_ports(self, devices_by_mac: Dict[str, List[DeviceData]]) -> None:
+        """
+        Ajouter les résultats TCP-connect aux sources de chaque device
+        
+        Passent ensuite par DeviceIntelligenceEngine.merge_device_data
+        (union open_ports / services).
+        """
+        targets = {}
+        for mac, sources in devices_by_mac.items():
+            ip = next((s.ip for s in sources if s.ip and s.is_online), None)
+            if ip:
+                targets[mac] = ip
+        
+        if not targets:
+            return
+        
+        try:
+            results = await self.port_prober.probe_hosts(targets)
+        except Exception as e:
+            self.logger.error(f"Port probe error: {e}")
+            return
+        
+        for mac, result in results.items():
+            devices_by_mac[mac].append(self.port_prober.to_device_data(mac, result))
+        
+        stats = self.port_prober.get_statistics()
+        self.logger.info(f"🔌 Ports: {len(targets)} devices ({stats['cache_hits']} cache hits cumulés)")
+    
+    async def _resolve_hostnames(self, devices_by_mac: Dict[str, List[DeviceData]]) -> None:
+        """
+        PTR concurrents pour les devices avec IP mais sans hostname
+        """
+        targets = {}
+        for mac, sources in devices_by_mac.items():
+            if any(s.hostname for s in sources):
+                continue
+            ip = next((s.ip for s in sources if s.ip), None)
+            if ip:
+                targets[mac] = ip
+        
+        if not targets:
+            return
+        
+        try:
+            names = await self.resolver.reverse_many(targets.values())
+        except Exception as e:
+            self.logger.error(f"Reverse DNS error: {e}")
+            return
+        
+        resolved = 0
+        for mac, ip in targets.items():
+            if names.get(ip):
+                devices_by_mac[mac].append(DeviceData(
+                    mac=mac,
+                    ip=ip,
+                    hostname=names[ip],
+                    source='dns',
+                    timestamp=datetime.now(),
+                    scan_type='ptr',
+                ))
+                resolved += 1
+        
+        self.logger.info(f"🔤 DNS: {resolved}/{len(targets)} hostnames résolus")
+    
+    def _add_os_fingerprints(self, devices_by_mac: Dict[str, List[DeviceData]]) -> None:
+        """
+        Ajouter une source 'fingerprint' pour les devices sans OS détecté
+        """
+        for mac, sources in devices_by_mac.items():
+            if any(s.os_detected for s in sources):
+                continue
+            ip = next((s.ip for s in sources if s.ip), None)
+            guess = self.fingerprinter.infer(ip) if ip else None
+            if guess:
+                os_name, confidence = guess
+                sources.append(DeviceData(
+                    mac=mac,
+                    ip=ip,
+                    source='fingerprint',
+                    timestamp=datetime.now(),
+                    os_detected=os_name,
+                    os_confidence=confidence,
+                    scan_type='passive',
+                    metadata=self.fingerprinter.get_observation(ip),
+                ))
+    
+    def _should_defer(self, source: str) -> bool:
+        """
+        Différer une source lourde si l'hôte est en charge critique
+        
+        La raison est conservée dans throttled_sources (exposée via get_statistics).
+        """
+        if source not in self.heavy_sources:
+            return False
+        
+        load = self.host_load.snapshot()
+        if load.throttle_factor > 0:
+            return False
+        
+        self.throttled_sources[source] = load.reasons
+        self.logger.warning(f"🌡️ {source} différé (hôte en surcharge: {', '.join(load.reasons)})")
+        return True
+    
     def _create_unified_device(
         self,
         merged_dict: Dict[str, Any],
@@ -233,6 +435,33 @@ class MultiSourceScanner:
             if merged_dict.get('is_online'):
                 device.start_online_period()
         
+        # Capacités (ports/services fusionnés)
+        if merged_dict.get('open_ports'):
+            ports = merged_dict['open_ports']
+            device.capabilities.open_ports = ports
+            device.capabilities.services = merged_dict.get('services', [])
+            device.capabilities.has_web_interface = bool(WEB_PORTS.intersection(ports))
+        
+        # Type: scoring hostname/vendor/services si aucune source ne l'a fourni
+        if merged_dict.get('device_type'):
+            device.device_type = merged_dict['device_type']
+        elif not device.device_type:
+            identification = self.identifier.identify(
+                device.hostname, device.vendor, merged_dict.get('services')
+            )
+            if identification['confidence'] != 'low':
+                device.device_type = identification['device_type']
+        
+        # Données brutes de la box (LAN browser)
+        freebox = next((s for s in sources if s.source == 'freebox'), None)
+        if freebox:
+            device.freebox_data = freebox.metadata
+        
+        # Client id DHCP (bail): signal d'identité pour le registry
+        client_id = next((s.metadata['client_id'] for s in sources if s.metadata.get('client_id')), None)
+        if client_id:
+            device.dhcp_client_id = client_id
+        
         # Update stats
         device.sources = merged_dict.get('sources', [])
         device.confidence_score = merged_dict.get('confidence_score', 0.0)
@@ -301,6 +530,8 @@ class MultiSourceScanner:
                 'total_devices': 0,
                 'online_devices': 0,
                 'sources_used': [],
+                'throttled_sources': self.throttled_sources,
+                'merge_cache': self.merge_cache.get_statistics(),
             }
         
         devices = list(self.last_unified_devices.values())
@@ -314,4 +545,6 @@ class MultiSourceScanner:
             'online_devices': online,
             'sources_used': sorted(list(sources_used)),
             'average_confidence': sum(d.confidence_score for d in devices) / len(devices),
+            'throttled_sources': self.throttled_sources,
+            'merge_cache': self.merge_cache.get_statistics(),
         }
@@ -0,0 +1,206 @@
+"""
+🏠 333HOME - TCP Port Prober
+
+Moteur de probes TCP-connect asynchrone (sans root, sans nmap):
+remplit open_ports / services pour DeviceCapabilities et le scoring
+"services" de DeviceIdentifier.
+
+- Limite globale de connexions en vol (Semaphore)
+- Pacing par hôte (concurrence + intervalle min entre deux connexions)
+- Cache par device avec TTL: un hôte n'est re-sondé que si périmé
+- Options TCP du SYN-ACK transmises au fingerprinting OS passif
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.core.device_intelligence import DeviceData
+from ..os_fingerprint import get_os_fingerprinter, read_tcp_options
+
+
+logger = logging.getLogger(__name__)
+
+# Ports sondés par défaut → nom de service
+DEFAULT_PORTS = {
+    22: 'ssh',
+    53: 'dns',
+    80: 'http',
+    135: 'msrpc',
+    139: 'netbios-ssn',
+    443: 'https',
+    445: 'smb',
+    554: 'rtsp',
+    631: 'ipp',
+    1883: 'mqtt',
+    3389: 'rdp',
+    5000: 'upnp',
+    5900: 'vnc',
+    8008: 'http-alt',
+    8009: 'cast',
+    8080: 'http-proxy',
+    8443: 'https-alt',
+    9080: 'http-alt',
+    9100: 'jetdirect',
+    62078: 'iphone-sync',
+}
+
+WEB_PORTS = {80, 443, 8008, 8080, 8443, 9080}
+
+
+@dataclass
+class PortProbeResult:
+    """Résultat des probes d'un hôte"""
+    ip: str
+    open_ports: List[int] = field(default_factory=list)
+    reachable: bool = False         # Au moins un port ouvert ou refusé (RST)
+    probed_at: float = 0.0          # time.monotonic()
+    duration_ms: float = 0.0
+
+    @property
+    def services(self) -> List[str]:
+        """Ports ouverts au format attendu par DeviceIdentifier ('22', '80'...)"""
+        return [str(p) for p in self.open_ports]
+
+
+class TCPPortProber:
+    """
+    Probes TCP-connect avec limite globale, pacing par hôte et cache TTL
+    """
+
+    def __init__(
+        self,
+        ports: Optional[List[int]] = None,
+        max_in_flight: int = 64,
+        per_host_concurrency: int = 4,
+        per_host_interval: float = 0.02,
+        connect_timeout: float = 1.0,
+        cache_ttl: float = 3600.0,
+    ):
+        self.ports = sorted(ports or DEFAULT_PORTS)
+        self.max_in_flight = max_in_flight
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_interval = per_host_interval
+        self.connect_timeout = connect_timeout
+        self.cache_ttl = cache_ttl
+
+        self.fingerprinter = get_os_fingerprinter()
+        self._cache: Dict[str, PortProbeResult] = {}
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Statistiques
+        self.cache_hits = 0
+        self.hosts_probed = 0
+        self.connects = 0
+
+    def _global_limit(self) -> asyncio.Semaphore:
+        # Semaphore lié à la boucle courante (recréé si la boucle change)
+        loop = asyncio.get_running_loop()
+        if self._in_flight is None or self._loop is not loop:
+            self._in_flight = asyncio.Semaphore(self.max_in_flight)
+            self._loop = loop
+        return self._in_flight
+
+    def get_cached(self, key: str) -> Optional[PortProbeResult]:
+        """Résultat en cache s'il est encore frais"""
+        result = self._cache.get(key)
+        if result and time.monotonic() - result.probed_at < self.cache_ttl:
+            return result
+        return None
+
+    async def _connect(self, ip: str, port: int) -> Optional[bool]:
+        """True = ouvert, False = refusé (hôte présent), None = filtré/timeout"""
+        async with self._global_limit():
+            self.connects += 1
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(ip, port), self.connect_timeout
+                )
+            except ConnectionRefusedError:
+                return False
+            except (OSError, asyncio.TimeoutError):
+                return None
+            # SYN-ACK déjà reçu: options TCP lues localement (0 paquet en plus)
+            self.fingerprinter.observe_tcp(ip, read_tcp_options(writer.get_extra_info('socket')))
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+            return True
+
+    async def probe_host(self, ip: str, key: Optional[str] = None, force: bool = False) -> PortProbeResult:
+        """
+        Sonder un hôte (ou retourner le cache s'il est frais)
+
+        Args:
+            ip: IP à sonder
+            key: Clé de cache (MAC de préférence, IP par défaut)
+            force: Ignorer le cache
+        """
+        key = (key or ip).upper()
+        cached = None if force else self.get_cached(key)
+        if cached and cached.ip == ip:
+            self.cache_hits += 1
+            return cached
+
+        start = time.monotonic()
+        host_slots = asyncio.Semaphore(self.per_host_concurrency)
+
+        async def paced(index: int, port: int) -> Optional[bool]:
+            # Étaler les SYN vers un même hôte (IoT fragiles, IDS des box)
+            await asyncio.sleep(index * self.per_host_interval)
+            async with host_slots:
+                return await self._connect(ip, port)
+
+        results = await asyncio.gather(*(paced(i, p) for i, p in enumerate(self.ports)))
+
+        result = PortProbeResult(
+            ip=ip,
+            open_ports=[p for p, state in zip(self.ports, results) if state],
+            reachable=any(state is not None for state in results),
+            probed_at=time.monotonic(),
+            duration_ms=(time.monotonic() - start) * 1000,
+        )
+        self._cache[key] = result
+        self.hosts_probed += 1
+        logger.debug(f"🔌 {ip}: {len(result.open_ports)} ports ouverts ({result.duration_ms:.0f}ms)")
+        return result
+
+    async def probe_hosts(self, targets: Dict[str, str], force: bool = False) -> Dict[str, PortProbeResult]:
+        """
+        Sonder plusieurs hôtes en parallèle (limite globale partagée)
+
+        Args:
+            targets: {mac: ip}
+        """
+        macs = list(targets)
+        results = await asyncio.gather(*(self.probe_host(targets[m], key=m, force=force) for m in macs))
+        return dict(zip(macs, results))
+
+    def to_device_data(self, mac: str, result: PortProbeResult) -> DeviceData:
+        """Résultat → DeviceData (source 'portscan') pour la fusion intelligence"""
+        return DeviceData(
+            mac=mac.upper(),
+            ip=result.ip,
+            source='portscan',
+            is_online=result.reachable,
+            timestamp=datetime.now(),
+            open_ports=list(result.open_ports),
+            services=result.services,
+            scan_type='tcp_connect',
+            metadata={'service_names': [DEFAULT_PORTS.get(p, str(p)) for p in result.open_ports]},
+        )
+
+    def get_statistics(self) -> Dict[str, int]:
+        return {
+            'ports': len(self.ports),
+            'cached_hosts': len(self._cache),
+            'cache_hits': self.cache_hits,
+            'hosts_probed': self.hosts_probed,
+            'connects': self.connects,
+        }
@@ -0,0 +1,103 @@
+"""
+🏠 333HOME - Router API Scanner
+
+Source "box/routeur": inventaire complet du LAN en un appel HTTP à l'API
+du routeur (hôtes connus, adresses, joignabilité), au lieu d'un balayage
+du subnet.
+
+Interface pluggable: chaque box implémente RouterAPISource.
+Box supportées: Freebox OS (freebox_api.py).
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type
+
+from src.core.config import settings
+from src.core.device_intelligence import DeviceData
+
+
+logger = logging.getLogger(__name__)
+
+
+class RouterAPIError(Exception):
+    """Erreur de l'API du routeur (auth refusée, réponse invalide...)"""
+
+
+class RouterAPISource(ABC):
+    """
+    Interface d'une API routeur
+
+    `name` est utilisé comme DeviceData.source (doit correspondre à un poids
+    de DeviceIntelligenceEngine.confidence_weights).
+    """
+
+    name: str = "router"
+
+    @abstractmethod
+    async def fetch_hosts(self) -> List[DeviceData]:
+        """Récupérer tous les hôtes connus du routeur"""
+
+    @classmethod
+    @abstractmethod
+    def from_settings(cls) -> Optional['RouterAPISource']:
+        """Instancier depuis la config (None si non configuré)"""
+
+
+def _router_sources() -> Dict[str, Type[RouterAPISource]]:
+    from .freebox_api import FreeboxAPISource
+    return {
+        'freebox': FreeboxAPISource,
+    }
+
+
+def create_router_source(kind: Optional[str] = None) -> Optional[RouterAPISource]:
+    """
+    Créer la source routeur configurée (HOME333_ROUTER_API)
+
+    Returns:
+        RouterAPISource ou None (désactivé / type inconnu / non configuré)
+    """
+    kind = (kind if kind is not None else settings.router_api).lower()
+    if not kind:
+        return None
+
+    source_cls = _router_sources().get(kind)
+    if source_cls is None:
+        logger.warning(f"Router API: type inconnu '{kind}'")
+        return None
+    return source_cls.from_settings()
+
+
+class RouterScanner:
+    """
+    Scanner routeur: délègue à la RouterAPISource configurée
+    """
+
+    def __init__(self, subnet: str = "192.168.1.0/24", source: Optional[RouterAPISource] = None):
+        self.subnet = subnet
+        self.source = source if source is not None else create_router_source()
+        self.logger = logger
+
+    @property
+    def enabled(self) -> bool:
+        return self.source is not None
+
+    async def scan(self) -> List[DeviceData]:
+        """
+        Scan routeur: un appel API = inventaire complet
+        """
+        if self.source is None:
+            return []
+
+        self.logger.info(f"📡 Router API ({self.source.name}): Starting...")
+        devices = []
+
+        try:
+            devices = await self.source.fetch_hosts()
+            online = sum(1 for d in devices if d.is_online)
+            self.logger.info(f"📡 Router API: Found {len(devices)} hosts ({online} reachable)")
+        except Exception as e:
+            self.logger.error(f"Router API scan error: {e}")
+
+        return devices
@@ -207,6 +207,9 @@ class UnifiedDevice:
     # === FREEBOX SPECIFIC ===
     freebox_data: Optional[Dict[str, Any]] = None
     
+    # === DHCP ===
+    dhcp_client_id: Optional[str] = None   # Option 61 (stable malgré la rotation MAC)
+    
     @property
     def is_online(self) -> bool:
         """Raccourci pour vérifier si le device est en ligne"""
@@ -385,6 +388,7 @@ class UnifiedDevice:
             
             # Freebox
             'freebox_data': self.freebox_data,
+            'dhcp_client_id': self.dhcp_client_id,
             
             # Helpers
             'display_name': self.display_name,
@@ -481,4 +485,5 @@ class UnifiedDevice:
             tags=data.get('tags', []),
             notes=data.get('notes', ''),
             freebox_data=data.get('freebox_data'),
+            dhcp_client_id=data.get('dhcp_client_id'),
         )
@@ -0,0 +1,359 @@
+"""
+🏠 333HOME - SNMP Client (v2c)
+
+Client SNMPv2c asynchrone minimal: encodage BER + GETBULK sur UDP.
+Suffisant pour parcourir des tables (bulk walk) sans dépendance externe
+(pysnmp 4.4.x est incompatible avec pyasn1 >= 0.5).
+
+Types supportés: INTEGER, OCTET STRING, NULL, OID, IpAddress,
+Counter32, Gauge32, TimeTicks, Counter64 + exceptions v2 (endOfMibView...).
+"""
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+Oid = Tuple[int, ...]
+
+# Tags BER
+TAG_INTEGER = 0x02
+TAG_OCTET_STRING = 0x04
+TAG_NULL = 0x05
+TAG_OID = 0x06
+TAG_SEQUENCE = 0x30
+TAG_IP_ADDRESS = 0x40
+TAG_COUNTER32 = 0x41
+TAG_GAUGE32 = 0x42
+TAG_TIMETICKS = 0x43
+TAG_COUNTER64 = 0x46
+
+# PDUs
+PDU_GET_NEXT = 0xA1
+PDU_RESPONSE = 0xA2
+PDU_GET_BULK = 0xA5
+
+SNMP_VERSION_2C = 1
+
+
+class SnmpError(Exception):
+    """Erreur protocole SNMP (réponse invalide ou error-status != 0)"""
+
+
+class SnmpException:
+    """Valeur d'exception SNMPv2 (noSuchObject, noSuchInstance, endOfMibView)"""
+
+    def __init__(self, name: str, tag: int):
+        self.name = name
+        self.tag = tag
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+NO_SUCH_OBJECT = SnmpException('noSuchObject', 0x80)
+NO_SUCH_INSTANCE = SnmpException('noSuchInstance', 0x81)
+END_OF_MIB_VIEW = SnmpException('endOfMibView', 0x82)
+_EXCEPTIONS = {e.tag: e for e in (NO_SUCH_OBJECT, NO_SUCH_INSTANCE, END_OF_MIB_VIEW)}
+
+
+def parse_oid(oid: str) -> Oid:
+    """'1.3.6.1' → (1, 3, 6, 1)"""
+    return tuple(int(part) for part in oid.strip('.').split('.'))
+
+
+# === ENCODAGE BER ===
+
+def _encode_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes([length])
+    raw = length.to_bytes((length.bit_length() + 7) // 8, 'big')
+    return bytes([0x80 | len(raw)]) + raw
+
+
+def _tlv(tag: int, payload: bytes) -> bytes:
+    return bytes([tag]) + _encode_length(len(payload)) + payload
+
+
+def _encode_integer(value: int, tag: int = TAG_INTEGER) -> bytes:
+    length = max(1, (value.bit_length() + 8) // 8)
+    return _tlv(tag, value.to_bytes(length, 'big', signed=True))
+
+
+def _encode_oid(oid: Oid) -> bytes:
+    if len(oid) < 2:
+        raise SnmpError(f"OID trop court: {oid}")
+    payload = bytearray([oid[0] * 40 + oid[1]])
+    for arc in oid[2:]:
+        chunk = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        payload.extend(reversed(chunk))
+    return _tlv(TAG_OID, bytes(payload))
+
+
+def _encode_value(value: Any) -> bytes:
+    if value is None:
+        return _tlv(TAG_NULL, b'')
+    if isinstance(value, SnmpException):
+        return _tlv(value.tag, b'')
+    if isinstance(value, bool) or not isinstance(value, (int, bytes, tuple)):
+        raise SnmpError(f"Type de valeur non supporté: {type(value).__name__}")
+    if isinstance(value, int):
+        return _encode_integer(value)
+    if isinstance(value, bytes):
+        return _tlv(TAG_OCTET_STRING, value)
+    return _encode_oid(value)
+
+
+def encode_message(
+    pdu_type: int,
+    request_id: int,
+    varbinds: List[Tuple[Oid, Any]],
+    community: str = 'public',
+    field_a: int = 0,
+    field_b: int = 0,
+) -> bytes:
+    """
+    Encoder un message SNMPv2c
+
+    field_a/field_b = (non-repeaters, max-repetitions) pour GETBULK,
+    (error-status, error-index) pour les autres PDUs.
+    """
+    vb_payload = b''.join(
+        _tlv(TAG_SEQUENCE, _encode_oid(oid) + _encode_value(value))
+        for oid, value in varbinds
+    )
+    pdu = _tlv(pdu_type, (
+        _encode_integer(request_id)
+        + _encode_integer(field_a)
+        + _encode_integer(field_b)
+        + _tlv(TAG_SEQUENCE, vb_payload)
+    ))
+    return _tlv(TAG_SEQUENCE, (
+        _encode_integer(SNMP_VERSION_2C)
+        + _tlv(TAG_OCTET_STRING, community.encode())
+        + pdu
+    ))
+
+
+# === DÉCODAGE BER ===
+
+def _read_tlv(data: bytes, pos: int) -> Tuple[int, bytes, int]:
+    """Lire un TLV → (tag, payload, position suivante)"""
+    try:
+        tag = data[pos]
+        length = data[pos + 1]
+        pos += 2
+        if length & 0x80:
+            n = length & 0x7F
+            length = int.from_bytes(data[pos:pos + n], 'big')
+            pos += n
+    except IndexError:
+        raise SnmpError("Message tronqué")
+    end = pos + length
+    if end > len(data):
+        raise SnmpError("Message tronqué")
+    return tag, data[pos:end], end
+
+
+def _decode_oid(payload: bytes) -> Oid:
+    if not payload:
+        raise SnmpError("OID vide")
+    first = payload[0]
+    arcs = [min(first // 40, 2), first - 40 * min(first // 40, 2)]
+    arc = 0
+    for byte in payload[1:]:
+        arc = (arc << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(arc)
+            arc = 0
+    return tuple(arcs)
+
+
+def _decode_value(tag: int, payload: bytes) -> Any:
+    if tag == TAG_INTEGER:
+        return int.from_bytes(payload, 'big', signed=True)
+    if tag in (TAG_COUNTER32, TAG_GAUGE32, TAG_TIMETICKS, TAG_COUNTER64):
+        return int.from_bytes(payload, 'big', signed=False)
+    if tag == TAG_OCTET_STRING:
+        return bytes(payload)
+    if tag == TAG_IP_ADDRESS:
+        return '.'.join(str(b) for b in payload)
+    if tag == TAG_OID:
+        return _decode_oid(payload)
+    if tag == TAG_NULL:
+        return None
+    if tag in _EXCEPTIONS:
+        return _EXCEPTIONS[tag]
+    raise SnmpError(f"Tag BER inconnu: 0x{tag:02x}")
+
+
+def decode_message(data: bytes) -> Dict[str, Any]:
+    """
+    Décoder un message SNMPv2c
+
+    Returns:
+        {version, community, pdu_type, request_id, field_a, field_b, varbinds}
+    """
+    tag, message, _ = _read_tlv(data, 0)
+    if tag != TAG_SEQUENCE:
+        raise SnmpError("Message SNMP invalide")
+
+    _, version, pos = _read_tlv(message, 0)
+    _, community, pos = _read_tlv(message, pos)
+    pdu_type, pdu, _ = _read_tlv(message, pos)
+
+    fields = []
+    pos = 0
+    for _ in range(3):
+        _, raw, pos = _read_tlv(pdu, pos)
+        fields.append(int.from_bytes(raw, 'big', signed=True))
+    _, vb_list, _ = _read_tlv(pdu, pos)
+
+    varbinds = []
+    pos = 0
+    while pos < len(vb_list):
+        _, vb, pos = _read_tlv(vb_list, pos)
+        _, oid_raw, vpos = _read_tlv(vb, 0)
+        value_tag, value_raw, _ = _read_tlv(vb, vpos)
+        varbinds.append((_decode_oid(oid_raw), _decode_value(value_tag, value_raw)))
+
+    return {
+        'version': int.from_bytes(version, 'big'),
+        'community': community.decode(errors='replace'),
+        'pdu_type': pdu_type,
+        'request_id': fields[0],
+        'field_a': fields[1],
+        'field_b': fields[2],
+        'varbinds': varbinds,
+    }
+
+
+# === TRANSPORT UDP ===
+
+class _SnmpProtocol(asyncio.DatagramProtocol):
+    """Associe chaque réponse à sa requête via request-id"""
+
+    def __init__(self):
+        self.pending: Dict[int, asyncio.Future] = {}
+
+    def datagram_received(self, data: bytes, addr):
+        try:
+            message = decode_message(data)
+        except SnmpError as e:
+            logger.debug(f"SNMP: réponse ignorée de {addr}: {e}")
+            return
+        future = self.pending.pop(message['request_id'], None)
+        if future and not future.done():
+            future.set_result(message)
+
+    def error_received(self, exc):
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(exc)
+        self.pending.clear()
+
+
+class SnmpClient:
+    """
+    Client SNMPv2c asynchrone (un socket UDP par agent)
+
+    Usage:
+        async with SnmpClient('192.168.1.2') as client:
+            rows = await client.bulk_walk('1.3.6.1.2.1.4.22.1.2')
+    """
+
+    _request_ids = itertools.count(1)
+
+    def __init__(
+        self,
+        host: str,
+        community: str = 'public',
+        port: int = 161,
+        timeout: float = 2.0,
+        retries: int = 1,
+        max_repetitions: int = 25,
+    ):
+        self.host = host
+        self.community = community
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.max_repetitions = max_repetitions
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._protocol: Optional[_SnmpProtocol] = None
+
+    async def __aenter__(self) -> 'SnmpClient':
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    async def open(self):
+        if self._transport is None:
+            loop = asyncio.get_running_loop()
+            self._transport, self._protocol = await loop.create_datagram_endpoint(
+                _SnmpProtocol, remote_addr=(self.host, self.port)
+            )
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+            self._protocol = None
+
+    async def _request(self, pdu_type: int, varbinds: List[Tuple[Oid, Any]], field_a: int, field_b: int) -> Dict[str, Any]:
+        await self.open()
+        for attempt in range(self.retries + 1):
+            request_id = next(self._request_ids) & 0x7FFFFFFF
+            future = asyncio.get_running_loop().create_future()
+            self._protocol.pending[request_id] = future
+            self._transport.sendto(encode_message(
+                pdu_type, request_id, varbinds, self.community, field_a, field_b
+            ))
+            try:
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                self._protocol.pending.pop(request_id, None)
+                logger.debug(f"SNMP: timeout {self.host} (essai {attempt + 1}/{self.retries + 1})")
+        raise asyncio.TimeoutError(f"SNMP: pas de réponse de {self.host}:{self.port}")
+
+    async def get_bulk(self, oid: Oid, max_repetitions: Optional[int] = None) -> List[Tuple[Oid, Any]]:
+        """Une requête GETBULK (non-repeaters=0) à partir de `oid`"""
+        response = await self._request(
+            PDU_GET_BULK, [(oid, None)], 0, max_repetitions or self.max_repetitions
+        )
+        if response['field_a'] != 0:
+            raise SnmpError(f"SNMP error-status={response['field_a']} de {self.host}")
+        return response['varbinds']
+
+    async def bulk_walk(self, root: str) -> List[Tuple[Oid, Any]]:
+        """
+        Parcourir une sous-arborescence par GETBULK successifs
+
+        Returns:
+            Liste (oid, valeur) triée, limitée à la sous-arborescence `root`
+        """
+        root_oid = parse_oid(root)
+        rows: List[Tuple[Oid, Any]] = []
+        current = root_oid
+
+        while True:
+            varbinds = await self.get_bulk(current)
+            if not varbinds:
+                return rows
+            for oid, value in varbinds:
+                if isinstance(value, SnmpException) or oid[:len(root_oid)] != root_oid:
+                    return rows
+                if oid <= current:
+                    # Agent non conforme (OID non croissant) → éviter une boucle infinie
+                    logger.warning(f"SNMP: OID non croissant de {self.host}, walk interrompu")
+                    return rows
+                rows.append((oid, value))
+                current = oid
@@ -0,0 +1,178 @@
+"""
+🏠 333HOME - SNMP Scanner
+
+Scanner SNMP pour switches et APs managés.
+Bulk-walk des tables BRIDGE-MIB / Q-BRIDGE-MIB (MAC → port) et
+ipNetToMedia (IP → MAC) : quelques requêtes par agent donnent
+MAC ↔ IP ↔ port pour tout le réseau, sans balayer le subnet.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from src.core.config import settings
+from src.core.device_intelligence import DeviceData
+from .snmp_client import SnmpClient, parse_oid
+
+
+logger = logging.getLogger(__name__)
+
+# Tables parcourues
+IP_NET_TO_MEDIA_PHYS = '1.3.6.1.2.1.4.22.1.2'       # index: ifIndex.a.b.c.d → MAC
+DOT1D_BASE_PORT_IFINDEX = '1.3.6.1.2.1.17.1.4.1.2'  # index: bridgePort → ifIndex
+DOT1D_TP_FDB_PORT = '1.3.6.1.2.1.17.4.3.1.2'        # index: MAC (6 arcs) → bridgePort
+DOT1Q_TP_FDB_PORT = '1.3.6.1.2.1.17.7.1.2.2.1.2'    # index: fdbId.MAC → bridgePort
+IF_NAME = '1.3.6.1.2.1.31.1.1.1.1'                  # index: ifIndex → nom (ex: "gi0/3")
+
+TABLES = (IP_NET_TO_MEDIA_PHYS, DOT1D_BASE_PORT_IFINDEX, DOT1D_TP_FDB_PORT, DOT1Q_TP_FDB_PORT, IF_NAME)
+
+
+def _format_mac(octets) -> Optional[str]:
+    if len(octets) != 6:
+        return None
+    return ':'.join(f'{b:02X}' for b in octets)
+
+
+def _index(oid: Tuple[int, ...], table: str) -> Tuple[int, ...]:
+    return oid[len(parse_oid(table)):]
+
+
+class SNMPScanner:
+    """
+    Scanner SNMP: tables bridge/ARP des équipements managés
+
+    Les agents sont configurés via HOME333_SNMP_TARGETS (host ou host:port).
+    Sans agent configuré, la source est inactive.
+    """
+
+    def __init__(
+        self,
+        subnet: str = "192.168.1.0/24",
+        targets: Optional[List[str]] = None,
+        community: Optional[str] = None,
+        timeout: float = 2.0,
+    ):
+        self.subnet = subnet
+        self.targets = list(targets if targets is not None else settings.snmp_targets)
+        self.community = community or settings.snmp_community
+        self.timeout = timeout
+        self.logger = logger
+
+    async def scan(self) -> List[DeviceData]:
+        """
+        Scan SNMP: walk des tables de chaque agent (en parallèle)
+
+        Un agent en échec est journalisé et ignoré. Un MAC vu sur plusieurs switches est rattaché au port qui apprend
+        le moins de MACs (port d'accès plutôt qu'uplink).
+        """
+        if not self.targets:
+            return []
+
+        self.logger.info(f"📡 SNMP: Starting ({len(self.targets)} agents)...")
+        devices: List[DeviceData] = []
+
+        try:
+            per_agent = await asyncio.gather(
+                *(self._walk_agent(t) for t in self.targets),
+                return_exceptions=True,
+            )
+
+            ips: Dict[str, str] = {}
+            locations: Dict[str, List[Dict]] = {}
+            port_load: Counter = Counter()
+            for target, result in zip(self.targets, per_agent):
+                if isinstance(result, Exception):
+                    # Un agent en échec n'invalide pas les tables des autres
+                    self.logger.warning(f"SNMP: agent {target} en échec ({result!r})")
+                    continue
+                agent_ips, agent_fdb = result
+                ips.update(agent_ips)
+                for mac, location in agent_fdb.items():
+                    locations.setdefault(mac, []).append(location)
+                    port_load[(location['snmp_agent'], location['bridge_port'])] += 1
+
+            for mac in sorted(set(ips) | set(locations)):
+                metadata = {}
+                if mac in locations:
+                    metadata = min(
+                        locations[mac],
+                        key=lambda loc: port_load[(loc['snmp_agent'], loc['bridge_port'])]
+                    )
+                devices.append(DeviceData(
+                    mac=mac,
+                    ip=ips.get(mac),
+                    source='snmp',
+                    is_online=True,
+                    timestamp=datetime.now(),
+                    scan_type='snmp_bridge' if metadata else 'snmp_arp',
+                    metadata=metadata,
+                ))
+
+            self.logger.info(f"📡 SNMP: Found {len(devices)} devices")
+
+        except Exception as e:
+            self.logger.error(f"SNMP scan error: {e}")
+
+        return devices
+
+    async def _walk_agent(self, target: str) -> Tuple[Dict[str, str], Dict[str, Dict]]:
+        """
+        Parcourir les tables d'un agent
+
+        Returns:
+            ({mac: ip}, {mac: {snmp_agent, bridge_port, switch_port, vlan}})
+        """
+        host, _, port = target.partition(':')
+        client = SnmpClient(host, self.community, port=int(port or 161), timeout=self.timeout)
+
+        async with client:
+            results = await asyncio.gather(
+                *(client.bulk_walk(table) for table in TABLES),
+                return_exceptions=True,
+            )
+
+        tables = {}
+        for table, result in zip(TABLES, results):
+            if isinstance(result, Exception):
+                # Table non supportée (ex: pas de Q-BRIDGE) ou agent muet
+                self.logger.debug(f"SNMP {target}: {table} indisponible ({result!r})")
+                result = []
+            tables[table] = result
+
+        if all(isinstance(r, Exception) for r in results):
+            self.logger.warning(f"SNMP: agent {target} injoignable")
+
+        ips: Dict[str, str] = {}
+        for oid, value in tables[IP_NET_TO_MEDIA_PHYS]:
+            index = _index(oid, IP_NET_TO_MEDIA_PHYS)
+            mac = _format_mac(value) if isinstance(value, bytes) else None
+            if mac and len(index) == 5:
+                ips[mac] = '.'.join(str(b) for b in index[1:])
+
+        if_index = {_index(oid, DOT1D_BASE_PORT_IFINDEX)[0]: value for oid, value in tables[DOT1D_BASE_PORT_IFINDEX]}
+        if_name = {
+            _index(oid, IF_NAME)[0]: value.decode(errors='replace')
+            for oid, value in tables[IF_NAME] if isinstance(value, bytes)
+        }
+
+        # Q-BRIDGE (avec VLAN) prioritaire, BRIDGE-MIB en complément
+        fdb: Dict[str, Dict] = {}
+        for table in (DOT1Q_TP_FDB_PORT, DOT1D_TP_FDB_PORT):
+            for oid, bridge_port in tables[table]:
+                index = _index(oid, table)
+                mac = _format_mac(index[-6:])
+                if not mac or mac in fdb or not bridge_port:
+                    continue
+                port_name = if_name.get(if_index.get(bridge_port), f"port{bridge_port}")
+                fdb[mac] = {
+                    'snmp_agent': target,
+                    'bridge_port': bridge_port,
+                    'switch_port': port_name,
+                    'vlan': index[0] if table == DOT1Q_TP_FDB_PORT and len(index) == 7 else None,
+                }
+
+        self.logger.debug(f"SNMP {target}: {len(ips)} IP, {len(fdb)} FDB")
+        return ips, fdb
@@ -10,9 +10,11 @@ Récupère les hostnames et IPs VPN via 'tailscale status --json'.
 import asyncio
 import json
 import logging
-import re
+import socket
 from typing import Dict, Optional
 
+from ..dns_resolver import get_dns_resolver
+
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,7 @@ class TailscaleScanner:
     def __init__(self, subnet: str = "192.168.1.0/24"):
         self.subnet = subnet
         self.logger = logger
+        self.resolver = get_dns_resolver()
     
     async def scan(self) -> Dict[str, Dict[str, str]]:
         """
@@ -91,22 +94,24 @@ class TailscaleScanner:
                     self.logger.info(f"📡 Tailscale: Added Self ({hostname} - {vpn_ip})")
             
             # 2. Itérer sur les peers (autres devices)
-            for peer_id, peer_data in data.get('Peer', {}).items():
-                hostname = peer_data.get('HostName', '').strip()
-                tailscale_ips = peer_data.get('TailscaleIPs', [])
+            peers = [
+                p for p in data.get('Peer', {}).values()
+                if p.get('HostName', '').strip() and p.get('TailscaleIPs')
+            ]
+            
+            # Résoudre tous les hostnames vers une IP locale en un lot
+            local_ips = await asyncio.gather(
+                *(self._resolve_to_local_ip(p['HostName'].strip()) for p in peers)
+            )
+            
+            for peer_data, local_ip in zip(peers, local_ips):
+                hostname = peer_data['HostName'].strip()
                 is_online = peer_data.get('Online', False)  # ⚠️ CRITIQUE: vérifier si VPN actif
-                
-                if not hostname or not tailscale_ips:
-                    continue
-                
-                vpn_ip = tailscale_ips[0]  # Première IP Tailscale
+                vpn_ip = peer_data['TailscaleIPs'][0]  # Première IP Tailscale
                 
                 # Normaliser hostname (enlever domain si présent)
                 hostname_short = hostname.split('.')[0].upper()
                 
-                # Essayer de résoudre vers une IP locale
-                local_ip = await self._resolve_to_local_ip(hostname)
-                
                 enrichment_map[hostname_short] = {
                     'vpn_ip': vpn_ip,
                     'local_ip': local_ip,  # Peut être None
@@ -126,26 +131,21 @@ class TailscaleScanner:
         """
         Résoudre un hostname vers une IP locale (192.168.x.x)
         
-        Utilise getent hosts pour tenter de résoudre le hostname
-        vers une IP du réseau local.
+        DNS via le résolveur partagé (cache TTL), puis getaddrinfo
+        (nsswitch: /etc/hosts, mDNS) sans subprocess.
         """
         try:
-            proc = await asyncio.create_subprocess_shell(
-                f"getent hosts {hostname}",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            stdout, _ = await proc.communicate()
+            local_ip = await self.resolver.resolve(hostname)
+            if not local_ip:
+                infos = await asyncio.wait_for(
+                    asyncio.get_running_loop().getaddrinfo(hostname, None, family=socket.AF_INET),
+                    timeout=2.0
+                )
+                local_ip = infos[0][4][0] if infos else None
             
-            if proc.returncode == 0:
-                output = stdout.decode().strip()
-                # Format: IP hostname
-                parts = output.split()
-                if parts:
-                    local_ip = parts[0]
-                    # Vérifier que c'est bien une IP locale (192.168.x.x ou 10.x.x.x)
-                    if local_ip.startswith(('192.168.', '10.', '172.')):
-                        return local_ip
+            # Vérifier que c'est bien une IP locale (192.168.x.x ou 10.x.x.x)
+            if local_ip and local_ip.startswith(('192.168.', '10.', '172.')):
+                return local_ip
         except Exception as e:
             self.logger.debug(f"Could not resolve {hostname}: {e}")
         
@@ -34,6 +34,9 @@ class NetworkEventType(str, Enum):
     MAC_CHANGED = "mac_changed"
     HOSTNAME_CHANGED = "hostname_changed"
     DEVICE_PROMOTED = "device_promoted"
+    TRAFFIC_SPIKE = "traffic_spike"
+    LATENCY_DEGRADED = "latency_degraded"
+    PACKET_LOSS = "packet_loss"
 
 
 # === NETWORK DEVICE ===
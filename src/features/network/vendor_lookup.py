@@ -1,8 +1,9 @@
 """
 🏠 333HOME - MAC Vendor Lookup Service
 
-Service de lookup vendor via MAC address avec fallback sur API externe.
-Utilise cache local pour éviter trop de requêtes API.
+Service de lookup vendor via MAC address: base OUI locale (overlay curé +
+registre IEEE complet hors ligne), fallback sur API externe pour les
+préfixes absents. Utilise cache local pour éviter trop de requêtes API.
 
 API: https://macvendors.com/api
 """
@@ -15,6 +16,8 @@ from typing import Optional, Dict
 from datetime import datetime, timedelta
 import aiohttp
 
+from .detector import ExtendedOUIDatabase
+
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,7 @@ class VendorLookupService:
         self.api_url = "https://api.macvendors.com/"
         self.rate_limit_delay = 1.0  # 1s entre requêtes (rate limit API)
         self.last_api_call = None
+        self.oui_db = ExtendedOUIDatabase()
         self._load_cache()
     
     def _load_cache(self):
@@ -98,9 +102,9 @@ class VendorLookupService:
         Lookup vendor par MAC address
         
         1. Vérifie cache local (évite requêtes API répétées)
-        2. Essaie API MacVendors (source la plus à jour)
-        3. Fallback sur OUI database locale si API fail
-        4. Sauvegarde résultat dans cache
+        2. OUI database locale (overlay + registre IEEE, sans réseau)
+        3. Fallback sur API MacVendors (préfixes absents du registre)
+        4. Sauvegarde résultat API dans cache
         
         Args:
             mac: Adresse MAC complète (AA:BB:CC:DD:EE:FF)
@@ -124,21 +128,14 @@ class VendorLookupService:
             logger.debug(f"📦 Cache hit: {oui} → {vendor}")
             return vendor
         
-        # 2. Essayer API MacVendors (source la plus à jour)
-        vendor = await self._api_lookup(oui)
+        # 2. OUI database locale (pas de réseau, pas de rate limit)
+        oui_info = self.oui_db.lookup(mac)
+        if oui_info and oui_info.get('vendor'):
+            logger.debug(f"📍 Local OUI: {oui} → {oui_info['vendor']}")
+            return oui_info['vendor']
         
-        # 3. Fallback sur OUI database locale si API fail
-        if not vendor:
-            logger.debug(f"⚠️ API fail, trying local OUI database for {oui}")
-            try:
-                from src.core.models.oui_database import ExtendedOUIDatabase
-                oui_db = ExtendedOUIDatabase()
-                oui_info = oui_db.lookup(mac)
-                if oui_info and oui_info.get('vendor'):
-                    vendor = oui_info['vendor']
-                    logger.info(f"📍 Local OUI fallback: {oui} → {vendor}")
-            except Exception as e:
-                logger.debug(f"Local OUI lookup failed: {e}")
+        # 3. Fallback sur API MacVendors
+        vendor = await self._api_lookup(oui)
         
         # 4. Sauvegarder dans cache (même si None pour éviter requêtes répétées)
         self.cache[oui] = {
@@ -0,0 +1 @@
+"""Network monitoring tests"""
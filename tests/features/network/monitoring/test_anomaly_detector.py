@@ -0,0 +1,147 @@
+"""
+🧪 Tests - Anomaly Detector
+
+Tests des détecteurs EWMA / baseline saisonnière (front montant,
+délai entre événements, pics habituels ignorés) et de leur alimentation
+par LatencyMonitor / BandwidthMonitor
+"""
+
+import random
+import time
+
+import pytest
+
+from src.features.network.history import NetworkHistory
+from src.features.network.monitoring.anomaly_detector import AnomalyDetector
+from src.features.network.monitoring.bandwidth_monitor import BandwidthMonitor
+from src.features.network.monitoring.icmp_prober import EchoReply
+from src.features.network.monitoring.latency_monitor import LatencyMonitor
+from src.features.network.registry import NetworkRegistry
+from src.features.network.schemas import NetworkEventType
+
+# Lundi 00:00 heure locale
+MONDAY = time.mktime((2024, 1, 1, 0, 0, 0, 0, 1, -1))
+
+
+def make_detector(events, **kwargs):
+    kwargs.setdefault('threshold', 4.0)
+    kwargs.setdefault('cooldown', 600)
+    return AnomalyDetector(sink=events.append, **kwargs)
+
+
+class TestAnomalyDetector:
+    """Tests pour anomaly_detector.py"""
+
+    def test_latency_jump_raises_one_event(self):
+        events = []
+        detector = make_detector(events)
+        rng = random.Random(1)
+        t = MONDAY
+        for _ in range(200):
+            t += 1
+            assert detector.observe('latency', 'gw', rng.uniform(4, 6), t) is None
+
+        # Dégradation soutenue: un seul événement (front montant)
+        t += 1
+        detector.observe('latency', 'gw', 80.0, t)
+        assert detector.get_status()['active'] == ['latency:gw']
+        for _ in range(20):
+            t += 1
+            detector.observe('latency', 'gw', 80.0, t)
+        assert len(events) == 1
+        anomaly = events[0]
+        assert (anomaly.metric, anomaly.key, anomaly.value) == ('latency', 'gw', 80.0)
+        assert anomaly.expected == pytest.approx(5, abs=0.5)
+
+        # Retour à la normale puis rechute dans le délai: supprimée
+        for _ in range(100):
+            t += 1
+            detector.observe('latency', 'gw', 5.0, t)
+        for _ in range(5):
+            t += 1
+            detector.observe('latency', 'gw', 80.0, t)
+        assert len(events) == 1 and detector.stats['suppressed'] == 1
+
+    def test_small_values_and_warmup_ignored(self):
+        events = []
+        detector = make_detector(events)
+        # Trop peu d'échantillons pour juger
+        for i in range(10):
+            detector.observe('traffic', 'mac', 0.0, MONDAY + i)
+        detector.observe('traffic', 'mac', 50e6, MONDAY + 10)
+        # Pic au-dessus du bruit mais sous le seuil absolu (8 Mbit/s)
+        for i in range(100):
+            detector.observe('traffic', 'mac', 1e3, MONDAY + 20 + i)
+        detector.observe('traffic', 'mac', 5e6, MONDAY + 200)
+        assert events == []
+
+    def test_seasonal_baseline_suppresses_usual_peaks(self):
+        events = []
+        detector = make_detector(events, cooldown=0)
+        rng = random.Random(3)
+        # 3 semaines à 1 échantillon / 5 min: sauvegarde chaque nuit de 3 h à 4 h
+        t = MONDAY
+        for _ in range(3 * 7 * 288):
+            hour = time.localtime(t).tm_hour
+            value = rng.uniform(80e6, 100e6) if hour == 3 else rng.uniform(0.5e6, 1.5e6)
+            detector.observe('traffic', 'nas', value, t, emit=False)
+            t += 300
+
+        # Lundi 03:00 habituel: pas d'événement ; même pic à 10:00: anomalie
+        detector.observe('traffic', 'nas', 1e6, t + 2 * 3600 + 3000)
+        assert detector.observe('traffic', 'nas', 90e6, t + 3 * 3600 + 60) is None
+        for i in range(12):
+            detector.observe('traffic', 'nas', 1e6, t + 9 * 3600 + i * 300)
+        anomaly = detector.observe('traffic', 'nas', 90e6, t + 10 * 3600 + 60)
+        assert anomaly is not None and anomaly.seasonal_z_score > 4
+        assert [e.key for e in events] == ['nas']
+
+
+class TestMonitorAnomalies:
+    """Détecteurs alimentés par les moniteurs"""
+
+    def test_latency_monitor_reports_packet_loss(self):
+        events = []
+        monitor = LatencyMonitor(history_size=100, prober=object(), anomalies=make_detector(events))
+        for seq in range(40):
+            monitor._record('10.0.0.1', [EchoReply('10.0.0.1', seq, 3.0)] * 4)
+        for _ in range(5):
+            monitor._record('10.0.0.1', [None] * 4)
+        assert [e.metric for e in events] == ['loss']
+        assert monitor.anomalies._detectors[('latency', '10.0.0.1')].count == 40
+
+        monitor.clear_history('10.0.0.1')
+        assert monitor.anomalies.get_status()['detectors'] == 0
+
+    def test_bandwidth_monitor_reports_spike(self, monkeypatch):
+        events = []
+        monitor = BandwidthMonitor(registry=object(), anomalies=make_detector(events))
+        monitor.register_device('192.168.1.10', 'AA:BB:CC:DD:EE:01')
+        clock = [MONDAY]
+        monkeypatch.setattr(time, 'time', lambda: clock[0])
+        for _ in range(60):
+            clock[0] += 5
+            monitor.add_sample('AA:BB:CC:DD:EE:01', 10_000, 50_000)
+        clock[0] += 5
+        monitor.add_sample('AA:BB:CC:DD:EE:01', 10_000, 100_000_000)
+        assert [(e.metric, e.key) for e in events] == [('traffic', 'AA:BB:CC:DD:EE:01')]
+
+    def test_history_event_resolves_mac(self, tmp_path, monkeypatch):
+        saved = []
+        monkeypatch.setattr(NetworkHistory, '__init__', lambda self: None)
+        monkeypatch.setattr(NetworkHistory, '_save_event', lambda self, event: saved.append(event))
+        registry = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        registry.update_from_scan([{'mac': 'AA:BB:CC:DD:EE:01', 'current_ip': '192.168.1.10', 'current_hostname': 'nas', 'is_online': True}])
+        detector = AnomalyDetector(threshold=4.0, cooldown=0, registry=registry)
+        for i in range(50):
+            detector.observe('latency', '192.168.1.10', 2.0, MONDAY + i)
+        detector.observe('latency', '192.168.1.10', 150.0, MONDAY + 50)
+
+        event = saved[0]
+        assert (event.event_type, event.device_mac, event.device_name) == (
+            NetworkEventType.LATENCY_DEGRADED, 'AA:BB:CC:DD:EE:01', 'nas')
+        assert event.details['key'] == '192.168.1.10' and event.details['unit'] == 'ms'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,84 @@
+"""
+🧪 Tests - Bandwidth Series
+
+Tests des buckets multi-résolution (rollups en cascade, fenêtres
+arbitraires) comparés à une somme brute des échantillons
+"""
+
+import math
+import random
+
+import pytest
+
+from src.features.network.monitoring.bandwidth_monitor import BandwidthMonitor
+from src.features.network.monitoring.bandwidth_series import BandwidthSeries
+
+
+RESOLUTIONS = ((1, 60), (10, 60), (100, 50))
+
+
+def brute_totals(samples, window, now, resolution):
+    last = int(now // resolution)
+    first = last - max(1, math.ceil(window / resolution)) + 1
+    picked = [s for s in samples if first <= int(s[0] // resolution) <= last]
+    return sum(s[1] for s in picked), sum(s[2] for s in picked)
+
+
+class TestBandwidthSeries:
+    """Tests pour bandwidth_series.py"""
+
+    def test_windows_match_raw_samples(self):
+        rng = random.Random(7)
+        series = BandwidthSeries(RESOLUTIONS)
+        samples, t = [], 10_000.0
+        while t < 13_000:
+            t += rng.choice([0.3, 1.0, 2.5, 7.0, 45.0])
+            sample = (t, rng.randint(0, 5000), rng.randint(0, 50000))
+            samples.append(sample)
+            series.add(*sample)
+
+            if len(samples) % 37 == 0:
+                for window in (1, 30, 60, 200, 600, 4000):
+                    result = series.totals(window, t)
+                    expected = brute_totals(samples, window, t, result['resolution'])
+                    assert (result['bytes_sent'], result['bytes_received']) == expected
+
+    def test_points_peak_and_resolution(self):
+        series = BandwidthSeries(RESOLUTIONS)
+        series.add(1000.2, 100, 900)
+        series.add(1000.7, 0, 1000)
+        series.add(1005.0, 10, 10)
+
+        points = series.points(10, 1005.5)
+        assert len(points) == 10
+        assert points[0] == {'timestamp': 996, 'bytes_sent': 0, 'bytes_received': 0}
+        assert points[4] == {'timestamp': 1000, 'bytes_sent': 100, 'bytes_received': 1900}
+
+        totals = series.totals(60, 1005.5)
+        assert totals['peak_total_bps'] == 2000 * 8 and totals['peak_timestamp'] == 1000
+        # Fenêtre longue: buckets de 10 s, bucket ouvert de la résolution fine inclus
+        assert series.totals(60, 1005.5, resolution=10)['total_bytes'] == 2020
+        with pytest.raises(ValueError):
+            series.points(60, 1005.5, resolution=5)
+
+
+class TestBandwidthMonitorSeries:
+    """BandwidthMonitor: fenêtres et top talkers sans liste d'échantillons"""
+
+    def test_window_stats_and_top_talkers(self):
+        monitor = BandwidthMonitor()
+        monitor.register_device("192.168.1.10", "AA:00:00:00:00:01")
+        monitor.register_device("192.168.1.11", "AA:00:00:00:00:02")
+        for _ in range(3):
+            monitor.add_sample("AA:00:00:00:00:01", 1000, 4000)
+        monitor.add_sample("AA:00:00:00:00:02", 100, 100)
+
+        window = monitor.get_window_stats("AA:00:00:00:00:01", 300)
+        assert (window['bytes_sent'], window['bytes_received']) == (3000, 12000)
+        assert monitor.get_stats("AA:00:00:00:00:01").sample_count == 3
+        assert monitor.get_top_talkers(limit=1, window=60)[0].mac == "AA:00:00:00:00:01"
+        assert monitor.get_history("AA:00:00:00:00:09", 60) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
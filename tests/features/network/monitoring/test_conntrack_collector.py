@@ -0,0 +1,95 @@
+"""
+🧪 Tests - Conntrack Collector
+
+Rejeu de tables conntrack capturées (fixtures/) : deltas par flux,
+attribution par IP du LAN, alimentation du BandwidthMonitor
+"""
+
+import asyncio
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.features.network.monitoring.bandwidth_monitor import BandwidthMonitor
+from src.features.network.monitoring.conntrack_collector import ConntrackCollector, parse_conntrack
+from src.features.network.registry import NetworkRegistry
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+MAC_A = "AA:BB:CC:00:00:10"
+MAC_B = "AA:BB:CC:00:00:20"
+
+
+def replay(collector, table, name):
+    """Remplacer la table lue par le collecteur par une capture"""
+    shutil.copy(FIXTURES / name, table)
+    return asyncio.run(collector.collect())
+
+
+class TestConntrackCollector:
+    """Tests pour conntrack_collector.py"""
+
+    def test_parse_fixture(self):
+        flows, accounting = parse_conntrack((FIXTURES / "nf_conntrack_t0.txt").read_text().splitlines())
+        assert accounting is True
+        flow = flows[('tcp', '192.168.1.10', '93.184.216.34', '51544', '443')]
+        assert (flow.orig_bytes, flow.reply_bytes) == (15000, 420000)
+
+        _, accounting = parse_conntrack((FIXTURES / "nf_conntrack_noacct.txt").read_text().splitlines())
+        assert accounting is False
+
+    def test_replay_deltas(self, tmp_path):
+        table = tmp_path / "nf_conntrack"
+        collector = ConntrackCollector(source=str(table), use_cli=False)
+
+        assert replay(collector, table, "nf_conntrack_t0.txt") == {}      # Référence
+        deltas = replay(collector, table, "nf_conntrack_t1.txt")
+
+        assert deltas == {
+            # Sortant + LAN↔LAN (côté serveur) + entrant SSH
+            '192.168.1.10': (6000 + 30000 + 900, 600000 + 500 + 400),
+            '192.168.1.20': (500, 30000),
+            '192.168.1.30': (30000, 90000),    # Nouveau flux: compté en entier
+        }
+        assert collector.last_peer_deltas == {
+            '93.184.216.34': 606000, '1.1.1.1': 120000, '45.33.32.156': 1300,
+        }
+        assert replay(collector, table, "nf_conntrack_t1.txt") == {}
+
+    def test_missing_source(self, tmp_path):
+        collector = ConntrackCollector(source=str(tmp_path / "absent"), use_cli=False)
+        assert asyncio.run(collector.collect()) == {}
+        assert collector.get_statistics()['unavailable']
+
+
+class TestBandwidthMonitorCollection:
+    """BandwidthMonitor._collect_samples: deltas conntrack → MAC du registry"""
+
+    def test_collect_samples(self, tmp_path):
+        registry = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        registry.update_from_scan([
+            {'mac': MAC_A, 'current_ip': '192.168.1.10', 'current_hostname': 'nas', 'is_online': True},
+            {'mac': MAC_B, 'current_ip': '192.168.1.20', 'is_online': True},
+        ])
+        table = tmp_path / "nf_conntrack"
+        monitor = BandwidthMonitor(
+            collector=ConntrackCollector(source=str(table), use_cli=False), registry=registry,
+        )
+
+        for name in ("nf_conntrack_t0.txt", "nf_conntrack_t1.txt"):
+            shutil.copy(FIXTURES / name, table)
+            asyncio.run(monitor._collect_samples())
+
+        stats = monitor.get_stats(MAC_A)
+        assert (stats.hostname, stats.total_bytes_sent, stats.total_bytes_received) == ('nas', 36900, 600900)
+        assert monitor.get_stats(MAC_B).total_bytes == 30500
+        assert monitor.unattributed_bytes == 120000          # 192.168.1.30 absent du registry
+
+        # Intervalle sans trafic: échantillon nul pour les devices collectés
+        asyncio.run(monitor._collect_samples())
+        assert monitor.get_stats(MAC_A).sample_count == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
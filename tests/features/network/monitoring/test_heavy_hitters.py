@@ -0,0 +1,73 @@
+"""
+🧪 Tests - Heavy Hitters
+
+Tests des top talkers sur fenêtre glissante (Space-Saving + Count-Min)
+comparés au décompte exact
+"""
+
+import random
+from collections import Counter
+
+import pytest
+
+from src.features.network.monitoring.bandwidth_monitor import BandwidthMonitor
+from src.features.network.monitoring.heavy_hitters import SpaceSaving, WindowedHeavyHitters
+
+
+class TestHeavyHitters:
+    """Tests pour heavy_hitters.py"""
+
+    def test_space_saving_bounded(self):
+        summary = SpaceSaving(capacity=4)
+        for key, weight in [('a', 10), ('b', 5), ('c', 1), ('d', 1), ('e', 2), ('a', 3)]:
+            summary.add(key, weight)
+        assert len(summary.counts) == 4
+        assert summary.counts['a'] == 13 and summary.counts['e'] == 3    # Hérite du minimum (1)
+
+    def test_topk_matches_exact_counts(self):
+        rng = random.Random(3)
+        hitters = WindowedHeavyHitters(bucket_seconds=60, buckets=10, capacity=32)
+        exact_recent, t = Counter(), 0.0
+        # 5000 IPs, distribution à longue traîne, 20 minutes de trafic
+        for _ in range(20000):
+            t += 0.06
+            key = f"10.{int(rng.paretovariate(1.1)) % 5000}"
+            weight = rng.randint(100, 1500)
+            hitters.add(key, weight, t)
+            if t > 1200 - 300:
+                exact_recent[key] += weight
+
+        top = hitters.top(5, window=300, now=t)
+        assert [key for key, _ in top] == [key for key, _ in exact_recent.most_common(5)]
+        assert all(estimate >= exact_recent[key] for key, estimate in top)
+        assert hitters.total(300, now=t) == sum(exact_recent.values())
+
+    def test_window_expiry(self):
+        hitters = WindowedHeavyHitters(bucket_seconds=60, buckets=5)
+        hitters.add('old', 10_000, timestamp=0)
+        hitters.add('new', 10, timestamp=290)
+        assert [k for k, _ in hitters.top(3, window=600, now=290)] == ['old', 'new']
+        assert [k for k, _ in hitters.top(3, window=60, now=290)] == ['new']
+        hitters.add('newer', 1, timestamp=301)               # Réutilise le slot de 'old'
+        assert 'old' not in dict(hitters.top(3, window=600, now=301))
+
+
+class TestBandwidthMonitorTopTalkers:
+    """BandwidthMonitor: classement par fenêtre via les sketches"""
+
+    def test_top_talkers_window(self):
+        monitor = BandwidthMonitor()
+        for i, (sent, received) in enumerate([(100, 100), (5000, 10), (10, 9000)]):
+            mac = f"AA:00:00:00:00:0{i}"
+            monitor.register_device(f"192.168.1.{i}", mac)
+            monitor.add_sample(mac, sent, received)
+        monitor.reset_stats("AA:00:00:00:00:02")
+
+        assert [s.mac for s in monitor.get_top_talkers(limit=1, sort_by="total", window=300)] == ["AA:00:00:00:00:01"]
+        assert [s.mac for s in monitor.get_top_talkers(limit=2, sort_by="download", window=300)] == [
+            "AA:00:00:00:00:00", "AA:00:00:00:00:01",
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
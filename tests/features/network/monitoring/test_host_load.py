@@ -0,0 +1,126 @@
+"""
+🧪 Tests - Host Load Monitor
+
+Tests pour le throttling des scans selon la charge du Pi
+"""
+
+import asyncio
+import pytest
+
+from src.features.network.monitoring.host_load import HostLoadMonitor
+from src.features.network.monitoring.scan_scheduler import AdaptiveScanScheduler
+from src.features.network.registry import NetworkRegistry, DeviceRegistryEntry
+
+
+def make_monitor(tmp_path, load1=0.2, temp_c=45.0, cpu_count=4):
+    """Moniteur avec load average et température factices"""
+    temp_file = tmp_path / "temp"
+    temp_file.write_text(str(int(temp_c * 1000)))
+    return HostLoadMonitor(
+        load_reader=lambda: (load1, load1, load1),
+        temp_path=temp_file,
+        cpu_count=cpu_count,
+        cache_ttl=0,
+    )
+
+
+class TestHostLoadMonitor:
+    """Tests pour host_load.py"""
+
+    def test_normal_load(self, tmp_path):
+        """Hôte au repos → pas de throttling"""
+        snap = make_monitor(tmp_path).snapshot()
+
+        assert snap.level == "normal"
+        assert snap.throttle_factor == 1.0
+        assert snap.reasons == []
+
+    def test_high_temperature_is_critical(self, tmp_path):
+        """CPU à 82°C → critique, raison explicite"""
+        snap = make_monitor(tmp_path, temp_c=82.0).snapshot()
+
+        assert snap.level == "critical"
+        assert snap.throttle_factor == 0.0
+        assert any("cpu_temp" in r for r in snap.reasons)
+
+    def test_load_normalized_per_cpu(self, tmp_path):
+        """Load 3.0 sur 4 CPUs = 0.75/cpu → elevated"""
+        snap = make_monitor(tmp_path, load1=3.0, cpu_count=4).snapshot()
+
+        assert snap.level == "elevated"
+        assert snap.throttle_factor == 0.5
+
+    def test_loop_lag_raises_level(self, tmp_path):
+        """Un event loop en retard déclenche le throttling"""
+        monitor = make_monitor(tmp_path)
+        monitor.record_loop_lag(0.8)
+
+        snap = monitor.snapshot()
+        assert snap.level == "critical"
+        assert snap.to_dict()["loop_lag_ms"] == 800.0
+
+    def test_missing_sensors_are_ignored(self, tmp_path):
+        """Pas de capteur température (hors Pi) → niveau selon les autres signaux"""
+        monitor = HostLoadMonitor(
+            load_reader=lambda: (0.1, 0.1, 0.1),
+            temp_path=tmp_path / "absent",
+            cpu_count=4,
+        )
+
+        snap = monitor.snapshot()
+        assert snap.cpu_temp_c is None
+        assert snap.level == "normal"
+
+
+class TestSchedulerThrottling:
+    """Intégration scheduler ↔ charge hôte"""
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        reg = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        reg.devices = {
+            f"AA:00:00:00:00:0{i}": DeviceRegistryEntry(
+                mac=f"AA:00:00:00:00:0{i}", current_ip=f"192.168.1.{i}", is_online=True,
+            )
+            for i in range(1, 5)
+        }
+        return reg
+
+    def _scheduler(self, registry, monitor):
+        async def probe(ip):
+            return True
+
+        scheduler = AdaptiveScanScheduler(
+            probe=probe, max_packets_per_second=100, max_concurrent_probes=4,
+            registry=registry, host_load=monitor,
+        )
+        scheduler.sync_targets()
+        for s in scheduler.schedules.values():
+            s.next_due = 0
+        return scheduler
+
+    def test_critical_load_defers_probes(self, tmp_path, registry):
+        """Charge critique → aucun probe, raison exposée dans le statut"""
+        scheduler = self._scheduler(registry, make_monitor(tmp_path, temp_c=85.0))
+
+        result = asyncio.run(scheduler.run_once())
+
+        assert result["deferred"] is True
+        assert result["probed"] == 0
+        status = scheduler.get_status()
+        assert status["deferred_ticks"] == 1
+        assert status["throttle"]["level"] == "critical"
+        assert status["throttle"]["reasons"]
+
+    def test_elevated_load_halves_rate(self, tmp_path, registry):
+        """Charge élevée → débit divisé par 2, probes maintenus"""
+        scheduler = self._scheduler(registry, make_monitor(tmp_path, load1=3.0))
+
+        result = asyncio.run(scheduler.run_once())
+
+        assert result["probed"] == 4
+        assert scheduler.budget.rate == 50
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
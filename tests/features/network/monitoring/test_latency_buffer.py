@@ -0,0 +1,70 @@
+"""
+🧪 Tests - Latency Ring Buffer
+
+Tests de l'historique de latence compact (éviction, bitmap de pertes,
+quantiles, histogrammes) et de son intégration LatencyMonitor
+"""
+
+import statistics
+
+import pytest
+
+from src.features.network.monitoring.icmp_prober import EchoReply
+from src.features.network.monitoring.latency_buffer import LatencyRingBuffer, percentile
+from src.features.network.monitoring.latency_monitor import LatencyMonitor
+
+
+class TestLatencyRingBuffer:
+    """Tests pour latency_buffer.py"""
+
+    def test_wraparound_and_loss_bitmap(self):
+        buffer = LatencyRingBuffer(capacity=10)
+        evicted = [buffer.append(None if i % 3 == 0 else float(i), 1000 + i) for i in range(25)]
+
+        assert evicted[:10] == [None] * 10
+        assert evicted[10] == (None, 1000)          # Perte écrasée
+        assert evicted[11] == (1.0, 1001)
+        samples = buffer.samples()
+        assert [ts for ts, _ in samples] == list(range(1015, 1025))
+        assert [rtt for _, rtt in samples] == [None if i % 3 == 0 else float(i) for i in range(15, 25)]
+        assert buffer.latest() == (1024, None)
+        assert buffer.nbytes < 10 * 9
+
+    def test_percentiles_and_histogram(self):
+        buffer = LatencyRingBuffer(capacity=1000)
+        values = [0.5 + i * 0.25 for i in range(400)]
+        for i, value in enumerate(values):
+            buffer.append(value, 1000 + i)
+        buffer.append(None, 2000)
+
+        expected = statistics.quantiles(values, n=100, method='inclusive')
+        result = buffer.percentiles((50, 95, 99))
+        assert result == {'p50': round(expected[49], 2), 'p95': round(expected[94], 2), 'p99': round(expected[98], 2)}
+        assert percentile([1.0, 2.0], 50) == 1.5
+
+        histogram = buffer.histogram((1, 10, 50))
+        assert [b['count'] for b in histogram['buckets']] == [2, 36, 160, 202]
+        assert histogram['buckets'][-1]['lt'] is None
+        assert (histogram['total'], histogram['lost']) == (401, 1)
+
+        # Période: seules les mesures récentes comptent
+        assert buffer.histogram((1, 10, 50), since=1398)['total'] == 3
+        assert LatencyRingBuffer(5).percentiles() == {'p50': None, 'p95': None, 'p99': None}
+
+
+class TestLatencyMonitorHistory:
+    """LatencyMonitor: historique compact + agrégats synchronisés"""
+
+    def test_monitor_queries(self):
+        monitor = LatencyMonitor(history_size=3, prober=object())
+        monitor._record('10.0.0.1', [EchoReply('10.0.0.1', s, rtt) for s, rtt in enumerate((50.0, 1.1, 2.2, 3.3))])
+
+        stats = monitor.calculate_stats('10.0.0.1')
+        assert (stats.measurements_count, stats.max_latency_ms, stats.avg_latency_ms) == (3, 3.3, 2.2)
+        assert monitor.get_percentiles('10.0.0.1', (50,), hours=1) == {'p50': 2.2}
+        assert monitor.get_histogram('10.0.0.1', (2,))['buckets'][0]['count'] == 1
+        assert monitor.get_percentiles('10.0.0.9') is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
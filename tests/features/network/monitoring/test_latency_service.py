@@ -0,0 +1,119 @@
+"""
+🧪 Tests - Continuous Latency Service
+
+Tests de la mesure de latence continue (cibles, échéances jitterées,
+plafond de probes simultanés, backoff des hôtes hors ligne)
+"""
+
+import asyncio
+
+import pytest
+
+from src.features.network.monitoring.host_load import HostLoadMonitor
+from src.features.network.monitoring.icmp_prober import EchoReply
+from src.features.network.monitoring.latency_monitor import LatencyMonitor
+from src.features.network.monitoring.latency_service import ContinuousLatencyService, default_gateway
+
+
+class SlowProber:
+    """Prober factice: IPs joignables, durée de probe, suivi de la concurrence"""
+
+    def __init__(self, reachable):
+        self.reachable = reachable
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def open(self):
+        return True
+
+    async def ping(self, ip, count=4, timeout=2.0, interval=0.2):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return [EchoReply(ip, 1, 3.0) if ip in self.reachable else None] * count
+
+
+def make_service(prober, load=0.0, **kwargs):
+    return ContinuousLatencyService(
+        monitor=LatencyMonitor(history_size=1000, prober=prober),
+        target_provider=lambda: {'10.0.0.1': ('nas', 'device'), '10.0.0.2': ('tv', 'device')},
+        host_load=HostLoadMonitor(load_reader=lambda: (load, load, load), temp_path="/nonexistent", cpu_count=1),
+        **kwargs,
+    )
+
+
+class TestContinuousLatencyService:
+    """Tests pour latency_service.py"""
+
+    def test_default_gateway(self, tmp_path):
+        route = tmp_path / "route"
+        route.write_text(
+            "Iface\tDestination\tGateway\tFlags\tRefCnt\tUse\tMetric\tMask\n"
+            "eth0\t0001A8C0\t00000000\t0001\t0\t0\t0\t00FFFFFF\n"
+            "eth0\t00000000\t0101A8C0\t0003\t0\t0\t0\t00000000\n"
+        )
+        assert default_gateway(route) == "192.168.1.1"
+        assert default_gateway(tmp_path / "missing") is None
+
+    def test_continuous_probing(self):
+        prober = SlowProber(reachable={'10.0.0.1'})
+        service = make_service(prober, interval=0.05, offline_interval=0.4, max_in_flight=1)
+
+        async def run():
+            service.start()
+            await asyncio.sleep(0.8)
+            await service.shutdown()
+
+        asyncio.run(run())
+
+        assert prober.max_in_flight == 1
+        assert service.monitor.calculate_stats('10.0.0.1').measurements_count >= 5
+        online, offline = service.targets['10.0.0.1'], service.targets['10.0.0.2']
+        assert online.is_online is True and online.interval == 0.05
+        # Hors ligne: sondé moins souvent (backoff borné)
+        assert offline.is_online is False and 0.05 < offline.interval <= 0.4
+        assert offline.total_probes < online.total_probes
+        assert service.get_status()['running'] is False
+
+    def test_manual_targets_and_throttle(self):
+        service = make_service(SlowProber(reachable=set()), load=5.0)
+
+        assert service.add_targets(['10.0.0.9'], name="cam") == 3
+        assert service.targets['10.0.0.9'].source == 'manual'
+        assert service.refresh_targets() == 3
+        assert service.remove_targets(['10.0.0.9']) == 2
+
+        # Pi en surcharge: probes dus reportés
+        for target in service.targets.values():
+            target.next_due = 0
+        service._heap = [(0, ip) for ip in service.targets]
+        assert asyncio.run(service.run_once()) == 0
+        assert service.deferred == 1 and all(t.next_due > 0 for t in service.targets.values())
+
+    def test_failing_tick_does_not_stop_loop(self):
+        service = make_service(SlowProber(reachable={'10.0.0.1'}), interval=0.05)
+        snapshot = service.host_load.snapshot
+        failures = []
+
+        def flaky_snapshot():
+            if not failures:
+                failures.append(True)
+                raise OSError("loadavg unreadable")
+            return snapshot()
+
+        service.host_load.snapshot = flaky_snapshot
+
+        async def run():
+            service.start()
+            await asyncio.sleep(0.4)
+            alive = not service._task.done()
+            await service.shutdown()
+            return alive
+
+        assert asyncio.run(run()) is True
+        assert failures and service.monitor.calculate_stats('10.0.0.1').measurements_count >= 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
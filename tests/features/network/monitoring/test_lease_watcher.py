@@ -0,0 +1,98 @@
+"""
+🧪 Tests - DHCP Lease Watcher
+
+Tests de l'application des baux au registry / DHCPTracker (inotify)
+"""
+
+import asyncio
+import pytest
+
+from src.features.network.monitoring.dhcp_tracker import DHCPTracker
+from src.features.network.monitoring.lease_watcher import DHCPLeaseWatcher
+from src.features.network.registry import NetworkRegistry
+
+
+LEASES = "1893456000 aa:bb:cc:00:00:01 192.168.1.10 pc-salon *\n"
+
+
+def make_watcher(tmp_path, **kwargs):
+    path = tmp_path / "dnsmasq.leases"
+    path.write_text(LEASES)
+    watcher = DHCPLeaseWatcher(
+        lease_files=[str(path)],
+        registry=NetworkRegistry(registry_file=str(tmp_path / "registry.json")),
+        tracker=DHCPTracker(history_file=tmp_path / "dhcp_history.json"),
+        debounce=0.05,
+        **kwargs,
+    )
+    return watcher, path
+
+
+async def wait_for(condition, timeout=3.0):
+    for _ in range(int(timeout / 0.02)):
+        if condition():
+            return True
+        await asyncio.sleep(0.02)
+    return False
+
+
+class TestDHCPLeaseWatcher:
+    """Tests pour lease_watcher.py"""
+
+    def test_initial_leases_not_marked_online(self, tmp_path):
+        """Baux existants au démarrage → registry renseigné, pas online"""
+        watcher, _ = make_watcher(tmp_path)
+        watcher.refresh_all()
+
+        entry = watcher.registry.devices["AA:BB:CC:00:00:01"]
+        assert entry.current_ip == "192.168.1.10"
+        assert entry.current_hostname == "pc-salon"
+        assert entry.is_online is False
+
+    def test_ip_change_applied_on_write(self, tmp_path):
+        """Nouvelle attribution écrite → registry + tracker mis à jour sans scan"""
+        watcher, path = make_watcher(tmp_path)
+
+        async def run():
+            await watcher.start()
+            try:
+                path.write_text(LEASES.replace("192.168.1.10", "192.168.1.42"))
+                return await wait_for(
+                    lambda: watcher.registry.devices["AA:BB:CC:00:00:01"].current_ip == "192.168.1.42"
+                )
+            finally:
+                await watcher.stop()
+
+        assert asyncio.run(run())
+        assert watcher.mode == "stopped"
+
+        entry = watcher.registry.devices["AA:BB:CC:00:00:01"]
+        assert entry.is_online is True
+        assert [h["ip"] for h in entry.ip_history] == ["192.168.1.10", "192.168.1.42"]
+        history = watcher.tracker.get_device_ip_history("AA:BB:CC:00:00:01")
+        assert [h["ip"] for h in history] == ["192.168.1.10", "192.168.1.42"]
+
+    def test_polling_fallback(self, tmp_path, monkeypatch):
+        """Sans inotify → polling stat(), même résultat"""
+        from src.features.network.monitoring import lease_watcher
+
+        def no_inotify():
+            raise OSError("inotify unavailable")
+
+        monkeypatch.setattr(lease_watcher, "_Inotify", no_inotify)
+        watcher, path = make_watcher(tmp_path, poll_interval=0.05)
+
+        async def run():
+            await watcher.start()
+            mode = watcher.mode
+            try:
+                path.write_text(LEASES + "1893456000 aa:bb:cc:00:00:02 192.168.1.11 tv *\n")
+                return mode, await wait_for(lambda: "AA:BB:CC:00:00:02" in watcher.registry.devices)
+            finally:
+                await watcher.stop()
+
+        assert asyncio.run(run()) == ("polling", True)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
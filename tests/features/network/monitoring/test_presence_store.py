@@ -0,0 +1,174 @@
+"""
+🧪 Tests - Presence Store
+
+Tests des bitmaps de présence: intervalles RLE, requêtes sur fenêtre,
+rétention et persistance
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.core.config import settings
+from src.features.network import history as history_module
+from src.features.network.history import NetworkHistory
+from src.features.network.monitoring.presence_store import PresenceStore, iter_bits
+from src.features.network.registry import NetworkRegistry
+
+
+MAC_A = "AA:BB:CC:00:00:01"
+MAC_B = "AA:BB:CC:00:00:02"
+SLOT = 60
+
+
+def make_store(tmp_path, **kwargs):
+    return PresenceStore(slot_seconds=SLOT, storage_file=tmp_path / "presence.json", **kwargs)
+
+
+def feed(store, observations):
+    """observations: {slot: [macs online]}"""
+    for slot, macs in sorted(observations.items()):
+        store.record(macs, at=slot * SLOT)
+
+
+# A online aux slots 0-2, vu offline au slot 5, de retour aux slots 7-8
+# B vu uniquement au slot 5
+OBSERVATIONS = {0: [MAC_A], 1: [MAC_A], 2: [MAC_A], 5: [MAC_B], 7: [MAC_A], 8: [MAC_A]}
+
+
+class TestPresenceStore:
+    """Tests pour presence_store.py"""
+
+    def test_iter_bits(self):
+        assert list(iter_bits(0b101001)) == [0, 3, 5]
+        assert list(iter_bits(0)) == []
+
+    def test_runs_hold_state_between_observations(self, tmp_path):
+        store = make_store(tmp_path)
+        feed(store, OBSERVATIONS)
+
+        assert store.intervals[store.index[MAC_A]] == [[0, 5], [7, 9]]
+        assert store.intervals[store.index[MAC_B]] == [[5, 7]]
+
+        stats = store.get_device_stats(MAC_A.lower())
+        assert stats["tracked_seconds"] == 9 * SLOT
+        assert stats["online_seconds"] == 7 * SLOT
+        assert stats["uptime_percentage"] == 77.78
+        assert (stats["observations"], stats["detections"]) == (6, 5)
+        assert stats["longest_online_seconds"] == 5 * SLOT
+        assert stats["longest_offline_seconds"] == 2 * SLOT
+        assert stats["online_periods"] == 2
+
+        # B suivi depuis sa première apparition
+        assert store.get_device_stats(MAC_B)["uptime_percentage"] == 50.0
+        assert store.get_device_stats("00:00:00:00:00:00") is None
+
+    def test_window_queries(self, tmp_path):
+        store = make_store(tmp_path)
+        feed(store, OBSERVATIONS)
+
+        stats = store.get_device_stats(MAC_A, start=datetime.fromtimestamp(7 * SLOT))
+        assert stats["uptime_percentage"] == 100.0
+        assert stats["detection_rate"] == 1.0
+
+        stats = store.get_device_stats(MAC_A, start=datetime.fromtimestamp(3 * SLOT),
+                                       end=datetime.fromtimestamp(7 * SLOT))
+        assert stats["online_seconds"] == 2 * SLOT
+        assert stats["detection_rate"] == 0.0    # Seule observation: slot 5, offline
+
+        periods = store.get_online_periods(MAC_A)
+        assert periods[1] == (datetime.fromtimestamp(7 * SLOT), datetime.fromtimestamp(9 * SLOT))
+        assert store.get_online_at(datetime.fromtimestamp(6 * SLOT)) == [MAC_B]
+
+    def test_same_slot_merged_and_past_ignored(self, tmp_path):
+        store = make_store(tmp_path)
+        assert store.record([MAC_A], at=0)
+        assert store.record([MAC_B], at=30)
+        assert store.record([MAC_A], at=SLOT)
+        assert not store.record([MAC_B], at=10)
+
+        assert store.slots == [0, 1]
+        assert sorted(store.get_online_at(datetime.fromtimestamp(0))) == [MAC_A, MAC_B]
+
+    def test_retention_trims_old_slots(self, tmp_path):
+        store = PresenceStore(slot_seconds=86400, retention_days=3, storage_file=tmp_path / "presence.json")
+        for day in range(6):
+            store.record([MAC_A] if day != 4 else [], at=day * 86400)
+
+        assert store.slots == [3, 4, 5]
+        assert store.intervals[0] == [[3, 4], [5, 6]]
+        assert store.get_device_stats(MAC_A)["tracked_seconds"] == 3 * 86400
+
+    def test_persistence_round_trip(self, tmp_path):
+        store = make_store(tmp_path)
+        feed(store, OBSERVATIONS)
+        store.save()
+
+        reloaded = make_store(tmp_path)
+        assert reloaded.intervals == store.intervals
+        assert reloaded.get_device_stats(MAC_A) == store.get_device_stats(MAC_A)
+
+        # Taille de slot différente: historique ignoré
+        assert PresenceStore(slot_seconds=SLOT * 2, storage_file=tmp_path / "presence.json").slots == []
+
+    def test_sample_registry(self, tmp_path):
+        registry = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        registry.update_from_lease(MAC_A, "192.168.1.10")
+        store = make_store(tmp_path, registry=registry)
+
+        store.sample_registry()
+        assert store.get_online_at(datetime.now()) == [MAC_A]
+
+    @pytest.mark.parametrize("sampling", [True, False])
+    def test_loop_samples_registry_only_when_kept_fresh(self, tmp_path, sampling):
+        """Sans scan scheduler, les flags is_online figés ne sont pas rejoués"""
+        registry = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        registry.update_from_lease(MAC_A, "192.168.1.10")
+        store = make_store(tmp_path, registry=registry, sample_registry=sampling)
+
+        async def run():
+            await store.start()
+            await asyncio.sleep(0.05)
+            await store.stop()
+
+        asyncio.run(run())
+        assert store.get_online_at(datetime.now()) == ([MAC_A] if sampling else [])
+
+
+class TestHistoryStatistics:
+    """NetworkHistory: présence lue uniquement si HOME333_PRESENCE_ENABLED"""
+
+    @pytest.fixture
+    def history(self, tmp_path, monkeypatch):
+        store = make_store(tmp_path)
+        feed(store, OBSERVATIONS)
+        monkeypatch.setattr(history_module, 'get_presence_store', lambda: store)
+        monkeypatch.setattr(NetworkHistory, '__init__', lambda self: None)
+        monkeypatch.setattr(NetworkHistory, 'reload', lambda self: None)
+
+        history = NetworkHistory()
+        history.storage = {'events': [], 'devices': {MAC_A: {
+            'current_hostname': "nas", 'current_ip': "192.168.1.10", 'total_appearances': 5,
+            'first_seen': "2026-01-01T10:00:00", 'last_seen': "2026-01-11T10:00:00",
+        }}}
+        return history
+
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_presence_gated_by_setting(self, history, monkeypatch, enabled):
+        monkeypatch.setattr(settings, 'presence_enabled', enabled)
+
+        stats = history.get_device_statistics(MAC_A)
+        periods = history.get_device_history(MAC_A).online_periods
+
+        if enabled:
+            assert stats.uptime_percentage == 77.78     # 7 slots online sur 9
+            assert len(periods) == 2
+        else:
+            # Estimation sur les apparitions (5 en 10 jours), jamais 0% par défaut
+            assert (stats.uptime_percentage, stats.average_connection_duration_hours) == (5.0, 48.0)
+            assert periods == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,120 @@
+"""
+🧪 Tests - Reachability Service
+
+Tests du service de joignabilité partagé (cache TTL, coalescence des
+probes concurrents, lots ICMP, processus `ping` bornés)
+"""
+
+import asyncio
+
+import pytest
+
+from src.features.network.monitoring import reachability as reachability_module
+from src.features.network.monitoring.icmp_prober import EchoReply
+from src.features.network.monitoring.latency_monitor import LatencyMonitor
+from src.features.network.monitoring.reachability import ReachabilityService
+
+
+class FakeProber:
+    """Prober ICMP simulé : hôtes joignables fixes, appels enregistrés"""
+
+    def __init__(self, up=(), available=True, delay=0.05):
+        self.up = set(up)
+        self.available = available
+        self.delay = delay
+        self.batches = []
+
+    async def open(self):
+        return self.available
+
+    async def ping_many(self, ips, count=1, timeout=1.0):
+        self.batches.append(list(ips))
+        await asyncio.sleep(self.delay)
+        return {ip: [EchoReply(ip, 1, 1.0, ttl=64) if ip in self.up else None] for ip in ips}
+
+
+class FakeProcess:
+    running = 0
+    peak = 0
+
+    def __init__(self, ip):
+        self.returncode = 0 if ip.endswith('.1') else 1
+
+    async def communicate(self):
+        FakeProcess.running += 1
+        FakeProcess.peak = max(FakeProcess.peak, FakeProcess.running)
+        await asyncio.sleep(0.01)
+        FakeProcess.running -= 1
+        return b'64 bytes from x: icmp_seq=1 ttl=64 time=1.0 ms\n', b''
+
+
+class TestReachabilityService:
+    """Tests pour reachability.py"""
+
+    def test_concurrent_requests_are_coalesced(self):
+        prober = FakeProber(up={'10.0.0.1'})
+        service = ReachabilityService(prober=prober, ttl=30)
+
+        async def scenario():
+            return await asyncio.gather(
+                service.is_reachable(['10.0.0.1', '10.0.0.2']),
+                service.is_reachable(['10.0.0.2', '10.0.0.1']),
+                service.is_reachable(['10.0.0.1']),
+            )
+
+        first, second, third = asyncio.run(scenario())
+        assert first == second == {'10.0.0.1': True, '10.0.0.2': False}
+        assert third == {'10.0.0.1': True}
+        assert prober.batches == [['10.0.0.1', '10.0.0.2']]
+        assert service.stats['coalesced'] == 3
+
+        # Cache valide: aucun nouveau probe ; max_age=0 force un probe
+        assert asyncio.run(service.is_reachable(['10.0.0.2'])) == {'10.0.0.2': False}
+        assert len(prober.batches) == 1
+        asyncio.run(service.is_reachable(['10.0.0.2'], max_age=0))
+        assert prober.batches[-1] == ['10.0.0.2']
+
+    def test_cancelled_caller_does_not_break_others(self):
+        prober = FakeProber(up={'10.0.0.1'}, delay=0.1)
+        service = ReachabilityService(prober=prober, ttl=30)
+
+        async def scenario():
+            first = asyncio.ensure_future(service.is_reachable(['10.0.0.1']))
+            await asyncio.sleep(0)
+            second = asyncio.ensure_future(service.is_reachable(['10.0.0.1']))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(scenario()) == {'10.0.0.1': True}
+        assert service.get_statistics()['in_flight'] == 0
+
+    def test_process_fallback_is_bounded(self, monkeypatch):
+        async def fake_exec(*args, **kwargs):
+            return FakeProcess(args[-1])
+
+        monkeypatch.setattr(reachability_module.asyncio, 'create_subprocess_exec', fake_exec)
+        FakeProcess.peak = 0
+        service = ReachabilityService(prober=FakeProber(available=False), ttl=30, max_processes=3)
+        ips = [f'10.0.{i}.1' for i in range(5)] + [f'10.0.{i}.2' for i in range(5)]
+
+        result = asyncio.run(service.is_reachable(ips))
+        assert [ip for ip, up in result.items() if up] == ips[:5]
+        assert FakeProcess.peak == 3
+        assert service.stats['processes'] == 10
+
+
+class TestLatencyMonitorReachability:
+    """Mesures de latence réinjectées dans le cache partagé"""
+
+    def test_latency_results_feed_cache(self):
+        service = ReachabilityService(prober=FakeProber(), ttl=30)
+        monitor = LatencyMonitor(history_size=10, prober=object(), reachability=service)
+        monitor._record('10.0.0.5', [None, EchoReply('10.0.0.5', 2, 3.0)])
+        monitor._record('10.0.0.6', [None, None])
+        assert (service.get_cached('10.0.0.5'), service.get_cached('10.0.0.6')) == (True, False)
+        assert service.get_cached('10.0.0.7') is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
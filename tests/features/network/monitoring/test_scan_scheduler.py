@@ -0,0 +1,192 @@
+"""
+🧪 Tests - Adaptive Scan Scheduler
+
+Tests pour le scheduler de probes adaptatif (profils, backoff, registry)
+"""
+
+import asyncio
+import time
+import pytest
+
+from src.features.network.registry import NetworkRegistry, DeviceRegistryEntry
+from src.features.network.monitoring.host_load import HostLoadMonitor
+from src.features.network.monitoring.scan_scheduler import (
+    AdaptiveScanScheduler,
+    ProbeBudget,
+    PROFILE_INTERVALS,
+    BACKOFF_FACTOR,
+)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Registry isolé avec 3 profils de devices"""
+    reg = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+    reg.devices = {
+        "AA:00:00:00:00:01": DeviceRegistryEntry(
+            mac="AA:00:00:00:00:01", current_ip="192.168.1.10",
+            current_hostname="iPhone-de-Paul", is_online=True,
+        ),
+        "AA:00:00:00:00:02": DeviceRegistryEntry(
+            mac="AA:00:00:00:00:02", current_ip="192.168.1.1",
+            vendor="Freebox", device_type="router", is_online=True,
+        ),
+        "AA:00:00:00:00:03": DeviceRegistryEntry(
+            mac="AA:00:00:00:00:03", current_ip="192.168.1.30",
+            vendor="Dell", is_online=False,
+        ),
+    }
+    return reg
+
+
+def make_scheduler(registry, reachable):
+    """Scheduler avec probe factice (set d'IPs joignables)"""
+    probed = []
+
+    async def probe(ip):
+        probed.append(ip)
+        return ip in reachable
+
+    # Hôte au repos (indépendant de la charge réelle de la machine de test)
+    idle_host = HostLoadMonitor(load_reader=lambda: (0.0, 0.0, 0.0), temp_path="/nonexistent")
+    scheduler = AdaptiveScanScheduler(
+        probe=probe, max_packets_per_second=1000, registry=registry, host_load=idle_host,
+    )
+    scheduler.probed = probed
+    return scheduler
+
+
+def force_due(scheduler):
+    for s in scheduler.schedules.values():
+        s.next_due = 0
+
+
+class TestAdaptiveScanScheduler:
+    """Tests pour scan_scheduler.py"""
+
+    def test_classify_profiles(self, registry):
+        """Mobiles = volatile, routeur = static, PC inconnu = standard"""
+        scheduler = make_scheduler(registry, set())
+        profiles = {mac: scheduler.classify_device(e) for mac, e in registry.devices.items()}
+
+        assert profiles["AA:00:00:00:00:01"] == "volatile"
+        assert profiles["AA:00:00:00:00:02"] == "static"
+        assert profiles["AA:00:00:00:00:03"] == "standard"
+
+    def test_ip_history_makes_device_volatile(self, registry):
+        """Un device ayant déjà changé d'IP est volatile"""
+        entry = registry.devices["AA:00:00:00:00:03"]
+        entry.ip_history = [{"ip": "192.168.1.30"}, {"ip": "192.168.1.31"}]
+
+        scheduler = make_scheduler(registry, set())
+        assert scheduler.classify_device(entry) == "volatile"
+
+    def test_stable_device_backs_off(self, registry):
+        """Un device stable voit son intervalle augmenter"""
+        scheduler = make_scheduler(registry, {"192.168.1.1"})
+        scheduler.sync_targets()
+        force_due(scheduler)
+
+        asyncio.run(scheduler.run_once())
+
+        router = scheduler.schedules["AA:00:00:00:00:02"]
+        assert router.interval == PROFILE_INTERVALS["static"][0] * BACKOFF_FACTOR
+        assert router.next_due > time.monotonic()
+
+    def test_interval_capped_at_profile_max(self, registry):
+        """L'intervalle ne dépasse jamais le max du profil"""
+        scheduler = make_scheduler(registry, {"192.168.1.10"})
+        for _ in range(20):
+            scheduler.sync_targets()
+            force_due(scheduler)
+            asyncio.run(scheduler.run_once())
+
+        phone = scheduler.schedules["AA:00:00:00:00:01"]
+        assert phone.interval == PROFILE_INTERVALS["volatile"][1]
+
+    def test_offline_after_consecutive_misses(self, registry):
+        """Un seul probe raté ne marque pas offline, deux si"""
+        scheduler = make_scheduler(registry, set())
+        scheduler.sync_targets()
+
+        force_due(scheduler)
+        asyncio.run(scheduler.run_once())
+        assert registry.devices["AA:00:00:00:00:01"].is_online is True
+
+        force_due(scheduler)
+        asyncio.run(scheduler.run_once())
+        assert registry.devices["AA:00:00:00:00:01"].is_online is False
+        assert scheduler.schedules["AA:00:00:00:00:01"].interval == PROFILE_INTERVALS["volatile"][0]
+
+    def test_device_back_online_updates_registry(self, registry):
+        """Un device offline qui répond repasse online avec last_seen"""
+        scheduler = make_scheduler(registry, {"192.168.1.30"})
+        scheduler.sync_targets()
+        force_due(scheduler)
+
+        result = asyncio.run(scheduler.run_once())
+
+        entry = registry.devices["AA:00:00:00:00:03"]
+        assert entry.is_online is True
+        assert entry.last_seen_online is not None
+        assert result["changed"] >= 1
+
+    def test_only_due_devices_are_probed(self, registry):
+        """Les devices non dus ne sont pas probés"""
+        scheduler = make_scheduler(registry, set())
+        scheduler.sync_targets()
+        for s in scheduler.schedules.values():
+            s.next_due = time.monotonic() + 3600
+        scheduler.schedules["AA:00:00:00:00:02"].next_due = 0
+
+        asyncio.run(scheduler.run_once())
+
+        assert scheduler.probed == ["192.168.1.1"]
+
+    def test_removed_device_is_unscheduled(self, registry):
+        """Un device retiré du registry sort du planning"""
+        scheduler = make_scheduler(registry, set())
+        scheduler.sync_targets()
+        del registry.devices["AA:00:00:00:00:03"]
+
+        assert scheduler.sync_targets() == 2
+
+    def test_failing_tick_does_not_stop_loop(self, registry):
+        """Une erreur sur un tick est journalisée, la boucle continue"""
+        scheduler = make_scheduler(registry, set())
+        scheduler.tick_interval = 0.01
+        ticks = []
+
+        async def run_once():
+            ticks.append(len(ticks))
+            if len(ticks) == 1:
+                raise OSError("registry save failed")
+
+        scheduler.run_once = run_once
+
+        async def scenario():
+            scheduler.start()
+            await asyncio.sleep(0.1)
+            alive = not scheduler._task.done()
+            scheduler.stop()
+            return alive
+
+        assert asyncio.run(scenario()) is True
+        assert len(ticks) > 1
+
+    def test_budget_limits_rate(self):
+        """Le token bucket impose le débit max"""
+        budget = ProbeBudget(rate=50, burst=1)
+
+        async def consume():
+            start = time.monotonic()
+            for _ in range(6):
+                await budget.acquire(1)
+            return time.monotonic() - start
+
+        elapsed = asyncio.run(consume())
+        assert elapsed >= 5 / 50 * 0.9
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+🧪 Tests - Streaming Latency Stats
+
+Tests des agrégats en flux (Welford, min/max glissants, pertes, jitter
+RFC 3550) comparés à un recalcul complet de la fenêtre
+"""
+
+import random
+import statistics
+
+import pytest
+
+from src.features.network.monitoring.icmp_prober import EchoReply
+from src.features.network.monitoring.latency_monitor import LatencyMonitor
+from src.features.network.monitoring.streaming_stats import WindowedLatencyStats
+
+
+class TestWindowedLatencyStats:
+    """Tests pour streaming_stats.py"""
+
+    def test_matches_full_recomputation(self):
+        rng = random.Random(42)
+        samples = [None if rng.random() < 0.1 else rng.uniform(1, 80) for _ in range(500)]
+        window = 50
+        stats = WindowedLatencyStats()
+
+        for i, rtt in enumerate(samples):
+            if i >= window:
+                stats.remove(samples[i - window])
+            stats.add(rtt)
+
+            current = samples[max(0, i - window + 1):i + 1]
+            received = [x for x in current if x is not None]
+            assert stats.count == len(current)
+            assert stats.loss_percent == pytest.approx((len(current) - len(received)) / len(current) * 100)
+            if received:
+                assert stats.mean == pytest.approx(statistics.fmean(received))
+                assert (stats.min, stats.max) == (min(received), max(received))
+            if len(received) > 1:
+                assert stats.variance == pytest.approx(statistics.variance(received))
+
+    def test_rfc3550_jitter(self):
+        stats = WindowedLatencyStats()
+        for rtt in (10.0, 26.0, None, 10.0):
+            stats.add(rtt)
+        # J1 = 16/16 = 1, J2 = 1 + (16 - 1)/16 (pertes ignorées)
+        assert stats.jitter == pytest.approx(1 + 15 / 16)
+
+
+class TestLatencyMonitorAggregates:
+    """LatencyMonitor: stats et classements lus depuis les agrégats"""
+
+    def test_stats_follow_history_window(self):
+        monitor = LatencyMonitor(history_size=4, prober=object())
+        monitor._record('10.0.0.1', [EchoReply('10.0.0.1', 1, 100.0), None])
+        monitor._record('10.0.0.1', [EchoReply('10.0.0.1', s, 5.0) for s in range(2, 6)])
+        monitor._record('10.0.0.2', [None, None])
+
+        stats = monitor.calculate_stats('10.0.0.1')
+        # Le RTT de 100 ms et la perte ont quitté la fenêtre de 4 mesures
+        assert (stats.measurements_count, stats.avg_latency_ms, stats.max_latency_ms) == (4, 5.0, 5.0)
+        assert stats.packet_loss_percent == 0.0
+        assert monitor.calculate_stats('10.0.0.2').quality_label == "Offline"
+
+        assert [s.ip for s in monitor.get_top_performers()] == ['10.0.0.1']
+        assert monitor.get_worst_performers(limit=1)[0].ip == '10.0.0.2'
+
+        monitor.clear_history('10.0.0.1')
+        assert monitor.calculate_stats('10.0.0.1') is None
+
+    def test_stats_window_shorter_than_history(self):
+        """Stats sur les mesures récentes, historique long conservé"""
+        monitor = LatencyMonitor(history_size=1000, stats_window=10, prober=object())
+        monitor._record('10.0.0.1', [None] * 5 + [EchoReply('10.0.0.1', s, 200.0) for s in range(50)])
+        monitor._record('10.0.0.1', [EchoReply('10.0.0.1', s, 5.0) for s in range(10)])
+
+        stats = monitor.calculate_stats('10.0.0.1')
+        assert (stats.measurements_count, stats.avg_latency_ms, stats.max_latency_ms) == (10, 5.0, 5.0)
+        assert stats.packet_loss_percent == 0.0
+        assert len(monitor.history['10.0.0.1']) == 65
+
+        # Défaut: fenêtre de stats indépendante de la taille de l'historique
+        assert LatencyMonitor(prober=object()).stats_window == 100
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,182 @@
+"""
+🧪 Tests - Time Series Store
+
+Tests des segments colonnaires persistés (écriture bufferisée, lecture
+mmap par fenêtre, compaction en rollups 1 min) et du rechargement de
+l'historique latence / bande passante
+"""
+
+import math
+import os
+import time
+
+import pytest
+
+from src.features.network.monitoring.bandwidth_monitor import BandwidthMonitor
+from src.features.network.monitoring.bandwidth_series import BandwidthSeries
+from src.features.network.monitoring.icmp_prober import EchoReply
+from src.features.network.monitoring.latency_monitor import LatencyMonitor
+from src.features.network.monitoring.timeseries_store import TimeSeriesStore
+from src.features.network.registry import NetworkRegistry
+
+MAC = 'AA:BB:CC:DD:EE:01'
+T0 = 1_699_999_200.0      # Début d'heure (multiple de 3600)
+
+
+def make_store(tmp_path, **kwargs):
+    kwargs.setdefault('raw_retention_hours', 2)
+    kwargs.setdefault('rollup_retention_days', 1)
+    return TimeSeriesStore(root=tmp_path / "ts", flush_interval=1, **kwargs)
+
+
+class TestTimeSeriesStore:
+    """Tests pour timeseries_store.py"""
+
+    def test_range_query_across_segments(self, tmp_path):
+        store = make_store(tmp_path)
+        for i in range(3 * 360):                # 3 h à 10 s → 3 segments bruts
+            store.append('latency', '10.0.0.1', T0 + i * 10, (float(i),))
+        assert store.flush() == 1080
+
+        raw_dir = store.root / 'latency' / '10.0.0.1' / 'raw'
+        assert sorted(os.listdir(raw_dir)) == sorted(
+            f"{int(T0) + h * 3600}.{ext}" for h in range(3) for ext in ('ts', 'c0')
+        )
+        # 4 octets d'offset + 4 octets de float32 par point
+        assert (raw_dir / f"{int(T0)}.ts").stat().st_size == 360 * 4
+
+        points = store.query('latency', '10.0.0.1', T0 + 3595, T0 + 3625)
+        assert [(ts - T0, values) for ts, values in points] == [(3600.0, (360.0,)), (3610.0, (361.0,)), (3620.0, (362.0,))]
+        assert store.query('latency', '10.0.0.2', T0, T0 + 100) == []
+
+    def test_pending_points_and_clock_skew(self, tmp_path):
+        store = make_store(tmp_path)
+        store.append('bandwidth', MAC, T0 + 10, (100, 1000))
+        assert store.keys('bandwidth') == [MAC]
+        assert store.query('bandwidth', MAC, T0, T0 + 20) == [(T0 + 10, (100, 1000))]
+
+        store.flush()
+        store.append('bandwidth', MAC, T0 + 5, (1, 2))      # Horloge reculée
+        store.flush()
+        timestamps = [ts for ts, _ in store.query('bandwidth', MAC, T0, T0 + 20)]
+        assert timestamps == [T0 + 10, T0 + 10]
+        assert os.listdir(store.root / 'bandwidth') == ['AA%3ABB%3ACC%3ADD%3AEE%3A01']
+
+    def test_reopen_and_torn_write(self, tmp_path):
+        store = make_store(tmp_path)
+        for i in range(5):
+            store.append('latency', 'gw', T0 + i, (1.0 + i,))
+        store.flush()
+        # Écriture interrompue: une valeur sans offset + octets partiels
+        column = store.root / 'latency' / 'gw' / 'raw' / f"{int(T0)}.c0"
+        with open(column, 'ab') as f:
+            f.write(b'\x00' * 6)
+
+        reopened = make_store(tmp_path)
+        assert len(reopened.query('latency', 'gw', T0, T0 + 10)) == 5
+        reopened.append('latency', 'gw', T0 + 6, (math.nan,))
+        reopened.flush()
+        points = reopened.query('latency', 'gw', T0, T0 + 10)
+        assert [values[0] for _, values in points[:5]] == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert points[-1][0] == T0 + 6 and math.isnan(points[-1][1][0])
+
+    def test_compaction_downsamples_and_expires(self, tmp_path):
+        store = make_store(tmp_path)
+        for i in range(4 * 60):                 # 4 h, un point par minute + 30 s
+            store.append('latency', 'gw', T0 + i * 60, (10.0,))
+            store.append('latency', 'gw', T0 + i * 60 + 30, (20.0 if i % 2 else math.nan,))
+            store.append('bandwidth', MAC, T0 + i * 60 + 15, (100, 200))
+            store.append('bandwidth', MAC, T0 + i * 60 + 45, (1, 2))
+        store.flush()
+
+        # Rétention brute 2 h: les 2 premières heures passent en rollups
+        result = store.compact(now=T0 + 4 * 3600)
+        assert result == {'rolled_up': 4, 'expired': 0}
+        assert len(os.listdir(store.root / 'latency' / 'gw' / 'raw')) == 4
+
+        points = store.query('latency', 'gw', T0, T0 + 4 * 3600)
+        assert len(points) == 120 + 240
+        assert points[0] == (T0, (10.0,))             # Perte ignorée dans la moyenne
+        assert points[1] == (T0 + 60, (15.0,))
+        assert points[120] == (T0 + 7200, (10.0,))     # Suite en brut
+        bandwidth = store.query('bandwidth', MAC, T0, T0 + 4 * 3600)
+        assert bandwidth[0] == (T0, (101.0, 202.0))
+        assert sum(values[1] for _, values in bandwidth) == 240 * 202
+
+        # Compaction idempotente, puis expiration des rollups (1 jour)
+        assert store.compact(now=T0 + 4 * 3600) == {'rolled_up': 0, 'expired': 0}
+        store.compact(now=T0 + 3 * 86400)
+        assert store.keys('latency') == []
+
+    def test_delete(self, tmp_path):
+        store = make_store(tmp_path)
+        store.append('latency', 'a', T0, (1.0,))
+        store.append('latency', 'b', T0, (1.0,))
+        store.flush()
+        store.delete('latency', 'a')
+        assert store.keys('latency') == ['b']
+        with pytest.raises(ValueError):
+            store.append('unknown', 'a', T0, (1.0,))
+
+
+class TestMonitorRestore:
+    """Historique latence / bande passante rechargé après redémarrage"""
+
+    def test_latency_history_survives_restart(self, tmp_path):
+        store = make_store(tmp_path)
+        monitor = LatencyMonitor(history_size=3, prober=object(), store=store)
+        monitor._record('10.0.0.1', [EchoReply('10.0.0.1', 1, 50.0), None])
+        monitor._record('10.0.0.1', [EchoReply('10.0.0.1', s, 5.0) for s in (3, 4)])
+        store.flush()
+
+        restarted = LatencyMonitor(history_size=3, prober=object(), store=make_store(tmp_path))
+        assert restarted.restore_history() == 3
+        stats = restarted.calculate_stats('10.0.0.1')
+        assert (stats.measurements_count, stats.packet_loss_percent) == (3, 33.33)
+        series = restarted.get_series('10.0.0.1', hours=1)
+        assert [p['latency_ms'] for p in series] == [50.0, None, 5.0, 5.0]
+
+        restarted.clear_history()
+        assert restarted.store.keys('latency') == []
+
+    def test_bandwidth_history_survives_restart(self, tmp_path):
+        registry = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        registry.update_from_scan([{'mac': MAC, 'current_ip': '192.168.1.10', 'current_hostname': 'nas', 'is_online': True}])
+        store = make_store(tmp_path)
+        monitor = BandwidthMonitor(registry=registry, store=store)
+        monitor.register_device('192.168.1.10', MAC)
+        for _ in range(3):
+            monitor.add_sample(MAC, 1000, 5000)
+        store.flush()
+
+        restarted = BandwidthMonitor(registry=registry, store=make_store(tmp_path))
+        assert restarted.restore_history() == 3
+        stats = restarted.get_stats(MAC)
+        assert (stats.ip, stats.hostname, stats.total_bytes) == ('192.168.1.10', 'nas', 18000)
+        assert stats.current_total_bps == 0.0
+        assert restarted.get_window_stats(MAC, 600)['bytes_received'] == 15000
+        assert [s.mac for s in restarted.get_top_talkers(window=300)] == [MAC]
+
+    def test_bandwidth_restore_is_downsampled_by_age(self, tmp_path, monkeypatch):
+        store = make_store(tmp_path, raw_retention_hours=72)
+        now = time.time()
+        start = now - 2 * 86400
+        timestamps = [start + i * 5 for i in range(int((now - 60 - start) // 5))]
+        for ts in timestamps:
+            store.append('bandwidth', MAC, ts, (10, 100))
+        store.flush()
+
+        added = []
+        original_add = BandwidthSeries.add
+        monkeypatch.setattr(BandwidthSeries, 'add', lambda self, *args: added.append(args) or original_add(self, *args))
+        restarted = BandwidthMonitor(registry=NetworkRegistry(registry_file=str(tmp_path / "registry.json")), store=store)
+        assert restarted.restore_history() == len(timestamps)
+
+        # Rejeu borné: 1 h au-delà de 24 h, 1 min au-delà de 10 min, brut ensuite
+        assert len(added) < 24 + 1440 + 130
+        stats = restarted.get_stats(MAC)
+        assert (stats.sample_count, stats.total_bytes) == (len(timestamps), 110 * len(timestamps))
+        assert restarted.get_window_stats(MAC, 3 * 86400)['bytes_received'] == 100 * len(timestamps)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
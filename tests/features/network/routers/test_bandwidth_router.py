@@ -104,7 +104,7 @@ class TestBandwidthRouter:
         assert "count" in data
         assert "top_talkers" in data
         assert data["count"] == 1
-        mock_monitor.get_top_talkers.assert_called_once_with(limit=10, sort_by="total")
+        mock_monitor.get_top_talkers.assert_called_once_with(limit=10, sort_by="total", window=None)
     
     @patch("src.features.network.routers.bandwidth_router.get_bandwidth_monitor")
     def test_get_top_talkers_with_params(self, mock_get_monitor, client):
@@ -116,7 +116,24 @@ class TestBandwidthRouter:
         response = client.get("/api/network/bandwidth/top-talkers?limit=5&sort_by=upload")
         
         assert response.status_code == 200
-        mock_monitor.get_top_talkers.assert_called_once_with(limit=5, sort_by="upload")
+        mock_monitor.get_top_talkers.assert_called_once_with(limit=5, sort_by="upload", window=None)
+    
+    @patch("src.features.network.routers.bandwidth_router.get_bandwidth_monitor")
+    def test_get_history(self, mock_get_monitor, client):
+        """Test GET /bandwidth/history/{mac}"""
+        mock_monitor = Mock()
+        mock_monitor.get_history.return_value = [{"timestamp": 0, "bytes_sent": 1, "bytes_received": 2}]
+        mock_get_monitor.return_value = mock_monitor
+        
+        response = client.get("/api/network/bandwidth/history/aa:bb:cc:dd:ee:ff?window=86400")
+        
+        assert response.status_code == 200
+        assert response.json()["count"] == 1
+        mock_monitor.get_history.assert_called_once_with("aa:bb:cc:dd:ee:ff", 86400, None)
+        
+        mock_monitor.get_history.side_effect = ValueError("Résolution inconnue: 5s")
+        response = client.get("/api/network/bandwidth/history/aa:bb:cc:dd:ee:ff?resolution=5")
+        assert response.status_code == 400
     
     @patch("src.features.network.routers.bandwidth_router.get_bandwidth_monitor")
     def test_register_device(self, mock_get_monitor, client, sample_device_stats):
@@ -82,6 +82,47 @@ class TestLatencyRouter:
         assert response.status_code == 500
         assert "erreur" in response.json()["detail"].lower()
     
+    @patch("src.features.network.routers.latency_router.get_latency_monitor")
+    def test_get_latency_percentiles(self, mock_get_monitor, client):
+        """Test GET /latency/{ip}/percentiles"""
+        mock_monitor = Mock()
+        mock_monitor.get_percentiles.return_value = {"p50": 12.0, "p99": 40.5}
+        mock_get_monitor.return_value = mock_monitor
+        
+        response = client.get("/api/network/latency/192.168.1.100/percentiles?q=50&q=99&hours=2")
+        
+        assert response.status_code == 200
+        assert response.json()["percentiles"] == {"p50": 12.0, "p99": 40.5}
+        mock_monitor.get_percentiles.assert_called_once_with("192.168.1.100", [50.0, 99.0], hours=2.0)
+    
+    @patch("src.features.network.routers.latency_router.get_latency_monitor")
+    def test_get_latency_histogram_not_found(self, mock_get_monitor, client):
+        """Test GET /latency/{ip}/histogram device sans mesure"""
+        mock_monitor = Mock()
+        mock_monitor.get_histogram.return_value = None
+        mock_get_monitor.return_value = mock_monitor
+        
+        response = client.get("/api/network/latency/192.168.1.200/histogram")
+        
+        assert response.status_code == 404
+    
+    @patch("src.features.network.routers.latency_router.get_latency_service")
+    def test_latency_service_targets(self, mock_get_service, client):
+        """Test POST /latency/service/targets + GET /latency/service/status"""
+        mock_service = Mock()
+        mock_service.add_targets.return_value = 4
+        mock_service.get_status.return_value = {"running": True, "targets": 4}
+        mock_service.get_targets.return_value = []
+        mock_get_service.return_value = mock_service
+        
+        response = client.post("/api/network/latency/service/targets?ips=192.168.1.50&name=cam")
+        assert response.json() == {"added": 1, "total_targets": 4}
+        mock_service.add_targets.assert_called_once_with(["192.168.1.50"], name="cam")
+        
+        response = client.get("/api/network/latency/service/status")
+        assert response.status_code == 200
+        assert response.json()["status"]["running"] is True
+    
     @patch("src.features.network.routers.latency_router.get_latency_monitor")
     def test_measure_latency_success(self, mock_get_monitor, client, sample_latency_stats):
         """Test POST /latency/measure avec succès"""
@@ -0,0 +1 @@
+"""Network scanners tests"""
@@ -0,0 +1,131 @@
+"""
+🧪 Tests - DHCP Lease Scanner
+
+Tests des parsers dnsmasq / ISC et de la lecture incrémentale
+"""
+
+import asyncio
+import pytest
+
+from src.features.network.scanners.dhcp_lease_scanner import (
+    DHCPLeaseScanner, LeaseFileReader, parse_dnsmasq_leases, parse_isc_leases,
+)
+
+
+DNSMASQ = """\
+1893456000 aa:bb:cc:00:00:01 192.168.1.10 pc-salon 01:aa:bb:cc:00:00:01
+0 aa:bb:cc:00:00:02 192.168.1.11 * *
+duid 00:01:00:01:2c:3d:4e:5f:aa:bb:cc:00:00:01
+1893456000 1234567 fd00::10 pc-salon 00:01:00:01
+"""
+
+ISC_HEADER = "# The format of this file is documented in the dhcpd.leases(5) manual page.\n"
+
+
+def isc_block(ip, mac, hostname=None, state="active", ends="2030/01/01 10:00:00"):
+    host = f'  client-hostname "{hostname}";\n' if hostname else ""
+    return (
+        f"lease {ip} {{\n"
+        f"  starts 1 2029/12/31 10:00:00;\n"
+        f"  ends 2 {ends};\n"
+        f"  binding state {state};\n"
+        f"  next binding state free;\n"
+        f"  hardware ethernet {mac};\n"
+        f"{host}"
+        f"}}\n"
+    )
+
+
+class TestLeaseParsers:
+    """Tests des formats de baux"""
+
+    def test_dnsmasq(self):
+        """IPv4 uniquement, '*' = pas de hostname, expiry 0 = infini"""
+        leases = parse_dnsmasq_leases(DNSMASQ)
+
+        assert set(leases) == {"AA:BB:CC:00:00:01", "AA:BB:CC:00:00:02"}
+        assert leases["AA:BB:CC:00:00:01"].ip == "192.168.1.10"
+        assert leases["AA:BB:CC:00:00:01"].hostname == "pc-salon"
+        assert leases["AA:BB:CC:00:00:02"].hostname is None
+        assert leases["AA:BB:CC:00:00:02"].expires is None
+
+    def test_isc_latest_block_wins(self):
+        """Journal ISC: le dernier bloc fait foi, 'free' libère le bail"""
+        text = (
+            ISC_HEADER
+            + isc_block("192.168.1.50", "aa:bb:cc:00:00:03", "laptop")
+            + isc_block("192.168.1.51", "aa:bb:cc:00:00:03", "laptop")
+            + isc_block("192.168.1.60", "aa:bb:cc:00:00:04")
+            + isc_block("192.168.1.60", "aa:bb:cc:00:00:04", state="free")
+        )
+        leases = parse_isc_leases(text)
+
+        assert set(leases) == {"AA:BB:CC:00:00:03"}
+        assert leases["AA:BB:CC:00:00:03"].ip == "192.168.1.51"
+
+
+class TestLeaseFileReader:
+    """Tests de la lecture incrémentale"""
+
+    def test_dnsmasq_delta(self, tmp_path):
+        """Fichier réécrit → seul le bail modifié est dans le delta"""
+        path = tmp_path / "dnsmasq.leases"
+        path.write_text(DNSMASQ)
+        reader = LeaseFileReader(path)
+
+        first = reader.refresh()
+        assert first.initial and len(first.upserted) == 2
+
+        path.write_text(DNSMASQ.replace("192.168.1.11", "192.168.1.99"))
+        delta = reader.refresh()
+
+        assert not delta.initial
+        assert [(l.mac, l.ip) for l in delta.upserted] == [("AA:BB:CC:00:00:02", "192.168.1.99")]
+        assert delta.removed == []
+        assert not reader.refresh()  # Rien de nouveau
+
+    def test_isc_reads_only_appended_bytes(self, tmp_path):
+        """Journal ISC: parse à partir de l'offset, bloc incomplet différé"""
+        path = tmp_path / "dhcpd.leases"
+        path.write_text(ISC_HEADER + isc_block("192.168.1.50", "aa:bb:cc:00:00:03"))
+        reader = LeaseFileReader(path)
+        reader.refresh()
+        assert reader.format == "isc"
+
+        partial = isc_block("192.168.1.52", "aa:bb:cc:00:00:03", "laptop")
+        with open(path, "a") as f:
+            f.write(partial[:40])
+        assert not reader.refresh()  # Bloc en cours d'écriture
+
+        with open(path, "a") as f:
+            f.write(partial[40:] + isc_block("192.168.1.60", "aa:bb:cc:00:00:04"))
+        delta = reader.refresh()
+
+        assert [(l.mac, l.ip) for l in delta.upserted] == [
+            ("AA:BB:CC:00:00:03", "192.168.1.52"),
+            ("AA:BB:CC:00:00:04", "192.168.1.60"),
+        ]
+
+        with open(path, "a") as f:
+            f.write(isc_block("192.168.1.60", "aa:bb:cc:00:00:04", state="released"))
+        delta = reader.refresh()
+        assert [l.mac for l in delta.removed] == ["AA:BB:CC:00:00:04"]
+
+
+class TestDHCPLeaseScanner:
+    """Tests pour DHCPLeaseScanner"""
+
+    def test_scan_returns_active_leases(self, tmp_path):
+        """Baux actifs → DeviceData source 'dhcp' (identité, pas de présence)"""
+        path = tmp_path / "dnsmasq.leases"
+        path.write_text(DNSMASQ + "1000 aa:bb:cc:00:00:05 192.168.1.12 old-phone *\n")
+
+        devices = {d.mac: d for d in asyncio.run(DHCPLeaseScanner(lease_files=[str(path)]).scan())}
+
+        assert set(devices) == {"AA:BB:CC:00:00:01", "AA:BB:CC:00:00:02"}  # Bail de 1970 expiré
+        assert devices["AA:BB:CC:00:00:01"].source == "dhcp"
+        assert devices["AA:BB:CC:00:00:01"].is_online is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
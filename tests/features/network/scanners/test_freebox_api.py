@@ -0,0 +1,163 @@
+"""
+🧪 Tests - Freebox API Source
+
+Tests de la source routeur contre une Freebox locale (stand-in aiohttp)
+"""
+
+import asyncio
+import hashlib
+import hmac
+import pytest
+from aiohttp import web
+
+from src.features.network.scanners.freebox_api import FreeboxAPISource
+from src.features.network.scanners.router_api import RouterAPIError, RouterScanner
+
+
+APP_TOKEN = "app-token-secret"
+CHALLENGE = "challenge-42"
+
+LAN_HOSTS = [
+    {
+        "id": "ether-aa:bb:cc:00:00:01",
+        "primary_name": "PC-Salon",
+        "host_type": "workstation",
+        "vendor_name": "Intel Corporate",
+        "reachable": True,
+        "persistent": True,
+        "last_activity": 1700000300,
+        "l2ident": {"id": "aa:bb:cc:00:00:01", "type": "mac_address"},
+        "l3connectivities": [
+            {"addr": "192.168.1.20", "af": "ipv4", "reachable": False, "last_activity": 1690000000},
+            {"addr": "192.168.1.10", "af": "ipv4", "reachable": True, "last_activity": 1700000300},
+            {"addr": "fe80::1", "af": "ipv6", "reachable": True, "last_activity": 1700000300},
+        ],
+        "names": [{"name": "PC-Salon", "source": "dhcp"}],
+    },
+    {
+        "id": "ether-aa:bb:cc:00:00:02",
+        "primary_name": "iPhone",
+        "host_type": "smartphone",
+        "reachable": False,
+        "l2ident": {"id": "aa:bb:cc:00:00:02", "type": "mac_address"},
+        "l3connectivities": [],
+    },
+    {
+        "id": "dhcp-unknown",
+        "l2ident": {"id": "xyz", "type": "dhcp_client_id"},
+    },
+]
+
+
+class FreeboxStandIn:
+    """Freebox OS minimale: api_version, login, session, LAN browser"""
+
+    def __init__(self):
+        self.sessions = set()
+        self.login_count = 0
+        self.browser_calls = 0
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get("/api_version", self.api_version)
+        app.router.add_get("/api/v8/login/", self.login)
+        app.router.add_post("/api/v8/login/session/", self.session)
+        app.router.add_get("/api/v8/lan/browser/pub/", self.browser)
+        return app
+
+    async def api_version(self, request):
+        return web.json_response({"api_base_url": "/api/", "api_version": "8.2", "device_name": "Freebox Server"})
+
+    async def login(self, request):
+        return web.json_response({"success": True, "result": {"logged_in": False, "challenge": CHALLENGE}})
+
+    async def session(self, request):
+        body = await request.json()
+        expected = hmac.new(APP_TOKEN.encode(), CHALLENGE.encode(), hashlib.sha1).hexdigest()
+        if body.get("password") != expected:
+            return web.json_response({"success": False, "error_code": "invalid_token", "msg": "bad token"}, status=403)
+        self.login_count += 1
+        token = f"session-{self.login_count}"
+        self.sessions.add(token)
+        return web.json_response({"success": True, "result": {"session_token": token}})
+
+    async def browser(self, request):
+        if request.headers.get("X-Fbx-App-Auth") not in self.sessions:
+            return web.json_response({"success": False, "error_code": "auth_required"}, status=403)
+        self.browser_calls += 1
+        return web.json_response({"success": True, "result": LAN_HOSTS})
+
+
+async def with_freebox(test, app_token=APP_TOKEN):
+    """Lance le stand-in sur un port libre et exécute test(box, source)"""
+    box = FreeboxStandIn()
+    runner = web.AppRunner(box.app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        source = FreeboxAPISource(base_url=f"http://127.0.0.1:{port}", app_token=app_token)
+        return await test(box, source)
+    finally:
+        await runner.cleanup()
+
+
+class TestFreeboxAPISource:
+    """Tests pour freebox_api.py"""
+
+    def test_fetch_hosts_maps_lan_browser(self):
+        """LAN browser → DeviceData (MAC, IPv4 joignable, type, metadata)"""
+        async def test(box, source):
+            return await source.fetch_hosts()
+
+        devices = {d.mac: d for d in asyncio.run(with_freebox(test))}
+
+        assert set(devices) == {"AA:BB:CC:00:00:01", "AA:BB:CC:00:00:02"}
+        pc = devices["AA:BB:CC:00:00:01"]
+        assert pc.source == "freebox"
+        assert pc.ip == "192.168.1.10"
+        assert pc.is_online is True
+        assert pc.hostname == "PC-Salon"
+        assert pc.device_type == "computer"
+        assert pc.metadata["host_type"] == "workstation"
+        assert devices["AA:BB:CC:00:00:02"].is_online is False
+        assert devices["AA:BB:CC:00:00:02"].ip is None
+
+    def test_session_token_is_cached(self):
+        """Deux inventaires → un seul login, un appel LAN browser chacun"""
+        async def test(box, source):
+            await source.fetch_hosts()
+            await source.fetch_hosts()
+            return box
+
+        box = asyncio.run(with_freebox(test))
+
+        assert box.login_count == 1
+        assert box.browser_calls == 2
+
+    def test_expired_session_relogin(self):
+        """Session expirée côté box → re-login transparent"""
+        async def test(box, source):
+            await source.fetch_hosts()
+            box.sessions.clear()
+            devices = await source.fetch_hosts()
+            return box, devices
+
+        box, devices = asyncio.run(with_freebox(test))
+
+        assert box.login_count == 2
+        assert len(devices) == 2
+
+    def test_bad_app_token(self):
+        """app_token invalide → RouterAPIError, le scanner retourne []"""
+        async def test(box, source):
+            with pytest.raises(RouterAPIError):
+                await source.fetch_hosts()
+            return await RouterScanner(source=source).scan()
+
+        assert asyncio.run(with_freebox(test, app_token="wrong")) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,115 @@
+"""
+🧪 Tests - Merge Cache
+
+Tests de la mémoïsation des fusions multi-sources (empreintes, éviction,
+intégration dans MultiSourceScanner)
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+
+from src.features.network.scanners.merge_cache import MergeCache, fingerprint
+from src.features.network.scanners.multi_source import MultiSourceScanner
+from src.core.device_intelligence import DeviceData
+
+
+MAC = "AA:BB:CC:00:00:01"
+
+
+def observation(source="arp", **fields):
+    return DeviceData(mac=MAC, source=source, timestamp=datetime.now(), is_online=True, **fields)
+
+
+class FakeRouterScanner:
+    """Inventaire de box factice (une seule source, sans délai)"""
+    enabled = True
+
+    def __init__(self):
+        self.devices = []
+
+    async def scan(self):
+        return [DeviceData(mac=mac, source='freebox', timestamp=datetime.now(), **fields)
+                for mac, fields in self.devices]
+
+
+def make_scanner():
+    scanner = MultiSourceScanner()
+    scanner.enabled_sources = {name: False for name in scanner.enabled_sources}
+    scanner.enabled_sources['router'] = True
+    scanner.scanners['router'] = FakeRouterScanner()
+    return scanner
+
+
+class TestFingerprint:
+    """Empreinte des observations normalisées"""
+
+    def test_ignores_volatile_fields(self):
+        a = [observation(ip="192.168.1.10", response_time_ms=1.2, open_ports=[443, 80])]
+        b = [observation(ip="192.168.1.10", response_time_ms=9.7, open_ports=[80, 443], metadata={'x': 1})]
+        assert fingerprint(a) == fingerprint(b)
+
+        assert fingerprint(a) != fingerprint([observation(ip="192.168.1.11")])
+        assert fingerprint(a) != fingerprint(a + [observation(source="mdns", hostname="tv")])
+
+
+class TestMergeCache:
+    """Tests pour merge_cache.py"""
+
+    def test_hit_miss_and_detached_copies(self):
+        cache = MergeCache()
+        assert cache.get(MAC, 1) is None
+        cache.put(MAC, 1, {'mac': MAC, 'sources': ['arp']})
+
+        merged = cache.get(MAC, 1)
+        merged['sources'].append('tailscale')
+        assert cache.get(MAC, 1)['sources'] == ['arp']
+        assert cache.get(MAC, 2) is None
+
+        stats = cache.get_statistics()
+        assert (stats['hits'], stats['misses'], stats['hit_rate']) == (2, 2, 0.5)
+
+    def test_lru_cap_and_idle_eviction(self):
+        cache = MergeCache(max_entries=2, idle_ttl=60)
+        for i in range(3):
+            cache.put(f"MAC{i}", i, {})
+        assert cache.get("MAC0", 0) is None
+        assert len(cache) == 2
+
+        cache._entries["MAC1"].seen_at = time.monotonic() - 120
+        assert cache.evict_idle() == 1
+        assert cache.get_statistics()['evictions'] == 2
+
+
+class TestScannerMemoization:
+    """Intégration: scans successifs de MultiSourceScanner"""
+
+    def test_unchanged_devices_skip_merge(self):
+        scanner = make_scanner()
+        scanner.scanners['router'].devices = [
+            (MAC, {'ip': "192.168.1.10", 'hostname': "nas", 'is_online': True}),
+            ("AA:BB:CC:00:00:02", {'ip': "192.168.1.11", 'is_online': True}),
+        ]
+        merges = []
+        merge = scanner.engine.merge_device_data
+        scanner.engine.merge_device_data = lambda sources: merges.append(sources[0].mac) or merge(sources)
+
+        first = asyncio.run(scanner.scan_all())
+        second = asyncio.run(scanner.scan_all())
+
+        assert len(merges) == 2
+        assert [d.to_dict()['vendor'] for d in second] == [d.to_dict()['vendor'] for d in first]
+        assert scanner.get_statistics()['merge_cache']['hits'] == 2
+
+        # Observation modifiée → re-fusion de ce device seulement
+        scanner.scanners['router'].devices[0] = (MAC, {'ip': "192.168.1.20", 'hostname': "nas", 'is_online': True})
+        third = asyncio.run(scanner.scan_all())
+
+        assert merges[2:] == [MAC]
+        assert third[0].current_ip == "192.168.1.20"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+"""
+🧪 Tests - TCP Port Prober
+
+Tests des probes TCP-connect contre des ports locaux (127.0.0.1)
+"""
+
+import asyncio
+import socket
+from datetime import datetime
+import pytest
+
+from src.features.network.scanners import port_prober
+from src.features.network.scanners.port_prober import TCPPortProber
+from src.core.device_intelligence import DeviceData, DeviceIntelligenceEngine
+
+
+MAC = "AA:BB:CC:00:00:01"
+
+
+def free_port() -> int:
+    """Port local fermé (connexion refusée)"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def open_server():
+    server = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+class TestTCPPortProber:
+    """Tests pour port_prober.py"""
+
+    def test_open_and_refused_ports(self):
+        """Port ouvert détecté, port refusé = hôte joignable"""
+        closed = free_port()
+
+        async def run():
+            server, port = await open_server()
+            try:
+                prober = TCPPortProber(ports=[port, closed], per_host_interval=0)
+                return port, await prober.probe_host("127.0.0.1", key=MAC)
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        port, result = asyncio.run(run())
+
+        assert result.open_ports == [port]
+        assert result.services == [str(port)]
+        assert result.reachable is True
+
+    def test_cache_ttl(self):
+        """Résultat frais → pas de re-probe; périmé → re-probe"""
+        closed = free_port()
+
+        async def run():
+            prober = TCPPortProber(ports=[closed], per_host_interval=0, cache_ttl=60)
+            await prober.probe_host("127.0.0.1", key=MAC)
+            await prober.probe_host("127.0.0.1", key=MAC)
+            after_hit = prober.connects
+
+            prober.cache_ttl = 0
+            await prober.probe_host("127.0.0.1", key=MAC)
+            return prober, after_hit
+
+        prober, after_hit = asyncio.run(run())
+
+        assert after_hit == 1
+        assert prober.cache_hits == 1
+        assert prober.connects == 2
+
+    def test_global_in_flight_limit(self, monkeypatch):
+        """Jamais plus de max_in_flight connexions simultanées (tous hôtes)"""
+        state = {"current": 0, "peak": 0}
+
+        async def slow_connect(host, port):
+            state["current"] += 1
+            state["peak"] = max(state["peak"], state["current"])
+            await asyncio.sleep(0.01)
+            state["current"] -= 1
+            raise ConnectionRefusedError()
+
+        monkeypatch.setattr(port_prober.asyncio, "open_connection", slow_connect)
+        prober = TCPPortProber(ports=list(range(1, 11)), max_in_flight=3, per_host_interval=0)
+        targets = {f"AA:BB:CC:00:00:{i:02X}": f"10.0.0.{i}" for i in range(1, 6)}
+
+        results = asyncio.run(prober.probe_hosts(targets))
+
+        assert len(results) == 5
+        assert prober.connects == 50
+        assert state["peak"] == 3
+
+    def test_results_merge_into_intelligence(self):
+        """DeviceData 'portscan' → union open_ports/services dans la fusion"""
+        prober = TCPPortProber(ports=[22, 80])
+        result = port_prober.PortProbeResult(ip="192.168.1.10", open_ports=[22, 80], reachable=True)
+        sources = [
+            DeviceData(mac=MAC, source="arp", timestamp=datetime.now(), ip="192.168.1.10", is_online=True),
+            prober.to_device_data(MAC, result),
+        ]
+
+        merged = DeviceIntelligenceEngine().merge_device_data(sources)
+
+        assert merged["open_ports"] == [22, 80]
+        assert merged["services"] == ["22", "80"]
+        assert "portscan" in merged["sources"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,209 @@
+"""
+🧪 Tests - SNMP Scanner
+
+Tests du client SNMPv2c et du scanner bridge-table contre un agent
+SNMP local (stand-in UDP sur 127.0.0.1)
+"""
+
+import asyncio
+import bisect
+import pytest
+
+from src.features.network.scanners.snmp_client import (
+    END_OF_MIB_VIEW, PDU_GET_BULK, PDU_RESPONSE, SnmpClient,
+    decode_message, encode_message, parse_oid,
+)
+from src.features.network.scanners.snmp_scanner import SNMPScanner
+
+
+MAC_PC = bytes.fromhex("aabbcc000001")
+MAC_PHONE = bytes.fromhex("aabbcc000002")
+MAC_UPLINK = bytes.fromhex("aabbcc0000ff")   # Routeur, vu derrière l'uplink
+
+
+def switch_mib():
+    """MIB d'un petit switch: ARP + BRIDGE-MIB + Q-BRIDGE + ifName"""
+    mib = {
+        # ipNetToMediaPhysAddress.ifIndex.ip
+        parse_oid("1.3.6.1.2.1.4.22.1.2.1.192.168.1.10"): MAC_PC,
+        parse_oid("1.3.6.1.2.1.4.22.1.2.1.192.168.1.11"): MAC_PHONE,
+        parse_oid("1.3.6.1.2.1.4.22.1.2.1.192.168.1.254"): MAC_UPLINK,
+        # dot1dBasePortIfIndex
+        parse_oid("1.3.6.1.2.1.17.1.4.1.2.1"): 101,
+        parse_oid("1.3.6.1.2.1.17.1.4.1.2.2"): 102,
+        parse_oid("1.3.6.1.2.1.17.1.4.1.2.8"): 108,
+        # ifName
+        parse_oid("1.3.6.1.2.1.31.1.1.1.1.101"): b"gi0/1",
+        parse_oid("1.3.6.1.2.1.31.1.1.1.1.102"): b"gi0/2",
+        parse_oid("1.3.6.1.2.1.31.1.1.1.1.108"): b"gi0/8",
+        # Valeur hors tables parcourues (fin de walk)
+        parse_oid("1.3.6.1.2.1.99.1"): 0,
+    }
+    # dot1qTpFdbPort.vlan.mac (VLAN 10)
+    for mac, port in ((MAC_PC, 1), (MAC_PHONE, 2), (MAC_UPLINK, 8)):
+        mib[parse_oid("1.3.6.1.2.1.17.7.1.2.2.1.2.10") + tuple(mac)] = port
+    return mib
+
+
+class SnmpAgentStandIn(asyncio.DatagramProtocol):
+    """Agent SNMPv2c minimal: répond aux GETBULK sur une MIB en mémoire"""
+
+    def __init__(self, mib, community="public"):
+        self.oids = sorted(mib)
+        self.mib = mib
+        self.community = community
+        self.requests = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        request = decode_message(data)
+        if request["community"] != self.community or request["pdu_type"] != PDU_GET_BULK:
+            return  # Comme un vrai agent: silence
+        self.requests += 1
+
+        varbinds = []
+        current = request["varbinds"][0][0]
+        for _ in range(request["field_b"]):
+            pos = bisect.bisect_right(self.oids, current)
+            if pos >= len(self.oids):
+                varbinds.append((current, END_OF_MIB_VIEW))
+                break
+            current = self.oids[pos]
+            varbinds.append((current, self.mib[current]))
+
+        self.transport.sendto(encode_message(
+            PDU_RESPONSE, request["request_id"], varbinds, request["community"]
+        ), addr)
+
+
+async def start_agent(mib, **kwargs):
+    loop = asyncio.get_running_loop()
+    transport, agent = await loop.create_datagram_endpoint(
+        lambda: SnmpAgentStandIn(mib, **kwargs), local_addr=("127.0.0.1", 0)
+    )
+    return transport, agent, transport.get_extra_info("sockname")[1]
+
+
+class TestSnmpCodec:
+    """Tests de l'encodage BER"""
+
+    def test_oid_encoding(self):
+        """1.3.6.1.2.1 → 06 05 2B 06 01 02 01 (arcs > 127 en base 128)"""
+        message = encode_message(PDU_GET_BULK, 1, [(parse_oid("1.3.6.1.2.1"), None)])
+        assert bytes.fromhex("06052b06010201") in message
+
+        oid = parse_oid("1.3.6.1.4.1.2636.3.1")
+        decoded = decode_message(encode_message(PDU_GET_BULK, 7, [(oid, None)]))
+        assert decoded["varbinds"] == [(oid, None)]
+
+    def test_roundtrip(self):
+        """Encode/décode: community, request-id, valeurs typées"""
+        varbinds = [
+            (parse_oid("1.3.6.1.2.1.1.3.0"), 123456),
+            (parse_oid("1.3.6.1.2.1.1.5.0"), b"switch-salon"),
+            (parse_oid("1.3.6.1.2.1.1.9.0"), -1),
+            (parse_oid("1.3.6.1.2.1.1.10.0"), END_OF_MIB_VIEW),
+        ]
+        decoded = decode_message(encode_message(PDU_RESPONSE, 4242, varbinds, "home"))
+
+        assert decoded["community"] == "home"
+        assert decoded["request_id"] == 4242
+        assert decoded["varbinds"] == varbinds
+
+
+class TestSnmpClient:
+    """Tests du bulk walk contre l'agent stand-in"""
+
+    def test_bulk_walk_stays_in_subtree(self):
+        """Le walk s'arrête à la fin de la table et pagine (max_repetitions)"""
+        async def run():
+            transport, agent, port = await start_agent(switch_mib())
+            try:
+                async with SnmpClient("127.0.0.1", port=port, max_repetitions=2) as client:
+                    return await client.bulk_walk("1.3.6.1.2.1.4.22.1.2"), agent.requests
+            finally:
+                transport.close()
+
+        rows, requests = asyncio.run(run())
+
+        assert [value for _, value in rows] == [MAC_PC, MAC_PHONE, MAC_UPLINK]
+        assert requests == 2  # 3 lignes, 2 par requête
+
+    def test_timeout_on_wrong_community(self):
+        """Agent muet → TimeoutError après les retries"""
+        async def run():
+            transport, _, port = await start_agent(switch_mib(), community="secret")
+            try:
+                async with SnmpClient("127.0.0.1", port=port, timeout=0.1, retries=1) as client:
+                    await client.bulk_walk("1.3.6.1.2.1.4.22.1.2")
+            finally:
+                transport.close()
+
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(run())
+
+
+class TestSNMPScanner:
+    """Tests pour snmp_scanner.py"""
+
+    def test_scan_maps_mac_ip_port(self):
+        """Une passe par agent → MAC ↔ IP ↔ port/VLAN"""
+        async def run():
+            transport, _, port = await start_agent(switch_mib())
+            try:
+                return await SNMPScanner(targets=[f"127.0.0.1:{port}"]).scan()
+            finally:
+                transport.close()
+
+        devices = {d.mac: d for d in asyncio.run(run())}
+
+        pc = devices["AA:BB:CC:00:00:01"]
+        assert pc.source == "snmp"
+        assert pc.ip == "192.168.1.10"
+        assert pc.metadata["switch_port"] == "gi0/1"
+        assert pc.metadata["vlan"] == 10
+        assert devices["AA:BB:CC:00:00:02"].metadata["switch_port"] == "gi0/2"
+        assert len(devices) == 3
+
+    def test_prefers_access_port_across_switches(self):
+        """MAC vu sur 2 switches → port d'accès, pas l'uplink chargé"""
+        core = {
+            parse_oid("1.3.6.1.2.1.17.4.3.1.2") + tuple(MAC_PC): 24,       # uplink
+            parse_oid("1.3.6.1.2.1.17.4.3.1.2") + tuple(MAC_PHONE): 24,
+            parse_oid("1.3.6.1.2.1.17.4.3.1.2") + tuple(MAC_UPLINK): 1,
+        }
+
+        async def run():
+            t1, _, p1 = await start_agent(switch_mib())
+            t2, _, p2 = await start_agent(core)
+            try:
+                return await SNMPScanner(targets=[f"127.0.0.1:{p2}", f"127.0.0.1:{p1}"]).scan()
+            finally:
+                t1.close()
+                t2.close()
+
+        devices = {d.mac: d for d in asyncio.run(run())}
+
+        assert devices["AA:BB:CC:00:00:01"].metadata["switch_port"] == "gi0/1"
+        assert devices["AA:BB:CC:00:00:01"].metadata["vlan"] == 10
+
+    def test_failing_agent_keeps_other_results(self):
+        """Agent mal configuré → journalisé, les autres agents restent exploités"""
+        async def run():
+            transport, _, port = await start_agent(switch_mib())
+            try:
+                return await SNMPScanner(targets=["127.0.0.1:snmp", f"127.0.0.1:{port}"]).scan()
+            finally:
+                transport.close()
+
+        assert len(asyncio.run(run())) == 3
+
+    def test_no_targets_is_noop(self):
+        """Sans agent configuré → aucune requête, aucun device"""
+        assert asyncio.run(SNMPScanner(targets=[]).scan()) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+"""
+🧪 Tests - Change Feed
+
+Tests du flux de changements numéroté (curseurs since, ring buffer,
+persistance) et de son alimentation par le registry
+"""
+
+import pytest
+
+from src.features.network.change_feed import ChangeFeed
+from src.features.network.registry import NetworkRegistry
+
+
+MAC_A = "AA:BB:CC:00:00:01"
+MAC_B = "AA:BB:CC:00:00:02"
+
+
+class TestChangeFeed:
+    """Tests pour change_feed.py"""
+
+    def test_cursor_pagination(self):
+        feed = ChangeFeed(capacity=100)
+        feed.extend({'type': 'ip_changed', 'mac': MAC_A if i % 2 else MAC_B} for i in range(10))
+
+        page = feed.since(0, limit=4)
+        assert [e['seq'] for e in page['events']] == [1, 2, 3, 4]
+        assert page['next_seq'] == 4
+
+        page = feed.since(page['next_seq'], limit=100)
+        assert [e['seq'] for e in page['events']] == list(range(5, 11))
+        assert (page['next_seq'], page['truncated']) == (10, False)
+        assert feed.since(10)['events'] == []
+
+        # Filtre: le curseur avance quand même jusqu'au dernier seq
+        page = feed.since(0, mac=MAC_A.lower())
+        assert [e['seq'] for e in page['events']] == [2, 4, 6, 8, 10]
+        assert feed.since(0, mac=MAC_A, limit=2)['next_seq'] == 4
+
+    def test_ring_buffer_truncation(self):
+        feed = ChangeFeed(capacity=3)
+        feed.extend({'type': 'new_device', 'mac': MAC_A} for _ in range(5))
+
+        page = feed.since(1)
+        assert [e['seq'] for e in page['events']] == [3, 4, 5]
+        assert page['truncated'] is True
+        assert feed.since(2)['truncated'] is False
+        assert feed.since(42)['truncated'] is True       # Curseur inconnu (feed réinitialisé)
+
+    def test_persistence(self, tmp_path):
+        feed = ChangeFeed(capacity=10, storage_file=tmp_path / "changes.json")
+        feed.extend([{'type': 'new_device', 'mac': MAC_A}, {'type': 'device_offline', 'mac': MAC_A}])
+        feed.save()
+
+        reloaded = ChangeFeed(capacity=10, storage_file=tmp_path / "changes.json")
+        assert reloaded.last_seq == 2
+        assert reloaded.append({'type': 'device_online', 'mac': MAC_A}) == 3
+        assert [e['type'] for e in reloaded.latest(2)] == ['device_online', 'device_offline']
+
+
+class TestRegistryFeed:
+    """Le registry publie tous ses changements dans un seul flux"""
+
+    def test_scan_and_lease_changes_published(self, tmp_path):
+        registry = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        registry.update_from_scan([{'mac': MAC_A, 'current_ip': "192.168.1.10", 'is_online': True}])
+        cursor = registry.get_recent_changes(since=0)['next_seq']
+
+        registry.update_from_lease(MAC_B, "192.168.1.10", "tv")
+        page = registry.get_recent_changes(since=cursor)
+        assert [e['type'] for e in page['events']] == ['new_device', 'ip_conflict_opened']
+
+        registry.update_from_scan([])
+        types = [e['type'] for e in registry.get_recent_changes(since=page['next_seq'])['events']]
+        assert types.count('device_offline') == 2
+        assert 'ip_conflict_resolved' in types
+
+        # Persisté avec le registry
+        reloaded = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        assert reloaded.get_recent_changes(limit=1)['events'][0]['seq'] == registry.feed.last_seq
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
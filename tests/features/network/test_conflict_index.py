@@ -0,0 +1,109 @@
+"""
+🧪 Tests - IP Conflict Index
+
+Tests de l'index IP ↔ MAC incrémental (registry + DHCP tracker)
+"""
+
+import pytest
+
+from src.features.network.conflict_index import CONFLICT_OPENED, CONFLICT_RESOLVED, ConflictIndex
+from src.features.network.monitoring.dhcp_tracker import DHCPTracker
+from src.features.network.registry import NetworkRegistry
+
+
+MAC_A = "AA:BB:CC:00:00:01"
+MAC_B = "AA:BB:CC:00:00:02"
+MAC_C = "AA:BB:CC:00:00:03"
+
+
+class TestConflictIndex:
+    """Tests pour conflict_index.py"""
+
+    def test_open_and_resolve_on_transitions(self):
+        """Événement à l'ouverture (2e MAC) et à la résolution (retour à 1)"""
+        index = ConflictIndex()
+        received = []
+        index.subscribe(received.append)
+
+        assert index.set_ip(MAC_A, "192.168.1.10") == []
+        opened = index.set_ip(MAC_B, "192.168.1.10", hostname="tv")
+        assert [e["type"] for e in opened] == [CONFLICT_OPENED]
+        assert opened[0]["macs"] == [MAC_A, MAC_B]
+
+        # 3e MAC: conflit déjà ouvert, pas de nouvel événement
+        assert index.set_ip(MAC_C, "192.168.1.10") == []
+        assert index.get_conflicts()[0]["conflict_count"] == 3
+        assert index.set_ip(MAC_C, "192.168.1.30") == []
+
+        resolved = index.set_ip(MAC_B, "192.168.1.20")
+        assert [e["type"] for e in resolved] == [CONFLICT_RESOLVED]
+        assert resolved[0]["remaining_macs"] == [MAC_A]
+        assert index.get_conflicts() == []
+        assert [e["type"] for e in received] == [CONFLICT_OPENED, CONFLICT_RESOLVED]
+
+    def test_remove_and_rebuild(self):
+        index = ConflictIndex()
+        index.rebuild([(MAC_A, "10.0.0.1", {}), (MAC_B, "10.0.0.1", {}), (MAC_C, None, {})])
+
+        assert index.get_conflicts()[0]["ip"] == "10.0.0.1"
+        assert index.get_ip(MAC_C) is None
+
+        assert index.remove(MAC_A)[0]["type"] == CONFLICT_RESOLVED
+        assert index.get_statistics()["open_conflicts"] == 0
+
+    def test_failing_subscriber_does_not_break_writes(self):
+        index = ConflictIndex()
+        index.subscribe(lambda event: 1 / 0)
+        index.set_ip(MAC_A, "10.0.0.1")
+
+        assert len(index.set_ip(MAC_B, "10.0.0.1")) == 1
+
+
+class TestRegistryConflicts:
+    """Index du registry: devices online uniquement"""
+
+    def test_lease_and_scan_update_index(self, tmp_path):
+        registry = NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+        registry.update_from_lease(MAC_A, "192.168.1.10", "pc")
+        changes = registry.update_from_lease(MAC_B, "192.168.1.10", "tv")
+
+        assert CONFLICT_OPENED in [c["type"] for c in changes]
+        assert registry.get_conflicts()[0]["devices"][1]["hostname"] == "tv"
+
+        # Scan sans MAC_B → offline → conflit résolu
+        stats = registry.update_from_scan([{"mac": MAC_A, "current_ip": "192.168.1.10", "is_online": True}])
+        assert CONFLICT_RESOLVED in [c["type"] for c in stats["changes"]]
+        assert registry.get_conflicts() == []
+
+    def test_index_rebuilt_on_load(self, tmp_path):
+        path = str(tmp_path / "registry.json")
+        registry = NetworkRegistry(registry_file=path)
+        registry.update_from_lease(MAC_A, "192.168.1.10")
+        registry.update_from_lease(MAC_B, "192.168.1.10")
+        registry._save()
+
+        assert len(NetworkRegistry(registry_file=path).get_conflicts()) == 1
+
+
+class TestDHCPTrackerConflicts:
+    """Index du DHCP tracker (IP actuelle de chaque device suivi)"""
+
+    def test_tracker_reads_index(self, tmp_path):
+        tracker = DHCPTracker(history_file=tmp_path / "dhcp_history.json")
+        tracker.track_ip_change(MAC_A, "192.168.1.10", "pc")
+        events = tracker.track_ip_change(MAC_B, "192.168.1.10", "tv")
+
+        assert events[0]["type"] == CONFLICT_OPENED
+        conflict = tracker.get_ip_conflicts()[0]
+        assert conflict["ip"] == "192.168.1.10"
+        assert [d["mac"] for d in conflict["devices"]] == [MAC_A, MAC_B]
+
+        # Rechargé depuis le fichier: même état
+        assert len(DHCPTracker(history_file=tmp_path / "dhcp_history.json").get_ip_conflicts()) == 1
+
+        assert tracker.track_ip_change(MAC_B, "192.168.1.11")[0]["type"] == CONFLICT_RESOLVED
+        assert tracker.get_ip_conflicts() == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
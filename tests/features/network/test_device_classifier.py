@@ -0,0 +1,182 @@
+"""
+🧪 Tests - Device Classifier
+
+Tests du classifieur compilé (types, OS, spoofing): équivalence avec les
+anciennes chaînes de règles, lot de 10k devices (benchmark opt-in:
+HOME333_BENCHMARKS=1)
+"""
+
+import os
+import random
+import re
+import time
+import pytest
+
+from src.features.network.detector import DeviceIdentifier
+from src.features.network.device_classifier import DeviceClassifier, KeywordMatcher
+from src.core.device_intelligence import DeviceIntelligenceEngine, ConflictType
+
+
+# Anciennes implémentations (regex non compilées, boucle par type) - référence
+LEGACY_TYPES = {
+    'smartphone': ([r'.*iphone.*', r'.*android.*', r'.*samsung.*', r'.*galaxy.*', r'.*pixel.*', r'.*xiaomi.*'],
+                   ['Apple', 'Samsung', 'Huawei', 'Xiaomi', 'OnePlus', 'Google'], ['5353']),
+    'computer': ([r'.*desktop.*', r'.*laptop.*', r'.*pc.*', r'.*-pc$', r'.*win.*', r'.*ubuntu.*'],
+                 ['Dell', 'HP', 'Lenovo', 'ASUS', 'MSI'], ['135', '139', '445', '3389']),
+    'router': ([r'.*router.*', r'.*gateway.*', r'.*livebox.*', r'.*freebox.*', r'.*bbox.*'],
+               ['Netgear', 'TP-Link', 'D-Link', 'Freebox', 'Orange'], ['80', '443', '8080']),
+    'smart_tv': ([r'.*tv.*', r'.*samsung.*tv.*', r'.*lg.*tv.*'], ['Samsung', 'LG', 'Sony'], ['8080', '9080']),
+    'iot': ([r'.*esp.*', r'.*sensor.*', r'.*smart.*', r'.*bulb.*', r'.*camera.*'],
+            ['Espressif', 'Raspberry Pi', 'Nest', 'Philips'], ['80', '443', '1883']),
+    'raspberry_pi': ([r'.*raspberry.*', r'.*rpi.*', r'.*pi.*'], ['Raspberry Pi'], ['22', '80']),
+}
+
+
+def legacy_identify(hostname, vendor, services):
+    scores = {}
+    for device_type, (hostnames, vendors, ports) in LEGACY_TYPES.items():
+        score = 0.0
+        if hostname and any(re.match(p, hostname.lower()) for p in hostnames):
+            score += 0.4
+        if vendor and any(v.lower() in vendor.lower() for v in vendors):
+            score += 0.4
+        if services and any(str(s) in ports for s in services):
+            score += 0.2
+        if score > 0:
+            scores[device_type] = score
+    if scores:
+        best = max(scores, key=scores.get)
+        if scores[best] >= 0.3:
+            return best, 'high' if scores[best] >= 0.7 else 'medium'
+    return 'unknown', 'low'
+
+
+def legacy_os(vendor, hostname, device_type):
+    vendor, hostname, device_type = (vendor or '').lower(), (hostname or '').lower(), (device_type or '').lower()
+    if 'apple' in vendor or 'iphone' in vendor or 'ipad' in vendor:
+        if 'iphone' in device_type or 'ipad' in device_type:
+            return 'iOS'
+        if 'macbook' in hostname or 'imac' in hostname or 'mac' in hostname:
+            return 'macOS'
+        return 'iOS/macOS'
+    if 'android' in vendor or 'samsung' in vendor or 'xiaomi' in vendor or 'huawei' in vendor:
+        return 'Android'
+    if 'desktop-' in hostname or 'win-' in hostname or hostname.startswith('pc-'):
+        return 'Windows'
+    if any(v in vendor for v in ['asus', 'msi', 'dell', 'hp', 'lenovo', 'microsoft']):
+        return 'Windows'
+    if 'raspberry' in vendor or 'espressif' in vendor or 'esp32' in vendor:
+        return 'Linux Embedded'
+    if 'router' in device_type or 'freebox' in vendor or 'livebox' in vendor:
+        return 'Linux/RouterOS'
+    if 'tv' in device_type or 'smart' in device_type:
+        return 'Android TV/Linux'
+    return None
+
+
+HOSTNAMES = ['iPhone-de-Marie', 'DESKTOP-4F2K', 'pc-bureau', 'win-server', 'freebox-server', 'Samsung-TV',
+             'lg-tv-salon', 'esp-32-cuisine', 'raspberrypi', 'MacBook-Pro', 'imac', 'ubuntu-laptop',
+             'camera-jardin', 'gateway', 'bulb-01', 'sensor', 'nas', None, '']
+VENDORS = ['Apple Inc.', 'Samsung Electronics', 'Hewlett Packard', 'Dell Inc.', 'Espressif Inc.',
+           'Raspberry Pi Trading Ltd', 'Freebox SAS', 'Orange Livebox', 'Sony', 'Cisco Systems',
+           'Microsoft', 'Google', 'Philips Lighting', 'Unknown', None]
+TYPES = ['smartphone', 'computer', 'Windows PC', 'router', 'smart_tv', 'iphone', 'mac mini', None]
+SERVICES = [None, [], ['22'], ['80', '443'], ['5353'], ['3389', '445'], ['1883'], ['9080']]
+
+
+def random_devices(count, seed=33):
+    rng = random.Random(seed)
+    return [
+        {
+            'mac': f"AA:BB:CC:{i >> 16 & 0xFF:02X}:{i >> 8 & 0xFF:02X}:{i & 0xFF:02X}",
+            'hostname': rng.choice(HOSTNAMES),
+            'vendor': rng.choice(VENDORS),
+            'device_type': rng.choice(TYPES),
+            'services': rng.choice(SERVICES),
+        }
+        for i in range(count)
+    ]
+
+
+def unique_devices(count):
+    """Hostnames uniques: pas de cache du classifieur"""
+    devices = random_devices(count)
+    for i, device in enumerate(devices):
+        device['hostname'] = f"{device['hostname'] or 'host'}-{i}"
+    return devices
+
+
+class TestKeywordMatcher:
+    """Tests du matcher multi-mots-clés"""
+
+    def test_overlapping_keywords(self):
+        matcher = KeywordMatcher(['pi', 'rpi', 'raspberry', 'win', 'win-', 'he', 'she', 'hers'])
+
+        assert matcher.search('raspberry-rpi') == {'raspberry', 'rpi', 'pi'}
+        assert matcher.search('win-server') == {'win', 'win-'}
+        assert matcher.search('ushers') == {'she', 'he', 'hers'}
+        assert matcher.search('xyz') == frozenset()
+
+
+class TestDeviceClassifier:
+    """Tests pour device_classifier.py"""
+
+    def test_matches_legacy_rules(self):
+        """Mêmes types / OS / spoofing que les anciennes chaînes de règles"""
+        classifier = DeviceClassifier()
+        devices = random_devices(2000)
+
+        for device, result in zip(devices, classifier.classify(devices)):
+            expected_type = legacy_identify(device['hostname'], device['vendor'], device['services'])
+            assert (result.device_type, result.confidence) == expected_type, device
+            assert result.os == legacy_os(device['vendor'], device['hostname'], device['device_type']), device
+
+    def test_identifier_and_engine_use_classifier(self):
+        identification = DeviceIdentifier().identify('Samsung-TV', 'Samsung Electronics', ['9080'])
+        assert identification == {'device_type': 'smart_tv', 'confidence': 'high', 'score': 1.0}
+
+        engine = DeviceIntelligenceEngine()
+        assert engine._infer_os_from_context({'hostname': 'PC-salon', 'vendor': None}) == 'Windows'
+        conflicts = engine.detect_conflicts([
+            {'mac': 'AA:00:00:00:00:01', 'ip': '192.168.1.2', 'vendor': 'Apple Inc.', 'device_type': 'Windows PC'},
+            {'mac': 'AA:00:00:00:00:02', 'ip': '192.168.1.3', 'vendor': 'Apple Inc.', 'device_type': 'smartphone'},
+        ])
+        assert [c.conflict_type for c in conflicts] == [ConflictType.MAC_SPOOFING]
+        assert conflicts[0].affected_devices == ['AA:00:00:00:00:01']
+
+
+class TestClassifierBatch:
+    """Lot de 10k devices: mêmes résultats que les règles historiques"""
+
+    def test_10k_devices(self):
+        classifier = DeviceClassifier()
+        devices = unique_devices(10_000)
+
+        results = classifier.classify(devices)
+
+        assert len(results) == 10_000
+        for device, result in zip(devices, results):
+            expected_type = legacy_identify(device['hostname'], device['vendor'], device['services'])
+            assert (result.device_type, result.confidence) == expected_type, device
+            assert result.os == legacy_os(device['vendor'], device['hostname'], device['device_type']), device
+
+
+@pytest.mark.skipif(not os.environ.get("HOME333_BENCHMARKS"), reason="benchmark: HOME333_BENCHMARKS=1 pytest -s")
+def test_benchmark_10k_devices():
+    """Temps compilé vs règles historiques (hors suite unitaire)"""
+    devices = unique_devices(10_000)
+
+    start = time.perf_counter()
+    DeviceClassifier().classify(devices)
+    compiled = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for device in devices:
+        legacy_identify(device['hostname'], device['vendor'], device['services'])
+        legacy_os(device['vendor'], device['hostname'], device['device_type'])
+    legacy = time.perf_counter() - start
+
+    print(f"\n10k devices: compilé {compiled * 1000:.0f} ms, règles historiques {legacy * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
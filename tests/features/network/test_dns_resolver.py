@@ -0,0 +1,182 @@
+"""
+🧪 Tests - Async DNS Resolver
+
+Tests du résolveur PTR/A et de son cache contre un serveur DNS local
+(stand-in UDP sur 127.0.0.1)
+"""
+
+import asyncio
+import struct
+import pytest
+
+from src.features.network.dns_resolver import (
+    CLASS_IN, HEADER, TYPE_A, TYPE_PTR, TYPE_SOA,
+    AsyncDnsResolver, encode_name, read_name,
+)
+
+
+ZONE = {
+    (TYPE_PTR, "10.1.168.192.in-addr.arpa"): ("pc-salon.lan", 600),
+    (TYPE_PTR, "11.1.168.192.in-addr.arpa"): ("tv.lan", 0),
+    (TYPE_A, "nas.lan"): ("192.168.1.20", 600),
+}
+SOA_MINIMUM = 120
+
+
+class DnsStandIn(asyncio.DatagramProtocol):
+    """Serveur DNS minimal: zone en mémoire, NXDOMAIN + SOA sinon"""
+
+    def __init__(self, delay=0.0, silent=False):
+        self.delay = delay
+        self.silent = silent
+        self.queries = []
+        self.peers = set()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        query_id = HEADER.unpack_from(data, 0)[0]
+        name, pos = read_name(data, HEADER.size)
+        qtype = struct.unpack_from("!H", data, pos)[0]
+        self.queries.append((qtype, name))
+        self.peers.add(addr)
+        if self.silent:
+            return
+        question = data[HEADER.size:pos + 4]
+        asyncio.get_running_loop().call_later(
+            self.delay, self.transport.sendto, self._answer(query_id, question, qtype, name), addr
+        )
+
+    def _answer(self, query_id, question, qtype, name):
+        record = ZONE.get((qtype, name))
+        if record:
+            value, ttl = record
+            rdata = bytes(int(b) for b in value.split(".")) if qtype == TYPE_A else encode_name(value)
+            # Nom compressé: pointeur vers la question (offset 12)
+            answer = b"\xc0\x0c" + struct.pack("!HHIH", qtype, CLASS_IN, ttl, len(rdata)) + rdata
+            return HEADER.pack(query_id, 0x8180, 1, 1, 0, 0) + question + answer
+
+        soa_rdata = encode_name("ns.lan") + encode_name("admin.lan") + struct.pack("!IIIII", 1, 3600, 600, 86400, SOA_MINIMUM)
+        soa = encode_name("lan") + struct.pack("!HHIH", TYPE_SOA, CLASS_IN, 3600, len(soa_rdata)) + soa_rdata
+        return HEADER.pack(query_id, 0x8183, 1, 0, 1, 0) + question + soa
+
+
+async def start_server(**kwargs):
+    transport, server = await asyncio.get_running_loop().create_datagram_endpoint(
+        lambda: DnsStandIn(**kwargs), local_addr=("127.0.0.1", 0)
+    )
+    return transport, server, transport.get_extra_info("sockname")[1]
+
+
+def run_with_server(test, server_kwargs=None, **resolver_kwargs):
+    async def runner():
+        transport, server, port = await start_server(**(server_kwargs or {}))
+        resolver = AsyncDnsResolver(nameserver="127.0.0.1", port=port, **resolver_kwargs)
+        try:
+            return await test(resolver, server)
+        finally:
+            resolver.close()
+            transport.close()
+    return asyncio.run(runner())
+
+
+class TestAsyncDnsResolver:
+    """Tests pour dns_resolver.py"""
+
+    def test_batch_reverse_and_forward(self):
+        """PTR en lot + A, inconnu → None"""
+        async def test(resolver, server):
+            names = await resolver.reverse_many(["192.168.1.10", "192.168.1.11", "192.168.1.99"])
+            ip = await resolver.resolve("NAS.lan.")
+            return names, ip
+
+        names, ip = run_with_server(test)
+
+        assert names == {"192.168.1.10": "pc-salon.lan", "192.168.1.11": "tv.lan", "192.168.1.99": None}
+        assert ip == "192.168.1.20"
+
+    def test_positive_and_negative_cache(self):
+        """Réponses (positives et NXDOMAIN) servies depuis le cache"""
+        async def test(resolver, server):
+            for _ in range(3):
+                await resolver.reverse_many(["192.168.1.10", "192.168.1.99"])
+            return resolver, server
+
+        resolver, server = run_with_server(test)
+
+        assert len(server.queries) == 2
+        assert resolver.stats["hits"] == 2
+        assert resolver.stats["negative_hits"] == 2
+
+    def test_ttl_respected(self):
+        """TTL 0 → re-demandé; TTL négatif = minimum du SOA"""
+        async def test(resolver, server):
+            await resolver.reverse("192.168.1.11")
+            await resolver.reverse("192.168.1.11")
+            await resolver.reverse("192.168.1.99")
+            expires, _ = resolver._cache[(TYPE_PTR, "99.1.168.192.in-addr.arpa")]
+            return server, expires - asyncio.get_running_loop().time()
+
+        server, negative_ttl = run_with_server(test, min_ttl=0)
+
+        assert server.queries.count((TYPE_PTR, "11.1.168.192.in-addr.arpa")) == 2
+        assert SOA_MINIMUM - 5 < negative_ttl <= SOA_MINIMUM
+
+    def test_concurrent_identical_queries_coalesced(self):
+        """Même question en parallèle → une seule requête réseau"""
+        async def test(resolver, server):
+            results = await asyncio.gather(*(resolver.reverse("192.168.1.10") for _ in range(5)))
+            return results, server
+
+        results, server = run_with_server(test, server_kwargs={"delay": 0.05})
+
+        assert results == ["pc-salon.lan"] * 5
+        assert len(server.queries) == 1
+
+    def test_cancelled_first_lookup_does_not_block_coalesced(self):
+        """Premier appelant annulé → l'appelant fusionné reçoit la réponse"""
+        async def test(resolver, server):
+            first = asyncio.ensure_future(resolver.reverse("192.168.1.10"))
+            await asyncio.sleep(0.01)
+            second = asyncio.ensure_future(resolver.reverse("192.168.1.10"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            return await asyncio.wait_for(second, 1.0), resolver, server
+
+        name, resolver, server = run_with_server(test, server_kwargs={"delay": 0.05})
+
+        assert name == "pc-salon.lan"
+        assert len(server.queries) == 1 and resolver.stats['coalesced'] == 1
+        assert resolver._inflight == {}
+
+    def test_first_batch_shares_one_socket(self):
+        """Premier lot concurrent → un seul socket, max_in_flight respecté"""
+        async def test(resolver, server):
+            ips = [f"192.168.2.{i}" for i in range(20)]
+            await resolver.reverse_many(ips)
+            return server
+
+        server = run_with_server(test, server_kwargs={"delay": 0.01}, max_in_flight=4)
+
+        assert len(server.queries) == 20
+        assert len(server.peers) == 1
+
+    def test_timeout_returns_none(self):
+        """Serveur muet → None après retries, en cache (error_ttl)"""
+        async def test(resolver, server):
+            first = await resolver.reverse("192.168.1.10")
+            second = await resolver.reverse("192.168.1.10")
+            return first, second, resolver, server
+
+        first, second, resolver, server = run_with_server(
+            test, server_kwargs={"silent": True}, timeout=0.05, retries=1
+        )
+
+        assert first is None and second is None
+        assert len(server.queries) == 2  # 1 essai + 1 retry, puis cache
+        assert resolver.stats["timeouts"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
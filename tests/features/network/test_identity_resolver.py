@@ -0,0 +1,227 @@
+"""
+🧪 Tests - Identity Resolver
+
+Tests du rattachement des MACs aléatoires (rotation Wi-Fi privée) à un
+device logique unique du registry
+"""
+
+import asyncio
+import json
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import BackgroundTasks
+
+from src.features.network.identity_resolver import is_default_hostname, is_randomized_mac, normalize_hostname
+from src.features.network.registry import NetworkRegistry
+from src.features.network.routers.scan_router import scan_network
+from src.features.network.scanners.multi_source import MultiSourceScanner
+from src.features.network.schemas import ScanRequest
+from src.core.device_intelligence import DeviceData
+from src.features.network.scanners.dhcp_lease_scanner import parse_dnsmasq_leases, parse_isc_leases
+
+
+RANDOM_1 = "CA:08:C5:00:00:01"
+RANDOM_2 = "9E:67:44:00:00:02"
+RANDOM_3 = "DA:11:22:33:44:55"
+UNIVERSAL = "B8:27:EB:00:00:01"
+
+
+def make_registry(tmp_path):
+    return NetworkRegistry(registry_file=str(tmp_path / "registry.json"))
+
+
+def scan(registry, *devices):
+    return registry.update_from_scan([
+        {'mac': mac, 'current_ip': ip, 'current_hostname': hostname, 'is_online': True}
+        for mac, ip, hostname in devices
+    ])
+
+
+class TestSignals:
+    """MACs aléatoires et hostnames"""
+
+    def test_randomized_mac(self):
+        assert is_randomized_mac(RANDOM_1)
+        assert is_randomized_mac(RANDOM_2)
+        assert not is_randomized_mac(UNIVERSAL)
+        assert not is_randomized_mac("03:00:00:00:00:01")    # Multicast
+
+    def test_hostname_normalization(self):
+        assert normalize_hostname("iPhone-de-Marie.local") == "iphone-de-marie"
+        assert normalize_hostname("iPhone") is None
+        assert normalize_hostname("android") is None
+        assert normalize_hostname(None) is None
+
+    def test_default_model_hostname(self):
+        assert is_default_hostname("galaxy-a52")
+        assert is_default_hostname("iphone-15-pro")
+        assert is_default_hostname("android-3f9a2b1c")
+        assert not is_default_hostname("pixel-de-marie")
+        assert not is_default_hostname("laptop-salon")
+
+    def test_lease_client_id(self):
+        dnsmasq = parse_dnsmasq_leases(f"1700000000 {RANDOM_1.lower()} 192.168.1.20 pixel 01:aa:bb:cc\n")
+        assert dnsmasq[RANDOM_1].client_id == "01:aa:bb:cc"
+
+        isc = parse_isc_leases(
+            'lease 192.168.1.21 {\n  binding state active;\n'
+            f'  hardware ethernet {RANDOM_2.lower()};\n  uid "\\001\\236gD";\n}}\n'
+        )
+        assert isc[RANDOM_2].client_id == "\\001\\236gD"
+
+
+class TestRegistryRotation:
+    """Rotation détectée à l'arrivée d'une nouvelle MAC"""
+
+    def test_hostname_rotation_reuses_entry(self, tmp_path):
+        registry = make_registry(tmp_path)
+        scan(registry, (RANDOM_1, "192.168.1.20", "Pixel-de-Marie"))
+        registry.devices[RANDOM_1].notes = "Téléphone de Marie"
+        scan(registry)                                           # Parti
+
+        stats = scan(registry, (RANDOM_2, "192.168.1.21", "Pixel-de-Marie"))
+
+        assert list(registry.devices) == [RANDOM_2]
+        device = registry.devices[RANDOM_2]
+        assert device.previous_macs == [RANDOM_1]
+        assert device.notes == "Téléphone de Marie"
+        assert [h['ip'] for h in device.ip_history] == ["192.168.1.20", "192.168.1.21"]
+        assert stats['new'] == 0
+        assert stats['changes'][0] == {**stats['changes'][0], 'type': 'mac_rotated', 'old_mac': RANDOM_1}
+
+    def test_concurrent_or_universal_not_merged(self, tmp_path):
+        registry = make_registry(tmp_path)
+        # Deux appareils présents en même temps avec le même nom
+        scan(registry, (RANDOM_1, "192.168.1.20", "laptop-salon"), (RANDOM_2, "192.168.1.21", "laptop-salon"))
+        # Nom générique ou MAC universelle: jamais rattachés
+        scan(registry, (RANDOM_3, "192.168.1.22", "iPhone"))
+        scan(registry, (UNIVERSAL, "192.168.1.23", "laptop-salon"))
+
+        assert len(registry.devices) == 4
+
+    def test_default_model_name_needs_second_signal(self, tmp_path):
+        registry = make_registry(tmp_path)
+        # Deux Galaxy A52 distincts, jamais présents en même temps
+        scan(registry, (RANDOM_1, "192.168.1.20", "galaxy-a52"))
+        scan(registry)
+        scan(registry, (RANDOM_2, "192.168.1.21", "galaxy-a52"))
+
+        assert set(registry.devices) == {RANDOM_1, RANDOM_2}
+
+        # Même fabricant connu: rattachement accepté
+        scan(registry)
+        registry.devices[RANDOM_2].vendor = "Samsung"
+        registry.update_from_scan([{'mac': RANDOM_3, 'current_ip': "192.168.1.22", 'current_hostname': "galaxy-a52",
+                                    'vendor': "Samsung", 'is_online': True}])
+
+        assert RANDOM_3 in registry.devices and RANDOM_2 not in registry.devices
+        assert registry.devices[RANDOM_3].previous_macs == [RANDOM_2]
+
+    def test_distinct_client_ids_not_merged(self, tmp_path):
+        registry = make_registry(tmp_path)
+        registry.update_from_lease(RANDOM_1, "192.168.1.20", "laptop-salon", seen=False, client_id="01:aa")
+
+        registry.update_from_lease(RANDOM_2, "192.168.1.21", "laptop-salon", client_id="01:bb")
+
+        assert set(registry.devices) == {RANDOM_1, RANDOM_2}
+
+    def test_lease_client_id_rotation(self, tmp_path):
+        registry = make_registry(tmp_path)
+        registry.update_from_lease(RANDOM_1, "192.168.1.20", None, client_id="ff:00:11")
+
+        changes = registry.update_from_lease(RANDOM_2, "192.168.1.20", None, client_id="ff:00:11")
+
+        assert changes[0]['type'] == 'mac_rotated'
+        assert list(registry.devices) == [RANDOM_2]
+        assert registry.get_conflicts() == []    # L'ancienne MAC a quitté l'index
+
+
+class FakeLeaseScanner:
+    """Baux DHCP factices (une seule source, sans délai)"""
+    readers = ['dnsmasq']
+
+    def __init__(self, leases):
+        self.leases = leases
+
+    async def scan(self):
+        return [
+            DeviceData(mac=mac, ip=ip, hostname=hostname, source='dhcp', timestamp=datetime.now(),
+                       is_online=True, scan_type='dnsmasq_lease', metadata={'client_id': client_id})
+            for mac, ip, hostname, client_id in self.leases
+        ]
+
+
+class TestScanPath:
+    """Client id des baux: MultiSourceScanner → scan_router → registry"""
+
+    def run_scan(self, registry, *leases):
+        scanner = MultiSourceScanner()
+        scanner.enabled_sources = {name: False for name in scanner.enabled_sources}
+        scanner.enabled_sources['dhcp'] = True
+        scanner.scanners['dhcp'] = FakeLeaseScanner(leases)
+
+        router = "src.features.network.routers.scan_router"
+        with patch(f"{router}.MultiSourceScanner", return_value=scanner), \
+                patch(f"{router}.NetworkHistory", MagicMock()), \
+                patch(f"{router}.get_device_by_mac", return_value=None), \
+                patch(f"{router}._scan_in_progress", False), patch(f"{router}._current_scan", None), \
+                patch("src.features.network.registry.get_network_registry", return_value=registry):
+            return asyncio.run(scan_network(ScanRequest(), BackgroundTasks()))
+
+    def test_client_id_reaches_registry(self, tmp_path):
+        registry = make_registry(tmp_path)
+        self.run_scan(registry, (RANDOM_1, "192.168.1.20", "phone-a", "01:aa:bb:cc"))
+        assert registry.devices[RANDOM_1].dhcp_client_id == "01:aa:bb:cc"
+
+        # Nouvelle MAC, autre hostname: seul le client id permet le rattachement
+        result = self.run_scan(registry, (RANDOM_2, "192.168.1.21", "phone-b", "01:aa:bb:cc"))
+
+        assert list(registry.devices) == [RANDOM_2]
+        assert registry.devices[RANDOM_2].previous_macs == [RANDOM_1]
+        assert result.new_devices == 0
+
+
+class TestConsolidation:
+    """Fusion des entrées déjà présentes au chargement"""
+
+    def test_existing_entries_consolidated_on_load(self, tmp_path):
+        def entry(mac, first, last, hostname, online=False):
+            return {
+                'mac': mac, 'current_hostname': hostname, 'is_online': online,
+                'first_seen': first, 'last_seen': last, 'last_seen_online': last, 'total_detections': 2,
+                'ip_history': [{'ip': '192.168.1.20', 'first_seen': first, 'last_seen': last, 'occurrences': 1}],
+            }
+
+        path = tmp_path / "registry.json"
+        path.write_text(json.dumps({'devices': {
+            RANDOM_1: entry(RANDOM_1, "2026-01-01T10:00:00", "2026-01-02T10:00:00", "Pixel-de-Marie"),
+            RANDOM_2: entry(RANDOM_2, "2026-01-03T10:00:00", "2026-01-04T10:00:00", "pixel-de-marie"),
+            RANDOM_3: entry(RANDOM_3, "2026-01-05T10:00:00", "2026-01-06T10:00:00", "Pixel-de-Marie", online=True),
+            # Présence chevauchante → autre appareil
+            "DE:00:00:00:00:04": entry("DE:00:00:00:00:04", "2026-01-05T12:00:00", "2026-01-05T13:00:00",
+                                       "Pixel-de-Marie"),
+            # Nom de modèle par défaut sans second signal → autres appareils
+            "DE:00:00:00:00:05": entry("DE:00:00:00:00:05", "2026-01-01T10:00:00", "2026-01-01T11:00:00",
+                                       "iPhone-15"),
+            "DE:00:00:00:00:06": entry("DE:00:00:00:00:06", "2026-01-02T10:00:00", "2026-01-02T11:00:00",
+                                       "iphone-15"),
+        }}))
+
+        registry = NetworkRegistry(registry_file=str(path))
+
+        assert set(registry.devices) == {RANDOM_3, "DE:00:00:00:00:04", "DE:00:00:00:00:05", "DE:00:00:00:00:06"}
+        device = registry.devices[RANDOM_3]
+        assert device.previous_macs == [RANDOM_1, RANDOM_2]
+        assert device.first_seen == "2026-01-01T10:00:00"
+        assert device.total_detections == 6
+        assert device.ip_history[0]['occurrences'] == 3
+        assert registry.get_statistics()['randomized_macs_merged'] == 2
+
+        # Sauvegardé: le rechargement ne refusionne rien
+        assert len(NetworkRegistry(registry_file=str(path)).devices) == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+"""
+🧪 Tests - IEEE OUI Registry
+
+Tests de la compilation du registre binaire et du plus long préfixe
+"""
+
+import pytest
+
+from src.features.network.oui_registry import OUIRegistry, compile_registry
+from src.features.network.detector import ExtendedOUIDatabase
+
+
+MA_L = """OUI/MA-L                                                    Organization
+company_id                                                  Organization
+                                                            Address
+
+70-B3-D5   (hex)		IEEE Registration Authority
+70B3D5     (base 16)		IEEE Registration Authority
+				445 Hoes Lane
+				Piscataway  NJ  08554
+				US
+
+B8-27-EB   (hex)		Raspberry Pi Foundation
+B827EB     (base 16)		Raspberry Pi Foundation
+				Mitchell Wood House
+				Caldecote  Cambridgeshire  CB23 7NU
+				GB
+"""
+
+MA_M = """70-B3-D5   (hex)		Vendor 28 bits
+A00000-AFFFFF     (base 16)		Vendor 28 bits
+				Somewhere
+"""
+
+MA_S = """70-B3-D5                      (hex)                         Vendor 36 bits
+A12000-A12FFF                 (base 16)                     Vendor 36 bits
+                                                            Somewhere
+"""
+
+CSV = """Registry,Assignment,Organization Name,Organization Address
+MA-L,DCA632,Raspberry Pi Trading Ltd,"Maurice Wilkes Building, Cambridge GB"
+"""
+
+
+@pytest.fixture
+def registry(tmp_path):
+    sources = []
+    for name, content in (("oui.txt", MA_L), ("mam.txt", MA_M), ("oui36.txt", MA_S), ("extra.csv", CSV)):
+        path = tmp_path / name
+        path.write_text(content)
+        sources.append(path)
+
+    counts = compile_registry(sources, tmp_path / "oui.bin")
+    # Bloc parent "IEEE Registration Authority" ignoré
+    assert counts == {24: 2, 28: 1, 36: 1}
+
+    registry = OUIRegistry(tmp_path / "oui.bin")
+    yield registry
+    registry.close()
+
+
+class TestOUIRegistry:
+    """Tests pour oui_registry.py"""
+
+    def test_longest_prefix_match(self, registry):
+        """36 bits > 28 bits > 24 bits"""
+        assert registry.lookup("70:B3:D5:A1:23:45") == ("Vendor 36 bits", 36)
+        assert registry.lookup("70:B3:D5:A9:00:01") == ("Vendor 28 bits", 28)
+        # Hors MA-M / MA-S connus: pas de repli sur le bloc de l'autorité IEEE
+        assert registry.lookup("70-B3-D5-00-00-01") is None
+        assert registry.lookup("b827eb112233") == ("Raspberry Pi Foundation", 24)
+        assert registry.lookup("DC:A6:32:00:00:01") == ("Raspberry Pi Trading Ltd", 24)
+
+    def test_unknown_and_invalid(self, registry):
+        assert registry.lookup("CA:08:C5:00:00:00") is None
+        assert registry.lookup("zz") is None
+        assert registry.lookup("") is None
+
+    def test_missing_file(self, tmp_path):
+        """Fichier absent → registre indisponible, lookups None"""
+        registry = OUIRegistry(tmp_path / "absent.bin")
+
+        assert registry.available is False
+        assert registry.lookup("B8:27:EB:11:22:33") is None
+
+    def test_bundled_registry(self):
+        """Registre embarqué: complet et rapide à ouvrir"""
+        registry = OUIRegistry()
+        stats = registry.get_statistics()
+
+        assert registry.available
+        assert stats["entries"]["24bit"] > 30000
+        assert registry.lookup("00:50:C2:F7:10:00") == ("RF Code", 36)
+        assert registry.lookup("70:B3:D5:12:34:56") is None
+        registry.close()
+
+
+class TestExtendedOUIDatabase:
+    """Overlay curé au-dessus du registre"""
+
+    def test_overlay_then_registry(self):
+        db = ExtendedOUIDatabase()
+
+        curated = db.lookup("EC:FA:BC:00:00:01")
+        assert curated["source"] == "local_oui"
+        assert curated["type"] == "iot"
+
+        ieee = db.lookup("10:E9:92:00:00:01")
+        assert ieee["source"] == "ieee_oui"
+        assert ieee["vendor"] == "INGRAM MICRO SERVICES"
+        assert "type" not in ieee
+
+        # MA-M / MA-S absent du registre: échec local (fallback API)
+        assert db.lookup("70:B3:D5:12:34:56") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])